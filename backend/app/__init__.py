@@ -8,6 +8,7 @@ from .api.github_routes import github_bp
 from .api.helper_routes import helper_bp
 from .api.team_routes import team_bp
 from .api.db_routes import db_bp
+from .services.job_queue import register_job_commands
 import logging
 
 
@@ -34,6 +35,7 @@ def create_app():
     app.register_blueprint(helper_bp, url_prefix="/api")
     app.register_blueprint(team_bp, url_prefix="/api")
     app.register_blueprint(db_bp, url_prefix="/api")
+    register_job_commands(app)
 
     # Configure logging
     logging.basicConfig(level=logging.INFO)
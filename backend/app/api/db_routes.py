@@ -6,69 +6,51 @@ user query, and deleting specific user contributions.
 Routes:
 - /db/check-duplicate (POST): Checks if a dataset with the given name and type already exists for the authenticated
   user.
-- /db/save-data (POST): Saves the provided data to the database for the authenticated user.
+- /db/save-data (POST): Saves the provided data to the database for the authenticated user, in one request or in
+  chunks appended to the dataset.
 - /db/user-queries (GET): Retrieves all queries made by the authenticated user.
 - /db/user-queries/<query_id> (DELETE): Deletes a specific user query by its ID.
 - /db/user-queries/<query_id> (GET): Retrieves contributions for a specific user query by its ID.
+- /db/user-queries/<query_id>/rows (GET): Retrieves the rows of a user query page by page, or streams them as NDJSON.
+- /db/user-queries/<query_id>/export (GET): Streams the rows of a user query as a Parquet or Arrow IPC file.
+- /db/user-queries/<query_id>/languages (GET): Sums the language rows of a commit or repository query per author and
+  language.
 - /db/user-contributions/<query_id>/<contribution_id> (DELETE): Deletes a specific contribution by its ID for a given
   user query.
-
-Functions:
-- convert_row_to_dict(table_header: List[str], table_data: List[List[Any]]) -> List[Dict[str, Any]]:
-    Converts table data into a list of dictionaries using the provided table header.
+- /db/user-contributions/<query_id> (DELETE): Deletes the contributions with the given IDs from a user query.
 """
 
-from typing import List, Dict, Any
-from flask import Blueprint, jsonify, request
+import json
+from typing import List, Optional
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models import (
-    User,
-    UserQuery,
-    GithubContributionData,
-    CommitComment,
-    IssueComment,
-    GistComment,
-    RepositoryDiscussionComment,
-    Gist,
-    Issue,
-    PullRequest,
-    RepositoryDiscussion,
-    Repository,
-    Commit,
-)
+from werkzeug.utils import secure_filename
+from app.models import Repository, User, UserQuery
+from sqlalchemy import delete, select
 from app.database import db
+from app.services.bulk_ingest import INGEST_COLUMNS, bulk_insert
+from app.services.dataset_reader import (
+    DEFAULT_PAGE_ROWS,
+    MAX_PAGE_ROWS,
+    dataset_model,
+    iter_rows,
+    read_page,
+)
+from app.services.dataset_export import EXPORT_FORMATS, export_dataset
+from app.services.language_tables import LANGUAGE_DATA_TYPES, language_totals
 
-MODEL_MAP = {
-    "total": GithubContributionData.create_from_row,
-    "Commit Comments": CommitComment.create_from_row,
-    "Gist Comments": GistComment.create_from_row,
-    "Issue Comments": IssueComment.create_from_row,
-    "Repository Discussion Comments": RepositoryDiscussionComment.create_from_row,
-    "Gists": Gist.create_from_row,
-    "Issues": Issue.create_from_row,
-    "Pull Requests": PullRequest.create_from_row,
-    "Repository Discussions": RepositoryDiscussion.create_from_row,
-    "Repositories": Repository.create_from_row,
-    "Repo Commits": Commit.create_from_row,
-    "User Commits": Commit.create_from_row,
-}
+# The repository types a "Repositories" dataset is saved under
+REPOSITORY_DATA_TYPES = [
+    "Owned Original Repo",
+    "Owned Forked Repo",
+    "Collaborating Original Repo",
+    "Collaborating Forked Repo",
+]
 
-db_bp = Blueprint("db", __name__)
+# The number of IDs per DELETE statement, below the bound parameter limit of SQLite
+DELETE_CHUNK_IDS = 5000
 
-
-def convert_row_to_dict(
-    table_header: List[str], table_data: List[List[Any]]
-) -> List[Dict[str, Any]]:
-    """
-    Convert table data into a list of dictionaries using the provided table header.
-    Args:
-        table_header (List[str]): A list of strings representing the header of the table.
-        table_data (List[List[Any]]): A list of lists where each inner list represents a row of the table.
-    Returns:
-        List[Dict[str, Any]]: A list of dictionaries where each dictionary represents a row of the table,
-                              with keys from the table header and values from the corresponding row.
-    """
-    return [dict(zip(table_header, row)) for row in table_data]
+db_bp = Blueprint("db", __name__)
 
 
 @db_bp.route("/db/check-duplicate", methods=["POST"])
@@ -81,7 +63,8 @@ def check_duplicate():
     and checks if a dataset with the same name and type already exists for the user identified
     by the JWT token. If the dataset type is one of the specified types, it is normalized to
     "Repositories". The function then queries the database to check for an existing dataset
-    with the same name and type for the current user.
+    with the same name and type for the current user. A chunked upload that never received its last chunk does not
+    count, as saving the dataset again replaces it.
 
     Returns:
         Response: A JSON response indicating whether the dataset exists or not.
@@ -91,17 +74,12 @@ def check_duplicate():
     data = request.get_json()
     name = data.get("name")
     dstype = data.get("type")
-    if dstype in [
-        "Owned Original Repo",
-        "Owned Forked Repo",
-        "Collaborating Original Repo",
-        "Collaborating Forked Repo",
-    ]:
+    if dstype in REPOSITORY_DATA_TYPES:
         dstype = "Repositories"
     github_id = get_jwt_identity()
     user = User.query.filter_by(github_id=github_id).first()
     existing_dataset = UserQuery.query.filter_by(
-        ds_name=name, user_login=user.github_login, data_type=dstype
+        ds_name=name, user_login=user.github_login, data_type=dstype, complete=True
     ).first()
     if existing_dataset:
         return jsonify({"exists": True}), 200
@@ -113,19 +91,22 @@ def check_duplicate():
 def save_to_db():
     """
     Save data from a JSON request to the database.
-    This function extracts data from a JSON request, processes it, and saves it to the database.
-    It handles different types of data, including repositories and other data types, and associates
-    the data with a user based on their GitHub ID.
+    This function extracts a table from a JSON request and inserts its rows in bulk, see bulk_insert.
+    A large table can be uploaded in chunks: the first request creates the dataset and returns its id, and the
+    following requests pass that id as "queryId" to append their rows to it. Every chunk but the last passes "final"
+    as false, which keeps the dataset incomplete; a new upload of the same name and type replaces an incomplete
+    dataset, so an upload that failed part way can be retried from its first chunk.
     The function performs the following steps:
     1. Extracts data from the JSON request.
-    2. Converts table data into a dictionary format.
-    3. Determines the repository type if applicable.
-    4. Begins a database session and retrieves the user based on their GitHub ID.
-    5. Creates a UserQuery entry for the user.
-    6. Iterates over the converted data and creates corresponding database entries.
-    7. Commits the transaction if successful, or rolls back in case of an error.
+    2. Determines the repository type if applicable.
+    3. Begins a database session and retrieves the user based on their GitHub ID.
+    4. Creates a UserQuery entry for the user, replacing an incomplete one of the same name and type, or looks up
+       the dataset of "queryId" and the repository type of its rows.
+    5. Inserts the rows with chunked multi-row INSERT statements.
+    6. Commits the transaction if successful, or rolls back in case of an error.
     Returns:
-        Response: A JSON response indicating success or failure, with an appropriate HTTP status code.
+        Response: A JSON response with the id of the dataset and the number of rows saved and the rows saved per
+        second, or the error, with an appropriate HTTP status code.
     Raises:
         Exception: If an error occurs during the database transaction, the error is logged and a JSON
                    response with the error message is returned.
@@ -133,45 +114,69 @@ def save_to_db():
     data = request.get_json()
     ds_name = data.get("name")
     dstype = data.get("type")
-    table_header = data.get("tableHeader")
-    table_data = data.get("tableData")
+    table_header = data.get("tableHeader") or []
+    table_data = data.get("tableData") or []
     langs = data.get("langs")
     start_time = data.get("startTime")
     end_time = data.get("endTime")
+    query_id = data.get("queryId")
+    final = data.get("final", True) is not False
     github_id = get_jwt_identity()
-    converted_data = convert_row_to_dict(table_header, table_data)
     repo_type = None
-    if dstype in [
-        "Owned Original Repo",
-        "Owned Forked Repo",
-        "Collaborating Original Repo",
-        "Collaborating Forked Repo",
-    ]:
+    if dstype in REPOSITORY_DATA_TYPES:
         repo_type = dstype
         dstype = "Repositories"
 
     try:
         with db.session.begin():
             user = User.query.filter_by(github_id=github_id).first()
-            user_query = UserQuery.create(
-                user_login=user.github_login,
-                ds_name=ds_name,
-                start_time=start_time if start_time else None,
-                end_time=end_time if end_time else None,
-                data_type=dstype,
+            if query_id is None:
+                if dstype not in INGEST_COLUMNS:
+                    return jsonify({"error": f"Unknown data type: {dstype}"}), 400
+                for incomplete in UserQuery.query.filter_by(
+                    ds_name=ds_name, user_login=user.github_login, data_type=dstype, complete=False
+                ):
+                    db.session.delete(incomplete)
+                user_query = UserQuery.create(
+                    user_login=user.github_login,
+                    ds_name=ds_name,
+                    start_time=start_time if start_time else None,
+                    end_time=end_time if end_time else None,
+                    data_type=dstype,
+                    complete=final,
+                )
+                db.session.flush()
+            else:
+                user_query = UserQuery.query.filter_by(
+                    id=query_id, user_login=user.github_login
+                ).first()
+                if not user_query:
+                    return jsonify({"error": "User query not found or not authorized"}), 404
+                if user_query.data_type == "Repositories":
+                    # The later chunks need not repeat the type the dataset was created with
+                    repo_type = (
+                        db.session.query(Repository.repository_type)
+                        .filter(Repository.user_query_id == user_query.id)
+                        .limit(1)
+                        .scalar()
+                    ) or repo_type
+                if final:
+                    user_query.complete = True
+            stats = bulk_insert(
+                user_query.data_type,
+                table_header,
+                table_data,
+                user_query.id,
+                repository_type=repo_type,
+                langs=langs,
             )
-            db.session.flush()
-            create_function = MODEL_MAP.get(dstype)
-            for row in converted_data:
-                if dstype == "Repositories":
-                    contribution = create_function(row, repo_type, user_query.id)
-                elif dstype == "total":
-                    contribution = create_function(row, langs, user_query.id)
-                else:
-                    contribution = create_function(row, user_query.id)
-                db.session.add(contribution)
             db.session.commit()
-        return jsonify({"message": "Data saved successfully"}), 200
+        return (
+            jsonify(
+                {"message": "Data saved successfully", "query_id": user_query.id, **stats}
+            ),
+            200,
+        )
     except Exception as e:
         db.session.rollback()
         print(e)
@@ -285,6 +290,149 @@ def get_user_query_contribution(query_id):
     return jsonify(contributions)
 
 
+@db_bp.route("/db/user-queries/<int:query_id>/rows", methods=["GET"])
+@jwt_required()
+def get_user_query_rows(query_id):
+    """
+    Retrieve the rows of a user query page by page, or stream them.
+
+    Rows are ordered by id and paged by keyset: a page holds the rows whose id is greater than "after", so the next
+    page is requested with the id of the last row received. With "format=ndjson", the rows after "after" are streamed
+    as newline-delimited JSON, read in batches without loading the dataset into memory.
+
+    Args:
+        query_id (int): The ID of the user query.
+
+    Returns:
+        Response: A JSON response with the rows and the "after" value of the next page (null after the last page),
+        or the stream of rows. 404 if the user query does not exist or belongs to another user.
+    """
+    github_id = get_jwt_identity()
+    user = User.query.filter_by(github_id=github_id).first()
+    user_query = UserQuery.query.filter_by(
+        id=query_id, user_login=user.github_login
+    ).first()
+    if not user_query:
+        return jsonify({"error": "User query not found or not authorized"}), 404
+    after = request.args.get("after", default=0, type=int)
+    limit = request.args.get("limit", type=int)
+
+    if request.args.get("format") == "ndjson":
+        rows = iter_rows(user_query, after=after, limit=limit)
+        lines = (json.dumps(row) + "\n" for row in rows)
+        return Response(
+            stream_with_context(lines), mimetype="application/x-ndjson"
+        )
+
+    size = max(1, min(limit or DEFAULT_PAGE_ROWS, MAX_PAGE_ROWS))
+    rows = read_page(user_query, after=after, limit=size)
+    # A full page may be followed by more rows
+    return jsonify({"rows": rows, "after": rows[-1]["id"] if len(rows) == size else None})
+
+
+@db_bp.route("/db/user-queries/<int:query_id>/export", methods=["GET"])
+@jwt_required()
+def export_user_query(query_id):
+    """
+    Stream the rows of a user query as a columnar file.
+
+    With "format=parquet" (the default) the file is Parquet, with "format=arrow" an Arrow IPC stream. The columns are
+    typed after the table's columns, and the file is written a row group at a time while the rows are read, see
+    export_dataset.
+
+    Args:
+        query_id (int): The ID of the user query.
+
+    Returns:
+        Response: The stream of the file, as an attachment named after the dataset. 400 if the format is unknown, 404
+        if the user query does not exist or belongs to another user.
+    """
+    export_format = request.args.get("format", default="parquet")
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"Unknown export format: {export_format}"}), 400
+    github_id = get_jwt_identity()
+    user = User.query.filter_by(github_id=github_id).first()
+    user_query = UserQuery.query.filter_by(
+        id=query_id, user_login=user.github_login
+    ).first()
+    if not user_query:
+        return jsonify({"error": "User query not found or not authorized"}), 404
+
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    file_name = secure_filename(user_query.ds_name) or f"query-{query_id}"
+    return Response(
+        stream_with_context(export_dataset(user_query, export_format)),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{file_name}.{extension}"'},
+    )
+
+
+@db_bp.route("/db/user-queries/<int:query_id>/languages", methods=["GET"])
+@jwt_required()
+def get_user_query_languages(query_id):
+    """
+    Sum the language statistics of a commit or repository query per author and language.
+
+    The sums are computed by the database from the commit_languages or repository_languages rows of the query, so no
+    language statistics are parsed per request.
+
+    Args:
+        query_id (int): The ID of the user query.
+
+    Returns:
+        Response: A JSON list of the totals, each with the "login" and "language" and the "additions" and "deletions"
+        of a commit query or the "bytes" of a repository query. 400 if the query has no language statistics, 404 if
+        the user query does not exist or belongs to another user.
+    """
+    github_id = get_jwt_identity()
+    user = User.query.filter_by(github_id=github_id).first()
+    user_query = UserQuery.query.filter_by(
+        id=query_id, user_login=user.github_login
+    ).first()
+    if not user_query:
+        return jsonify({"error": "User query not found or not authorized"}), 404
+    if user_query.data_type not in LANGUAGE_DATA_TYPES:
+        return jsonify({"error": f"{user_query.data_type} has no language statistics"}), 400
+    return jsonify(language_totals(user_query))
+
+
+def _delete_rows(query_id: int, user_login: str, contribution_ids: List[int]) -> Optional[int]:
+    """
+    Deletes rows of a user query with one indexed DELETE per chunk of ids. The ownership of the user query is checked
+    by the statement itself, so rows of another user's query are never touched.
+
+    Args:
+        query_id (int): The ID of the user query.
+        user_login (str): The GitHub login of the authenticated user.
+        contribution_ids (List[int]): The IDs of the rows to delete.
+
+    Returns:
+        Optional[int]: The number of rows deleted, or None if the user query does not exist or belongs to another
+        user.
+    """
+    owned = select(UserQuery.id).where(
+        UserQuery.id == query_id, UserQuery.user_login == user_login
+    )
+    data_type = db.session.execute(
+        select(UserQuery.data_type).where(
+            UserQuery.id == query_id, UserQuery.user_login == user_login
+        )
+    ).scalar()
+    if data_type is None:
+        return None
+    table = dataset_model(data_type).__table__
+    deleted = 0
+    for start in range(0, len(contribution_ids), DELETE_CHUNK_IDS):
+        result = db.session.execute(
+            delete(table).where(
+                table.c.user_query_id == owned.scalar_subquery(),
+                table.c.id.in_(contribution_ids[start : start + DELETE_CHUNK_IDS]),
+            )
+        )
+        deleted += result.rowcount
+    return deleted
+
+
 @db_bp.route("/db/user-contributions/<query_id>/<contribution_id>", methods=["DELETE"])
 @jwt_required()
 def delete_user_contribution(query_id, contribution_id):
@@ -304,86 +452,50 @@ def delete_user_contribution(query_id, contribution_id):
     try:
         with db.session.begin():
             user = User.query.filter_by(github_id=github_id).first()
-            user_query = UserQuery.query.filter_by(
-                id=query_id, user_login=user.github_login
-            ).first()
-
-            if not user_query:
+            deleted = _delete_rows(
+                int(query_id), user.github_login, [int(contribution_id)]
+            )
+            if deleted is None:
                 return jsonify({"error": "User query not found or not authorized"}), 404
-
-            data_type = user_query.data_type
-            contribution = None
-            contribution_id = int(contribution_id)
-
-            if data_type == "total":
-                contribution = next(
-                    (
-                        c
-                        for c in user_query.total_contribution
-                        if c.id == contribution_id
-                    ),
-                    None,
-                )
-            elif data_type == "Commit Comments":
-                contribution = next(
-                    (c for c in user_query.commit_comments if c.id == contribution_id),
-                    None,
-                )
-            elif data_type == "Issue Comments":
-                contribution = next(
-                    (c for c in user_query.issue_comments if c.id == contribution_id),
-                    None,
-                )
-            elif data_type == "Gist Comments":
-                contribution = next(
-                    (c for c in user_query.gist_comments if c.id == contribution_id),
-                    None,
-                )
-            elif data_type == "Repository Discussion Comments":
-                contribution = next(
-                    (
-                        c
-                        for c in user_query.repository_discussion_comments
-                        if c.id == contribution_id
-                    ),
-                    None,
-                )
-            elif data_type == "Gists":
-                contribution = next(
-                    (c for c in user_query.gists if c.id == contribution_id), None
-                )
-            elif data_type == "Issues":
-                contribution = next(
-                    (c for c in user_query.issues if c.id == contribution_id), None
-                )
-            elif data_type == "Pull Requests":
-                contribution = next(
-                    (c for c in user_query.pull_requests if c.id == contribution_id),
-                    None,
-                )
-            elif data_type == "Repository Discussions":
-                contribution = next(
-                    (
-                        c
-                        for c in user_query.repository_discussion
-                        if c.id == contribution_id
-                    ),
-                    None,
-                )
-            elif data_type == "Repositories":
-                contribution = next(
-                    (c for c in user_query.repository if c.id == contribution_id), None
-                )
-            elif data_type == "Repo Commits" or data_type == "User Commits":
-                contribution = next(
-                    (c for c in user_query.commit if c.id == contribution_id), None
-                )
-
-            if not contribution:
+            if not deleted:
                 return jsonify({"error": "Contribution not found"}), 404
-            db.session.delete(contribution)
             db.session.commit()
         return jsonify({"message": "Contribution deleted successfully"}), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
+
+
+@db_bp.route("/db/user-contributions/<int:query_id>", methods=["DELETE"])
+@jwt_required()
+def delete_user_contributions(query_id):
+    """
+    Deletes several contributions of a user query at once.
+    Args:
+        query_id (int): The ID of the user query.
+    Returns:
+        Response: A JSON response indicating the result of the deletion operation.
+            - If no list of integer IDs is given as "ids", returns a 400 error with a message.
+            - If the user query is not found or not authorized, returns a 404 error with a message.
+            - Otherwise returns a 200 status with the number of contributions deleted; IDs that are not in the user
+              query are skipped.
+            - If an exception occurs, returns a 500 error with the exception message.
+    """
+    data = request.get_json(silent=True) or {}
+    contribution_ids = data.get("ids")
+    if not isinstance(contribution_ids, list) or not all(
+        isinstance(contribution_id, int) for contribution_id in contribution_ids
+    ):
+        return jsonify({"error": "ids must be a list of contribution IDs"}), 400
+    github_id = get_jwt_identity()
+    try:
+        with db.session.begin():
+            user = User.query.filter_by(github_id=github_id).first()
+            deleted = _delete_rows(query_id, user.github_login, contribution_ids)
+            if deleted is None:
+                return jsonify({"error": "User query not found or not authorized"}), 404
+            db.session.commit()
+        return jsonify({"message": "Contributions deleted successfully", "deleted": deleted}), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
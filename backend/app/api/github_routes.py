@@ -6,10 +6,20 @@ The routes are protected with JWT authentication and require a valid JWT token t
 
 Routes:
     - /graphql/rate-limit: Fetches the current API rate limit usage for the authenticated GitHub user.
+    - /graphql/token-pool: Reports the rate-limit budget of every token in the user's bulk-job token pool.
     - /graphql/current-user-login: Fetches the login details of the currently authenticated GitHub user.
     - /graphql/user-login/<login>: Fetches the login details of a specific GitHub user identified by their username.
     - /graphql/user-profile-stats/<login>: Fetches the profile statistics of a specific GitHub user.
     - /graphql/user-contributions-collection/<login>: Fetches a user's GitHub contributions over a specified period.
+    - /graphql/batch/user-profile-stats: Fetches the profile statistics of several GitHub users in batched requests.
+    - /graphql/batch/user-contributions-collection: Fetches the contributions of several GitHub users in batched
+      requests.
+    - /graphql/jobs/total-contributions: Starts a server-side job that mines the total contributions of a cohort of
+      GitHub users.
+    - /graphql/jobs/user-commits: Starts a server-side job that mines the commits of a cohort of GitHub users.
+    - /graphql/jobs/refresh/<query_id>: Starts a server-side job that fetches only the new items of a saved dataset.
+    - /graphql/jobs/<job_id>: Reports the progress of a mining job, or cancels it.
+    - /graphql/jobs/<job_id>/results: Streams the result table of a mining job as NDJSON.
     - /graphql/user-contribution-years/<login>: Fetches the years in which a GitHub user has made contributions.
     - /graphql/user-contribution-calendar/<login>: Fetches a user's contribution calendar within a specified date range.
     - /graphql/user-repositories-a/<login>: Fetches non-forked repositories owned by the specified GitHub user.
@@ -29,8 +39,15 @@ Routes:
     - /graphql/repository_branches/<owner>/<repo>: Fetches repository branches for a specified GitHub repository.
     - /graphql/repository_default_branch/<owner>/<repo>: Fetches the default branch of a GitHub repository.
     - /graphql/repository_contributors/<owner>/<repo>: Fetches the contributors of a GitHub repository.
+    - /graphql/repository_authors/<owner>/<repo>: Fetches the unique authors of a GitHub repository incrementally.
     - /graphql/repository_branch_commits/<owner>/<repo>/<use_default>: Fetches commit history for a specific branch in
       a GitHub repository.
+    - /graphql/stream/<kind>/<login>: Streams every comment, gist, issue, pull request, discussion or repository of a
+      GitHub user as NDJSON.
+    - /graphql/stream/repository_branch_commits/<owner>/<repo>/<use_default>: Streams the whole commit history of a
+      branch as NDJSON.
+    - /graphql/count/<kind>/<login>: Counts the comments, gists, issues, pull requests or discussions a GitHub user
+      created in a time window.
     - /graphql/user_repository_names/<login>: Fetches the names of all repositories owned by a given GitHub user.
     - /graphql/repository_contributor_contributions/<owner>/<repo>/<login>: Fetches commit contributions of a GitHub
       user in a specific repository.
@@ -40,32 +57,49 @@ Helper Functions:
     - check_user: Checks if the authenticated user exists in the database.
     - extract_user_credentials_and_host: Extracts the user's personal access token, protocol, and host from the user
       object.
-    - fetch_with_retries: Fetches data with retry logic and exponential backoff.
+    - find_job: Looks up a total-contributions, commit mining or dataset refresh job started by the user.
 
 Constants:
-    - MAX_RETRIES: Maximum number of retry attempts for fetching data.
-    - INITIAL_RETRY_DELAY: Initial delay in seconds before retrying a failed request.
+    - JOB_POLL_INTERVAL: Seconds between checks for new rows while streaming the results of a job.
 """
 
+import itertools
+import json
 import logging
 import time
-from datetime import datetime, timezone
 from urllib.parse import urlparse
 
-import requests
-from requests.exceptions import Timeout, RequestException
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from pygments.lexers import guess_lexer_for_filename
-from pygments.lexers.special import TextLexer
 
 from app.models.user import User
+from app.models.user_query import UserQuery
+from app.models.commit_detail_cache import CommitDetailCache
+from app.models.contribution_window_cache import ContributionWindowCache
+from app.models.repository_contributors_checkpoint import RepositoryContributorsCheckpoint
+from app.services.token_pool import get_token_pool_budget
+from app.services.cohort_jobs import start_cohort_job, get_cohort_job
+from app.services.commit_mining import start_commit_mining_job, get_commit_mining_job
+from app.services.job_queue import StoredJob, find_stored_job
+from app.services.dataset_reader import iter_rows
+from app.services.dataset_refresh import (
+    REFRESHABLE_DATA_TYPES,
+    start_dataset_refresh_job,
+    get_dataset_refresh_job,
+)
+from app.services.github_rest_services import (
+    can_access_repository,
+    fetch_with_retries,
+    process_commit_details,
+)
 from ..services.github_graphql_services import (
     get_rate_limit,
     get_current_user_login,
     get_specific_user_login,
     get_user_profile_stats,
     get_user_contributions_collection,
+    get_users_profile_stats,
+    get_users_contributions_collection,
     get_user_contribution_years,
     get_user_contribution_calendar,
     get_user_repositories_page,
@@ -80,13 +114,21 @@ from ..services.github_graphql_services import (
     get_repository_branches_page,
     get_repository_default_branch,
     get_repository_contributors_page,
+    get_repository_contributors,
     get_repository_branch_commits_page,
     get_repository_contributor_contributions_page,
     get_user_repository_names_page,
+    stream_user_nodes,
+    stream_repository_branch_commits,
+    count_user_nodes_in_window,
+    USER_NODE_STREAMS,
+    COUNTABLE_KINDS,
 )
 
 github_bp = Blueprint("api", __name__)
 
+JOB_POLL_INTERVAL = 1
+
 
 def check_user():
     """
@@ -121,6 +163,27 @@ def extract_user_credentials_and_host(user):
     return pat, protocol, host
 
 
+def find_job(job_id, user_login):
+    """
+    Looks up a total-contributions, commit mining or dataset refresh job started by the user. A job that is not live
+    in this process, e.g. one run by a worker in another process, is read from the job table.
+
+    Args:
+        job_id (str): The id of the job.
+        user_login (str): The login of the user asking for the job.
+
+    Returns:
+        CohortJob | CommitMiningJob | DatasetRefreshJob | StoredJob | None: The job, or None if it does not exist or
+        belongs to another user.
+    """
+    return (
+        get_cohort_job(job_id, user_login)
+        or get_commit_mining_job(job_id, user_login)
+        or get_dataset_refresh_job(job_id, user_login)
+        or find_stored_job(job_id, user_login)
+    )
+
+
 @github_bp.route("/graphql/rate-limit", methods=["GET"])
 @jwt_required()
 def rate_limit():
@@ -140,6 +203,24 @@ def rate_limit():
     return jsonify(data)
 
 
+@github_bp.route("/graphql/token-pool", methods=["GET"])
+@jwt_required()
+def token_pool():
+    """
+    Reports the rate-limit budget of every token in the authenticated user's bulk-job token pool, so operators can
+    see how much headroom the pool has left.
+
+    Returns:
+        Response (JSON): The masked tokens with their limit, remaining points and reset time, and the total
+        remaining points of the pool.
+
+    Raises:
+        401 Unauthorized: If the JWT token is invalid or missing.
+    """
+    user = check_user()
+    return jsonify(get_token_pool_budget(user))
+
+
 @github_bp.route("/graphql/current-user-login", methods=["GET"])
 @jwt_required()
 def current_user_login():
@@ -233,10 +314,302 @@ def user_contributions_collection(login):
     end = request.args.get("end")
     user = check_user()
     pat, protocol, host = extract_user_credentials_and_host(user)
-    data = get_user_contributions_collection(login, protocol, host, pat, start, end)
+    data = get_user_contributions_collection(
+        login, protocol, host, pat, start, end, cache=ContributionWindowCache
+    )
+    return jsonify(data)
+
+
+@github_bp.route("/graphql/batch/user-profile-stats", methods=["POST"])
+@jwt_required()
+def users_profile_stats():
+    """
+    Fetches the profile statistics of several GitHub users, folding many logins into each GraphQL request.
+
+    Request Body (JSON):
+        logins (list): The GitHub usernames of the users.
+
+    Returns:
+        Response (JSON): The profile statistics keyed by login.
+
+    Raises:
+        400 Bad Request: If no logins are provided.
+        401 Unauthorized: If the JWT token is invalid or missing.
+        500 Internal Server Error: If an unexpected error occurs.
+    """
+    logins = (request.get_json(silent=True) or {}).get("logins")
+    if not logins or not isinstance(logins, list):
+        return jsonify({"error": "A non-empty list of logins is required"}), 400
+    user = check_user()
+    pat, protocol, host = extract_user_credentials_and_host(user)
+    data = get_users_profile_stats(logins, protocol, host, pat)
     return jsonify(data)
 
 
+@github_bp.route("/graphql/batch/user-contributions-collection", methods=["POST"])
+@jwt_required()
+def users_contributions_collection():
+    """
+    Fetches the contributions of several GitHub users over a specified period, folding many logins into each
+    GraphQL request.
+
+    Request Body (JSON):
+        logins (list): The GitHub usernames of the users.
+        start (str, optional): Start date (YYYY-MM-DD). Defaults to each account's creation date.
+        end (str, optional): End date (YYYY-MM-DD). Defaults to the current date.
+
+    Returns:
+        Response (JSON): The count of different contribution types keyed by login.
+
+    Raises:
+        400 Bad Request: If no logins are provided.
+        401 Unauthorized: If the JWT token is invalid or missing.
+        500 Internal Server Error: If an unexpected error occurs.
+    """
+    body = request.get_json(silent=True) or {}
+    logins = body.get("logins")
+    if not logins or not isinstance(logins, list):
+        return jsonify({"error": "A non-empty list of logins is required"}), 400
+    user = check_user()
+    pat, protocol, host = extract_user_credentials_and_host(user)
+    data = get_users_contributions_collection(
+        logins, protocol, host, pat, body.get("start"), body.get("end")
+    )
+    return jsonify(data)
+
+
+@github_bp.route("/graphql/jobs/total-contributions", methods=["POST"])
+@jwt_required()
+def start_total_contributions_job():
+    """
+    Starts a server-side job that mines the total contributions of a cohort of GitHub users and saves them as a
+    "total" dataset. The job keeps running when the browser tab is closed.
+
+    Request Body (JSON):
+        logins (list): The GitHub usernames of the users.
+        name (str): The name of the dataset the rows are saved under.
+        start (str, optional): Start date (YYYY-MM-DD) of the time range.
+        end (str, optional): End date (YYYY-MM-DD) of the time range.
+        langs (list, optional): The selected languages. Defaults to all languages.
+
+    Returns:
+        Response (JSON): The progress of the started job, with status code 202.
+
+    Raises:
+        400 Bad Request: If no logins or no dataset name are provided.
+        401 Unauthorized: If the JWT token is invalid or missing.
+        409 Conflict: If a dataset of this type with this name already exists.
+    """
+    body = request.get_json(silent=True) or {}
+    logins = body.get("logins")
+    ds_name = body.get("name")
+    if not logins or not isinstance(logins, list):
+        return jsonify({"error": "A non-empty list of logins is required"}), 400
+    if not ds_name:
+        return jsonify({"error": "A dataset name is required"}), 400
+    user = check_user()
+    if UserQuery.query.filter_by(
+        ds_name=ds_name, user_login=user.github_login, data_type="total"
+    ).first():
+        return jsonify({"error": "A dataset with this name already exists"}), 409
+    job = start_cohort_job(
+        current_app._get_current_object(),
+        user,
+        logins,
+        ds_name,
+        body.get("start"),
+        body.get("end"),
+        body.get("langs"),
+    )
+    return jsonify(job.progress()), 202
+
+
+@github_bp.route("/graphql/jobs/user-commits", methods=["POST"])
+@jwt_required()
+def start_user_commits_job():
+    """
+    Starts a server-side job that mines the commits of a cohort of GitHub users in their repositories and saves them
+    as a "User Commits" dataset. A commit found on several branches is fetched and saved once.
+
+    Request Body (JSON):
+        logins (list): The GitHub usernames of the users.
+        name (str): The name of the dataset the rows are saved under.
+        all_branches (bool, optional): Whether every branch is mined, rather than only the default branch. Defaults
+        to false.
+
+    Returns:
+        Response (JSON): The progress of the started job, with status code 202.
+
+    Raises:
+        400 Bad Request: If no logins or no dataset name are provided.
+        401 Unauthorized: If the JWT token is invalid or missing.
+        409 Conflict: If a dataset of this type with this name already exists.
+    """
+    body = request.get_json(silent=True) or {}
+    logins = body.get("logins")
+    ds_name = body.get("name")
+    if not logins or not isinstance(logins, list):
+        return jsonify({"error": "A non-empty list of logins is required"}), 400
+    if not ds_name:
+        return jsonify({"error": "A dataset name is required"}), 400
+    user = check_user()
+    if UserQuery.query.filter_by(
+        ds_name=ds_name, user_login=user.github_login, data_type="User Commits"
+    ).first():
+        return jsonify({"error": "A dataset with this name already exists"}), 409
+    job = start_commit_mining_job(
+        current_app._get_current_object(),
+        user,
+        logins,
+        ds_name,
+        bool(body.get("all_branches")),
+    )
+    return jsonify(job.progress()), 202
+
+
+@github_bp.route("/graphql/jobs/refresh/<int:query_id>", methods=["POST"])
+@jwt_required()
+def start_refresh_job(query_id):
+    """
+    Starts a server-side job that refreshes a saved dataset incrementally. For every login of the dataset only the
+    items ordered after the newest one already saved are fetched; they are inserted into the dataset, or update the
+    rows they match. The rows and progress are read from the job endpoints.
+
+    URL Parameter:
+        query_id (int): The id of the dataset.
+
+    Returns:
+        Response (JSON): The progress of the started job, with status code 202.
+
+    Raises:
+        400 Bad Request: If datasets of this data type cannot be refreshed.
+        401 Unauthorized: If the JWT token is invalid or missing.
+        404 Not Found: If the dataset does not exist or belongs to another user.
+    """
+    user = check_user()
+    user_query = UserQuery.query.filter_by(
+        id=query_id, user_login=user.github_login
+    ).first()
+    if user_query is None:
+        return jsonify({"error": "Dataset not found"}), 404
+    if user_query.data_type not in REFRESHABLE_DATA_TYPES:
+        return (
+            jsonify({"error": f"{user_query.data_type} datasets cannot be refreshed"}),
+            400,
+        )
+    job = start_dataset_refresh_job(current_app._get_current_object(), user, user_query)
+    return jsonify(job.progress()), 202
+
+
+@github_bp.route("/graphql/jobs/<job_id>", methods=["GET"])
+@jwt_required()
+def cohort_job_progress(job_id):
+    """
+    Reports the progress of a total-contributions, commit mining or dataset refresh job.
+
+    URL Parameter:
+        job_id (str): The id of the job.
+
+    Returns:
+        Response (JSON): The job's status, the number of processed logins and saved rows, the invalid and failed
+        logins, and the id of the dataset the rows are saved under. A job parked by the rate limit reports the time
+        it is resumed at. Commit mining jobs also report the progress of every repository.
+
+    Raises:
+        401 Unauthorized: If the JWT token is invalid or missing.
+        404 Not Found: If the job does not exist.
+    """
+    user = check_user()
+    job = find_job(job_id, user.github_login)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.progress())
+
+
+@github_bp.route("/graphql/jobs/<job_id>/results", methods=["GET"])
+@jwt_required()
+def cohort_job_results(job_id):
+    """
+    Streams the result table of a total-contributions, commit mining or dataset refresh job as newline-delimited
+    JSON, one row per line. Rows are sent as soon as their chunk, repository or page is saved, and the stream ends
+    when the job stops. Only the rows produced in this server process since the job was last resumed are streamed.
+    A job that is not live in this process, e.g. one that finished, is parked or runs in another process, streams
+    the rows saved in its dataset so far, as the dataset's rows endpoint returns them, and ends.
+
+    URL Parameter:
+        job_id (str): The id of the job.
+
+    Query Parameters:
+        offset (int, optional): The number of rows to skip. Defaults to 0.
+        follow (str, optional): "false" returns the rows produced so far instead of following the job. Defaults to
+        "true".
+
+    Returns:
+        Response (NDJSON): The rows of the result table.
+
+    Raises:
+        401 Unauthorized: If the JWT token is invalid or missing.
+        404 Not Found: If the job does not exist.
+        409 Conflict: If the job is not live in this process and has not saved any rows yet, with its progress.
+    """
+    user = check_user()
+    job = find_job(job_id, user.github_login)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    offset = request.args.get("offset", 0, type=int)
+    follow = request.args.get("follow", "true").lower() != "false"
+
+    if isinstance(job, StoredJob):
+        user_query = (
+            UserQuery.query.filter_by(id=job.user_query_id, user_login=user.github_login).first()
+            if job.user_query_id is not None
+            else None
+        )
+        if user_query is None:
+            return jsonify({"error": "Job has no saved rows", "job": job.progress()}), 409
+        rows = itertools.islice(iter_rows(user_query), max(offset, 0), None)
+        lines = (json.dumps(row) + "\n" for row in rows)
+        return Response(stream_with_context(lines), mimetype="application/x-ndjson")
+
+    def generate(offset):
+        while True:
+            done = job.done
+            rows = job.rows_from(offset)
+            for row in rows:
+                yield json.dumps(row) + "\n"
+            offset += len(rows)
+            if done or not follow:
+                return
+            time.sleep(JOB_POLL_INTERVAL)
+
+    return Response(generate(offset), mimetype="application/x-ndjson")
+
+
+@github_bp.route("/graphql/jobs/<job_id>", methods=["DELETE"])
+@jwt_required()
+def cancel_cohort_job(job_id):
+    """
+    Cancels a total-contributions, commit mining or dataset refresh job after the chunk, repository or page it is
+    processing; a queued or parked job is cancelled at once. Rows saved so far are kept.
+
+    URL Parameter:
+        job_id (str): The id of the job.
+
+    Returns:
+        Response (JSON): The progress of the job, with status code 202.
+
+    Raises:
+        401 Unauthorized: If the JWT token is invalid or missing.
+        404 Not Found: If the job does not exist.
+    """
+    user = check_user()
+    job = find_job(job_id, user.github_login)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    job.cancel()
+    return jsonify(job.progress()), 202
+
+
 @github_bp.route("/graphql/user-contribution-years/<login>", methods=["GET"])
 @jwt_required()
 def user_contribution_years(login):
@@ -285,7 +658,9 @@ def user_contribution_calendar(login):
     end = request.args.get("end")
     user = check_user()
     pat, protocol, host = extract_user_credentials_and_host(user)
-    data = get_user_contribution_calendar(login, protocol, host, pat, start, end)
+    data = get_user_contribution_calendar(
+        login, protocol, host, pat, start, end, cache=ContributionWindowCache
+    )
     return jsonify(data)
 
 
@@ -703,6 +1078,33 @@ def repository_contributors(owner, repo):
     return jsonify(data)
 
 
+@github_bp.route("/graphql/repository_authors/<owner>/<repo>", methods=["GET"])
+@jwt_required()
+def repository_authors(owner, repo):
+    """
+    Fetches the unique authors of the default-branch history of a GitHub repository. The authors are stored with the
+    head they were collected up to, so later requests only walk the commits added to the history since.
+
+    URL Parameters:
+        owner (str): The GitHub username or organization name.
+        repo (str): The name of the repository.
+
+    Returns:
+        Response (JSON): The unique author names and logins and the head they were collected up to.
+
+    Raises:
+        401 Unauthorized: If the JWT token is invalid or missing.
+        404 Not Found: If the repository does not exist.
+        500 Internal Server Error: If an unexpected error occurs.
+    """
+    user = check_user()
+    pat, protocol, host = extract_user_credentials_and_host(user)
+    data = get_repository_contributors(
+        owner, repo, protocol, host, pat, checkpoint=RepositoryContributorsCheckpoint
+    )
+    return jsonify(data)
+
+
 @github_bp.route(
     "/graphql/repository_branch_commits/<owner>/<repo>/<use_default>", methods=["GET"]
 )
@@ -738,6 +1140,110 @@ def repository_branch_commits(owner, repo, use_default):
     return jsonify(data)
 
 
+@github_bp.route("/graphql/stream/<kind>/<login>", methods=["GET"])
+@jwt_required()
+def stream_user_list(kind, login):
+    """
+    Streams every node of a per-login list as newline-delimited JSON. The pages are fetched on the server one after
+    another and each node is sent as soon as its page arrives, so the client makes a single request per list.
+
+    URL Parameters:
+        kind (str): The list to stream: user-commit-comments, user-gist-comments, user-issue-comments,
+        user-repository-discussion-comments, user-gists, user-issues, user-pull-requests,
+        user-repository-discussions or user-repositories-a/b/c/d.
+        login (str): The GitHub username.
+
+    Returns:
+        Response (NDJSON): One node per line. If the iteration stops early, the last line holds the rate-limit
+        ("no_limit") or error information.
+
+    Raises:
+        401 Unauthorized: If the JWT token is invalid or missing.
+        404 Not Found: If the kind of list is unknown.
+    """
+    if kind not in USER_NODE_STREAMS:
+        return jsonify({"error": f"Unknown list: {kind}"}), 404
+    user = check_user()
+    pat, protocol, host = extract_user_credentials_and_host(user)
+    nodes = stream_user_nodes(kind, login, protocol, host, pat)
+    return Response(
+        (json.dumps(node) + "\n" for node in nodes), mimetype="application/x-ndjson"
+    )
+
+
+@github_bp.route(
+    "/graphql/stream/repository_branch_commits/<owner>/<repo>/<use_default>",
+    methods=["GET"],
+)
+@jwt_required()
+def stream_repository_branch_commits_route(owner, repo, use_default):
+    """
+    Streams the whole commit history of a branch as newline-delimited JSON, paginating on the server.
+
+    URL Parameters:
+        owner (str): The GitHub username or organization name.
+        repo (str): The name of the repository.
+        use_default (str): "true" to use the default branch.
+
+    Query Parameters:
+        branch (str, optional): The name of the branch. Required if use_default is not "true".
+
+    Returns:
+        Response (NDJSON): One commit per line. If the iteration stops early, the last line holds the rate-limit
+        ("no_limit") or error information.
+
+    Raises:
+        401 Unauthorized: If the JWT token is invalid or missing.
+    """
+    branch = request.args.get("branch")
+    user = check_user()
+    pat, protocol, host = extract_user_credentials_and_host(user)
+    commits = stream_repository_branch_commits(
+        owner, repo, branch, use_default.lower() == "true", protocol, host, pat
+    )
+    return Response(
+        (json.dumps(commit) + "\n" for commit in commits),
+        mimetype="application/x-ndjson",
+    )
+
+
+@github_bp.route("/graphql/count/<kind>/<login>", methods=["GET"])
+@jwt_required()
+def count_user_list(kind, login):
+    """
+    Counts the nodes of a per-login list created in a time window. The list is read newest first and the count stops
+    at the start of the window, so a narrow window in a long history costs a few pages instead of the whole list.
+
+    URL Parameters:
+        kind (str): The list to count: user-commit-comments, user-gist-comments, user-issue-comments,
+        user-repository-discussion-comments, user-gists, user-issues, user-pull-requests or
+        user-repository-discussions.
+        login (str): The GitHub username.
+
+    Query Parameters:
+        start (str): Start date (YYYY-MM-DD) of the window.
+        end (str): End date (YYYY-MM-DD) of the window.
+
+    Returns:
+        JSON: The number of nodes in the window ("count") and the number of pages fetched ("pages").
+
+    Raises:
+        400 Bad Request: If start or end is missing.
+        401 Unauthorized: If the JWT token is invalid or missing.
+        404 Not Found: If the kind of list is unknown.
+    """
+    if kind not in COUNTABLE_KINDS:
+        return jsonify({"error": f"Unknown list: {kind}"}), 404
+    start = request.args.get("start")
+    end = request.args.get("end")
+    if not start or not end:
+        return jsonify({"error": "A start and an end date are required"}), 400
+    user = check_user()
+    pat, protocol, host = extract_user_credentials_and_host(user)
+    data = count_user_nodes_in_window(kind, login, start, end, protocol, host, pat)
+    return jsonify(data)
+
+
 @github_bp.route(
     "/graphql/user_repository_names/<login>",
     methods=["GET"],
@@ -804,69 +1310,13 @@ def repository_contributor_contributions(owner, repo, login):
     return jsonify(data)
 
 
-MAX_RETRIES = 3
-INITIAL_RETRY_DELAY = 2
-
-
-def fetch_with_retries(url, headers, max_retries=MAX_RETRIES, timeout=15):
-    """
-    Fetch data with retry logic and exponential backoff.
-
-    Args:
-        url (str): The URL to fetch data from.
-        headers (dict): Headers for the request.
-        max_retries (int, optional): Maximum number of retry attempts.
-        timeout (int, optional): Request timeout in seconds.
-
-    Returns:
-        dict: JSON response if successful, or rate-limit response.
-
-    Raises:
-        Timeout: If all retry attempts are exhausted.
-    """
-    last_exception = None
-    response = None
-
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(url, headers=headers, timeout=timeout)
-            if response.status_code in {403, 429}:
-                current_time = datetime.now(timezone.utc)
-                reset_timestamp = int(response.headers.get("X-RateLimit-Reset"))
-                reset_at = datetime.fromtimestamp(reset_timestamp, tz=timezone.utc)
-                time_diff = reset_at - current_time
-                seconds = time_diff.total_seconds()
-
-                return {
-                    "no_limit": True,
-                    "wait_seconds": seconds + 3,
-                    "reset_at": reset_at.isoformat(),
-                }
-            response.raise_for_status()
-            if response.status_code == 200:
-                return response.json()
-            response.raise_for_status()
-
-        except Timeout as e:
-            last_exception = e
-            logging.warning(
-                "Request timed out. Retrying in %d seconds...",
-                INITIAL_RETRY_DELAY * (2**attempt),
-            )
-            time.sleep(INITIAL_RETRY_DELAY * (2**attempt))
-
-        except RequestException as e:
-            last_exception = e
-            logging.error("Request failed: %s. Retrying...", str(e))
-            time.sleep(INITIAL_RETRY_DELAY * (2**attempt))
-    raise Timeout("All retry attempts exhausted.") from last_exception
-
-
 @github_bp.route("/rest/commits/<owner>/<repo>/<sha>", methods=["GET"])
 @jwt_required()
 def get_commit_details(owner, repo, sha):
     """
-    Fetches details of a specific commit from GitHub.
+    Fetches details of a specific commit from GitHub. Processed details are cached permanently per
+    (host, owner, repo, sha), so repeated requests for the same commit are served from the database once a HEAD
+    request with the caller's token shows that the caller can read the repository.
 
     URL Parameters:
         owner (str): GitHub username of the repository owner.
@@ -883,6 +1333,12 @@ def get_commit_details(owner, repo, sha):
     """
     user = check_user()
     token, protocol, host = extract_user_credentials_and_host(user)
+
+    # Commit details never change for a SHA, but they are only served to callers who can read the repository
+    cached = CommitDetailCache.get(host, owner, repo, sha)
+    if cached is not None and can_access_repository(protocol, host, owner, repo, token):
+        return jsonify({"commit": cached})
+
     headers = {"Authorization": f"token {token}"}
 
     # Fetch commit details with retry logic
@@ -899,34 +1355,13 @@ def get_commit_details(owner, repo, sha):
             500,
         )
 
-    # Process commit details
-    res = {
-        "author": commit["commit"]["author"]["name"],
-        "author_email": commit["commit"]["author"]["email"],
-        "authoredDate": commit["commit"]["author"]["date"],
-        "message": commit["commit"]["message"],
-        "author_login": commit["author"]["login"] if commit["author"] else None,
-        "parents": len(commit["parents"]),
-        "additions": commit["stats"]["additions"],
-        "deletions": commit["stats"]["deletions"],
-        "changedFilesIfAvailable": len(commit["files"]),
-        "lang_stats": {},
-    }
-
-    # Calculate language statistics
-    for file in commit["files"]:
-        try:
-            lexer = guess_lexer_for_filename(file["filename"], file["patch"])
-        except Exception:
-            lexer = TextLexer()  # Default to plain text lexer if no lexer is found
-
-        if lexer.name in res["lang_stats"]:
-            res["lang_stats"][lexer.name]["additions"] += file["additions"]
-            res["lang_stats"][lexer.name]["deletions"] += file["deletions"]
-        else:
-            res["lang_stats"][lexer.name] = {
-                "additions": file["additions"],
-                "deletions": file["deletions"],
-            }
-
+    res = process_commit_details(commit)
+    CommitDetailCache.put(
+        host,
+        owner,
+        repo,
+        sha,
+        res,
+        current_app.config.get("COMMIT_CACHE_MAX_ENTRIES", 200000),
+    )
     return jsonify({"commit": res})
@@ -124,7 +124,7 @@ def check_duplicate():
     github_id = get_jwt_identity()
     user = User.query.filter_by(github_id=github_id).first()
     existing_dataset = UserQuery.query.filter_by(
-        ds_name=name, user_login=user.github_login, data_type=dstype
+        ds_name=name, user_login=user.github_login, data_type=dstype, complete=True
     ).first()
     if existing_dataset:
         return jsonify({"exists": True}), 200
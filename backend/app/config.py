@@ -16,6 +16,21 @@ class Config:
     JWT_SECRET_KEY = os.getenv("SECRET_KEY", "your_secret_key_here")
     SECRET_KEY = os.getenv("SECRET_KEY", "your_secret_key_here")
     FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
+    # Extra personal access tokens, and logins of users whose stored tokens may be shared, for bulk jobs
+    GITHUB_TOKEN_POOL = [
+        token.strip()
+        for token in os.getenv("GITHUB_TOKEN_POOL", "").split(",")
+        if token.strip()
+    ]
+    GITHUB_TOKEN_POOL_USERS = [
+        login.strip()
+        for login in os.getenv("GITHUB_TOKEN_POOL_USERS", "").split(",")
+        if login.strip()
+    ]
+    # Maximum number of processed commits kept in the commit detail cache
+    COMMIT_CACHE_MAX_ENTRIES = int(os.getenv("COMMIT_CACHE_MAX_ENTRIES", "200000"))
+    # Number of job worker threads per server process
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
 
 
 class AuthConfig(Config):
@@ -11,6 +11,13 @@ from .pull_request import PullRequest
 from .repository_discussion import RepositoryDiscussion
 from .repository import Repository
 from .commit import Commit
+from .commit_language import CommitLanguage
+from .repository_language import RepositoryLanguage
+from .commit_detail_cache import CommitDetailCache
+from .contribution_window_cache import ContributionWindowCache
+from .repository_contributors_checkpoint import RepositoryContributorsCheckpoint
+from .dataset_refresh_mark import DatasetRefreshMark
+from .background_job import BackgroundJob
 
 __all__ = [
     "User",
@@ -26,4 +33,11 @@ __all__ = [
     "PullRequest",
     "RepositoryDiscussion",
     "Repository",
+    "CommitLanguage",
+    "RepositoryLanguage",
+    "CommitDetailCache",
+    "ContributionWindowCache",
+    "RepositoryContributorsCheckpoint",
+    "DatasetRefreshMark",
+    "BackgroundJob",
 ]
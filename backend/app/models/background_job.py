@@ -0,0 +1,207 @@
+"""The module defines the BackgroundJob class, the durable record of a mining job and the checkpoint it resumes from."""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import and_, or_
+from app.database import db
+
+# Statuses of a job that has stopped for good
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+
+class BackgroundJob(db.Model):
+    __tablename__ = "background_jobs"
+    __table_args__ = (
+        db.Index("ix_background_jobs_status_resume_at", "status", "resume_at"),
+    )
+
+    id = db.Column(db.String(32), primary_key=True)
+    kind = db.Column(db.String(40), nullable=False)
+    user_login = db.Column(db.String(80), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default="queued")
+    params = db.Column(db.Text, nullable=False)
+    checkpoint = db.Column(db.Text, nullable=True)
+    progress = db.Column(db.Text, nullable=True)
+    resume_at = db.Column(db.DateTime, nullable=True)
+    worker_id = db.Column(db.String(80), nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    def __repr__(self):
+        return f"<BackgroundJob {self.kind} {self.id} {self.status}>"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "user_login": self.user_login,
+            "status": self.status,
+            "params": json.loads(self.params),
+            "checkpoint": json.loads(self.checkpoint) if self.checkpoint else None,
+            "progress": json.loads(self.progress) if self.progress else None,
+            "resume_at": self.resume_at.isoformat() if self.resume_at else None,
+            "error": self.error,
+        }
+
+    @classmethod
+    def enqueue(
+        cls, job_id: str, kind: str, user_login: str, params: Dict[str, Any]
+    ) -> "BackgroundJob":
+        """
+        Stores a new job for the workers to pick up.
+
+        Args:
+            job_id (str): The id of the job.
+            kind (str): The kind of the job, e.g. "commit_mining".
+            user_login (str): The login of the user who started the job.
+            params (Dict[str, Any]): The options the job is created from.
+
+        Returns:
+            BackgroundJob: The queued job.
+        """
+        record = cls(
+            id=job_id,
+            kind=kind,
+            user_login=user_login,
+            status="queued",
+            params=json.dumps(params),
+        )
+        db.session.add(record)
+        db.session.commit()
+        return record
+
+    @classmethod
+    def find(cls, job_id: str, user_login: str) -> Optional["BackgroundJob"]:
+        """
+        Returns a job started by the given user.
+
+        Args:
+            job_id (str): The id of the job.
+            user_login (str): The login of the user asking for the job.
+
+        Returns:
+            Optional[BackgroundJob]: The job, or None if it does not exist or belongs to another user.
+        """
+        return cls.query.filter_by(id=job_id, user_login=user_login).first()
+
+    @classmethod
+    def claim(
+        cls, worker_id: str, stale_before: datetime, now: Optional[datetime] = None
+    ) -> Optional["BackgroundJob"]:
+        """
+        Hands the oldest runnable job to a worker: a queued job, a parked job whose resume time has passed, or a
+        running job whose worker stopped sending heartbeats, e.g. because the server was restarted. The job is taken
+        with a conditional update, so two workers, also in different processes, never claim the same job.
+
+        Args:
+            worker_id (str): The id of the claiming worker.
+            stale_before (datetime): Running jobs without a heartbeat since this time are taken over.
+            now (Optional[datetime]): The current time. Defaults to now.
+
+        Returns:
+            Optional[BackgroundJob]: The claimed job, or None if no job is runnable.
+        """
+        now = now or datetime.utcnow()
+        candidates = (
+            cls.query.filter(
+                or_(
+                    cls.status == "queued",
+                    and_(cls.status == "parked", cls.resume_at <= now),
+                    and_(cls.status == "running", cls.heartbeat_at < stale_before),
+                )
+            )
+            .order_by(cls.created_at)
+            .limit(10)
+            .all()
+        )
+        for candidate in candidates:
+            heartbeat = (
+                cls.heartbeat_at.is_(None)
+                if candidate.heartbeat_at is None
+                else cls.heartbeat_at == candidate.heartbeat_at
+            )
+            claimed = (
+                cls.query.filter(
+                    cls.id == candidate.id, cls.status == candidate.status, heartbeat
+                ).update(
+                    {"status": "running", "worker_id": worker_id, "heartbeat_at": now},
+                    synchronize_session=False,
+                )
+                == 1
+            )
+            db.session.commit()
+            if claimed:
+                return db.session.get(cls, candidate.id, populate_existing=True)
+        return None
+
+    @classmethod
+    def save(
+        cls,
+        job_id: str,
+        status: str,
+        checkpoint: Dict[str, Any],
+        progress: Dict[str, Any],
+        resume_at: Optional[datetime] = None,
+        error: Optional[str] = None,
+    ) -> bool:
+        """
+        Records the state of a job after it finished a unit of work, and renews its heartbeat.
+
+        Args:
+            job_id (str): The id of the job.
+            status (str): The status of the job.
+            checkpoint (Dict[str, Any]): The state the job resumes from.
+            progress (Dict[str, Any]): The progress reported to the user.
+            resume_at (Optional[datetime]): The time a parked job is resumed at.
+            error (Optional[str]): The error a failed job stopped with.
+
+        Returns:
+            bool: Whether the user asked to cancel the job.
+        """
+        record = db.session.get(cls, job_id, populate_existing=True)
+        if record is None:
+            return False
+        record.status = status
+        record.checkpoint = json.dumps(checkpoint)
+        record.progress = json.dumps(progress)
+        record.resume_at = resume_at
+        record.error = error
+        record.heartbeat_at = datetime.utcnow()
+        db.session.commit()
+        return record.cancel_requested
+
+    @classmethod
+    def heartbeat(cls, job_id: str, worker_id: str) -> None:
+        """
+        Renews the heartbeat of a running job, so that no other worker takes it over.
+
+        Args:
+            job_id (str): The id of the job.
+            worker_id (str): The id of the worker running the job.
+        """
+        cls.query.filter_by(id=job_id, worker_id=worker_id, status="running").update(
+            {"heartbeat_at": datetime.utcnow()}, synchronize_session=False
+        )
+        db.session.commit()
+
+    @classmethod
+    def request_cancel(cls, job_id: str) -> None:
+        """
+        Cancels a job. A queued or parked job is cancelled at once; a running job stops after its current unit of work.
+
+        Args:
+            job_id (str): The id of the job.
+        """
+        record = db.session.get(cls, job_id, populate_existing=True)
+        if record is None or record.status in FINISHED_STATUSES:
+            return
+        record.cancel_requested = True
+        if record.status in ("queued", "parked"):
+            record.status = "cancelled"
+        db.session.commit()
@@ -5,6 +5,19 @@ from datetime import datetime
 
 class Commit(db.Model):
     __tablename__ = "commits"
+    __table_args__ = (
+        db.Index(
+            "ix_commits_user_query_id_authored_date",
+            "user_query_id",
+            "authored_date",
+        ),
+        db.Index(
+            "ix_commits_repo_name_author_login_authored_date",
+            "repo_name",
+            "author_login",
+            "authored_date",
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     repo_name = db.Column(db.String(80), nullable=True)
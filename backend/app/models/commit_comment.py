@@ -4,6 +4,13 @@ from datetime import datetime
 
 class CommitComment(db.Model):
     __tablename__ = "commit_comments"
+    __table_args__ = (
+        db.Index(
+            "ix_commit_comments_user_query_id_created_at",
+            "user_query_id",
+            "created_at",
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     body_text = db.Column(db.Text, nullable=False)
@@ -0,0 +1,179 @@
+"""The module defines the CommitDetailCache class, a permanent cache of processed commit details keyed by commit SHA."""
+
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from app.database import db
+
+# Entries read again within this interval keep their last access time, so cache hits rarely write
+TOUCH_INTERVAL = timedelta(hours=1)
+# The most inserts between two counts of the cache size
+EVICTION_CHECK_INSERTS = 1000
+# The most SHAs looked up per query, below the bound parameter limit of SQLite
+LOOKUP_CHUNK_SHAS = 500
+_inserts_lock = threading.Lock()
+
+
+class CommitDetailCache(db.Model):
+    __tablename__ = "commit_detail_cache"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "host", "owner", "repo", "sha", name="uq_commit_detail_cache_key"
+        ),
+        db.Index("ix_commit_detail_cache_last_accessed", "last_accessed"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    host = db.Column(db.String(255), nullable=False)
+    owner = db.Column(db.String(100), nullable=False)
+    repo = db.Column(db.String(100), nullable=False)
+    sha = db.Column(db.String(40), nullable=False)
+    details = db.Column(db.Text, nullable=False)
+    last_accessed = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    # Inserts by this process since the size of the cache was last counted
+    _inserts_since_check = 0
+
+    def __repr__(self):
+        return f"<CommitDetailCache {self.owner}/{self.repo}@{self.sha}>"
+
+    @classmethod
+    def get(cls, host: str, owner: str, repo: str, sha: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached details of a commit and marks the entry as recently used. The last access time is only
+        written when it is older than TOUCH_INTERVAL, so hits do not write to the database every time.
+
+        Args:
+            host (str): The host of the GitHub server.
+            owner (str): The owner of the repository.
+            repo (str): The name of the repository.
+            sha (str): The SHA of the commit.
+
+        Returns:
+            Optional[Dict[str, Any]]: The processed commit details, or None on a cache miss.
+        """
+        entry = cls.query.filter_by(host=host, owner=owner, repo=repo, sha=sha).first()
+        if entry is None:
+            return None
+        cls._touch([entry])
+        return json.loads(entry.details)
+
+    @classmethod
+    def get_many(
+        cls, host: str, owner: str, repo: str, shas: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the cached details of many commits of a repository, with one query per LOOKUP_CHUNK_SHAS SHAs, and
+        marks the entries found as recently used.
+
+        Args:
+            host (str): The host of the GitHub server.
+            owner (str): The owner of the repository.
+            repo (str): The name of the repository.
+            shas (List[str]): The SHAs of the commits.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The processed commit details of the cached commits, keyed by SHA.
+        """
+        shas = list(dict.fromkeys(shas))
+        entries = []
+        for start in range(0, len(shas), LOOKUP_CHUNK_SHAS):
+            entries.extend(
+                cls.query.filter(
+                    cls.host == host,
+                    cls.owner == owner,
+                    cls.repo == repo,
+                    cls.sha.in_(shas[start : start + LOOKUP_CHUNK_SHAS]),
+                ).all()
+            )
+        details = {entry.sha: json.loads(entry.details) for entry in entries}
+        cls._touch(entries)
+        return details
+
+    @classmethod
+    def _touch(cls, entries: List["CommitDetailCache"]) -> None:
+        """
+        Marks entries as recently used with one UPDATE for the entries whose last access is older than TOUCH_INTERVAL.
+
+        Args:
+            entries (List[CommitDetailCache]): The entries that were read.
+        """
+        now = datetime.utcnow()
+        stale = [entry.id for entry in entries if entry.last_accessed < now - TOUCH_INTERVAL]
+        if not stale:
+            return
+        db.session.execute(
+            update(cls).where(cls.id.in_(stale)).values(last_accessed=now)
+        )
+        db.session.commit()
+
+    @classmethod
+    def put(
+        cls,
+        host: str,
+        owner: str,
+        repo: str,
+        sha: str,
+        details: Dict[str, Any],
+        max_entries: int,
+    ) -> None:
+        """
+        Stores the processed details of a commit. The size of the cache is only counted every few inserts, see
+        _eviction_due; when it has grown beyond max_entries, the least recently used entries are evicted down to 90% of
+        the cap.
+
+        Args:
+            host (str): The host of the GitHub server.
+            owner (str): The owner of the repository.
+            repo (str): The name of the repository.
+            sha (str): The SHA of the commit.
+            details (Dict[str, Any]): The processed commit details.
+            max_entries (int): The maximum number of cached commits.
+        """
+        db.session.add(
+            cls(host=host, owner=owner, repo=repo, sha=sha, details=json.dumps(details))
+        )
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another request cached the same commit first
+            db.session.rollback()
+            return
+
+        if not cls._eviction_due(max_entries):
+            return
+        count = db.session.query(db.func.count(cls.id)).scalar()
+        if count > max_entries:
+            excess = count - int(max_entries * 0.9)
+            stale_ids = [
+                row.id
+                for row in db.session.query(cls.id)
+                .order_by(cls.last_accessed)
+                .limit(excess)
+            ]
+            cls.query.filter(cls.id.in_(stale_ids)).delete(synchronize_session=False)
+            db.session.commit()
+
+    @classmethod
+    def _eviction_due(cls, max_entries: int) -> bool:
+        """
+        Counts an insert and tells whether the size of the cache should be checked. The size is checked once per
+        tenth of the cap, at most every EVICTION_CHECK_INSERTS inserts, so the cache exceeds its cap by at most that
+        many entries between checks.
+
+        Args:
+            max_entries (int): The maximum number of cached commits.
+
+        Returns:
+            bool: Whether the caller should count the entries and evict.
+        """
+        interval = max(1, min(EVICTION_CHECK_INSERTS, max_entries // 10))
+        with _inserts_lock:
+            cls._inserts_since_check += 1
+            if cls._inserts_since_check < interval:
+                return False
+            cls._inserts_since_check = 0
+            return True
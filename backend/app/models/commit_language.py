@@ -0,0 +1,61 @@
+"""The module defines the CommitLanguage class, the lines one commit added and deleted in one language."""
+
+import json
+from typing import Any, Dict, List
+from app.database import db
+
+
+class CommitLanguage(db.Model):
+    __tablename__ = "commit_languages"
+    __table_args__ = (db.Index("ix_commit_languages_language", "language"),)
+
+    commit_id = db.Column(
+        db.Integer,
+        db.ForeignKey("commits.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    language = db.Column(db.String(80), primary_key=True)
+    additions = db.Column(db.Integer, nullable=False, default=0)
+    deletions = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<CommitLanguage {self.commit_id} {self.language}>"
+
+    @classmethod
+    def records_from_stats(cls, commit_id: int, lang_stats: Any) -> List[Dict[str, Any]]:
+        """
+        Builds the rows of a commit from its lang_stats, the JSON object of the additions and deletions per language
+        that commit mining stores. "N/A", missing and malformed stats give no rows.
+
+        Args:
+            commit_id (int): The id of the commit.
+            lang_stats (Any): The lang_stats of the commit, as text or already decoded.
+
+        Returns:
+            List[Dict[str, Any]]: The column values of the rows.
+        """
+        if isinstance(lang_stats, str):
+            try:
+                lang_stats = json.loads(lang_stats)
+            except ValueError:
+                return []
+        if not isinstance(lang_stats, dict):
+            return []
+        return [
+            {
+                "commit_id": commit_id,
+                "language": language[:80],
+                "additions": int(stats.get("additions") or 0),
+                "deletions": int(stats.get("deletions") or 0),
+            }
+            for language, stats in lang_stats.items()
+            if isinstance(stats, dict)
+        ]
+
+    def to_dict(self):
+        return {
+            "commit_id": self.commit_id,
+            "language": self.language,
+            "additions": self.additions,
+            "deletions": self.deletions,
+        }
@@ -0,0 +1,144 @@
+"""The module defines the ContributionWindowCache class, a permanent cache of contribution results of elapsed windows."""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.exc import IntegrityError
+from app.database import db
+
+
+class ContributionWindowCache(db.Model):
+    __tablename__ = "contribution_window_cache"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "host",
+            "scope",
+            "login",
+            "kind",
+            "window_start",
+            "window_end",
+            name="uq_contribution_window_cache_key",
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    host = db.Column(db.String(255), nullable=False)
+    # The visibility scope of the viewer the result was fetched for, which identifies the viewer's account rather than
+    # their token. Totals count the private contributions the viewer can see, so results are not shared across viewers.
+    # Results that are the same for every viewer, e.g. the creation time of an account, use the single-flight
+    # PUBLIC_SCOPE.
+    scope = db.Column(db.String(64), nullable=False)
+    login = db.Column(db.String(100), nullable=False)
+    kind = db.Column(db.String(20), nullable=False)
+    window_start = db.Column(db.String(40), nullable=False)
+    window_end = db.Column(db.String(40), nullable=False)
+    data = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ContributionWindowCache {self.login} {self.kind} {self.window_start}..{self.window_end}>"
+
+    @classmethod
+    def get_many(
+        cls, host: str, login: str, kind: str, windows: List[Tuple[str, str]], scope: str
+    ) -> Dict[Tuple[str, str], Any]:
+        """
+        Returns the cached results of several windows of a user with one lookup.
+
+        Args:
+            host (str): The host of the GitHub server.
+            login (str): The GitHub username.
+            kind (str): The kind of result, e.g. "collection" or "calendar".
+            windows (List[Tuple[str, str]]): The (start, end) pairs of the windows.
+            scope (str): The visibility scope of the viewer, or PUBLIC_SCOPE.
+
+        Returns:
+            Dict[Tuple[str, str], Any]: The cached results keyed by window. Windows that are not cached are missing.
+        """
+        if not windows:
+            return {}
+        entries = cls.query.filter(
+            cls.host == host,
+            cls.scope == scope,
+            cls.login == login.lower(),
+            cls.kind == kind,
+            cls.window_start.in_({start for start, _ in windows}),
+        )
+        wanted = set(windows)
+        return {
+            (entry.window_start, entry.window_end): json.loads(entry.data)
+            for entry in entries
+            if (entry.window_start, entry.window_end) in wanted
+        }
+
+    @classmethod
+    def get(
+        cls, host: str, login: str, kind: str, start: str, end: str, scope: str
+    ) -> Optional[Any]:
+        """
+        Returns the cached result of one window of a user.
+
+        Args:
+            host (str): The host of the GitHub server.
+            login (str): The GitHub username.
+            kind (str): The kind of result.
+            start (str): The start of the window.
+            end (str): The end of the window.
+            scope (str): The visibility scope of the viewer, or PUBLIC_SCOPE.
+
+        Returns:
+            Optional[Any]: The cached result, or None on a cache miss.
+        """
+        return cls.get_many(host, login, kind, [(start, end)], scope).get((start, end))
+
+    @classmethod
+    def put_many(
+        cls, host: str, login: str, kind: str, results: Dict[Tuple[str, str], Any], scope: str
+    ) -> None:
+        """
+        Stores the results of elapsed windows of a user. The results never change, so entries are never evicted.
+
+        Args:
+            host (str): The host of the GitHub server.
+            login (str): The GitHub username.
+            kind (str): The kind of result.
+            results (Dict[Tuple[str, str], Any]): The results keyed by (start, end) window.
+            scope (str): The visibility scope of the viewer the results were fetched for, or PUBLIC_SCOPE.
+        """
+        if not results:
+            return
+        db.session.add_all(
+            cls(
+                host=host,
+                scope=scope,
+                login=login.lower(),
+                kind=kind,
+                window_start=start,
+                window_end=end,
+                data=json.dumps(data),
+            )
+            for (start, end), data in results.items()
+        )
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another request cached the same windows first
+            db.session.rollback()
+
+    @classmethod
+    def put(
+        cls, host: str, login: str, kind: str, start: str, end: str, data: Any, scope: str
+    ) -> None:
+        """
+        Stores the result of one elapsed window of a user.
+
+        Args:
+            host (str): The host of the GitHub server.
+            login (str): The GitHub username.
+            kind (str): The kind of result.
+            start (str): The start of the window.
+            end (str): The end of the window.
+            data (Any): The result, serializable as JSON.
+            scope (str): The visibility scope of the viewer the result was fetched for, or PUBLIC_SCOPE.
+        """
+        cls.put_many(host, login, kind, {(start, end): data}, scope)
@@ -0,0 +1,67 @@
+"""The module defines the DatasetRefreshMark class, the high-water mark of one login in a saved dataset."""
+
+from datetime import datetime
+from typing import Dict
+from app.database import db
+
+
+class DatasetRefreshMark(db.Model):
+    __tablename__ = "dataset_refresh_marks"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "user_query_id", "login", name="uq_dataset_refresh_marks_login"
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_query_id = db.Column(
+        db.Integer, db.ForeignKey("user_queries.id", ondelete="CASCADE"), nullable=False
+    )
+    login = db.Column(db.String(80), nullable=False)
+    mark = db.Column(db.String(40), nullable=False)
+    refreshed_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    def __repr__(self):
+        return f"<DatasetRefreshMark {self.user_query_id} {self.login} {self.mark}>"
+
+    @classmethod
+    def get_marks(cls, user_query_id: int) -> Dict[str, str]:
+        """
+        Returns the high-water marks of every login of a dataset.
+
+        Args:
+            user_query_id (int): The id of the dataset.
+
+        Returns:
+            Dict[str, str]: The marks ("%Y-%m-%dT%H:%M:%SZ") keyed by lowercased login.
+        """
+        return {
+            entry.login: entry.mark
+            for entry in cls.query.filter_by(user_query_id=user_query_id)
+        }
+
+    @classmethod
+    def put(cls, user_query_id: int, login: str, mark: str) -> "DatasetRefreshMark":
+        """
+        Records the high-water mark of a login in a dataset. The caller commits the session, together with the rows
+        the mark covers.
+
+        Args:
+            user_query_id (int): The id of the dataset.
+            login (str): The GitHub username.
+            mark (str): The time ("%Y-%m-%dT%H:%M:%SZ") of the newest item of the login in the dataset.
+
+        Returns:
+            DatasetRefreshMark: The mark.
+        """
+        entry = cls.query.filter_by(
+            user_query_id=user_query_id, login=login.lower()
+        ).first()
+        if entry is None:
+            entry = cls(user_query_id=user_query_id, login=login.lower())
+            db.session.add(entry)
+        entry.mark = mark
+        entry.refreshed_at = datetime.utcnow()
+        return entry
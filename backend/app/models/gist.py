@@ -4,6 +4,9 @@ from datetime import datetime
 
 class Gist(db.Model):
     __tablename__ = "gists"
+    __table_args__ = (
+        db.Index("ix_gists_user_query_id_created_at", "user_query_id", "created_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     description = db.Column(db.Text, nullable=False)
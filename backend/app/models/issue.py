@@ -4,6 +4,9 @@ from datetime import datetime
 
 class Issue(db.Model):
     __tablename__ = "issues"
+    __table_args__ = (
+        db.Index("ix_issues_user_query_id_created_at", "user_query_id", "created_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     author_github_login = db.Column(db.String(80), nullable=False)
@@ -4,6 +4,13 @@ from datetime import datetime
 
 class PullRequest(db.Model):
     __tablename__ = "pull_requests"
+    __table_args__ = (
+        db.Index(
+            "ix_pull_requests_user_query_id_created_at",
+            "user_query_id",
+            "created_at",
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     author_github_login = db.Column(db.String(80), nullable=False)
@@ -0,0 +1,97 @@
+"""The module defines the RepositoryContributorsCheckpoint class, the authors of a repository up to a processed head."""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy.exc import IntegrityError
+from app.database import db
+
+
+class RepositoryContributorsCheckpoint(db.Model):
+    __tablename__ = "repository_contributors_checkpoint"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "host",
+            "owner",
+            "name",
+            name="uq_repository_contributors_checkpoint_repo",
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    host = db.Column(db.String(255), nullable=False)
+    owner = db.Column(db.String(100), nullable=False)
+    name = db.Column(db.String(100), nullable=False)
+    head_oid = db.Column(db.String(40), nullable=False)
+    head_committed_date = db.Column(db.String(40), nullable=False)
+    authors = db.Column(db.Text, nullable=False)
+    updated_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    def __repr__(self):
+        return f"<RepositoryContributorsCheckpoint {self.owner}/{self.name} {self.head_oid}>"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "head_oid": self.head_oid,
+            "head_committed_date": self.head_committed_date,
+            "authors": json.loads(self.authors),
+        }
+
+    @classmethod
+    def _find(cls, host: str, owner: str, name: str):
+        return cls.query.filter_by(
+            host=host, owner=owner.lower(), name=name.lower()
+        ).first()
+
+    @classmethod
+    def get(cls, host: str, owner: str, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the checkpoint of a repository.
+
+        Args:
+            host (str): The host of the GitHub server.
+            owner (str): The owner of the repository.
+            name (str): The name of the repository.
+
+        Returns:
+            Optional[Dict[str, Any]]: The head_oid and head_committed_date of the last processed head and the authors
+            ({"name": [...], "login": [...]}) of the history up to it, or None if the repository was never processed.
+        """
+        checkpoint = cls._find(host, owner, name)
+        return checkpoint.to_dict() if checkpoint else None
+
+    @classmethod
+    def put(
+        cls,
+        host: str,
+        owner: str,
+        name: str,
+        head_oid: str,
+        head_committed_date: str,
+        authors: Dict[str, List[str]],
+    ) -> None:
+        """
+        Stores the checkpoint of a repository, replacing the previous one.
+
+        Args:
+            host (str): The host of the GitHub server.
+            owner (str): The owner of the repository.
+            name (str): The name of the repository.
+            head_oid (str): The OID of the processed head.
+            head_committed_date (str): The commit date of the processed head.
+            authors (Dict[str, List[str]]): The authors of the history up to the head.
+        """
+        checkpoint = cls._find(host, owner, name)
+        if checkpoint is None:
+            checkpoint = cls(host=host, owner=owner.lower(), name=name.lower())
+            db.session.add(checkpoint)
+        checkpoint.head_oid = head_oid
+        checkpoint.head_committed_date = head_committed_date
+        checkpoint.authors = json.dumps(authors)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another request stored the checkpoint of the repository first
+            db.session.rollback()
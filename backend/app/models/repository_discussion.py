@@ -4,6 +4,13 @@ from datetime import datetime
 
 class RepositoryDiscussion(db.Model):
     __tablename__ = "repository_discussions"
+    __table_args__ = (
+        db.Index(
+            "ix_repository_discussions_user_query_id_created_at",
+            "user_query_id",
+            "created_at",
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     author_github_login = db.Column(db.String(80), nullable=False)
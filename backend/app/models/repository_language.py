@@ -0,0 +1,54 @@
+"""The module defines the RepositoryLanguage class, the size of the code of one repository in one language."""
+
+import json
+from typing import Any, Dict, List
+from app.database import db
+
+
+class RepositoryLanguage(db.Model):
+    __tablename__ = "repository_languages"
+    __table_args__ = (db.Index("ix_repository_languages_language", "language"),)
+
+    repository_id = db.Column(
+        db.Integer,
+        db.ForeignKey("repositories.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    language = db.Column(db.String(80), primary_key=True)
+    bytes = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<RepositoryLanguage {self.repository_id} {self.language}>"
+
+    @classmethod
+    def records_from_stats(cls, repository_id: int, languages: Any) -> List[Dict[str, Any]]:
+        """
+        Builds the rows of a repository from its languages, the JSON object of the bytes of code per language.
+        "N/A", missing and malformed values give no rows.
+
+        Args:
+            repository_id (int): The id of the repository.
+            languages (Any): The languages of the repository, as text or already decoded.
+
+        Returns:
+            List[Dict[str, Any]]: The column values of the rows.
+        """
+        if isinstance(languages, str):
+            try:
+                languages = json.loads(languages)
+            except ValueError:
+                return []
+        if not isinstance(languages, dict):
+            return []
+        return [
+            {"repository_id": repository_id, "language": language[:80], "bytes": int(size)}
+            for language, size in languages.items()
+            if isinstance(size, (int, float))
+        ]
+
+    def to_dict(self):
+        return {
+            "repository_id": self.repository_id,
+            "language": self.language,
+            "bytes": self.bytes,
+        }
@@ -3,6 +3,14 @@ from app.database import db
 
 class UserQuery(db.Model):
     __tablename__ = "user_queries"
+    __table_args__ = (
+        db.Index(
+            "ix_user_queries_user_login_ds_name_data_type",
+            "user_login",
+            "ds_name",
+            "data_type",
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_login = db.Column(
@@ -15,6 +23,8 @@ class UserQuery(db.Model):
         db.DateTime, nullable=False, default=db.func.current_timestamp()
     )
     data_type = db.Column(db.String(80), nullable=False)  # Add this line
+    # False while a dataset uploaded in chunks is missing its last chunk
+    complete = db.Column(db.Boolean, nullable=False, default=True, server_default=db.true())
 
     total_contribution = db.relationship(
         "GithubContributionData",
@@ -64,6 +74,12 @@ class UserQuery(db.Model):
         lazy=True,
         cascade="all, delete-orphan",
     )
+    refresh_marks = db.relationship(
+        "DatasetRefreshMark",
+        backref="user_query",
+        lazy=True,
+        cascade="all, delete-orphan",
+    )
 
     def __repr__(self):
         return (
@@ -71,13 +87,14 @@ class UserQuery(db.Model):
         )
 
     @classmethod
-    def create(cls, user_login, ds_name, start_time, end_time, data_type):
+    def create(cls, user_login, ds_name, start_time, end_time, data_type, complete=True):
         user_query = cls(
             user_login=user_login,
             ds_name=ds_name,
             start_time=start_time,
             end_time=end_time,
             data_type=data_type,
+            complete=complete,
         )
         db.session.add(user_query)
         return user_query
@@ -91,6 +108,7 @@ class UserQuery(db.Model):
             "end_time": self.end_time,
             "queried_at": self.queried_at,
             "data_type": self.data_type,
+            "complete": self.complete,
         }
 
     @classmethod
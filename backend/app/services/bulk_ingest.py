@@ -0,0 +1,290 @@
+"""
+This module saves the table of a dataset in bulk. /db/save-data used to build one ORM object per row and add them to
+the session one by one, which takes minutes for a large commit table. Here the table is transposed into columns, the
+timestamp columns are parsed in one vectorized pass, and the rows are written with multi-row INSERT statements of
+SQLAlchemy Core, a chunk at a time.
+
+Functions:
+    parse_timestamps(values: Sequence[Any]) -> List[Optional[datetime]]:
+    table_to_records(data_type: str, table_header: List[str], table_data: List[List[Any]], constants: Dict[str, Any])
+        -> List[Dict[str, Any]]:
+    bulk_insert(data_type: str, table_header: List[str], table_data: List[List[Any]], user_query_id: int,
+        repository_type: Optional[str] = None, langs: Any = None) -> Dict[str, Any]:
+
+Constants:
+    INGEST_COLUMNS: The model of every data type, with the table column each model column is read from.
+    INGEST_CHUNK_ROWS: The maximum number of rows per INSERT statement.
+    INGEST_MAX_PARAMETERS: The maximum number of bound parameters per INSERT statement.
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, insert, select
+from app.database import db
+from app.models import (
+    GithubContributionData,
+    CommitComment,
+    IssueComment,
+    GistComment,
+    RepositoryDiscussionComment,
+    Gist,
+    Issue,
+    PullRequest,
+    RepositoryDiscussion,
+    Repository,
+    Commit,
+)
+from .language_tables import LANGUAGE_TABLES, sync_dataset_languages
+
+INGEST_CHUNK_ROWS = 1000
+# SQLite accepts 32766 bound parameters per statement, PostgreSQL 65535
+INGEST_MAX_PARAMETERS = 30000
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+_COMMENT_COLUMNS = {
+    "body_text": "Body Text",
+    "created_at": "Created At",
+    "author_github_login": "GitHub ID",
+}
+_COMMIT_COLUMNS = {
+    "repo_name": "Repository",
+    "author_name": "Author",
+    "author_email": "Author Email",
+    "author_login": "Author Login",
+    "branch": "Branch",
+    "authored_date": "Authored Date",
+    "changed_files": "Changed Files",
+    "additions": "Additions",
+    "deletions": "Deletions",
+    "message": "Message",
+    "parent_count": "Parents",
+    "lang_stats": "Languages",
+}
+
+# The model of every data type, and the table column each model column is read from, as the models' create_from_row
+INGEST_COLUMNS = {
+    "total": (
+        GithubContributionData,
+        {
+            "author_github_login": "GitHub ID",
+            "name": "Name",
+            "email": "Email",
+            "created_at": "Created At",
+            "age": "Age (days)",
+            "bio": "Bio",
+            "company": "Company",
+            "watching": "Watching",
+            "starred_repo": "Starred Repositories",
+            "following": "Following",
+            "followers": "Followers",
+            "private_contrib": "Private Contributions",
+            "commits": "Commits",
+            "gists": "Gists",
+            "issues": "Issues",
+            "projects": "Projects",
+            "pull_requests": "Pull Requests",
+            "pull_request_reviews": "Pull Request Reviews",
+            "repositories": "Repositories",
+            "repo_discussions": "Repository Discussions",
+            "commit_comments": "Commit Comments",
+            "issue_comments": "Issue Comments",
+            "gist_comments": "Gist Comments",
+            "repo_discussion_comments": "Repository Discussion Comments",
+            **{
+                f"{prefix}{suffix}": f"{category}{header}"
+                for prefix, category in (
+                    ("owned_original_repo", "Owned Original Repo"),
+                    ("owned_forked_repo", "Owned Forked Repo"),
+                    ("collaborating_original_repo", "Collaborating Original Repo"),
+                    ("collaborating_forked_repo", "Collaborating Forked Repo"),
+                )
+                for suffix, header in (
+                    ("", ""),
+                    ("_size", " Size"),
+                    ("_selected_langs_size", " Selected Langs Size"),
+                )
+            },
+            "owned_original_repo_langs_number": "Owned Original Repo Langs Number",
+            "owned_forked_repo_langs_number": "Owned Forked Repo Langs Number",
+            "collaborating_original_repo_langs_number": "Collaborating Original Repo Langs Number",
+            "collaborating_forked_repo_langs_size_number": "Collaborating Forked Repo Langs Size Number",
+            "total_langs_number": "Total Langs Number",
+        },
+    ),
+    "Commit Comments": (CommitComment, _COMMENT_COLUMNS),
+    "Gist Comments": (GistComment, _COMMENT_COLUMNS),
+    "Issue Comments": (IssueComment, _COMMENT_COLUMNS),
+    "Repository Discussion Comments": (RepositoryDiscussionComment, _COMMENT_COLUMNS),
+    "Gists": (
+        Gist,
+        {
+            "description": "Description",
+            "created_at": "Created At",
+            "author_github_login": "GitHub ID",
+        },
+    ),
+    "Issues": (
+        Issue,
+        {
+            "author_github_login": "GitHub ID",
+            "created_at": "Created At",
+            "body_text": "Body Text",
+            "title": "Title",
+        },
+    ),
+    "Pull Requests": (PullRequest, _COMMENT_COLUMNS),
+    "Repository Discussions": (RepositoryDiscussion, _COMMENT_COLUMNS),
+    "Repositories": (
+        Repository,
+        {
+            "author_github_login": "GitHub ID",
+            "name": "Name",
+            "created_at": "Created At",
+            "updated_at": "Updated At",
+            "primary_language": "Primary Language",
+            "languages": "Language Stats",
+        },
+    ),
+    "Repo Commits": (Commit, _COMMIT_COLUMNS),
+    "User Commits": (Commit, _COMMIT_COLUMNS),
+}
+
+
+def parse_timestamps(values: Sequence[Any]) -> List[Optional[datetime]]:
+    """
+    Parses a column of "%Y-%m-%dT%H:%M:%SZ" timestamps in one vectorized pass. "N/A" and missing values become None.
+
+    Args:
+        values (Sequence[Any]): The values of the column.
+
+    Returns:
+        List[Optional[datetime]]: The parsed timestamps.
+
+    Raises:
+        ValueError: If a value is neither a timestamp nor "N/A".
+    """
+    column = pd.Series(values, dtype=object)
+    present = column.notna() & (column != "N/A")
+    parsed = pd.to_datetime(column.where(present), format=TIME_FORMAT, errors="coerce")
+    invalid = present & parsed.isna()
+    if invalid.any():
+        raise ValueError(
+            f"time data {column[invalid].iloc[0]!r} does not match format {TIME_FORMAT!r}"
+        )
+    return np.where(present.to_numpy(), parsed.array.to_pydatetime(), None).tolist()
+
+
+def table_to_records(
+    data_type: str,
+    table_header: List[str],
+    table_data: List[List[Any]],
+    constants: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """
+    Converts a table into the column values of its model's rows. The table is transposed once, so every model column
+    is taken as a whole; table columns the model does not store are dropped, and model columns without a table column
+    are None, as in the models' create_from_row.
+
+    Args:
+        data_type (str): The data type of the dataset, a key of INGEST_COLUMNS.
+        table_header (List[str]): The names of the table columns.
+        table_data (List[List[Any]]): The rows of the table.
+        constants (Dict[str, Any]): The values every row gets, e.g. the id of the dataset.
+
+    Returns:
+        List[Dict[str, Any]]: The column values of each row, keyed by model column.
+
+    Raises:
+        ValueError: If a timestamp cannot be parsed.
+    """
+    model, columns = INGEST_COLUMNS[data_type]
+    if not table_data:
+        return []
+    index = {name: position for position, name in enumerate(table_header)}
+    table_columns = list(zip(*table_data))
+    time_columns = {
+        column.name
+        for column in model.__table__.columns
+        if isinstance(column.type, db.DateTime)
+    }
+    names, values = [], []
+    for name, header in columns.items():
+        position = index.get(header)
+        column = [None] * len(table_data) if position is None else table_columns[position]
+        names.append(name)
+        values.append(parse_timestamps(column) if name in time_columns else column)
+    names.extend(constants)
+    values.extend([value] * len(table_data) for value in constants.values())
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def bulk_insert(
+    data_type: str,
+    table_header: List[str],
+    table_data: List[List[Any]],
+    user_query_id: int,
+    repository_type: Optional[str] = None,
+    langs: Any = None,
+) -> Dict[str, Any]:
+    """
+    Inserts the rows of a table into the dataset with multi-row INSERT statements, and builds the language rows of
+    commits and repositories from the inserted rows. The caller owns the transaction.
+
+    Args:
+        data_type (str): The data type of the dataset, a key of INGEST_COLUMNS.
+        table_header (List[str]): The names of the table columns.
+        table_data (List[List[Any]]): The rows of the table.
+        user_query_id (int): The id of the dataset.
+        repository_type (Optional[str]): The repository type of a "Repositories" dataset, e.g. "Owned Original Repo".
+        langs (Any): The selected languages of a "total" dataset.
+
+    Returns:
+        Dict[str, Any]: The number of rows and statements, the seconds taken, and the rows inserted per second.
+
+    Raises:
+        KeyError: If the data type cannot be saved.
+        ValueError: If a timestamp cannot be parsed.
+    """
+    started = time.perf_counter()
+    model = INGEST_COLUMNS[data_type][0]
+    constants = {"user_query_id": user_query_id}
+    if model is Repository:
+        constants["repository_type"] = repository_type
+    elif model is GithubContributionData:
+        constants["selected_langs"] = langs
+    records = table_to_records(data_type, table_header, table_data, constants)
+    # The rows appended to the dataset are the ones after its current last row
+    last_id = db.session.scalar(
+        select(func.max(model.id)).where(model.user_query_id == user_query_id)
+    )
+
+    chunk_rows = INGEST_CHUNK_ROWS
+    if records:
+        chunk_rows = max(1, min(chunk_rows, INGEST_MAX_PARAMETERS // len(records[0])))
+    statements = 0
+    for start in range(0, len(records), chunk_rows):
+        db.session.execute(insert(model).values(records[start : start + chunk_rows]))
+        statements += 1
+    if model in LANGUAGE_TABLES and records:
+        sync_dataset_languages(model, user_query_id, after=last_id or 0)
+
+    seconds = time.perf_counter() - started
+    stats = {
+        "rows": len(records),
+        "statements": statements,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(len(records) / seconds) if seconds > 0 else None,
+    }
+    logging.info(
+        "Inserted %d %s rows in %d statements in %.3fs (%s rows/s)",
+        stats["rows"],
+        data_type,
+        statements,
+        seconds,
+        stats["rows_per_second"],
+    )
+    return stats
@@ -0,0 +1,606 @@
+"""
+This module runs total-contribution mining for a cohort of GitHub users as a background job. The job fetches the
+profile statistics, contributions collection, contribution counts and the four repository categories of every login
+on the server, with concurrent requests paced by the rate-limit scheduler, and writes the rows straight into
+GithubContributionData. Callers poll the job's progress and stream its result table while it runs. The job is durable
+(see job_queue): it saves a checkpoint after every chunk, parks until the reset when the rate limit is exhausted, and is
+resumed from the checkpoint after a restart. Every figure of a row counts what the reading token can see, e.g. private
+repositories and contributions, so all requests use the token of the user who started the job rather than the pool.
+
+Classes:
+    CohortJob: The state and worker of one cohort job.
+
+Functions:
+    start_cohort_job(app: Flask, user: User, logins: List[str], ds_name: str, start: str = None, end: str = None, langs: Optional[List[str]] = None) -> CohortJob:
+    get_cohort_job(job_id: str, user_login: str) -> Optional[CohortJob]:
+    build_contribution_row(login: str, profile: dict, contributions: dict, repo_stats: dict, counts: Optional[dict], end: str = None) -> dict:
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import Flask
+from app.database import db
+from app.models.user import User
+from app.models.user_query import UserQuery
+from app.models.github_contribution_data import GithubContributionData
+from .job_queue import (
+    PARK_AFTER_SECONDS,
+    DurableJob,
+    JobParked,
+    enqueue_job,
+    get_live_job,
+    park_if_rate_limited,
+    register_job_kind,
+)
+from .github_graphql_services import (
+    BATCH_SIZE,
+    QUERY_CONCURRENCY,
+    REPOSITORY_TYPES,
+    _chunks,
+    count_in_window,
+    get_async_github_client,
+    get_users_contributions_collection,
+    get_users_profile_stats,
+)
+from .github_query.queries import (
+    UserCommitComments,
+    UserGistComments,
+    UserIssueComments,
+    UserRepositoryDiscussionComments,
+    UserGists,
+    UserIssues,
+    UserPullRequests,
+    UserRepositoryDiscussions,
+    UserRepositories,
+)
+
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# Table columns of the repository categories, in the order of the result table
+REPOSITORY_CATEGORIES = [
+    ("Owned Original Repo", "A"),
+    ("Owned Forked Repo", "B"),
+    ("Collaborating Original Repo", "C"),
+    ("Collaborating Forked Repo", "D"),
+]
+
+# Contributions that are counted in the time range when one is selected, read newest first
+COUNTED_CONTRIBUTIONS = {
+    "Commit Comments": UserCommitComments.count_query,
+    "Gist Comments": UserGistComments.count_query,
+    "Issue Comments": UserIssueComments.count_query,
+    "Repository Discussion Comments": UserRepositoryDiscussionComments.count_query,
+    "Gists": UserGists.count_query,
+    "Issues": UserIssues.count_query,
+    "Pull Requests": UserPullRequests.count_query,
+    "Repository Discussions": UserRepositoryDiscussions.count_query,
+}
+
+
+def _in_range(created_at: str, start: Optional[str], end: Optional[str]) -> bool:
+    """
+    Checks whether a creation time falls in the selected time range.
+
+    Args:
+        created_at (str): The creation time formatted as "%Y-%m-%dT%H:%M:%SZ".
+        start (Optional[str]): Start date (YYYY-MM-DD).
+        end (Optional[str]): End date (YYYY-MM-DD).
+
+    Returns:
+        bool: True if no range is selected or the time is inside it.
+    """
+    if not start or not end:
+        return True
+    return f"{start}T00:00:00Z" <= created_at <= f"{end}T00:00:00Z"
+
+
+def _repository_stats(
+    pages: List[Dict[str, Any]],
+    langs: Optional[List[str]],
+    start: Optional[str],
+    end: Optional[str],
+) -> Tuple[int, int, int, set]:
+    """
+    Aggregates the repositories of one category.
+
+    Args:
+        pages (List[Dict[str, Any]]): The raw pages of a UserRepositories query.
+        langs (Optional[List[str]]): The selected languages. "All" selects every language.
+        start (Optional[str]): Start date (YYYY-MM-DD) of the time range.
+        end (Optional[str]): End date (YYYY-MM-DD) of the time range.
+
+    Returns:
+        Tuple[int, int, int, set]: The number of repositories, their total language size, the size of the selected
+        languages and the set of languages used.
+    """
+    select_all = not langs or "All" in langs or "ALL" in langs
+    count = total_size = selected_size = 0
+    languages = set()
+    for page in pages:
+        for repo in UserRepositories.user_repository_page(page).get("nodes", []):
+            if not _in_range(repo["createdAt"], start, end):
+                continue
+            count += 1
+            for edge in repo["languages"]["edges"]:
+                name = edge["node"]["name"]
+                total_size += edge["size"]
+                if select_all or name in langs:
+                    selected_size += edge["size"]
+                languages.add(name)
+    return count, total_size, selected_size, languages
+
+
+def build_contribution_row(
+    login: str,
+    profile: Dict[str, Any],
+    contributions: Dict[str, int],
+    repo_stats: Dict[str, Tuple[int, int, int, set]],
+    counts: Optional[Dict[str, int]],
+    end: str = None,
+) -> Dict[str, Any]:
+    """
+    Builds one row of the total-contribution table, keyed by the column names GithubContributionData.create_from_row
+    reads. With a time range (counts given), the contribution counts come from the counted nodes and the profile
+    totals that cannot be restricted to a time range are reported as 0, as in the frontend table.
+
+    Args:
+        login (str): The GitHub username.
+        profile (Dict[str, Any]): The user's profile statistics.
+        contributions (Dict[str, int]): The user's contributions collection totals.
+        repo_stats (Dict[str, Tuple[int, int, int, set]]): The statistics of each repository category.
+        counts (Optional[Dict[str, int]]): The contributions counted in the time range, or None without a range.
+        end (str, optional): End date (YYYY-MM-DD) of the time range.
+
+    Returns:
+        Dict[str, Any]: The row.
+    """
+    created_at = profile["created_at"]
+    until = datetime.strptime(end, "%Y-%m-%d") if end else datetime.utcnow()
+    row = {
+        "GitHub ID": login,
+        "Name": profile.get("name") or "N/A",
+        "Email": profile.get("email") or "N/A",
+        "Created At": created_at,
+        "Age (days)": (until - datetime.strptime(created_at, TIME_FORMAT)).days,
+        "Bio": profile.get("bio") or "N/A",
+        "Company": profile.get("company") or "N/A",
+        "Private Contributions": contributions["res_con"],
+        "Commits": contributions["commit"],
+        "Pull Request Reviews": contributions["pr_review"],
+    }
+    if counts is None:
+        row.update(
+            {
+                "Watching": profile["watching"],
+                "Starred Repositories": profile["starred_repositories"],
+                "Following": profile["following"],
+                "Followers": profile["followers"],
+                "Gists": profile["gists"],
+                "Issues": profile["issues"],
+                "Projects": profile["projects"],
+                "Pull Requests": profile["pull_requests"],
+                "Repositories": profile["repositories"],
+                "Repository Discussions": profile["repository_discussions"],
+                "Commit Comments": profile["commit_comments"],
+                "Issue Comments": profile["issue_comments"],
+                "Gist Comments": profile["gist_comments"],
+                "Repository Discussion Comments": profile[
+                    "repository_discussion_comments"
+                ],
+            }
+        )
+    else:
+        row.update(
+            {
+                "Watching": 0,
+                "Starred Repositories": 0,
+                "Following": 0,
+                "Followers": 0,
+                "Projects": 0,
+                "Repositories": sum(stats[0] for stats in repo_stats.values()),
+            }
+        )
+        row.update(counts)
+
+    all_languages = set()
+    for column, _ in REPOSITORY_CATEGORIES:
+        count, total_size, selected_size, languages = repo_stats[column]
+        row[column] = count
+        row[f"{column} Size"] = total_size
+        row[f"{column} Selected Langs Size"] = selected_size
+        # The last column keeps the name the table has always used
+        suffix = "Langs Size Number" if column == "Collaborating Forked Repo" else "Langs Number"
+        row[f"{column} {suffix}"] = len(languages)
+        all_languages |= languages
+    row["Total Langs Number"] = len(all_languages)
+    return row
+
+
+@register_job_kind
+class CohortJob(DurableJob):
+    """
+    CohortJob holds the state of one total-contribution job: its options, progress, the rows produced so far and the
+    UserQuery the rows are saved under. A job worker runs it, processing the logins in chunks of BATCH_SIZE; each
+    chunk's rows are committed to the database before the next chunk starts, and the index of the next chunk is the
+    job's checkpoint.
+    """
+
+    kind = "cohort"
+
+    def __init__(
+        self,
+        user_login: str,
+        logins: List[str],
+        ds_name: str,
+        start: str = None,
+        end: str = None,
+        langs: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Initializes a pending job.
+
+        Args:
+            user_login (str): The login of the user who started the job.
+            logins (List[str]): The GitHub usernames to mine.
+            ds_name (str): The name of the dataset the rows are saved under.
+            start (str, optional): Start date (YYYY-MM-DD) of the time range.
+            end (str, optional): End date (YYYY-MM-DD) of the time range.
+            langs (Optional[List[str]]): The selected languages.
+        """
+        self.id = uuid.uuid4().hex
+        self.user_login = user_login
+        self.logins = list(dict.fromkeys(logins))
+        self.ds_name = ds_name
+        self.start = start
+        self.end = end
+        self.langs = langs or ["All"]
+        self.status = "pending"
+        self.next_chunk = 0
+        self.processed = 0
+        self.saved = 0
+        self.invalid: List[str] = []
+        self.failed: Dict[str, str] = {}
+        self.rows: List[Dict[str, Any]] = []
+        self.user_query_id: Optional[int] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+
+    def params(self) -> Dict[str, Any]:
+        return {
+            "logins": self.logins,
+            "ds_name": self.ds_name,
+            "start": self.start,
+            "end": self.end,
+            "langs": self.langs,
+        }
+
+    @classmethod
+    def from_params(cls, job_id: str, user_login: str, params: Dict[str, Any]) -> "CohortJob":
+        job = cls(user_login, **params)
+        job.id = job_id
+        return job
+
+    def checkpoint(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "next_chunk": self.next_chunk,
+                "user_query_id": self.user_query_id,
+                "processed": self.processed,
+                "saved": self.saved,
+                "invalid": list(self.invalid),
+                "failed": dict(self.failed),
+            }
+
+    def restore(self, checkpoint: Dict[str, Any]) -> None:
+        self.next_chunk = checkpoint["next_chunk"]
+        self.user_query_id = checkpoint["user_query_id"]
+        self.processed = checkpoint["processed"]
+        self.saved = checkpoint["saved"]
+        self.invalid = checkpoint["invalid"]
+        self.failed = checkpoint["failed"]
+
+    @property
+    def selected_langs(self) -> str:
+        """The selected languages as stored in GithubContributionData.selected_langs."""
+        if "All" in self.langs or "ALL" in self.langs:
+            return json.dumps(["ALL"])
+        return json.dumps(self.langs)
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has stopped."""
+        return self.status in ("completed", "failed", "cancelled")
+
+    def cancel(self) -> None:
+        """Asks the worker to stop after the chunk it is processing."""
+        self._request_cancel()
+
+    def progress(self) -> Dict[str, Any]:
+        """
+        Returns the progress of the job.
+
+        Returns:
+            Dict[str, Any]: The job's status, counts of processed, saved, invalid and failed logins, the id of the
+            UserQuery holding the saved rows, and the time a parked job is resumed at.
+        """
+        with self._lock:
+            return {
+                "id": self.id,
+                "status": self.status,
+                "ds_name": self.ds_name,
+                "total": len(self.logins),
+                "processed": self.processed,
+                "saved": self.saved,
+                "invalid": list(self.invalid),
+                "failed": dict(self.failed),
+                "user_query_id": self.user_query_id,
+                "resume_at": self.resume_at.isoformat() if self.resume_at else None,
+                "error": self.error,
+                "created_at": self.created_at.isoformat(),
+                "finished_at": (
+                    self.finished_at.isoformat() if self.finished_at else None
+                ),
+            }
+
+    def rows_from(self, offset: int) -> List[Dict[str, Any]]:
+        """
+        Returns the rows produced after the given offset.
+
+        Args:
+            offset (int): The number of rows the caller has already received.
+
+        Returns:
+            List[Dict[str, Any]]: The new rows.
+        """
+        with self._lock:
+            return self.rows[offset:]
+
+    def run(self, app: Flask, protocol: str, host: str, tokens: List[str]) -> None:
+        """
+        Runs the job inside an application context, from its checkpoint until it stops or parks.
+
+        Args:
+            app (Flask): The application whose database the rows are written to.
+            protocol (str): The protocol of the GitHub server.
+            host (str): The host of the GitHub API.
+            tokens (List[str]): The token pool, the owner's token first.
+        """
+        with app.app_context():
+            self.status = "running"
+            try:
+                if self.user_query_id is None:
+                    user_query = UserQuery.create(
+                        user_login=self.user_login,
+                        ds_name=self.ds_name,
+                        start_time=(
+                            datetime.strptime(self.start, "%Y-%m-%d") if self.start else None
+                        ),
+                        end_time=datetime.strptime(self.end, "%Y-%m-%d") if self.end else None,
+                        data_type="total",
+                    )
+                    db.session.commit()
+                    self.user_query_id = user_query.id
+                    self.save_checkpoint()
+                chunks = _chunks(self.logins, BATCH_SIZE)
+                for index in range(self.next_chunk, len(chunks)):
+                    if self._cancelled.is_set():
+                        self.status = "cancelled"
+                        break
+                    self._process_chunk(chunks[index], protocol, host, tokens)
+                    self.next_chunk = index + 1
+                    self.save_checkpoint()
+                else:
+                    self.status = "completed"
+            except JobParked as e:
+                db.session.rollback()
+                self._park(e)
+            except Exception as e:  # pylint: disable=broad-except
+                logging.exception("Cohort job %s failed", self.id)
+                db.session.rollback()
+                self.error = str(e)
+                self.status = "failed"
+            finally:
+                if self.status != "parked":
+                    self.finished_at = datetime.utcnow()
+                self.save_checkpoint()
+                db.session.remove()
+
+    async def _count_all(
+        self, client: Any, queries: List[Any], concurrency: int
+    ) -> List[Any]:
+        """
+        Counts the nodes of several connections in the job's time range, with at most `concurrency` counts in flight.
+
+        Args:
+            client (AsyncClient): The client executing the queries.
+            queries (List[CreatedAtWindow]): The counting queries.
+            concurrency (int): The maximum number of counts running at the same time.
+
+        Returns:
+            List[Any]: The result of each count, or the exception it raised, in the order of the queries.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(query):
+            async with semaphore:
+                return await count_in_window(client, query, self.start, self.end)
+
+        return await asyncio.gather(
+            *(run(query) for query in queries), return_exceptions=True
+        )
+
+    def _process_chunk(
+        self, logins: List[str], protocol: str, host: str, tokens: List[str]
+    ) -> None:
+        """
+        Fetches, builds and saves the rows of one chunk of logins. The chunk's state is only recorded once its rows
+        are saved, so a chunk that parks the job is processed again from the start.
+
+        Args:
+            logins (List[str]): The logins of the chunk.
+            protocol (str): The protocol of the GitHub server.
+            host (str): The host of the GitHub API.
+            tokens (List[str]): The token pool, the owner's token first. Only the owner's token is used.
+        """
+        concurrency = QUERY_CONCURRENCY
+        options = {"max_wait": PARK_AFTER_SECONDS}
+        profiles = get_users_profile_stats(
+            logins, protocol, host, tokens[0], **options
+        )
+        park_if_rate_limited(profiles)
+        if isinstance(profiles.get("error"), str):
+            self._fail(logins, profiles["error"])
+            return
+        found = [login for login in logins if "error" not in profiles[login]]
+        invalid = [login for login in logins if login not in found]
+        if not found:
+            with self._lock:
+                self.invalid.extend(invalid)
+                self.processed += len(invalid)
+            return
+
+        contributions = get_users_contributions_collection(
+            found, protocol, host, tokens[0], self.start, self.end, **options
+        )
+        park_if_rate_limited(contributions)
+        if isinstance(contributions.get("error"), str):
+            with self._lock:
+                self.invalid.extend(invalid)
+                self.processed += len(invalid)
+            self._fail(found, contributions["error"])
+            return
+
+        # Every query of the chunk, tagged with the login and table column it belongs to
+        jobs = []
+        count_jobs = []
+        for login in found:
+            for column, repo_t in REPOSITORY_CATEGORIES:
+                is_fork, ownership = REPOSITORY_TYPES[repo_t]
+                jobs.append(
+                    (login, column, UserRepositories(login, is_fork, ownership))
+                )
+            if self.start and self.end:
+                for column, count_query in COUNTED_CONTRIBUTIONS.items():
+                    count_jobs.append((login, column, count_query(login)))
+
+        client = get_async_github_client(
+            protocol=protocol, host=host, token=tokens[0], **options
+        )
+        results = asyncio.run(
+            client.execute_many(
+                [query for _, _, query in jobs],
+                concurrency=concurrency,
+                return_exceptions=True,
+            )
+        )
+        count_results = asyncio.run(
+            self._count_all(client, [query for _, _, query in count_jobs], concurrency)
+        )
+
+        repo_stats = {login: {} for login in found}
+        counts = {login: {} for login in found} if self.start and self.end else None
+        errors = {}
+        for (login, column, _), pages in zip(jobs, results):
+            if isinstance(pages, Exception):
+                errors[login] = str(pages)
+            else:
+                park_if_rate_limited(pages)
+                repo_stats[login][column] = _repository_stats(
+                    pages, self.langs, self.start, self.end
+                )
+        for (login, column, _), result in zip(count_jobs, count_results):
+            if isinstance(result, Exception):
+                errors[login] = str(result)
+            else:
+                park_if_rate_limited(result)
+                counts[login][column] = result["count"]
+
+        rows = [
+            build_contribution_row(
+                login,
+                profiles[login],
+                contributions[login],
+                repo_stats[login],
+                counts[login] if counts is not None else None,
+                self.end,
+            )
+            for login in found
+            if login not in errors
+        ]
+        for row in rows:
+            db.session.add(
+                GithubContributionData.create_from_row(
+                    row, self.selected_langs, self.user_query_id
+                )
+            )
+        db.session.commit()
+        with self._lock:
+            self.rows.extend(rows)
+            self.saved += len(rows)
+            self.invalid.extend(invalid)
+            self.failed.update(errors)
+            self.processed += len(logins)
+
+    def _fail(self, logins: List[str], error: str) -> None:
+        """
+        Records that a chunk of logins could not be fetched.
+
+        Args:
+            logins (List[str]): The logins of the chunk.
+            error (str): The error message.
+        """
+        with self._lock:
+            for login in logins:
+                self.failed[login] = error
+            self.processed += len(logins)
+
+
+def start_cohort_job(
+    app: Flask,
+    user: User,
+    logins: List[str],
+    ds_name: str,
+    start: str = None,
+    end: str = None,
+    langs: Optional[List[str]] = None,
+) -> CohortJob:
+    """
+    Queues a total-contribution job for the given logins; a job worker runs it.
+
+    Args:
+        app (Flask): The application whose database the rows are written to.
+        user (User): The user who starts the job; the job uses the user's token pool.
+        logins (List[str]): The GitHub usernames to mine.
+        ds_name (str): The name of the dataset the rows are saved under.
+        start (str, optional): Start date (YYYY-MM-DD) of the time range.
+        end (str, optional): End date (YYYY-MM-DD) of the time range.
+        langs (Optional[List[str]]): The selected languages. Defaults to all languages.
+
+    Returns:
+        CohortJob: The queued job.
+    """
+    job = CohortJob(user.github_login, logins, ds_name, start, end, langs)
+    return enqueue_job(app, job)
+
+
+def get_cohort_job(job_id: str, user_login: str) -> Optional[CohortJob]:
+    """
+    Looks up a job started by the given user that is live in this process.
+
+    Args:
+        job_id (str): The id of the job.
+        user_login (str): The login of the user asking for the job.
+
+    Returns:
+        Optional[CohortJob]: The job, or None if it is not live here or belongs to another user.
+    """
+    return get_live_job(job_id, user_login, CohortJob)
@@ -0,0 +1,578 @@
+"""
+This module mines the commits of a cohort of GitHub users as a background job. For every repository of a user, the
+job first collects the OIDs of the user's commits on the selected branches and deduplicates them, so that a commit
+reachable from several branches is fetched once. The details of the unique commits are then fetched from the REST API
+with bounded concurrency, served from CommitDetailCache where possible, and written straight into Commit rows.
+Callers poll the job's progress, which is reported per repository, and stream its result table while it runs. The job
+is durable (see job_queue): it saves a checkpoint after every repository, parks until the reset when the rate limit is
+exhausted, and is resumed from the checkpoint after a restart, skipping the repositories it has completed.
+
+The repositories of a user, and everything about private repositories, are read with the token of the user who
+started the job, since what a token can see depends on its owner. Only public repositories are read with the whole
+token pool; a public repository the pool cannot find, e.g. one made private since it was listed, is read again with
+the owner's token before it is marked failed.
+
+Classes:
+    CommitMiningJob: The state and worker of one commit mining job.
+
+Functions:
+    start_commit_mining_job(app: Flask, user: User, logins: List[str], ds_name: str, all_branches: bool = False) -> CommitMiningJob:
+    get_commit_mining_job(job_id: str, user_login: str) -> Optional[CommitMiningJob]:
+    build_commit_row(repo: str, branch: str, commit: dict) -> dict:
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from flask import Flask, current_app
+from requests.exceptions import HTTPError, Timeout
+from app.database import db
+from app.models.user import User
+from app.models.user_query import UserQuery
+from app.models.commit import Commit
+from app.models.commit_detail_cache import CommitDetailCache
+from .job_queue import (
+    PARK_AFTER_SECONDS,
+    DurableJob,
+    JobParked,
+    enqueue_job,
+    get_live_job,
+    park_if_rate_limited,
+    register_job_kind,
+)
+from .github_graphql_services import QUERY_CONCURRENCY, get_async_github_client
+from .github_rest_services import fetch_with_retries, process_commit_details
+from .language_tables import sync_languages
+from .github_query.graphql_client import QueryFailedException, TokenPoolAuthenticator
+from .github_query.queries import (
+    UserRepositoryNames,
+    RepositoryBranches,
+    RepositoryDefaultBranch,
+    RepositoryContributorContributions,
+)
+
+MAX_DETAIL_CONCURRENCY = 8
+
+
+def _is_not_found(error: Exception) -> bool:
+    """
+    Checks whether a GraphQL or REST request failed because the repository or commit was not found, which is how
+    GitHub answers a token that cannot see a private repository.
+
+    Args:
+        error (Exception): The error the request failed with. A REST request that kept failing raises Timeout from its
+        last error.
+
+    Returns:
+        bool: Whether the error is a not-found error.
+    """
+    if isinstance(error, QueryFailedException):
+        return error.response.status_code == 404 or "NOT_FOUND" in error.response.text
+    cause = error.__cause__
+    return isinstance(cause, HTTPError) and cause.response is not None and cause.response.status_code == 404
+
+
+def build_commit_row(repo: str, branch: str, commit: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Builds one row of the commit table, keyed by the column names Commit.create_from_row reads.
+
+    Args:
+        repo (str): The name of the repository.
+        branch (str): The branch the commit was found on.
+        commit (Dict[str, Any]): The processed commit details, see process_commit_details.
+
+    Returns:
+        Dict[str, Any]: The row.
+    """
+    return {
+        "Repository": repo,
+        "Author": commit["author"] or "N/A",
+        "Author Email": commit["author_email"] or "N/A",
+        "Author Login": commit["author_login"] or "N/A",
+        "Branch": branch,
+        "Authored Date": commit["authoredDate"],
+        "Changed Files": commit["changedFilesIfAvailable"],
+        "Additions": commit["additions"],
+        "Deletions": commit["deletions"],
+        "Message": commit["message"],
+        "Parents": commit["parents"],
+        "Languages": json.dumps(commit["lang_stats"]),
+    }
+
+
+@register_job_kind
+class CommitMiningJob(DurableJob):
+    """
+    CommitMiningJob holds the state of one commit mining job: its options, the progress of every repository, the rows
+    produced so far and the UserQuery the rows are saved under. A job worker runs it and commits the rows of each
+    repository before it moves on to the next one; the index of the current login and the completed repositories are
+    the job's checkpoint.
+    """
+
+    kind = "commit_mining"
+
+    def __init__(
+        self,
+        user_login: str,
+        logins: List[str],
+        ds_name: str,
+        all_branches: bool = False,
+        detail_concurrency: int = MAX_DETAIL_CONCURRENCY,
+        since: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        Initializes a pending job.
+
+        Args:
+            user_login (str): The login of the user who started the job.
+            logins (List[str]): The GitHub usernames whose commits are mined.
+            ds_name (str): The name of the dataset the rows are saved under.
+            all_branches (bool): Whether every branch is mined, rather than only the default branch.
+            detail_concurrency (int): The maximum number of commit details fetched at the same time.
+            since (Optional[Dict[str, str]]): Per login, the time ("%Y-%m-%dT%H:%M:%SZ") from which commits are
+            mined. Used to refresh a dataset with the commits committed after its newest one.
+        """
+        self.id = uuid.uuid4().hex
+        self.user_login = user_login
+        self.logins = list(dict.fromkeys(logins))
+        self.ds_name = ds_name
+        self.all_branches = all_branches
+        self.detail_concurrency = detail_concurrency
+        self.since = since or {}
+        self.status = "pending"
+        self.next_login = 0
+        self.processed = 0
+        self.saved = 0
+        self.invalid: List[str] = []
+        self.failed: Dict[str, str] = {}
+        self.repositories: Dict[str, Dict[str, Any]] = {}
+        self.rows: List[Dict[str, Any]] = []
+        self.user_query_id: Optional[int] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+
+    def params(self) -> Dict[str, Any]:
+        return {
+            "logins": self.logins,
+            "ds_name": self.ds_name,
+            "all_branches": self.all_branches,
+            "detail_concurrency": self.detail_concurrency,
+            "since": self.since,
+        }
+
+    @classmethod
+    def from_params(
+        cls, job_id: str, user_login: str, params: Dict[str, Any]
+    ) -> "CommitMiningJob":
+        job = cls(user_login, **params)
+        job.id = job_id
+        return job
+
+    def checkpoint(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "next_login": self.next_login,
+                "user_query_id": self.user_query_id,
+                "processed": self.processed,
+                "saved": self.saved,
+                "invalid": list(self.invalid),
+                "failed": dict(self.failed),
+                "repositories": {
+                    name: dict(repo) for name, repo in self.repositories.items()
+                },
+            }
+
+    def restore(self, checkpoint: Dict[str, Any]) -> None:
+        self.next_login = checkpoint["next_login"]
+        self.user_query_id = checkpoint["user_query_id"]
+        self.processed = checkpoint["processed"]
+        self.saved = checkpoint["saved"]
+        self.invalid = checkpoint["invalid"]
+        self.failed = checkpoint["failed"]
+        self.repositories = checkpoint["repositories"]
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has stopped."""
+        return self.status in ("completed", "failed", "cancelled")
+
+    def cancel(self) -> None:
+        """Asks the worker to stop after the repository it is processing."""
+        self._request_cancel()
+
+    def progress(self) -> Dict[str, Any]:
+        """
+        Returns the progress of the job.
+
+        Returns:
+            Dict[str, Any]: The job's status, counts of processed, invalid and failed logins, the number of saved
+            rows, per repository the number of unique commits found, the commits fetched so far and how many of
+            them came from the cache, and the time a parked job is resumed at.
+        """
+        with self._lock:
+            return {
+                "id": self.id,
+                "status": self.status,
+                "ds_name": self.ds_name,
+                "total": len(self.logins),
+                "processed": self.processed,
+                "saved": self.saved,
+                "invalid": list(self.invalid),
+                "failed": dict(self.failed),
+                "repositories": {
+                    name: dict(repo) for name, repo in self.repositories.items()
+                },
+                "user_query_id": self.user_query_id,
+                "resume_at": self.resume_at.isoformat() if self.resume_at else None,
+                "error": self.error,
+                "created_at": self.created_at.isoformat(),
+                "finished_at": (
+                    self.finished_at.isoformat() if self.finished_at else None
+                ),
+            }
+
+    def rows_from(self, offset: int) -> List[Dict[str, Any]]:
+        """
+        Returns the rows produced after the given offset.
+
+        Args:
+            offset (int): The number of rows the caller has already received.
+
+        Returns:
+            List[Dict[str, Any]]: The new rows.
+        """
+        with self._lock:
+            return self.rows[offset:]
+
+    def run(self, app: Flask, protocol: str, host: str, tokens: List[str]) -> None:
+        """
+        Runs the job inside an application context, from its checkpoint until it stops or parks.
+
+        Args:
+            app (Flask): The application whose database the rows are written to.
+            protocol (str): The protocol of the GitHub server.
+            host (str): The host of the GitHub API.
+            tokens (List[str]): The token pool the requests are spread over.
+        """
+        with app.app_context():
+            self.status = "running"
+            try:
+                if self.user_query_id is None:
+                    user_query = UserQuery.create(
+                        user_login=self.user_login,
+                        ds_name=self.ds_name,
+                        start_time=None,
+                        end_time=None,
+                        data_type="User Commits",
+                    )
+                    db.session.commit()
+                    self.user_query_id = user_query.id
+                    self.save_checkpoint()
+                owner_client = get_async_github_client(
+                    protocol=protocol, host=host, token=tokens[0], max_wait=PARK_AFTER_SECONDS
+                )
+                pool_client = get_async_github_client(
+                    protocol=protocol,
+                    host=host,
+                    token=tokens[0],
+                    tokens=tokens,
+                    max_wait=PARK_AFTER_SECONDS,
+                )
+                for index in range(self.next_login, len(self.logins)):
+                    if self._cancelled.is_set():
+                        self.status = "cancelled"
+                        break
+                    self._process_login(
+                        owner_client, pool_client, self.logins[index], protocol, host, tokens
+                    )
+                    if self._cancelled.is_set():
+                        # The login was left after one of its repositories
+                        self.status = "cancelled"
+                        break
+                    self.next_login = index + 1
+                    self.save_checkpoint()
+                else:
+                    self.status = "completed"
+            except JobParked as e:
+                db.session.rollback()
+                self._park(e)
+            except Exception as e:  # pylint: disable=broad-except
+                logging.exception("Commit mining job %s failed", self.id)
+                db.session.rollback()
+                self.error = str(e)
+                self.status = "failed"
+            finally:
+                if self.status != "parked":
+                    self.finished_at = datetime.utcnow()
+                self.save_checkpoint()
+                db.session.remove()
+
+    def _process_login(
+        self,
+        owner_client: Any,
+        pool_client: Any,
+        login: str,
+        protocol: str,
+        host: str,
+        tokens: List[str],
+    ) -> None:
+        """
+        Mines the commits of one login, repository by repository. Repositories completed before the job was parked
+        or stopped are skipped.
+
+        Args:
+            owner_client (AsyncClient): The GraphQL client of the owner's token, for the repository list and private
+            repositories.
+            pool_client (AsyncClient): The GraphQL client of the token pool, for public repositories.
+            login (str): The GitHub username.
+            protocol (str): The protocol of the GitHub server.
+            host (str): The host of the GitHub API.
+            tokens (List[str]): The token pool, the owner's token first.
+        """
+        try:
+            pages = asyncio.run(owner_client.execute(UserRepositoryNames(login)))
+            park_if_rate_limited(pages)
+        except QueryFailedException as e:
+            with self._lock:
+                self.invalid.append(login)
+                self.processed += 1
+            logging.info("Skipping %s: %s", login, e)
+            return
+        repos = []
+        github_id = None
+        for page in pages:
+            connection, github_id = UserRepositoryNames.user_repository_names(page)
+            repos.extend(connection.get("nodes") or [])
+
+        saved = 0
+        for repo in repos:
+            if self._cancelled.is_set():
+                return
+            owner, name = repo["owner"]["login"], repo["name"]
+            completed = self.repositories.get(f"{owner}/{name}")
+            if completed and completed["status"] == "completed":
+                saved += completed["commits"]
+                continue
+            attempts = [(owner_client, tokens[:1])]
+            if not repo.get("isPrivate"):
+                attempts.insert(0, (pool_client, tokens))
+            try:
+                for attempt, (client, attempt_tokens) in enumerate(attempts, 1):
+                    try:
+                        saved += self._process_repository(
+                            client, owner, name, github_id, protocol, host, attempt_tokens, self.since.get(login)
+                        )
+                        break
+                    except (QueryFailedException, Timeout) as e:
+                        if attempt == len(attempts) or not _is_not_found(e):
+                            raise
+                        logging.info(
+                            "%s/%s was not found with the token pool, retrying with the owner's token", owner, name
+                        )
+                self.save_checkpoint()
+            except JobParked:
+                raise
+            except Exception as e:  # pylint: disable=broad-except
+                logging.exception("Mining %s/%s failed", owner, name)
+                with self._lock:
+                    self.failed[f"{owner}/{name}"] = str(e)
+                    self.repositories[f"{owner}/{name}"]["status"] = "failed"
+        if saved == 0 and login not in self.since:
+            # Users without commits keep a placeholder row, as in the frontend table
+            self._save_rows(
+                [
+                    {
+                        "Repository": "N/A",
+                        "Author": "N/A",
+                        "Author Email": "N/A",
+                        "Author Login": login,
+                        "Branch": "N/A",
+                        "Authored Date": "N/A",
+                        "Changed Files": 0,
+                        "Additions": 0,
+                        "Deletions": 0,
+                        "Message": "N/A",
+                        "Parents": 0,
+                        "Languages": "N/A",
+                    }
+                ]
+            )
+        with self._lock:
+            self.processed += 1
+
+    async def _collect_oids(
+        self, client: Any, owner: str, name: str, github_id: str, since: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Collects the OIDs of the user's commits on the selected branches of a repository.
+
+        Args:
+            client (AsyncClient): The GraphQL client.
+            owner (str): The owner of the repository.
+            name (str): The name of the repository.
+            github_id (str): The node id of the user.
+            since (Optional[str]): Only commits committed at or after this time are collected.
+
+        Returns:
+            Dict[str, str]: The branch each unique OID was first found on, keyed by OID.
+        """
+        if self.all_branches:
+            pages = await client.execute(RepositoryBranches(owner, name))
+            park_if_rate_limited(pages)
+            branches = [
+                node["name"]
+                for page in pages
+                for node in RepositoryBranches.branches(page).get("nodes") or []
+            ]
+        else:
+            response = await client.execute(RepositoryDefaultBranch(owner, name))
+            park_if_rate_limited(response)
+            default_branch = RepositoryDefaultBranch.default_branch(response)
+            branches = [default_branch["name"]] if default_branch.get("name") else []
+        histories = await client.execute_many(
+            [
+                RepositoryContributorContributions(
+                    owner, name, branch, github_id, since=f'"{since}"' if since else None
+                )
+                for branch in branches
+            ],
+            concurrency=QUERY_CONCURRENCY,
+        )
+        oids: Dict[str, str] = {}
+        for branch, pages in zip(branches, histories):
+            park_if_rate_limited(pages)
+            for page in pages:
+                history = RepositoryContributorContributions.commits_list(page)
+                for node in history.get("nodes") or []:
+                    oids.setdefault(node["oid"], branch)
+        return oids
+
+    def _process_repository(
+        self,
+        client: Any,
+        owner: str,
+        name: str,
+        github_id: str,
+        protocol: str,
+        host: str,
+        tokens: List[str],
+        since: Optional[str] = None,
+    ) -> int:
+        """
+        Collects the unique commits of a repository, fetches their details and saves their rows.
+
+        Args:
+            client (AsyncClient): The GraphQL client.
+            owner (str): The owner of the repository.
+            name (str): The name of the repository.
+            github_id (str): The node id of the user.
+            protocol (str): The protocol of the GitHub server.
+            host (str): The host of the GitHub API.
+            tokens (List[str]): The tokens the REST requests are spread over.
+            since (Optional[str]): Only commits committed at or after this time are mined.
+
+        Returns:
+            int: The number of rows saved.
+        """
+        key = f"{owner}/{name}"
+        repo_progress = {"status": "collecting", "commits": 0, "fetched": 0, "cached": 0}
+        with self._lock:
+            self.repositories[key] = repo_progress
+        oids = asyncio.run(self._collect_oids(client, owner, name, github_id, since))
+        with self._lock:
+            repo_progress.update(status="fetching", commits=len(oids))
+
+        details = CommitDetailCache.get_many(host, owner, name, list(oids))
+        with self._lock:
+            repo_progress.update(cached=len(details), fetched=len(details))
+
+        missing = [oid for oid in oids if oid not in details]
+        # Every request uses the token with the most remaining REST budget when it is sent
+        authenticator = TokenPoolAuthenticator(tokens, host=host, resource="core")
+
+        def fetch(oid):
+            url = f"{protocol}://{host}/repos/{owner}/{name}/commits/{oid}"
+            return fetch_with_retries(
+                url, authenticator.get_authorization_header(), max_wait=PARK_AFTER_SECONDS
+            )
+
+        max_entries = current_app.config.get("COMMIT_CACHE_MAX_ENTRIES", 200000)
+        with ThreadPoolExecutor(max_workers=self.detail_concurrency) as executor:
+            for oid, commit in zip(missing, executor.map(fetch, missing)):
+                # The details fetched so far are cached, so a parked repository resumes cheaply
+                park_if_rate_limited(commit)
+                if not commit:
+                    raise RuntimeError(f"Failed to fetch commit {oid}")
+                details[oid] = process_commit_details(commit)
+                CommitDetailCache.put(host, owner, name, oid, details[oid], max_entries)
+                with self._lock:
+                    repo_progress["fetched"] += 1
+
+        rows = [build_commit_row(name, oids[oid], details[oid]) for oid in oids]
+        self._save_rows(rows)
+        with self._lock:
+            repo_progress["status"] = "completed"
+        return len(rows)
+
+    def _save_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Saves rows of the commit table, with their language rows, under the job's UserQuery.
+
+        Args:
+            rows (List[Dict[str, Any]]): The rows.
+        """
+        commits = [Commit.create_from_row(row, self.user_query_id) for row in rows]
+        db.session.add_all(commits)
+        db.session.flush()
+        sync_languages(Commit, [commit.id for commit in commits])
+        db.session.commit()
+        with self._lock:
+            self.rows.extend(rows)
+            self.saved += len(rows)
+
+
+def start_commit_mining_job(
+    app: Flask,
+    user: User,
+    logins: List[str],
+    ds_name: str,
+    all_branches: bool = False,
+) -> CommitMiningJob:
+    """
+    Queues a commit mining job for the given logins; a job worker runs it.
+
+    Args:
+        app (Flask): The application whose database the rows are written to.
+        user (User): The user who starts the job; the job uses the user's token pool.
+        logins (List[str]): The GitHub usernames whose commits are mined.
+        ds_name (str): The name of the dataset the rows are saved under.
+        all_branches (bool): Whether every branch is mined, rather than only the default branch.
+
+    Returns:
+        CommitMiningJob: The queued job.
+    """
+    job = CommitMiningJob(user.github_login, logins, ds_name, all_branches)
+    return enqueue_job(app, job)
+
+
+def get_commit_mining_job(job_id: str, user_login: str) -> Optional[CommitMiningJob]:
+    """
+    Looks up a job started by the given user that is live in this process.
+
+    Args:
+        job_id (str): The id of the job.
+        user_login (str): The login of the user asking for the job.
+
+    Returns:
+        Optional[CommitMiningJob]: The job, or None if it is not live here or belongs to another user.
+    """
+    return get_live_job(job_id, user_login, CommitMiningJob)
@@ -0,0 +1,131 @@
+"""
+This module exports a saved dataset as a columnar file, Parquet or Arrow IPC stream, for analysis with pandas, polars,
+R or DuckDB. The columns are typed after the model's columns, so timestamps stay timestamps and counts stay integers.
+The rows are read batch by batch with the keyset queries of dataset_reader, and every batch becomes one Parquet row
+group or one Arrow record batch that is sent before the next batch is read, so the export never holds more than one
+batch in memory.
+
+Functions:
+    arrow_schema(model: Type[db.Model]) -> pa.Schema:
+    export_dataset(user_query: UserQuery, export_format: str, batch_rows: int = EXPORT_BATCH_ROWS)
+        -> Generator[bytes, None, None]:
+
+Constants:
+    EXPORT_FORMATS: The media type and file extension of every export format.
+    EXPORT_BATCH_ROWS: The number of rows per row group or record batch.
+"""
+
+import io
+from typing import Dict, Generator, List, Tuple, Type
+import pyarrow as pa
+import pyarrow.parquet as pq
+from app.database import db
+from app.models import UserQuery
+from .dataset_reader import dataset_model, iter_batches
+
+EXPORT_FORMATS: Dict[str, Tuple[str, str]] = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+EXPORT_BATCH_ROWS = 10000
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    A write-only file that keeps what is written until it is drained. Unlike a truncated BytesIO, it reports the
+    total number of bytes written as its position, which the Parquet writer records in the file footer.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        """
+        Returns the bytes written since the last call.
+
+        Returns:
+            bytes: The bytes.
+        """
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_type(column: db.Column) -> pa.DataType:
+    if isinstance(column.type, db.DateTime):
+        return pa.timestamp("us")
+    if isinstance(column.type, db.Boolean):
+        return pa.bool_()
+    if isinstance(column.type, db.Integer):
+        return pa.int64()
+    return pa.string()
+
+
+def arrow_schema(model: Type[db.Model]) -> pa.Schema:
+    """
+    Builds the Arrow schema of the rows of a model, with one nullable field per table column.
+
+    Args:
+        model (Type[db.Model]): The model.
+
+    Returns:
+        pa.Schema: The schema.
+    """
+    return pa.schema(
+        [pa.field(column.name, _arrow_type(column)) for column in model.__table__.columns]
+    )
+
+
+def export_dataset(
+    user_query: UserQuery, export_format: str, batch_rows: int = EXPORT_BATCH_ROWS
+) -> Generator[bytes, None, None]:
+    """
+    Yields the file of a dataset chunk by chunk. A dataset without rows gives a valid file without rows.
+
+    Args:
+        user_query (UserQuery): The dataset.
+        export_format (str): The format of the file, a key of EXPORT_FORMATS.
+        batch_rows (int): The number of rows per row group or record batch.
+
+    Returns:
+        Generator[bytes, None, None]: The chunks of the file.
+
+    Raises:
+        KeyError: If the format or the data type of the dataset is unknown.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise KeyError(export_format)
+    schema = arrow_schema(dataset_model(user_query.data_type))
+    sink = _ChunkSink()
+    if export_format == "parquet":
+        writer = pq.ParquetWriter(sink, schema)
+        write = writer.write_table
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+        write = writer.write_batch
+    try:
+        for rows in iter_batches(user_query, batch_rows=batch_rows):
+            columns = zip(*rows)
+            batch = pa.record_batch(
+                [pa.array(values, type=field.type) for field, values in zip(schema, columns)],
+                schema=schema,
+            )
+            write(pa.Table.from_batches([batch]) if export_format == "parquet" else batch)
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
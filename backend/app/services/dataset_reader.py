@@ -0,0 +1,166 @@
+"""
+This module reads the rows of a saved dataset page by page. Pages are selected by keyset pagination on the row id
+(`id > after ORDER BY id LIMIT n`), so reading a page costs the same however deep into the dataset it is, and rows are
+read as column tuples through SQLAlchemy Core and turned into the dictionaries of the models' to_dict, without
+hydrating ORM instances.
+
+Functions:
+    dataset_model(data_type: str) -> Type[db.Model]:
+    read_page(user_query: UserQuery, after: int = 0, limit: int = DEFAULT_PAGE_ROWS) -> List[Dict[str, Any]]:
+    iter_batches(user_query: UserQuery, after: int = 0, limit: Optional[int] = None,
+        batch_rows: int = STREAM_BATCH_ROWS) -> Generator[List[Row], None, None]:
+    iter_rows(user_query: UserQuery, after: int = 0, limit: Optional[int] = None, batch_rows: int = STREAM_BATCH_ROWS)
+        -> Generator[Dict[str, Any], None, None]:
+
+Constants:
+    DEFAULT_PAGE_ROWS: The number of rows of a page when no limit is given.
+    MAX_PAGE_ROWS: The largest page that can be requested.
+    STREAM_BATCH_ROWS: The number of rows read per query while streaming.
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Dict, Generator, List, Optional, Type
+from sqlalchemy import Row, select
+from app.database import db
+from app.models import GithubContributionData, UserQuery
+from .bulk_ingest import INGEST_COLUMNS
+
+DEFAULT_PAGE_ROWS = 500
+MAX_PAGE_ROWS = 5000
+STREAM_BATCH_ROWS = 1000
+
+
+def dataset_model(data_type: str) -> Type[db.Model]:
+    """
+    Returns the model the rows of a dataset type are stored in.
+
+    Args:
+        data_type (str): The data type of the dataset, e.g. "Issues".
+
+    Returns:
+        Type[db.Model]: The model.
+
+    Raises:
+        KeyError: If the data type has no rows.
+    """
+    return INGEST_COLUMNS[data_type][0]
+
+
+def _serializer(model: Type[db.Model]) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Builds the function that turns a row of the model's table into the dictionary of the model's to_dict.
+
+    Args:
+        model (Type[db.Model]): The model.
+
+    Returns:
+        Callable[[Any], Dict[str, Any]]: The function.
+    """
+    names = [column.name for column in model.__table__.columns]
+    times = [isinstance(column.type, db.DateTime) for column in model.__table__.columns]
+    # Every to_dict shows a missing timestamp as "N/A", except the one of the total contributions
+    missing = None if model is GithubContributionData else "N/A"
+
+    def serialize(row) -> Dict[str, Any]:
+        return {
+            name: (
+                (value.isoformat() if isinstance(value, datetime) else missing)
+                if is_time
+                else value
+            )
+            for name, is_time, value in zip(names, times, row)
+        }
+
+    return serialize
+
+
+def _select_page(model: Type[db.Model], user_query_id: int, after: int, limit: int):
+    table = model.__table__
+    return (
+        select(*table.columns)
+        .where(table.c.user_query_id == user_query_id, table.c.id > after)
+        .order_by(table.c.id)
+        .limit(limit)
+    )
+
+
+def read_page(
+    user_query: UserQuery, after: int = 0, limit: int = DEFAULT_PAGE_ROWS
+) -> List[Dict[str, Any]]:
+    """
+    Reads the rows of a dataset that follow the given row id.
+
+    Args:
+        user_query (UserQuery): The dataset.
+        after (int): The id of the last row already read; 0 reads from the start.
+        limit (int): The maximum number of rows, at most MAX_PAGE_ROWS.
+
+    Returns:
+        List[Dict[str, Any]]: The rows, ordered by id, as the models' to_dict.
+    """
+    model = dataset_model(user_query.data_type)
+    serialize = _serializer(model)
+    limit = max(1, min(limit, MAX_PAGE_ROWS))
+    result = db.session.execute(_select_page(model, user_query.id, after, limit))
+    return [serialize(row) for row in result]
+
+
+def iter_batches(
+    user_query: UserQuery,
+    after: int = 0,
+    limit: Optional[int] = None,
+    batch_rows: int = STREAM_BATCH_ROWS,
+) -> Generator[List[Row], None, None]:
+    """
+    Yields the rows of a dataset that follow the given row id, a batch at a time, as the column tuples of the model's
+    table. Each batch is read with its own keyset query, so no cursor or transaction stays open between batches.
+
+    Args:
+        user_query (UserQuery): The dataset.
+        after (int): The id of the last row already read; 0 reads from the start.
+        limit (Optional[int]): The maximum number of rows. None yields every row.
+        batch_rows (int): The number of rows read per query.
+
+    Returns:
+        Generator[List[Row], None, None]: The batches of rows, ordered by id, in the column order of the table.
+    """
+    model = dataset_model(user_query.data_type)
+    user_query_id = user_query.id
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = batch_rows if remaining is None else min(batch_rows, remaining)
+        rows = db.session.execute(
+            _select_page(model, user_query_id, after, size)
+        ).all()
+        db.session.commit()
+        if rows:
+            yield rows
+        if len(rows) < size:
+            return
+        after = rows[-1].id
+        if remaining is not None:
+            remaining -= len(rows)
+
+
+def iter_rows(
+    user_query: UserQuery,
+    after: int = 0,
+    limit: Optional[int] = None,
+    batch_rows: int = STREAM_BATCH_ROWS,
+) -> Generator[Dict[str, Any], None, None]:
+    """
+    Yields the rows of a dataset that follow the given row id. The rows are read batch by batch, see iter_batches.
+
+    Args:
+        user_query (UserQuery): The dataset.
+        after (int): The id of the last row already read; 0 reads from the start.
+        limit (Optional[int]): The maximum number of rows. None yields every row.
+        batch_rows (int): The number of rows read per query.
+
+    Returns:
+        Generator[Dict[str, Any], None, None]: The rows, ordered by id, as the models' to_dict.
+    """
+    serialize = _serializer(dataset_model(user_query.data_type))
+    for rows in iter_batches(user_query, after, limit, batch_rows):
+        for row in rows:
+            yield serialize(row)
@@ -0,0 +1,807 @@
+"""
+This module refreshes a saved dataset incrementally as a background job. For every login of the dataset it keeps a
+high-water mark, the time of the newest item saved for the login, and fetches only the items ordered at or after it:
+comments, gists, issues, pull requests and discussions are read newest first and the walk stops at the mark,
+repositories are read by update time, and commits are mined from the history committed since the mark. The fetched
+items are upserted into the dataset's rows, matched on a natural key, so a refresh costs in proportion to the new
+activity rather than to the users' whole history. The job is durable (see job_queue): the rows of every page are saved
+as they are fetched, the login and cursor of the walk are its checkpoint, and a job parked by the rate limit or
+interrupted by a restart continues the walk where it stopped.
+
+Classes:
+    DatasetRefreshJob: The state and worker of one refresh job.
+
+Functions:
+    start_dataset_refresh_job(app: Flask, user: User, user_query: UserQuery) -> DatasetRefreshJob:
+    get_dataset_refresh_job(job_id: str, user_login: str) -> Optional[DatasetRefreshJob]:
+    build_node_row(login: str, node: dict, columns: Dict[str, str]) -> dict:
+    build_repository_row(login: str, node: dict) -> dict:
+
+Constants:
+    REFRESHABLE_DATA_TYPES: The data types of the datasets that can be refreshed.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import Flask
+from sqlalchemy import func
+from app.database import db
+from app.models import (
+    User,
+    UserQuery,
+    DatasetRefreshMark,
+    CommitComment,
+    GistComment,
+    IssueComment,
+    RepositoryDiscussionComment,
+    Gist,
+    Issue,
+    PullRequest,
+    RepositoryDiscussion,
+    Repository,
+    Commit,
+)
+from .job_queue import (
+    PARK_AFTER_SECONDS,
+    DurableJob,
+    JobParked,
+    enqueue_job,
+    get_live_job,
+    park_if_rate_limited,
+    register_job_kind,
+)
+from .cohort_jobs import REPOSITORY_CATEGORIES, TIME_FORMAT
+from .commit_mining import CommitMiningJob
+from .language_tables import LANGUAGE_TABLES, sync_languages
+from .github_graphql_services import REPOSITORY_TYPES, get_async_github_client
+from .github_query.graphql_client import QueryFailedException
+from .github_query.queries import (
+    UserCommitComments,
+    UserGistComments,
+    UserIssueComments,
+    UserRepositoryDiscussionComments,
+    UserGists,
+    UserIssues,
+    UserPullRequests,
+    UserRepositoryDiscussions,
+    UserRepositories,
+)
+from .github_query.queries.constants import (
+    FIELD_BODY_TEXT,
+    FIELD_DESCRIPTION,
+    FIELD_TITLE,
+)
+
+# Data types whose items are walked newest first, as (newest-first query, model, table columns besides "GitHub ID"
+# and "Created At" with the node field each is read from)
+NODE_DATA_TYPES = {
+    "Commit Comments": (
+        UserCommitComments.count_query,
+        CommitComment,
+        {"Body Text": FIELD_BODY_TEXT},
+    ),
+    "Gist Comments": (
+        UserGistComments.count_query,
+        GistComment,
+        {"Body Text": FIELD_BODY_TEXT},
+    ),
+    "Issue Comments": (
+        UserIssueComments.count_query,
+        IssueComment,
+        {"Body Text": FIELD_BODY_TEXT},
+    ),
+    "Repository Discussion Comments": (
+        UserRepositoryDiscussionComments.count_query,
+        RepositoryDiscussionComment,
+        {"Body Text": FIELD_BODY_TEXT},
+    ),
+    "Gists": (UserGists.count_query, Gist, {"Description": FIELD_DESCRIPTION}),
+    "Issues": (
+        UserIssues.count_query,
+        Issue,
+        {"Body Text": FIELD_BODY_TEXT, "Title": FIELD_TITLE},
+    ),
+    "Pull Requests": (
+        UserPullRequests.count_query,
+        PullRequest,
+        {"Body Text": FIELD_BODY_TEXT},
+    ),
+    "Repository Discussions": (
+        UserRepositoryDiscussions.count_query,
+        RepositoryDiscussion,
+        {"Body Text": FIELD_BODY_TEXT},
+    ),
+}
+
+REFRESHABLE_DATA_TYPES = [*NODE_DATA_TYPES, "Repositories", "User Commits"]
+
+# Per model: the column holding the login of a row, the columns that identify a row of the login, and the column the
+# high-water mark of a login is derived from when none was recorded yet
+ROW_KEYS = {
+    Repository: ("author_github_login", ("author_github_login", "name"), "updated_at"),
+    Commit: ("author_login", ("repo_name", "authored_date", "message"), "authored_date"),
+}
+NODE_ROW_KEYS = ("author_github_login", ("author_github_login", "created_at"), "created_at")
+
+
+def build_node_row(login: str, node: Dict[str, Any], columns: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Builds one row of a comment, gist, issue, pull request or discussion table, as the frontend builds it.
+
+    Args:
+        login (str): The GitHub username.
+        node (Dict[str, Any]): The node fetched from the user's connection.
+        columns (Dict[str, str]): The columns besides "GitHub ID" and "Created At", with the node field each is read
+        from.
+
+    Returns:
+        Dict[str, Any]: The row.
+    """
+    row = {"GitHub ID": login, "Created At": node["createdAt"]}
+    for column, field in columns.items():
+        row[column] = node.get(field) or "N/A"
+    return row
+
+
+def build_repository_row(login: str, node: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Builds one row of a repository table, as the frontend builds it.
+
+    Args:
+        login (str): The GitHub username.
+        node (Dict[str, Any]): The repository node of a UserRepositories page.
+
+    Returns:
+        Dict[str, Any]: The row.
+    """
+    languages: Dict[str, int] = {}
+    for edge in (node.get("languages") or {}).get("edges") or []:
+        name = edge["node"]["name"]
+        languages[name] = languages.get(name, 0) + edge["size"]
+    return {
+        "GitHub ID": login,
+        "Name": node["name"],
+        "Created At": node["createdAt"],
+        "Updated At": node["updatedAt"],
+        "Primary Language": (node.get("primaryLanguage") or {}).get("name") or "N/A",
+        "Language Stats": json.dumps(languages),
+    }
+
+
+class _CommitRefresh(CommitMiningJob):
+    """Mines the commits of one login committed since its high-water mark and keeps their rows for the upsert."""
+
+    def __init__(self, job: "DatasetRefreshJob", login: str, since: Optional[str]) -> None:
+        # A login listed in since gets no placeholder row when it has no new commits
+        super().__init__(job.user_login, [login], job.ds_name, since={login: since})
+        self.user_query_id = job.user_query_id
+
+    def _save_rows(self, rows: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self.rows.extend(rows)
+
+
+@register_job_kind
+class DatasetRefreshJob(DurableJob):
+    """
+    DatasetRefreshJob holds the state of one refresh job: the dataset it refreshes, the progress over its logins, the
+    rows fetched so far and the high-water mark reached for every login. A job worker runs it. The rows of every page
+    are committed as they are fetched and a login's new mark once its walk is complete, so a cancelled or failed job
+    can simply be started again; the index of the current login and the cursor of its walk are the job's checkpoint.
+    """
+
+    kind = "dataset_refresh"
+
+    def __init__(
+        self, user_login: str, user_query_id: int, ds_name: str, data_type: str
+    ) -> None:
+        """
+        Initializes a pending job.
+
+        Args:
+            user_login (str): The login of the user who started the job.
+            user_query_id (int): The id of the dataset to refresh.
+            ds_name (str): The name of the dataset.
+            data_type (str): The data type of the dataset, one of REFRESHABLE_DATA_TYPES.
+        """
+        self.id = uuid.uuid4().hex
+        self.user_login = user_login
+        self.user_query_id = user_query_id
+        self.ds_name = ds_name
+        self.data_type = data_type
+        self.status = "pending"
+        self.logins: List[str] = []
+        self.next_login = 0
+        # The walk of the current login: its mark, the cursor of the next page and the newest time seen so far
+        self.walk: Optional[Dict[str, Any]] = None
+        self.processed = 0
+        self.saved = 0
+        self.inserted = 0
+        self.updated = 0
+        self.invalid: List[str] = []
+        self.failed: Dict[str, str] = {}
+        self.marks: Dict[str, str] = {}
+        self.rows: List[Dict[str, Any]] = []
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        if data_type in NODE_DATA_TYPES:
+            self.model = NODE_DATA_TYPES[data_type][1]
+        else:
+            self.model = Repository if data_type == "Repositories" else Commit
+        self.login_column, self.key_columns, self.mark_column = ROW_KEYS.get(
+            self.model, NODE_ROW_KEYS
+        )
+        self.start_time: Optional[str] = None
+        self.end_time: Optional[str] = None
+        self.repository_type: Optional[str] = None
+
+    def params(self) -> Dict[str, Any]:
+        return {
+            "user_query_id": self.user_query_id,
+            "ds_name": self.ds_name,
+            "data_type": self.data_type,
+        }
+
+    @classmethod
+    def from_params(
+        cls, job_id: str, user_login: str, params: Dict[str, Any]
+    ) -> "DatasetRefreshJob":
+        job = cls(user_login, **params)
+        job.id = job_id
+        return job
+
+    def checkpoint(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "logins": list(self.logins),
+                "next_login": self.next_login,
+                "walk": dict(self.walk) if self.walk else None,
+                "processed": self.processed,
+                "saved": self.saved,
+                "inserted": self.inserted,
+                "updated": self.updated,
+                "invalid": list(self.invalid),
+                "failed": dict(self.failed),
+                "marks": dict(self.marks),
+            }
+
+    def restore(self, checkpoint: Dict[str, Any]) -> None:
+        self.logins = checkpoint["logins"]
+        self.next_login = checkpoint["next_login"]
+        self.walk = checkpoint["walk"]
+        self.processed = checkpoint["processed"]
+        self.saved = checkpoint["saved"]
+        self.inserted = checkpoint["inserted"]
+        self.updated = checkpoint["updated"]
+        self.invalid = checkpoint["invalid"]
+        self.failed = checkpoint["failed"]
+        self.marks = checkpoint["marks"]
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has stopped."""
+        return self.status in ("completed", "failed", "cancelled")
+
+    def cancel(self) -> None:
+        """Asks the worker to stop after the page it is processing."""
+        self._request_cancel()
+
+    def progress(self) -> Dict[str, Any]:
+        """
+        Returns the progress of the job.
+
+        Returns:
+            Dict[str, Any]: The job's status, counts of processed, invalid and failed logins, the number of inserted
+            and updated rows, the high-water mark reached for every processed login, and the time a parked job is
+            resumed at.
+        """
+        with self._lock:
+            return {
+                "id": self.id,
+                "status": self.status,
+                "ds_name": self.ds_name,
+                "data_type": self.data_type,
+                "total": len(self.logins),
+                "processed": self.processed,
+                "saved": self.saved,
+                "inserted": self.inserted,
+                "updated": self.updated,
+                "invalid": list(self.invalid),
+                "failed": dict(self.failed),
+                "marks": dict(self.marks),
+                "user_query_id": self.user_query_id,
+                "resume_at": self.resume_at.isoformat() if self.resume_at else None,
+                "error": self.error,
+                "created_at": self.created_at.isoformat(),
+                "finished_at": (
+                    self.finished_at.isoformat() if self.finished_at else None
+                ),
+            }
+
+    def rows_from(self, offset: int) -> List[Dict[str, Any]]:
+        """
+        Returns the rows fetched after the given offset, whether they were inserted, updated or already up to date.
+
+        Args:
+            offset (int): The number of rows the caller has already received.
+
+        Returns:
+            List[Dict[str, Any]]: The new rows.
+        """
+        with self._lock:
+            return self.rows[offset:]
+
+    def run(self, app: Flask, protocol: str, host: str, tokens: List[str]) -> None:
+        """
+        Runs the job inside an application context, from its checkpoint until it stops or parks.
+
+        Args:
+            app (Flask): The application whose database the dataset is stored in.
+            protocol (str): The protocol of the GitHub server.
+            host (str): The host of the GitHub API.
+            tokens (List[str]): The token pool the requests are spread over.
+        """
+        with app.app_context():
+            self.status = "running"
+            try:
+                user_query = db.session.get(UserQuery, self.user_query_id)
+                if user_query.start_time:
+                    self.start_time = user_query.start_time.strftime(TIME_FORMAT)
+                if user_query.end_time:
+                    self.end_time = user_query.end_time.strftime(TIME_FORMAT)
+                if self.data_type == "Repositories":
+                    repository_type = (
+                        db.session.query(Repository.repository_type)
+                        .filter(Repository.user_query_id == self.user_query_id)
+                        .limit(1)
+                        .scalar()
+                    )
+                    self.repository_type = dict(REPOSITORY_CATEGORIES).get(repository_type)
+                marks = DatasetRefreshMark.get_marks(self.user_query_id)
+                if not self.logins:
+                    logins = self._dataset_logins(marks)
+                    with self._lock:
+                        self.logins = logins
+                # What a token can see depends on its owner, so only public repositories are read with the pool
+                owner_client = get_async_github_client(
+                    protocol=protocol, host=host, token=tokens[0], max_wait=PARK_AFTER_SECONDS
+                )
+                pool_client = get_async_github_client(
+                    protocol=protocol,
+                    host=host,
+                    token=tokens[0],
+                    tokens=tokens,
+                    max_wait=PARK_AFTER_SECONDS,
+                )
+                for index in range(self.next_login, len(self.logins)):
+                    if self._cancelled.is_set():
+                        self.status = "cancelled"
+                        break
+                    login = self.logins[index]
+                    self._refresh_login(
+                        owner_client, pool_client, login, marks.get(login.lower()), protocol, host, tokens
+                    )
+                    if self._cancelled.is_set() and self.walk is not None:
+                        # The walk of the login was left after a page
+                        self.status = "cancelled"
+                        break
+                    self.next_login = index + 1
+                    self.save_checkpoint()
+                else:
+                    self.status = "completed"
+            except JobParked as e:
+                db.session.rollback()
+                self._park(e)
+            except Exception as e:  # pylint: disable=broad-except
+                logging.exception("Dataset refresh job %s failed", self.id)
+                db.session.rollback()
+                self.error = str(e)
+                self.status = "failed"
+            finally:
+                if self.status != "parked":
+                    self.finished_at = datetime.utcnow()
+                self.save_checkpoint()
+                db.session.remove()
+
+    def _dataset_logins(self, marks: Dict[str, str]) -> List[str]:
+        """
+        Lists the logins of the dataset: the logins of its rows and the logins with a recorded mark.
+
+        Args:
+            marks (Dict[str, str]): The recorded marks keyed by lowercased login.
+
+        Returns:
+            List[str]: The logins, each once.
+        """
+        column = getattr(self.model, self.login_column)
+        logins = {}
+        for (login,) in (
+            db.session.query(column)
+            .filter(self.model.user_query_id == self.user_query_id)
+            .distinct()
+        ):
+            if login and login != "N/A":
+                logins.setdefault(login.lower(), login)
+        for login in marks:
+            logins.setdefault(login, login)
+        return list(logins.values())
+
+    def _initial_mark(self, login: str) -> Optional[str]:
+        """
+        Derives the high-water mark of a login without a recorded one from the newest row of the login, or from the
+        start of the dataset's time range.
+
+        Args:
+            login (str): The GitHub username.
+
+        Returns:
+            Optional[str]: The mark, or None if every item of the login is to be fetched.
+        """
+        newest = (
+            db.session.query(func.max(getattr(self.model, self.mark_column)))
+            .filter(
+                self.model.user_query_id == self.user_query_id,
+                func.lower(getattr(self.model, self.login_column)) == login.lower(),
+            )
+            .scalar()
+        )
+        if newest is not None:
+            return newest.strftime(TIME_FORMAT)
+        return self.start_time
+
+    def _in_range(self, created_at: str) -> bool:
+        """Checks whether an item created at the given time belongs in the dataset's time range."""
+        if self.start_time and created_at < self.start_time:
+            return False
+        return not self.end_time or created_at <= self.end_time
+
+    def _refresh_login(
+        self,
+        owner_client: Any,
+        pool_client: Any,
+        login: str,
+        mark: Optional[str],
+        protocol: str,
+        host: str,
+        tokens: List[str],
+    ) -> None:
+        """
+        Fetches the items of one login ordered at or after its high-water mark, upserts their rows and records the
+        login's new mark. A walk the job was parked or stopped in is continued from its cursor.
+
+        Args:
+            owner_client (AsyncClient): The GraphQL client of the owner's token, see CommitMiningJob.
+            pool_client (AsyncClient): The GraphQL client of the token pool, for the commits of public repositories.
+            login (str): The GitHub username.
+            mark (Optional[str]): The recorded mark of the login.
+            protocol (str): The protocol of the GitHub server.
+            host (str): The host of the GitHub API.
+            tokens (List[str]): The token pool, the owner's token first.
+        """
+        if self.walk is None or self.walk["login"] != login:
+            self.walk = {
+                "login": login,
+                "since": mark or self._initial_mark(login),
+                "cursor": None,
+                "newest": None,
+            }
+        walk = self.walk
+        try:
+            if self.data_type in NODE_DATA_TYPES:
+                found = self._walk_nodes(owner_client, walk)
+            elif self.data_type == "Repositories":
+                found = self._walk_repositories(owner_client, walk)
+            else:
+                found = self._walk_commits(owner_client, pool_client, walk, protocol, host, tokens)
+        except JobParked:
+            raise
+        except QueryFailedException as e:
+            logging.info("Skipping %s: %s", login, e)
+            found = False
+        except Exception as e:  # pylint: disable=broad-except
+            logging.exception("Refreshing %s failed", login)
+            db.session.rollback()
+            with self._lock:
+                self.failed[login] = str(e)
+                self.processed += 1
+            self.walk = None
+            return
+        if self._cancelled.is_set() and walk["cursor"]:
+            return
+        if not found:
+            with self._lock:
+                self.invalid.append(login)
+                self.processed += 1
+            self.walk = None
+            return
+
+        new_mark = max(filter(None, [walk["since"], walk["newest"]]), default=None)
+        if new_mark:
+            DatasetRefreshMark.put(self.user_query_id, login, new_mark)
+        db.session.commit()
+        with self._lock:
+            if new_mark:
+                self.marks[login] = new_mark
+            self.processed += 1
+        self.walk = None
+
+    def _save_page(
+        self,
+        walk: Dict[str, Any],
+        rows: List[Dict[str, Any]],
+        newest: Optional[str],
+        cursor: Optional[str],
+    ) -> None:
+        """
+        Upserts the rows of one page of a walk and saves the walk's progress in the job's checkpoint.
+
+        Args:
+            walk (Dict[str, Any]): The walk of the current login.
+            rows (List[Dict[str, Any]]): The rows of the page.
+            newest (Optional[str]): The newest order time on the page.
+            cursor (Optional[str]): The cursor of the next page, or None if the walk is complete.
+        """
+        inserted, updated = self._upsert(walk["login"], rows)
+        db.session.commit()
+        with self._lock:
+            self.rows.extend(rows)
+            self.saved += len(rows)
+            self.inserted += inserted
+            self.updated += updated
+            walk["newest"] = max(filter(None, [walk["newest"], newest]), default=None)
+            walk["cursor"] = cursor
+        self.save_checkpoint()
+
+    def _walk_nodes(self, client: Any, walk: Dict[str, Any]) -> bool:
+        """
+        Walks a connection of the user newest first down to the high-water mark, saving the rows of the nodes in the
+        dataset's time range page by page.
+
+        Args:
+            client (AsyncClient): The GraphQL client.
+            walk (Dict[str, Any]): The walk of the current login.
+
+        Returns:
+            bool: Whether the user exists.
+        """
+        create_query, _, columns = NODE_DATA_TYPES[self.data_type]
+        query = create_query(walk["login"], fields=list(columns.values()))
+        if walk["cursor"]:
+            query.resume_from(walk["cursor"])
+        while True:
+            raw = asyncio.run(client.execute(query))
+            park_if_rate_limited(raw)
+            nodes, reached = query.nodes_since(raw, walk["since"])
+            more = not reached and query.next_page(raw)
+            self._save_page(
+                walk,
+                [
+                    build_node_row(walk["login"], node, columns)
+                    for node in nodes
+                    if self._in_range(node["createdAt"])
+                ],
+                max((query.order_time(node) for node in nodes), default=None),
+                query.cursor if more else None,
+            )
+            if not more or self._cancelled.is_set():
+                return True
+
+    def _walk_repositories(self, client: Any, walk: Dict[str, Any]) -> bool:
+        """
+        Walks the user's repositories of the dataset's repository type by update time, newest first, down to the
+        high-water mark, saving the rows of the repositories created in the dataset's time range page by page.
+
+        Args:
+            client (AsyncClient): The GraphQL client.
+            walk (Dict[str, Any]): The walk of the current login.
+
+        Returns:
+            bool: Whether the user exists.
+        """
+        if self.repository_type is None:
+            raise RuntimeError("The repository type of the dataset is unknown")
+        is_fork, ownership = REPOSITORY_TYPES[self.repository_type]
+        query = UserRepositories(
+            login=walk["login"],
+            is_fork=is_fork,
+            ownership=ownership,
+            repo_order_field="UPDATED_AT",
+        )
+        since = walk["since"]
+        while True:
+            raw = asyncio.run(
+                client.execute(query, pagination="frontend", end_cursor=walk["cursor"])
+            )
+            park_if_rate_limited(raw)
+            connection = UserRepositories.user_repository_page(raw)
+            if not connection:
+                return False
+            nodes = []
+            reached = False
+            for node in connection.get("nodes") or []:
+                if since and node["updatedAt"] < since:
+                    reached = True
+                    break
+                nodes.append(node)
+            page_info = connection.get("pageInfo") or {}
+            more = not reached and bool(page_info.get("hasNextPage"))
+            self._save_page(
+                walk,
+                [
+                    build_repository_row(walk["login"], node)
+                    for node in nodes
+                    if self._in_range(node["createdAt"])
+                ],
+                max((node["updatedAt"] for node in nodes), default=None),
+                page_info.get("endCursor") if more else None,
+            )
+            if not more or self._cancelled.is_set():
+                return True
+
+    def _walk_commits(
+        self,
+        owner_client: Any,
+        pool_client: Any,
+        walk: Dict[str, Any],
+        protocol: str,
+        host: str,
+        tokens: List[str],
+    ) -> bool:
+        """
+        Mines the commits of the user committed at or after the high-water mark and saves their rows. The newest
+        authored date is not recorded if a repository failed, so its commits are mined again by the next refresh.
+
+        Args:
+            owner_client (AsyncClient): The GraphQL client of the owner's token.
+            pool_client (AsyncClient): The GraphQL client of the token pool.
+            walk (Dict[str, Any]): The walk of the current login.
+            protocol (str): The protocol of the GitHub server.
+            host (str): The host of the GitHub API.
+            tokens (List[str]): The token pool, the owner's token first.
+
+        Returns:
+            bool: Whether the user exists.
+        """
+        login = walk["login"]
+        miner = _CommitRefresh(self, login, walk["since"])
+        miner._process_login(  # pylint: disable=protected-access
+            owner_client, pool_client, login, protocol, host, tokens
+        )
+        if miner.invalid:
+            return False
+        rows = miner.rows_from(0)
+        newest = None
+        if miner.failed:
+            with self._lock:
+                self.failed.update(miner.failed)
+        else:
+            newest = max(
+                (row["Authored Date"] for row in rows if row["Authored Date"] != "N/A"),
+                default=None,
+            )
+        self._save_page(walk, rows, newest, None)
+        return True
+
+    def _create(self, row: Dict[str, Any]) -> db.Model:
+        """Builds the model instance of a row, as /db/save-data does."""
+        if self.model is Repository:
+            return Repository.create_from_row(row, self.repository_type_name, self.user_query_id)
+        return self.model.create_from_row(row, self.user_query_id)
+
+    @property
+    def repository_type_name(self) -> Optional[str]:
+        """The name of the dataset's repository type, e.g. "Owned Original Repo"."""
+        names = {letter: name for name, letter in REPOSITORY_CATEGORIES}
+        return names.get(self.repository_type)
+
+    def _upsert(self, login: str, rows: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        Inserts the rows that are not in the dataset yet and updates the rows that are, matched on the key columns of
+        the model, and rebuilds the language rows of the inserted and changed commits and repositories. The
+        placeholder row of a login without items is removed once the login has items.
+
+        Args:
+            login (str): The GitHub username.
+            rows (List[Dict[str, Any]]): The rows of the fetched items.
+
+        Returns:
+            Tuple[int, int]: The numbers of inserted and updated rows.
+        """
+        if not rows:
+            return 0, 0
+        model = self.model
+        entries = [self._create(row) for row in rows]
+
+        def key(entry):
+            return tuple(
+                value.lower() if column == self.login_column and value else value
+                for column, value in ((c, getattr(entry, c)) for c in self.key_columns)
+            )
+
+        query = model.query.filter(model.user_query_id == self.user_query_id)
+        for column in self.key_columns:
+            query = query.filter(
+                getattr(model, column).in_({getattr(entry, column) for entry in entries})
+            )
+        existing = {key(entry): entry for entry in query}
+        columns = [
+            column.name
+            for column in model.__table__.columns
+            if column.name not in ("id", "user_query_id", *self.key_columns)
+        ]
+
+        inserted = updated = 0
+        touched = []
+        for entry in entries:
+            current = existing.get(key(entry))
+            if current is None:
+                db.session.add(entry)
+                existing[key(entry)] = entry
+                touched.append(entry)
+                inserted += 1
+                continue
+            changed = False
+            for column in columns:
+                if getattr(current, column) != getattr(entry, column):
+                    setattr(current, column, getattr(entry, column))
+                    changed = True
+            if changed:
+                touched.append(current)
+            updated += changed
+        if model in LANGUAGE_TABLES and touched:
+            db.session.flush()
+            sync_languages(model, {entry.id for entry in touched})
+
+        if inserted:
+            placeholder = (
+                model.repo_name == "N/A" if model is Commit else model.created_at.is_(None)
+            )
+            model.query.filter(
+                model.user_query_id == self.user_query_id,
+                func.lower(getattr(model, self.login_column)) == login.lower(),
+                placeholder,
+            ).delete(synchronize_session=False)
+        return inserted, updated
+
+
+def start_dataset_refresh_job(
+    app: Flask, user: User, user_query: UserQuery
+) -> DatasetRefreshJob:
+    """
+    Queues a refresh job for a saved dataset; a job worker runs it.
+
+    Args:
+        app (Flask): The application whose database the dataset is stored in.
+        user (User): The user who owns the dataset; the job uses the user's token pool.
+        user_query (UserQuery): The dataset to refresh. Its data type must be one of REFRESHABLE_DATA_TYPES.
+
+    Returns:
+        DatasetRefreshJob: The queued job.
+    """
+    job = DatasetRefreshJob(
+        user.github_login, user_query.id, user_query.ds_name, user_query.data_type
+    )
+    return enqueue_job(app, job)
+
+
+def get_dataset_refresh_job(job_id: str, user_login: str) -> Optional[DatasetRefreshJob]:
+    """
+    Looks up a job started by the given user that is live in this process.
+
+    Args:
+        job_id (str): The id of the job.
+        user_login (str): The login of the user asking for the job.
+
+    Returns:
+        Optional[DatasetRefreshJob]: The job, or None if it is not live here or belongs to another user.
+    """
+    return get_live_job(job_id, user_login, DatasetRefreshJob)
@@ -6,14 +6,17 @@ user login information, profile statistics, contributions, repositories, comment
 and more.
 
 Functions:
-    get_github_client(token: str, protocol: str = "https", host: str = "api.github.com") -> Client:
+    get_github_client(token: str, protocol: str = "https", host: str = "api.github.com", tokens: Optional[List[str]] = None, max_wait: Optional[float] = DEFAULT_MAX_WAIT) -> Client:
+    get_async_github_client(token: str, protocol: str = "https", host: str = "api.github.com", tokens: Optional[List[str]] = None, max_wait: Optional[float] = DEFAULT_MAX_WAIT) -> AsyncClient:
     get_rate_limit(protocol: str, host: str, token: str) -> dict:
     get_current_user_login(protocol: str, host: str, token: str) -> dict:
     get_specific_user_login(login: str, protocol: str, host: str, token: str) -> dict:
     get_user_profile_stats(login: str, protocol: str, host: str, token: str) -> dict:
-    get_user_contributions_collection(login: str, protocol: str, host: str, token: str, start: str = None, end: str = None) -> dict:
+    get_user_contributions_collection(login: str, protocol: str, host: str, token: str, start: str = None, end: str = None, cache: Any = None) -> dict:
+    get_users_profile_stats(logins: List[str], protocol: str, host: str, token: str, batch_size: int = BATCH_SIZE, tokens: Optional[List[str]] = None, max_wait: Optional[float] = DEFAULT_MAX_WAIT) -> dict:
+    get_users_contributions_collection(logins: List[str], protocol: str, host: str, token: str, start: str = None, end: str = None, batch_size: int = BATCH_SIZE, tokens: Optional[List[str]] = None, max_wait: Optional[float] = DEFAULT_MAX_WAIT) -> dict:
     get_user_contribution_years(login: str, protocol: str, host: str, token: str) -> dict:
-    get_user_contribution_calendar(login: str, protocol: str, host: str, token: str, start: str = None, end: str = None) -> dict:
+    get_user_contribution_calendar(login: str, protocol: str, host: str, token: str, start: str = None, end: str = None, cache: Any = None) -> dict:
     get_user_repositories_page(login: str, protocol: str, host: str, token: str, repo_t: str, end_cursor: Optional[str] = None) -> dict:
     get_user_commit_comments_page(login: str, protocol: str, host: str, token: str, end_cursor: Optional[str] = None) -> dict:
     get_user_gist_comments_page(login: str, protocol: str, host: str, token: str, end_cursor: Optional[str] = None) -> dict:
@@ -26,16 +29,25 @@ Functions:
     get_repository_branches_page(owner: str, repo_name: str, protocol: str, host: str, token: str, end_cursor: Optional[str] = None) -> dict:
     get_repository_default_branch(owner: str, repo_name: str, protocol: str, host: str, token: str) -> dict:
     get_repository_contributors_page(owner: str, repo_name: str, protocol: str, host: str, token: str, end_cursor: Optional[str] = None) -> dict:
+    get_repository_contributors(owner: str, repo_name: str, protocol: str, host: str, token: str, checkpoint: Any = None) -> dict:
     get_repository_branch_commits_page(owner: str, repo_name: str, branch_name: str, use_default: bool, protocol: str, host: str, token: str, end_cursor: Optional[str] = None) -> Dict[str, Any]:
     get_user_repository_names_page(login: str, protocol: str, host: str, token: str, end_cursor: Optional[str] = None) -> dict:
     get_repository_contributor_contributions_page(owner: str, repo_name: str, branch_name: str, id: str, protocol: str, host: str, token: str, end_cursor: Optional[str] = None) -> dict:
+    stream_user_nodes(kind: str, login: str, protocol: str, host: str, token: str) -> Generator[Dict[str, Any], None, None]:
+    stream_repository_branch_commits(owner: str, repo_name: str, branch_name: str, use_default: bool, protocol: str, host: str, token: str) -> Generator[Dict[str, Any], None, None]:
+    count_in_window(client: AsyncClient, query: CreatedAtWindow, start: str, end: str) -> Dict[str, Any]:
+    count_user_nodes_in_window(kind: str, login: str, start: str, end: str, protocol: str, host: str, token: str) -> Dict[str, Any]:
 """
 
-from datetime import datetime
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
 
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Generator, Optional, List, Tuple
 from collections import Counter
-from app.services.github_query.utils.helper import add_by_days
+from functools import partial
+from requests.exceptions import RequestException
+from app.services.github_query.queries.query import BatchQuery, PaginatedQuery
 from app.services.github_query.queries import (
     RateLimit,
     UserLoginViewer,
@@ -58,22 +70,165 @@ from app.services.github_query.queries import (
     RepositoryDefaultBranch,
     RepositoryContributorContributions,
     UserRepositoryNames,
+    CreatedAtWindow,
 )
 from .github_query.graphql_client import (
     PersonalAccessTokenAuthenticator,
+    TokenPoolAuthenticator,
     QueryFailedException,
     Client,
+    AsyncClient,
+    PUBLIC_SCOPE,
 )
+from .github_query.graphql_client.authentication import Authenticator
+from .github_query.graphql_client.scheduler import DEFAULT_MAX_WAIT
+
+QUERY_CONCURRENCY = 4
+BATCH_SIZE = 25
+
+# Repository types A-D as (isFork, ownerAffiliations)
+REPOSITORY_TYPES = {
+    "A": (False, "[OWNER]"),
+    "B": (True, "[OWNER]"),
+    "C": (False, "[COLLABORATOR]"),
+    "D": (True, "[COLLABORATOR]"),
+}
+
+
+def _user_repositories(repo_t: str, login: str) -> UserRepositories:
+    """
+    Builds the repositories query of one repository type.
+
+    Args:
+        repo_t (str): Repository type (A, B, C, D).
+        login (str): GitHub username.
+
+    Returns:
+        UserRepositories: The query.
+    """
+    is_fork, ownership = REPOSITORY_TYPES[repo_t]
+    return UserRepositories(login=login, is_fork=is_fork, ownership=ownership)
+
+
+# Per-login lists that can be streamed, as (query factory, connection extractor)
+USER_NODE_STREAMS = {
+    "user-commit-comments": (
+        UserCommitComments,
+        UserCommitComments.user_commit_comments,
+    ),
+    "user-gist-comments": (UserGistComments, UserGistComments.user_gist_comments),
+    "user-issue-comments": (
+        UserIssueComments,
+        UserIssueComments.user_issue_comments,
+    ),
+    "user-repository-discussion-comments": (
+        UserRepositoryDiscussionComments,
+        UserRepositoryDiscussionComments.user_repository_discussion_comments,
+    ),
+    "user-gists": (UserGists, UserGists.user_gists),
+    "user-issues": (UserIssues, UserIssues.user_issues),
+    "user-pull-requests": (UserPullRequests, UserPullRequests.user_pull_requests),
+    "user-repository-discussions": (
+        UserRepositoryDiscussions,
+        UserRepositoryDiscussions.user_repository_discussions,
+    ),
+    "user-repositories-a": (
+        partial(_user_repositories, "A"),
+        UserRepositories.user_repository_page,
+    ),
+    "user-repositories-b": (
+        partial(_user_repositories, "B"),
+        UserRepositories.user_repository_page,
+    ),
+    "user-repositories-c": (
+        partial(_user_repositories, "C"),
+        UserRepositories.user_repository_page,
+    ),
+    "user-repositories-d": (
+        partial(_user_repositories, "D"),
+        UserRepositories.user_repository_page,
+    ),
+}
+
+# Per-login lists that can be counted in a time window, newest first
+COUNTABLE_KINDS = {
+    "user-commit-comments": UserCommitComments.count_query,
+    "user-gist-comments": UserGistComments.count_query,
+    "user-issue-comments": UserIssueComments.count_query,
+    "user-repository-discussion-comments": UserRepositoryDiscussionComments.count_query,
+    "user-gists": UserGists.count_query,
+    "user-issues": UserIssues.count_query,
+    "user-pull-requests": UserPullRequests.count_query,
+    "user-repository-discussions": UserRepositoryDiscussions.count_query,
+}
+
+
+def _get_authenticator(
+    token: str, host: str, tokens: Optional[List[str]] = None
+) -> Authenticator:
+    """
+    Builds the authenticator for a single token, or for a token pool when several tokens are given.
+
+    Args:
+        token (str): The OAuth access token.
+        host (str): GitHub API host (e.g., api.github.com).
+        tokens (Optional[List[str]]): Additional tokens to spread the requests over.
+
+    Returns:
+        Authenticator: The authenticator.
+    """
+    if tokens:
+        return TokenPoolAuthenticator([token, *tokens], host=host)
+    return PersonalAccessTokenAuthenticator(token=token)
+
+
+# The visibility scopes of the viewers of tokens, keyed by the digest of the token
+_viewer_scopes: Dict[str, str] = {}
+
+
+def _visibility_scope(client: Client, token: str, host: str) -> Optional[str]:
+    """
+    Returns the visibility scope of the viewer a token belongs to, which keys the cached results that depend on what
+    the viewer can see. The scope identifies the viewer's account on the host rather than the token, so cached results
+    survive a rotated token. The viewer is looked up once per token.
+
+    Args:
+        client (Client): The client of the token.
+        token (str): The OAuth access token.
+        host (str): GitHub API host (e.g., api.github.com).
+
+    Returns:
+        Optional[str]: The scope, or None if the viewer could not be looked up, in which case nothing is cached.
+    """
+    key = _get_authenticator(token, host).visibility_scope()
+    scope = _viewer_scopes.get(key)
+    if scope is None:
+        try:
+            response = client.execute(query=UserLoginViewer.identity())
+        except QueryFailedException:
+            return None
+        if "no_limit" in response:
+            return None
+        viewer_id = response["viewer"]["id"]
+        scope = hashlib.sha256(f"{host}/{viewer_id}".encode()).hexdigest()
+        _viewer_scopes[key] = scope
+    return scope
 
 
 def get_github_client(
-    token: str, protocol: str = "https", host: str = "api.github.com"
+    token: str,
+    protocol: str = "https",
+    host: str = "api.github.com",
+    tokens: Optional[List[str]] = None,
+    max_wait: Optional[float] = DEFAULT_MAX_WAIT,
 ) -> Client:
     """
     Initializes and returns a GitHub GraphQL client.
 
     Args:
         token (str): The OAuth access token.
+        tokens (Optional[List[str]]): Additional tokens; each request then uses the one with the most remaining budget.
+        max_wait (Optional[float]): Longest wait for rate-limit budget before the rate-limit response is returned.
 
     Returns:
         Client: An initialized GitHub GraphQL client.
@@ -82,7 +237,35 @@ def get_github_client(
         protocol=protocol,
         host=host,
         is_enterprise=False,
-        authenticator=PersonalAccessTokenAuthenticator(token=token),
+        authenticator=_get_authenticator(token, host, tokens),
+        max_wait=max_wait,
+    )
+
+
+def get_async_github_client(
+    token: str,
+    protocol: str = "https",
+    host: str = "api.github.com",
+    tokens: Optional[List[str]] = None,
+    max_wait: Optional[float] = DEFAULT_MAX_WAIT,
+) -> AsyncClient:
+    """
+    Initializes and returns an asyncio GitHub GraphQL client for running independent queries concurrently.
+
+    Args:
+        token (str): The OAuth access token.
+        tokens (Optional[List[str]]): Additional tokens; each request then uses the one with the most remaining budget.
+        max_wait (Optional[float]): Longest wait for rate-limit budget before the rate-limit response is returned.
+
+    Returns:
+        AsyncClient: An initialized asyncio GitHub GraphQL client.
+    """
+    return AsyncClient(
+        protocol=protocol,
+        host=host,
+        is_enterprise=False,
+        authenticator=_get_authenticator(token, host, tokens),
+        max_wait=max_wait,
     )
 
 
@@ -190,11 +373,123 @@ def get_user_profile_stats(login: str, protocol: str, host: str, token: str):
         return {"error": str(e)}
 
 
+def _contribution_windows(
+    created_at: str, start: str = None, end: str = None
+) -> List[Tuple[str, str]]:
+    """
+    Splits a time range into the windows accepted by contributionsCollection, which spans at most one year. Windows
+    follow calendar years so that the windows of elapsed years are the same for every range that covers them and
+    their results can be cached.
+
+    Args:
+        created_at (str): Account creation time, used when start is not given.
+        start (str, optional): Start date (YYYY-MM-DD).
+        end (str, optional): End date (YYYY-MM-DD). Defaults to the current date.
+
+    Returns:
+        List[Tuple[str, str]]: The (from, to) pairs of the windows formatted as "%Y-%m-%dT%H:%M:%SZ".
+    """
+    gh_start = (
+        datetime.strptime(start, "%Y-%m-%d")
+        if start
+        else datetime.strptime(created_at, "%Y-%m-%dT%H:%M:%SZ")
+    )
+    gh_end = datetime.strptime(end, "%Y-%m-%d") if end else datetime.now()
+    end = gh_end.strftime("%Y-%m-%dT%H:%M:%SZ")
+    start = gh_start.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    windows = []
+    while start < end:
+        year = int(start[:4])
+        windows.append((start, min(f"{year}-12-31T23:59:59Z", end)))
+        start = f"{year + 1}-01-01T00:00:00Z"
+    return windows
+
+
+def _is_elapsed(window_end: str) -> bool:
+    """
+    Checks whether a window ended before the current year began. The contributions of such a window no longer
+    change, so its results can be cached permanently.
+
+    Args:
+        window_end (str): The end of the window formatted as "%Y-%m-%dT%H:%M:%SZ".
+
+    Returns:
+        bool: True if the window lies in an elapsed year.
+    """
+    return window_end < f"{datetime.utcnow().year}-01-01T00:00:00Z"
+
+
+def _chunks(items: List[Any], size: int) -> List[List[Any]]:
+    """
+    Splits a list into consecutive chunks of at most the given size.
+
+    Args:
+        items (List[Any]): The list to split.
+        size (int): The maximum chunk size.
+
+    Returns:
+        List[List[Any]]: The chunks.
+    """
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _account_created_at(client: Client, login: str, host: str, cache: Any = None) -> Any:
+    """
+    Returns the creation time of an account, which bounds the contribution windows of a range without a start date.
+    The creation time never changes and is the same for every viewer, so with a cache it is fetched once per login.
+
+    Args:
+        client (Client): The client executing the query.
+        login (str): GitHub username.
+        host (str): GitHub API host (e.g., api.github.com).
+        cache (ContributionWindowCache, optional): The cache of elapsed windows.
+
+    Returns:
+        Any: The creation time formatted as "%Y-%m-%dT%H:%M:%SZ", or the rate-limit or error response.
+    """
+    created_at = _cached_created_at(login, host, cache)
+    if created_at is not None:
+        return created_at
+    try:
+        response = client.execute(query=UserLogin(login=login))
+    except QueryFailedException as e:
+        return {"error": str(e)}
+    if "no_limit" in response:
+        return response
+    created_at = response["user"]["createdAt"]
+    _cache_created_at(login, host, created_at, cache)
+    return created_at
+
+
+def _cached_created_at(login: str, host: str, cache: Any = None) -> Optional[str]:
+    """Returns the cached creation time of an account, or None if it is not cached."""
+    if not cache:
+        return None
+    return cache.get(host, login, "created_at", "", "", PUBLIC_SCOPE)
+
+
+def _cache_created_at(login: str, host: str, created_at: Optional[str], cache: Any = None) -> None:
+    """Stores the creation time of an account that came along with another query, so it is not fetched again."""
+    if cache and created_at:
+        cache.put(host, login, "created_at", "", "", created_at, PUBLIC_SCOPE)
+
+
 def get_user_contributions_collection(
-    login: str, protocol: str, host: str, token: str, start: str = None, end: str = None
+    login: str,
+    protocol: str,
+    host: str,
+    token: str,
+    start: str = None,
+    end: str = None,
+    cache: Any = None,
 ):
     """
-    Retrieves a user's GitHub contributions over a specific time range.
+    Retrieves a user's GitHub contributions over a specific time range. Every one-year window is fetched in a single
+    request. Without a start date the windows start at the account's creation, which is looked up first, see
+    _account_created_at. The windows request only asks for the creation time when it is not cached, and caches it, so
+    a later request without a start date skips the lookup. With a cache, the windows of elapsed years are read from
+    and stored in it under the viewer's visibility scope, so only the windows of the current year go to GitHub.
 
     Args:
         login (str): GitHub username.
@@ -203,6 +498,7 @@ def get_user_contributions_collection(
         token (str): GitHub personal access token (PAT) for authentication.
         start (str, optional): Start date (YYYY-MM-DD). Defaults to account creation date.
         end (str, optional): End date (YYYY-MM-DD). Defaults to the current date.
+        cache (ContributionWindowCache, optional): The cache of elapsed windows.
 
     Returns:
         dict: Contribution statistics as a dictionary with counts for commits, PRs, issues, etc.
@@ -210,48 +506,198 @@ def get_user_contributions_collection(
     Raises:
         QueryFailedException: If the GraphQL query execution fails.
     """
-
-    # Fetch user details to determine the account creation date
-    response = get_specific_user_login(login, protocol, host, token)
-    if "no_limit" in response:
-        return response  # Rate limit reached, return rate-limit response
-
-    created_at = response["user"]["createdAt"]
     client = get_github_client(protocol=protocol, host=host, token=token)
+    if start:
+        created_at = _cached_created_at(login, host, cache)
+    else:
+        created_at = _account_created_at(client, login, host, cache)
+        if isinstance(created_at, dict):
+            return created_at
+    windows = _contribution_windows(created_at, start, end)
+    # Totals include the private contributions the viewer can see, so they are cached per visibility scope
+    scope = _visibility_scope(client, token, host) if cache else None
+    cached = cache.get_many(host, login, "collection", windows, scope) if scope else {}
+    contributions = Counter({"res_con": 0, "commit": 0, "pr_review": 0})
+    for queried_contribution in cached.values():
+        for key in contributions:
+            contributions[key] += queried_contribution[key]
+    windows = [window for window in windows if window not in cached]
+    if not windows:
+        return contributions
 
-    # Convert start and end dates to datetime format
-    gh_start = (
-        datetime.strptime(start, "%Y-%m-%d")
-        if start
-        else datetime.strptime(created_at, "%Y-%m-%dT%H:%M:%SZ")
+    query = UserContributionsCollection.windows(
+        login,
+        [
+            (f'"{window_start}"', f'"{window_end}"')
+            for window_start, window_end in windows
+        ],
+        created_at=created_at is None,
     )
-    gh_end = datetime.strptime(end, "%Y-%m-%d") if end else datetime.now()
-    end = gh_end.strftime("%Y-%m-%dT%H:%M:%SZ")
-    start = gh_start.strftime("%Y-%m-%dT%H:%M:%SZ")
-
-    contributions = Counter({"res_con": 0, "commit": 0, "pr_review": 0})
-    period_end = add_by_days(start, 365)
 
     try:
-        while start < end:
-            if period_end > end:
-                period_end = end
+        response = client.execute(query=query)
+        if "no_limit" in response:
+            return response
+        queried_created_at, queried_contributions = UserContributionsCollection.windows_contributions(
+            response
+        )
+        _cache_created_at(login, host, queried_created_at, cache)
+        elapsed = {}
+        for window, queried_contribution in zip(windows, queried_contributions):
+            for key in contributions:
+                contributions[key] += queried_contribution[key]
+            if _is_elapsed(window[1]):
+                elapsed[window] = queried_contribution
+        if scope:
+            cache.put_many(host, login, "collection", elapsed, scope)
+        return contributions
+    except QueryFailedException as e:
+        return {"error": str(e)}
+
+
+def get_users_profile_stats(
+    logins: List[str],
+    protocol: str,
+    host: str,
+    token: str,
+    batch_size: int = BATCH_SIZE,
+    tokens: Optional[List[str]] = None,
+    max_wait: Optional[float] = DEFAULT_MAX_WAIT,
+):
+    """
+    Fetches the profile statistics of several GitHub users, folding up to batch_size logins into each request.
+
+    Args:
+        logins (List[str]): The GitHub usernames of the users.
+        protocol (str): The protocol (http/https).
+        host (str): GitHub API host (e.g., api.github.com).
+        token (str): GitHub personal access token for authentication.
+        batch_size (int): The number of logins fetched per request.
+        tokens (Optional[List[str]]): A pool of tokens to spread the requests over.
+        max_wait (Optional[float]): The longest a request waits for rate-limit budget. None waits for the reset.
+
+    Returns:
+        dict: The profile statistics keyed by login, with an error entry for logins that do not exist.
 
-            response = client.execute(
-                query=UserContributionsCollection(
-                    login=login, start=f'"{start}"', end=f'"{period_end}"'
+    Raises:
+        QueryFailedException: If the GraphQL query execution fails.
+    """
+    client = get_async_github_client(
+        protocol=protocol, host=host, token=token, tokens=tokens, max_wait=max_wait
+    )
+    chunks = _chunks(list(logins), batch_size)
+    queries = [UserProfileStats.batch(chunk) for chunk in chunks]
+
+    try:
+        responses = asyncio.run(
+            client.execute_many(queries, concurrency=QUERY_CONCURRENCY)
+        )
+        stats = {}
+        for chunk, query, response in zip(chunks, queries, responses):
+            if "no_limit" in response:
+                return response
+            for login, raw_data in zip(chunk, query.split(response)):
+                stats[login] = (
+                    {"error": "Not Found", "message": login}
+                    if raw_data is None
+                    else UserProfileStats.profile_stats(raw_data)
                 )
+        return stats
+    except QueryFailedException as e:
+        return {"error": str(e)}
+
+
+def get_users_contributions_collection(
+    logins: List[str],
+    protocol: str,
+    host: str,
+    token: str,
+    start: str = None,
+    end: str = None,
+    batch_size: int = BATCH_SIZE,
+    tokens: Optional[List[str]] = None,
+    max_wait: Optional[float] = DEFAULT_MAX_WAIT,
+):
+    """
+    Retrieves the GitHub contributions of several users over a specific time range. Account creation dates and
+    yearly windows are fetched with aliased batch queries of up to batch_size users each.
+
+    Args:
+        logins (List[str]): GitHub usernames.
+        protocol (str): HTTP/HTTPS protocol for GitHub API.
+        host (str): GitHub API host (e.g., api.github.com).
+        token (str): GitHub personal access token (PAT) for authentication.
+        start (str, optional): Start date (YYYY-MM-DD). Defaults to each account's creation date.
+        end (str, optional): End date (YYYY-MM-DD). Defaults to the current date.
+        batch_size (int): The number of aliased user nodes per request.
+        tokens (Optional[List[str]]): A pool of tokens to spread the requests over.
+        max_wait (Optional[float]): The longest a request waits for rate-limit budget. None waits for the reset.
+
+    Returns:
+        dict: Contribution statistics keyed by login, with an error entry for logins that do not exist.
+
+    Raises:
+        QueryFailedException: If the GraphQL query execution fails.
+    """
+    client = get_async_github_client(
+        protocol=protocol, host=host, token=token, tokens=tokens, max_wait=max_wait
+    )
+    login_chunks = _chunks(list(logins), batch_size)
+    login_queries = [UserLogin.batch(chunk) for chunk in login_chunks]
+
+    try:
+        responses = asyncio.run(
+            client.execute_many(
+                login_queries, concurrency=QUERY_CONCURRENCY
             )
+        )
+        results = {}
+        jobs = []
+        for chunk, query, response in zip(login_chunks, login_queries, responses):
             if "no_limit" in response:
                 return response
-            queried_contribution = (
-                UserContributionsCollection.user_contributions_collection(response)
+            for login, raw_data in zip(chunk, query.split(response)):
+                if raw_data is None:
+                    results[login] = {"error": "Not Found", "message": login}
+                    continue
+                results[login] = Counter({"res_con": 0, "commit": 0, "pr_review": 0})
+                created_at = raw_data["user"]["createdAt"]
+                for window_start, window_end in _contribution_windows(
+                    created_at, start, end
+                ):
+                    jobs.append((login, window_start, window_end))
+
+        job_chunks = _chunks(jobs, batch_size)
+        window_queries = [
+            BatchQuery(
+                [
+                    UserContributionsCollection(
+                        login=login, start=f'"{window_start}"', end=f'"{window_end}"'
+                    )
+                    for login, window_start, window_end in chunk
+                ]
             )
-            for key in contributions:
-                contributions[key] += queried_contribution[key]
-            start = period_end
-            period_end = add_by_days(start, 365)
-        return contributions
+            for chunk in job_chunks
+        ]
+        responses = asyncio.run(
+            client.execute_many(
+                window_queries, concurrency=QUERY_CONCURRENCY
+            )
+        )
+        for chunk, query, response in zip(job_chunks, window_queries, responses):
+            if "no_limit" in response:
+                return response
+            for (login, _, _), raw_data in zip(chunk, query.split(response)):
+                if raw_data is None:
+                    continue
+                queried_contribution = (
+                    UserContributionsCollection.user_contributions_collection(
+                        raw_data
+                    )
+                )
+                for key in results[login]:
+                    results[login][key] += queried_contribution[key]
+        return results
     except QueryFailedException as e:
         return {"error": str(e)}
 
@@ -283,19 +729,58 @@ def get_user_contribution_years(login: str, protocol: str, host: str, token: str
         return {"error": str(e)}
 
 
+def _merge_calendars(
+    calendars: List[List[Dict[str, Any]]], first_day: str, last_day: str
+) -> List[Dict[str, Any]]:
+    """
+    Joins the weekly calendars of consecutive windows into one, keeping only the days of the requested range. The
+    week a window boundary falls into is split between two windows and is joined back together.
+
+    Args:
+        calendars (List[List[Dict[str, Any]]]): The weeks of each window, in order.
+        first_day (str): The first day of the range (YYYY-MM-DD).
+        last_day (str): The last day of the range (YYYY-MM-DD).
+
+    Returns:
+        List[Dict[str, Any]]: The weeks of the range.
+    """
+    weeks = []
+    for calendar in calendars:
+        for week in calendar:
+            days = [day for day in week["contributionDays"] if first_day <= day["date"] <= last_day]
+            if not days:
+                continue
+            previous = weeks[-1]["contributionDays"] if weeks else None
+            if previous and previous[-1]["weekday"] < days[0]["weekday"]:
+                previous.extend(days)
+            else:
+                weeks.append({"contributionDays": days})
+    return weeks
+
+
 def get_user_contribution_calendar(
-    login: str, protocol: str, host: str, token: str, start: str = None, end: str = None
+    login: str,
+    protocol: str,
+    host: str,
+    token: str,
+    start: str = None,
+    end: str = None,
+    cache: Any = None,
 ):
     """
-    Fetches the contribution calendar of a specific GitHub user.
+    Fetches the contribution calendar of a specific GitHub user. The range is split into calendar years, which are
+    fetched in a single request. Elapsed years are fetched whole, so that with a cache they are read from and stored
+    in it under the viewer's visibility scope for every range that touches them, and only the window of the current
+    year goes to GitHub.
 
     Args:
         login (str): The GitHub username.
         protocol (str): The protocol (http/https).
         host (str): GitHub API host (e.g., api.github.com).
         token (str): GitHub personal access token for authentication.
-        start (str, optional): Start date for filtering contributions.
-        end (str, optional): End date for filtering contributions.
+        start (str, optional): Start date (YYYY-MM-DD). Defaults to one year before the end, as on GitHub.
+        end (str, optional): End date (YYYY-MM-DD). Defaults to the current date.
+        cache (ContributionWindowCache, optional): The cache of elapsed windows.
 
     Returns:
         dict: Contribution calendar containing dates and contribution counts.
@@ -303,22 +788,57 @@ def get_user_contribution_calendar(
     Raises:
         QueryFailedException: If the GraphQL query execution fails.
     """
+    until = datetime.strptime(end, "%Y-%m-%d") if end else datetime.utcnow()
+    start = start or (until - timedelta(days=365)).strftime("%Y-%m-%d")
+    first_day, last_day = start, until.strftime("%Y-%m-%d")
+    # The calendar includes the end date
+    end = (until + timedelta(days=1)).strftime("%Y-%m-%d") if end else None
+    windows = []
+    for window_start, window_end in _contribution_windows(None, start, end):
+        if _is_elapsed(window_end):
+            year = window_start[:4]
+            window_start, window_end = f"{year}-01-01T00:00:00Z", f"{year}-12-31T23:59:59Z"
+        windows.append((window_start, window_end))
+
     client = get_github_client(protocol=protocol, host=host, token=token)
-    query_args = {"login": login}
-    if start:
-        query_args["start"] = f'"{start}"'
-    if end:
-        query_args["end"] = f'"{end}"'
-    try:
-        response = client.execute(query=UserContributionCalendar(**query_args))
+    # Calendars include the private contributions the viewer can see, so they are cached per visibility scope
+    scope = _visibility_scope(client, token, host) if cache else None
+    cached = cache.get_many(host, login, "calendar", windows, scope) if scope else {}
+    results = {window: (data["join_date"], data["calendar"]) for window, data in cached.items()}
+    missing = [window for window in windows if window not in cached]
+    if missing:
+        query = UserContributionCalendar.windows(
+            login,
+            [
+                (f'"{window_start}"', f'"{window_end}"')
+                for window_start, window_end in missing
+            ],
+        )
+        try:
+            response = client.execute(query=query)
+        except QueryFailedException as e:
+            return {"error": str(e)}
         if "no_limit" in response:
             return response
-        join_date, calendar, _ = UserContributionCalendar.user_contribution_calendar(
-            response
-        )
-        return join_date, calendar
-    except QueryFailedException as e:
-        return {"error": str(e)}
+        results.update(zip(missing, UserContributionCalendar.windows_calendars(response)))
+        if scope:
+            elapsed = {
+                window: {"join_date": results[window][0], "calendar": results[window][1]}
+                for window in missing
+                if _is_elapsed(window[1])
+            }
+            cache.put_many(host, login, "calendar", elapsed, scope)
+
+    join_date = next(
+        (
+            results[window][0]
+            for window in windows
+            if results[window][0] and first_day <= results[window][0]["occurredAt"][:10] <= last_day
+        ),
+        None,
+    )
+    calendar = _merge_calendars([results[window][1] for window in windows], first_day, last_day)
+    return join_date, calendar
 
 
 def get_user_repositories_page(
@@ -347,20 +867,7 @@ def get_user_repositories_page(
         QueryFailedException: If the GraphQL query execution fails.
     """
     client = get_github_client(protocol=protocol, host=host, token=token)
-    is_fork = None
-    ownership = None
-    if repo_t == "A":
-        is_fork = False
-        ownership = "[OWNER]"
-    elif repo_t == "B":
-        is_fork = True
-        ownership = "[OWNER]"
-    elif repo_t == "C":
-        is_fork = False
-        ownership = "[COLLABORATOR]"
-    else:
-        is_fork = True
-        ownership = "[COLLABORATOR]"
+    is_fork, ownership = REPOSITORY_TYPES.get(repo_t, REPOSITORY_TYPES["D"])
     try:
         response = client.execute(
             query=UserRepositories(login=login, is_fork=is_fork, ownership=ownership),
@@ -762,6 +1269,122 @@ def get_repository_contributors_page(
         return {"error": str(e)}
 
 
+def _walk_contributors(
+    client: Client,
+    owner: str,
+    repo_name: str,
+    stop_oid: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Walks the default-branch history of a repository from its head and collects the authors of its commits. With a
+    stop commit, only the commits that are not ancestors of it are collected: the walk follows the parents of the
+    commits it collects and ends once every parent still to be visited is an ancestor of the stop commit. Commit dates
+    are not relied on, so commits merged in with older dates than the stop commit are collected too. If the stop
+    commit is not in the history (e.g. after a force push), the whole history is walked.
+
+    Args:
+        client (Client): The GitHub GraphQL client.
+        owner (str): The GitHub username or organization name.
+        repo_name (str): The name of the repository.
+        stop_oid (str, optional): The OID of a commit whose ancestors have already been collected.
+
+    Returns:
+        Dict[str, Any]: The head (OID and commit date, None for an empty repository), the sets of author names and
+        logins of the collected commits, the OIDs of the walked commits and whether the stop commit was reached; or
+        the rate-limit response.
+    """
+    query = RepositoryContributors(owner=owner, repo_name=repo_name, pg_size=100)
+    authors = {"name": set(), "login": set()}
+    head, oids = None, set()
+    # Ancestors of the stop commit seen so far, and parents of collected commits that are still to be visited
+    known, pending = {stop_oid}, set()
+    for response in client.execute(query=query):
+        if "no_limit" in response:
+            return response
+        if head is None:
+            head = RepositoryContributors.head(response)
+            if head is None or head[0] == stop_oid:
+                break
+            pending.add(head[0])
+        collected = set()
+        for oid, parents in RepositoryContributors.history_commits(response):
+            oids.add(oid)
+            pending.discard(oid)
+            if oid in known:
+                known.update(parents)
+                pending.difference_update(parents)
+            else:
+                collected.add(oid)
+                pending.update(parent for parent in parents if parent not in known and parent not in oids)
+            if stop_oid in oids and not pending:
+                break
+        RepositoryContributors.extract_unique_author(response, authors, oids=collected)
+        if stop_oid in oids and not pending:
+            break
+    reached = head is not None and (head[0] == stop_oid or stop_oid in oids)
+    return {"head": head, "authors": authors, "oids": oids, "reached": reached}
+
+
+def get_repository_contributors(
+    owner: str,
+    repo_name: str,
+    protocol: str,
+    host: str,
+    token: str,
+    checkpoint: Any = None,
+) -> Dict[str, Any]:
+    """
+    Fetches the unique authors of the default-branch history of a GitHub repository. With a checkpoint store, the
+    authors are stored along with the head they were collected up to, and later calls only walk the commits that are
+    not ancestors of that head, including commits merged in since with older dates, and merge their authors in. If the
+    stored head is no longer in the history (e.g. after a force push), the authors are collected from the whole
+    history again.
+
+    Args:
+        owner (str): The GitHub username or organization name.
+        repo_name (str): The name of the repository.
+        protocol (str): The protocol (http/https).
+        host (str): GitHub API host (e.g., api.github.com).
+        token (str): GitHub personal access token for authentication.
+        checkpoint (RepositoryContributorsCheckpoint, optional): The store of processed heads and their authors.
+
+    Returns:
+        dict: The sorted author names and logins, the head they were collected up to, the number of commits walked,
+        and whether only the history after the stored head was walked.
+
+    Raises:
+        QueryFailedException: If the GraphQL query execution fails.
+    """
+    stored = checkpoint.get(host, owner, repo_name) if checkpoint is not None else None
+    client = get_github_client(protocol=protocol, host=host, token=token)
+    try:
+        result = _walk_contributors(
+            client, owner, repo_name, stop_oid=stored["head_oid"] if stored else None
+        )
+        if "no_limit" in result:
+            return result
+        # Without the stored head in the history the walk covered the whole history, and the stored authors are stale
+        incremental = result["reached"]
+        head, authors = result["head"], result["authors"]
+        if incremental:
+            authors["name"].update(stored["authors"]["name"])
+            authors["login"].update(stored["authors"]["login"])
+        authors = {key: sorted(values) for key, values in authors.items()}
+        if head is None:
+            return {**authors, "head_oid": None, "head_committed_date": None, "walked_commits": 0, "incremental": False}
+        if checkpoint is not None and not (incremental and head[0] == stored["head_oid"]):
+            checkpoint.put(host, owner, repo_name, head[0], head[1], authors)
+        return {
+            **authors,
+            "head_oid": head[0],
+            "head_committed_date": head[1],
+            "walked_commits": len(result["oids"]),
+            "incremental": incremental,
+        }
+    except QueryFailedException as e:
+        return {"error": str(e)}
+
+
 def get_repository_branch_commits_page(
     owner: str,
     repo_name: str,
@@ -904,3 +1527,154 @@ def get_repository_contributor_contributions_page(
         return {"pageInfo": page_info, "commits": commits}
     except QueryFailedException as e:
         return {"error": str(e)}
+
+
+def _stream_nodes(
+    client: Client, query: PaginatedQuery, extract: Callable[[Dict], Dict]
+) -> Generator[Dict[str, Any], None, None]:
+    """
+    Iterates over every page of a paginated query and yields the nodes of each page as it arrives.
+
+    Args:
+        client (Client): The client executing the query.
+        query (PaginatedQuery): The paginated query.
+        extract (Callable[[Dict], Dict]): Returns the connection (with its nodes) from a raw page.
+
+    Returns:
+        Generator[Dict[str, Any], None, None]: The nodes, followed by a rate-limit or error entry if the iteration
+        stopped early.
+    """
+    try:
+        for page in client.execute(query=query):
+            if "no_limit" in page:
+                yield page
+                return
+            yield from extract(page).get("nodes") or []
+    except QueryFailedException as e:
+        yield {"error": str(e)}
+    except RequestException as e:
+        # A timeout or connection error left after the client's retries; the streamed response has already started
+        yield {"error": f"Request to GitHub failed: {e}"}
+
+
+def stream_user_nodes(
+    kind: str, login: str, protocol: str, host: str, token: str
+) -> Generator[Dict[str, Any], None, None]:
+    """
+    Streams every node of a per-login list (comments, gists, issues, pull requests, discussions or repositories),
+    paginating on the server.
+
+    Args:
+        kind (str): The list to stream, a key of USER_NODE_STREAMS.
+        login (str): GitHub username.
+        protocol (str): API protocol (http/https).
+        host (str): GitHub API host (e.g., api.github.com).
+        token (str): User’s GitHub OAuth token.
+
+    Returns:
+        Generator[Dict[str, Any], None, None]: The nodes of the list.
+
+    Raises:
+        KeyError: If the kind of list is unknown.
+    """
+    create_query, extract = USER_NODE_STREAMS[kind]
+    client = get_github_client(protocol=protocol, host=host, token=token)
+    return _stream_nodes(client, create_query(login), extract)
+
+
+def stream_repository_branch_commits(
+    owner: str,
+    repo_name: str,
+    branch_name: str,
+    use_default: bool,
+    protocol: str,
+    host: str,
+    token: str,
+) -> Generator[Dict[str, Any], None, None]:
+    """
+    Streams the whole commit history of a branch, paginating on the server.
+
+    Args:
+        owner (str): The GitHub username or organization name.
+        repo_name (str): The repository name.
+        branch_name (str): The branch name (ignored if use_default=True).
+        use_default (bool): Whether to fetch from the default branch.
+        protocol (str): The protocol (http/https).
+        host (str): GitHub API host (e.g., api.github.com).
+        token (str): GitHub personal access token.
+
+    Returns:
+        Generator[Dict[str, Any], None, None]: The commits of the branch.
+    """
+    client = get_github_client(protocol=protocol, host=host, token=token)
+    query = RepositoryBranchCommits(
+        owner=owner,
+        repo_name=repo_name,
+        branch_name=branch_name,
+        use_default=use_default,
+    )
+    return _stream_nodes(client, query, query.commits_list)
+
+
+async def count_in_window(
+    client: AsyncClient, query: CreatedAtWindow, start: str, end: str
+) -> Dict[str, Any]:
+    """
+    Counts the nodes of a connection created in a time window. The connection is read newest first and the count
+    stops at the first page that passes the start of the window, so only the pages that overlap the window (and the
+    pages newer than it) are fetched.
+
+    Args:
+        client (AsyncClient): The client executing the query.
+        query (CreatedAtWindow): The counting query, see the count_query methods of the per-login queries.
+        start (str): Start date (YYYY-MM-DD) of the window.
+        end (str): End date (YYYY-MM-DD) of the window.
+
+    Returns:
+        Dict[str, Any]: The number of nodes in the window and the number of pages fetched, or the rate-limit
+        response if the count stopped early.
+
+    Raises:
+        QueryFailedException: If the GraphQL query execution fails.
+    """
+    start, end = f"{start}T00:00:00Z", f"{end}T00:00:00Z"
+    count = pages = 0
+    while True:
+        response = await client.execute(query=query)
+        if "no_limit" in response:
+            return response
+        pages += 1
+        page_count, reached_start = query.count_in_window(response, start, end)
+        count += page_count
+        if reached_start or not query.next_page(response):
+            return {"count": count, "pages": pages}
+
+
+def count_user_nodes_in_window(
+    kind: str, login: str, start: str, end: str, protocol: str, host: str, token: str
+) -> Dict[str, Any]:
+    """
+    Counts the nodes of a per-login list (comments, gists, issues, pull requests or discussions) created in a time
+    window, without paging through the user's whole history.
+
+    Args:
+        kind (str): The list to count, a key of COUNTABLE_KINDS.
+        login (str): GitHub username.
+        start (str): Start date (YYYY-MM-DD) of the window.
+        end (str): End date (YYYY-MM-DD) of the window.
+        protocol (str): API protocol (http/https).
+        host (str): GitHub API host (e.g., api.github.com).
+        token (str): User’s GitHub OAuth token.
+
+    Returns:
+        Dict[str, Any]: The number of nodes in the window and the number of pages fetched.
+
+    Raises:
+        KeyError: If the kind of list is unknown.
+    """
+    query = COUNTABLE_KINDS[kind](login)
+    client = get_async_github_client(protocol=protocol, host=host, token=token)
+    try:
+        return asyncio.run(count_in_window(client, query, start, end))
+    except QueryFailedException as e:
+        return {"error": str(e)}
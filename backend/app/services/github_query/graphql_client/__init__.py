@@ -3,11 +3,27 @@ This module initializes the package by importing key components including
 PersonalAccessTokenAuthenticator, Client, Query, PaginatedQuery, QueryNode, and QueryNodePaginator.
 """
 
-from .authentication import PersonalAccessTokenAuthenticator
+from .authentication import PersonalAccessTokenAuthenticator, TokenPoolAuthenticator
 from .client import QueryFailedException, Client
+from .async_client import AsyncClient
+from .pager import AdaptivePager
+from .scheduler import RateLimitScheduler, get_scheduler
+from .single_flight import PUBLIC_SCOPE, SingleFlight, get_single_flight
+from .transport import SessionPool, get_session, get_session_pool
 
 __all__ = [
     "PersonalAccessTokenAuthenticator",
+    "TokenPoolAuthenticator",
     "QueryFailedException",
     "Client",
+    "AsyncClient",
+    "AdaptivePager",
+    "RateLimitScheduler",
+    "get_scheduler",
+    "PUBLIC_SCOPE",
+    "SingleFlight",
+    "get_single_flight",
+    "SessionPool",
+    "get_session",
+    "get_session_pool",
 ]
@@ -0,0 +1,228 @@
+"""The module defines an asyncio client that executes several GraphQL queries concurrently."""
+
+import asyncio
+import logging
+import time
+from typing import Union, Dict, Any, AsyncGenerator, Iterable, List
+from requests.exceptions import Timeout, RequestException
+from requests import Response
+from app.services.github_query.queries.query import (
+    Query,
+    PaginatedQuery,
+)
+from .client import (
+    Client,
+    QueryFailedException,
+    MAX_RETRIES,
+    INITIAL_RETRY_DELAY,
+    SHRINK_STATUS_CODES,
+)
+from .single_flight import get_single_flight
+
+DEFAULT_CONCURRENCY = 5
+
+
+class AsyncClient(Client):
+    """
+    AsyncClient accepts the same Query and PaginatedQuery objects as Client, but executes them as coroutines so that
+    independent queries can overlap on one event loop. Requests go through the same pooled keep-alive sessions as
+    Client, and the retry/backoff, rate-limit handling and single-flight sharing are the same.
+    """
+
+    async def _retry_request(self, query: str, fail_fast: bool = False) -> Response:
+        """
+        Tries to send a request multiple times until it succeeds or the retry limit is reached.
+
+        Args:
+            query (str): The GraphQL query to execute.
+            fail_fast (bool): Whether timeouts and gateway errors are raised on their first occurrence instead of being
+            retried, so that the caller can retry with a cheaper query.
+
+        Returns:
+            Response: The server's response to the HTTP request.
+
+        Raises:
+            QueryFailedException: If all retry attempts fail due to API errors.
+            Timeout: If all retry attempts are exhausted and the request keeps timing out.
+        """
+        variables = None
+        if isinstance(query, Query):
+            query, variables = query.get_document(), query.get_variables()
+
+        last_exception = None
+        response = None
+
+        for attempt in range(MAX_RETRIES):
+            try:
+                response = await asyncio.to_thread(self._send, query, variables)
+                if isinstance(response, dict):
+                    return response
+
+                if response.status_code == 200:
+                    return response
+                if fail_fast and response.status_code in SHRINK_STATUS_CODES:
+                    break
+
+            except Timeout as e:
+                last_exception = e
+                if fail_fast:
+                    break
+                logging.warning(
+                    "Request timed out. Retrying in %d seconds...",
+                    INITIAL_RETRY_DELAY * (2**attempt),
+                )
+                await asyncio.sleep(INITIAL_RETRY_DELAY * (2**attempt))
+
+            except RequestException as e:
+                last_exception = e
+                logging.error("Request failed: %s. Retrying...", str(e))
+                await asyncio.sleep(INITIAL_RETRY_DELAY * (2**attempt))
+        if response is None:
+            raise Timeout("All retry attempts exhausted.") from last_exception
+        raise QueryFailedException(query=query, response=response)
+
+    async def _execute(
+        self, query: Union[str, Query], fail_fast: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Executes a query and handles response processing and error checking.
+
+        Args:
+            query (Union[str, Query]): The GraphQL query to execute.
+            fail_fast (bool): Whether timeouts and gateway errors are raised without retrying.
+
+        Returns:
+            Dict[str, Any]: The parsed JSON response from the server.
+
+        Raises:
+            QueryFailedException: If the query execution fails or returns errors.
+        """
+        key = self._single_flight_key(query, fail_fast)
+        if key is None:
+            return await self._fetch(query, fail_fast)
+        return await get_single_flight().run_async(
+            key,
+            lambda: self._fetch(query, fail_fast),
+            self._is_shareable,
+            across_scopes=self._is_viewer_independent(query),
+        )
+
+    async def _fetch(
+        self, query: Union[str, Query], fail_fast: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Sends a query to the server and checks its response.
+
+        Args:
+            query (Union[str, Query]): The GraphQL query to execute.
+            fail_fast (bool): Whether timeouts and gateway errors are raised without retrying.
+
+        Returns:
+            Dict[str, Any]: The parsed JSON response from the server.
+
+        Raises:
+            QueryFailedException: If the query execution fails or returns errors.
+        """
+        response = await self._retry_request(query, fail_fast)
+        if isinstance(response, dict) and response.get("no_limit"):
+            return response
+        return self._parse_response(query, response)
+
+    async def _execution_generator(
+        self, query: PaginatedQuery
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Handles the iteration over paginated query results, yielding each page's data as it's fetched.
+        The page size grows after fast pages and shrinks when a page times out, see AdaptivePager.
+        Iteration stops after yielding a rate-limit response.
+
+        Args:
+            query (PaginatedQuery): The paginated GraphQL query to execute.
+
+        Returns:
+            AsyncGenerator[Dict[str, Any], None]: An async generator yielding each page's data as a dictionary.
+        """
+        pager = self._create_pager(query)
+        while query.paginator.has_next():
+            started = time.monotonic()
+            try:
+                response = await self._execute(
+                    query, pager is not None and pager.can_shrink()
+                )
+            except (Timeout, QueryFailedException) as e:
+                if not self._shrink_page(query, pager, e):
+                    raise
+                continue
+            if response.get("no_limit"):
+                yield response
+                return
+            if pager is not None:
+                query.paginator.args["first"] = pager.record_success(
+                    time.monotonic() - started
+                )
+            self._update_paginator(query, response)
+            yield response
+
+    async def execute(
+        self,
+        query: Union[str, Query, PaginatedQuery],
+        pagination: str = "backend",
+        has_next_page: bool = None,
+        end_cursor: str = None,
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Public coroutine to execute a non-paginated or paginated query.
+
+        Args:
+            query (Union[str, Query, PaginatedQuery]): The GraphQL query to execute.
+            pagination (str): "frontend" fetches the single page after end_cursor, "backend" fetches every page.
+            has_next_page (bool): Unused, kept for signature compatibility with Client.execute.
+            end_cursor (str): The cursor to resume from when pagination is "frontend".
+
+        Returns:
+            Union[Dict[str, Any], List[Dict[str, Any]]]: The parsed JSON response from the server, or the list of
+            pages of a paginated query when pagination is "backend".
+        """
+        if pagination == "frontend":
+            if end_cursor is not None:
+                query.paginator.update_paginator(True, end_cursor)
+            return await self._execute(query)
+        if isinstance(query, PaginatedQuery):
+            return [page async for page in self._execution_generator(query)]
+        return await self._execute(query)
+
+    async def execute_many(
+        self,
+        queries: Iterable[Union[str, Query, PaginatedQuery]],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        pagination: str = "backend",
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Executes independent queries concurrently, with at most `concurrency` of them in flight at once.
+        Query objects keep their pagination state, so the same instance must not be passed twice.
+
+        Args:
+            queries (Iterable[Union[str, Query, PaginatedQuery]]): The GraphQL queries to execute.
+            concurrency (int): The maximum number of queries executed at the same time.
+            pagination (str): The pagination mode passed on to execute.
+            return_exceptions (bool): Whether a failed query yields its exception in the result list instead of
+            cancelling the whole batch.
+
+        Returns:
+            List[Any]: The results of execute, in the same order as the queries.
+
+        Raises:
+            ValueError: If concurrency is smaller than 1.
+        """
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(query):
+            async with semaphore:
+                return await self.execute(query, pagination=pagination)
+
+        return await asyncio.gather(
+            *(run(query) for query in queries), return_exceptions=return_exceptions
+        )
@@ -1,6 +1,8 @@
 """The module defines base Authenticator class that returns an authorization header."""
 
-from typing import Dict
+import hashlib
+from typing import Any, Dict, List, Optional
+from .scheduler import get_scheduler
 
 
 class Authenticator:
@@ -19,6 +21,16 @@ class Authenticator:
         """
         raise NotImplementedError("Authenticator cannot be implemented")
 
+    def visibility_scope(self) -> Optional[str]:
+        """
+        Identifies what the credentials can see. Identical requests are only shared between clients with the same
+        scope, so a private repository never leaks to a user whose token cannot read it.
+
+        Returns:
+            Optional[str]: The scope, or None if the requests of this authenticator must not be shared.
+        """
+        return None
+
 
 class PersonalAccessTokenAuthenticator(Authenticator):
     """
@@ -46,3 +58,108 @@ class PersonalAccessTokenAuthenticator(Authenticator):
             using a personal access token.
         """
         return {"Authorization": f"token {self._token}"}
+
+    def visibility_scope(self) -> Optional[str]:
+        """
+        Returns the visibility scope of the token, a hash of the token.
+
+        Returns:
+            Optional[str]: The scope.
+        """
+        return hashlib.sha256(self._token.encode("utf-8")).hexdigest()
+
+
+class TokenPoolAuthenticator(Authenticator):
+    """
+    TokenPoolAuthenticator authenticates every request with the personal access token of a pool that has the most
+    remaining rate-limit budget, as tracked by the rate-limit scheduler. A token that gets exhausted is passed over
+    until its budget is restored, so a bulk job is only throttled once every token of the pool is spent.
+    """
+
+    def __init__(
+        self, tokens: List[str], host: str = "api.github.com", resource: str = "graphql"
+    ) -> None:
+        """
+        Initializes the authenticator with a pool of personal access tokens.
+
+        Args:
+            tokens (List[str]): The personal access tokens of the pool. Duplicates are ignored.
+            host (str): The host of the GitHub server the tokens belong to.
+            resource (str): The rate-limit resource the requests are charged to.
+        """
+        tokens = list(dict.fromkeys(token for token in tokens if token))
+        if not tokens:
+            raise ValueError("Token pool must not be empty")
+        self._tokens = tokens
+        self._host = host
+        self._resource = resource
+
+    def _budget(self, token: str) -> Dict[str, Any]:
+        scheduler = get_scheduler()
+        return scheduler.budget(
+            scheduler.key(self._host, self._resource, f"token {token}")
+        )
+
+    def _select_token(self) -> str:
+        """
+        Picks the token with the most remaining budget. Tokens that have not been used yet count as full, and among
+        exhausted tokens the one that resets first is picked.
+
+        Returns:
+            str: The selected token.
+        """
+
+        def priority(token):
+            budget = self._budget(token)
+            remaining = budget["remaining"]
+            return (
+                -(float("inf") if remaining is None else remaining),
+                budget["reset_at"] or "",
+            )
+
+        return min(self._tokens, key=priority)
+
+    def get_authorization_header(self) -> Dict[str, str]:
+        """
+        Constructs and returns the authorization header using the token with the most remaining budget.
+
+        Returns:
+            dict: A dictionary representing the authorization header required for authentication with the GitHub API
+            using a personal access token.
+        """
+        return {"Authorization": f"token {self._select_token()}"}
+
+    def visibility_scope(self) -> Optional[str]:
+        """
+        Returns the visibility scope of the pool, a hash of its tokens. Any token of the pool may answer a request,
+        so only pools with the same tokens share requests.
+
+        Returns:
+            Optional[str]: The scope.
+        """
+        tokens = "\n".join(sorted(self._tokens))
+        return hashlib.sha256(tokens.encode("utf-8")).hexdigest()
+
+    def budgets(self) -> List[Dict[str, Any]]:
+        """
+        Returns the rate-limit budget of every token of the pool, with the tokens masked.
+
+        Returns:
+            List[Dict[str, Any]]: The masked token and its limit, remaining points, reset time and last query cost.
+        """
+        return [
+            {"token": mask_token(token), **self._budget(token)} for token in self._tokens
+        ]
+
+
+def mask_token(token: str) -> str:
+    """
+    Masks a personal access token so that it can be shown to operators.
+
+    Args:
+        token (str): The personal access token.
+
+    Returns:
+        str: The token with everything but its last four characters hidden.
+    """
+    return f"****{token[-4:]}" if len(token) > 8 else "****"
@@ -3,14 +3,13 @@
 import logging
 import re
 import time
-from datetime import datetime, timezone
 from typing import Union, Optional, Dict, Any, Generator, Tuple
-import requests
 from requests.exceptions import Timeout, RequestException
 from requests import Response
 from app.services.github_query.queries.query import (
     Query,
     PaginatedQuery,
+    BatchQuery,
 )
 from app.services.github_query.queries.costs.query_cost import (
     QueryCost,
@@ -18,6 +17,10 @@ from app.services.github_query.queries.costs.query_cost import (
 from .authentication import (
     Authenticator,
 )
+from .pager import AdaptivePager, SHRINK_STATUS_CODES
+from .scheduler import DEFAULT_MAX_WAIT, get_scheduler, rate_limit_response
+from .single_flight import PUBLIC_SCOPE, SingleFlight, get_single_flight
+from .transport import get_session
 
 MAX_RETRIES = 3
 INITIAL_RETRY_DELAY = 2
@@ -73,6 +76,9 @@ class Client:
         authenticator: Optional[Authenticator] = None,
         retry_attempts: int = 3,
         timeout_seconds: int = 15,
+        max_wait: Optional[float] = DEFAULT_MAX_WAIT,
+        adaptive_page_size: bool = True,
+        single_flight: bool = True,
     ) -> None:
         """
         Initializes the client with the necessary configuration and authentication.
@@ -84,6 +90,12 @@ class Client:
             authenticator (Optional[Authenticator]): The authenticator instance for handling authentication.
             retry_attempts (int): The number of times to retry the request before giving up.
             timeout_seconds (int): The number of seconds to wait for a response before timing out.
+            max_wait (Optional[float]): The longest a request waits for rate-limit budget before the rate-limit
+            information is returned instead. None waits until the budget is restored.
+            adaptive_page_size (bool): Whether paginated queries executed with backend pagination tune their page size
+            to the observed latency and timeouts.
+            single_flight (bool): Whether identical queries of clients with the same visibility scope share one
+            request and its recent result, see SingleFlight.
 
         Raises:
             InvalidAuthenticationError: If no authenticator is provided or if the provided authenticator is invalid.
@@ -93,6 +105,9 @@ class Client:
         self._is_enterprise = is_enterprise
         self._retry_attempts = retry_attempts
         self._timeout_seconds = timeout_seconds
+        self._max_wait = max_wait
+        self._adaptive_page_size = adaptive_page_size
+        self._single_flight = single_flight
 
         if authenticator is None:
             raise InvalidAuthenticationError("Authentication needs to be specified")
@@ -125,12 +140,86 @@ class Client:
         headers.update(kwargs)
         return headers
 
-    def _retry_request(self, query: str) -> Response:
+    def _send(
+        self, query: str, variables: Optional[Dict[str, Any]] = None
+    ) -> Union[Response, Dict[str, Any]]:
+        """
+        Sends a single GraphQL request through the pooled keep-alive session for this server and credential.
+        The request first waits for its turn in the rate-limit scheduler, and the response is fed back to it.
+        When the budget is exhausted, the request waits for the reset and is sent again as long as the wait does
+        not exceed the client's max_wait.
+
+        Args:
+            query (str): The GraphQL query to execute.
+            variables (Optional[Dict[str, Any]]): The values of the variables declared by the query.
+
+        Returns:
+            Union[Response, Dict[str, Any]]: The server's response to the HTTP request, or the rate-limit information
+            if the budget cannot be restored within max_wait.
+        """
+        scheduler = get_scheduler()
+
+        while True:
+            # Headers are regenerated on every pass so that a token pool can fail over to another token
+            headers = self._generate_headers()
+            token = headers.get("Authorization", "")
+            session = get_session(self._protocol, self._host, token)
+            key = scheduler.key(self._host, "graphql", token)
+            wait = scheduler.acquire(key, max_wait=self._max_wait)
+            if wait is not None:
+                return rate_limit_response(time.time() + wait)
+            payload = {"query": query}
+            if variables:
+                payload["variables"] = variables
+            response = session.post(
+                self._base_path(),
+                json=payload,
+                headers=headers,
+                timeout=self._timeout_seconds,
+            )
+            scheduler.update_from_headers(key, response.headers)
+            reset_at = self._rate_limit_reset(response)
+            if reset_at is None:
+                if response.status_code != 200:
+                    return response
+                rate_limit = (response.json().get("data") or {}).get("rateLimit")
+                if rate_limit:
+                    scheduler.update_from_body(key, rate_limit)
+                return response
+            scheduler.exhaust(key, reset_at)
+
+    @staticmethod
+    def _rate_limit_reset(response: Response) -> Optional[float]:
+        """
+        Checks whether the response reports that the rate limit has been exhausted.
+
+        Args:
+            response (Response): The server's response to the HTTP request.
+
+        Returns:
+            Optional[float]: The epoch time at which the rate limit resets if the request was rate limited,
+            otherwise None.
+        """
+        try:
+            res = response.json()
+        except ValueError:
+            # Gateway errors come back as HTML
+            return None
+        if "errors" in res and res["errors"][0]["type"] == "RATE_LIMITED":
+            retry_after = response.headers.get("Retry-After")
+            if retry_after is not None:
+                return time.time() + int(retry_after)
+            return float(response.headers.get("X-RateLimit-Reset"))
+        return None
+
+    def _retry_request(self, query: str, fail_fast: bool = False) -> Response:
         """
         Tries to send a request multiple times until it succeeds or the retry limit is reached.
 
         Args:
             query (str): The GraphQL query to execute.
+            fail_fast (bool): Whether timeouts and gateway errors are raised on their first occurrence instead of being
+            retried, so that the caller can retry with a cheaper query.
 
         Returns:
             Response: The server's response to the HTTP request.
@@ -139,40 +228,29 @@ class Client:
             QueryFailedException: If all retry attempts fail due to API errors.
             Timeout: If all retry attempts are exhausted and the request keeps timing out.
         """
+        variables = None
         if isinstance(query, Query):
-            query = query.get_query()
+            query, variables = query.get_document(), query.get_variables()
 
         last_exception = None
         response = None
 
         for attempt in range(MAX_RETRIES):
             try:
-                response = requests.post(
-                    self._base_path(),
-                    json={"query": query},
-                    headers=self._generate_headers(),
-                    timeout=self._timeout_seconds,
-                )
+                response = self._send(query, variables)
                 # self.debug_response(response)
-                res = response.json()
-                if "errors" in res and res["errors"][0]["type"] == "RATE_LIMITED":
-                    current_time = datetime.now(timezone.utc)
-                    reset_timestamp = int(response.headers.get("X-RateLimit-Reset"))
-                    reset_at = datetime.fromtimestamp(reset_timestamp, tz=timezone.utc)
-                    time_diff = reset_at - current_time
-                    seconds = time_diff.total_seconds()
-
-                    return {
-                        "no_limit": True,
-                        "wait_seconds": seconds + 3,
-                        "reset_at": reset_at.isoformat(),
-                    }
+                if isinstance(response, dict):
+                    return response
 
                 if response.status_code == 200:
                     return response
+                if fail_fast and response.status_code in SHRINK_STATUS_CODES:
+                    break
 
             except Timeout as e:
                 last_exception = e
+                if fail_fast:
+                    break
                 logging.warning(
                     "Request timed out. Retrying in %d seconds...",
                     INITIAL_RETRY_DELAY * (2**attempt),
@@ -183,27 +261,27 @@ class Client:
                 last_exception = e
                 logging.error("Request failed: %s. Retrying...", str(e))
                 time.sleep(INITIAL_RETRY_DELAY * (2**attempt))
-        if not response:
+        if response is None:
             raise Timeout("All retry attempts exhausted.") from last_exception
         raise QueryFailedException(query=query, response=response)
 
-    def _execute(self, query: Union[str, Query]) -> Dict[str, Any]:
+    @staticmethod
+    def _parse_response(
+        query: Union[str, Query], response: Response
+    ) -> Dict[str, Any]:
         """
-        Executes a query and handles response processing and error checking.
+        Extracts the data of a successful response.
 
         Args:
-            query (Union[str, Query]): The GraphQL query to execute.
+            query (Union[str, Query]): The GraphQL query that was executed.
+            response (Response): The server's response to the HTTP request.
 
         Returns:
             Dict[str, Any]: The parsed JSON response from the server.
 
         Raises:
-            QueryFailedException: If the query execution fails or returns errors.
+            QueryFailedException: If the response is not valid JSON or contains errors.
         """
-
-        response = self._retry_request(query)
-        if isinstance(response, dict) and response.get("no_limit"):
-            return response
         try:
             json_response = response.json()
         except RequestException as e:
@@ -211,13 +289,151 @@ class Client:
 
         if response.status_code == 200 and "errors" not in json_response:
             return json_response["data"]
+        # A batch keeps the results of its other roots when some of them are not found
+        if (
+            response.status_code == 200
+            and isinstance(query, BatchQuery)
+            and json_response.get("data")
+            and all(
+                error.get("type") == "NOT_FOUND" for error in json_response["errors"]
+            )
+        ):
+            return json_response["data"]
         raise QueryFailedException(query=query, response=response)
 
+    @staticmethod
+    def _update_paginator(query: PaginatedQuery, response: Dict[str, Any]) -> None:
+        """
+        Moves the paginator of the query to the page following the given response.
+
+        Args:
+            query (PaginatedQuery): The paginated GraphQL query that was executed.
+            response (Dict[str, Any]): The data of the page that was fetched.
+        """
+        curr_node = response
+        for field_name in query.path:
+            curr_node = curr_node[field_name]
+
+        end_cursor = curr_node["pageInfo"]["endCursor"]
+        has_next_page = curr_node["pageInfo"]["hasNextPage"]
+        query.paginator.update_paginator(has_next_page, end_cursor)
+
+    def _execute(
+        self, query: Union[str, Query], fail_fast: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Executes a query and handles response processing and error checking.
+
+        Args:
+            query (Union[str, Query]): The GraphQL query to execute.
+            fail_fast (bool): Whether timeouts and gateway errors are raised without retrying.
+
+        Returns:
+            Dict[str, Any]: The parsed JSON response from the server.
+
+        Raises:
+            QueryFailedException: If the query execution fails or returns errors.
+        """
+        key = self._single_flight_key(query, fail_fast)
+        if key is None:
+            return self._fetch(query, fail_fast)
+        return get_single_flight().run(
+            key,
+            lambda: self._fetch(query, fail_fast),
+            self._is_shareable,
+            across_scopes=self._is_viewer_independent(query),
+        )
+
+    def _fetch(
+        self, query: Union[str, Query], fail_fast: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Sends a query to the server and checks its response.
+
+        Args:
+            query (Union[str, Query]): The GraphQL query to execute.
+            fail_fast (bool): Whether timeouts and gateway errors are raised without retrying.
+
+        Returns:
+            Dict[str, Any]: The parsed JSON response from the server.
+
+        Raises:
+            QueryFailedException: If the query execution fails or returns errors.
+        """
+        response = self._retry_request(query, fail_fast)
+        if isinstance(response, dict) and response.get("no_limit"):
+            return response
+        return self._parse_response(query, response)
+
+    def _single_flight_key(
+        self, query: Union[str, Query], fail_fast: bool
+    ) -> Optional[str]:
+        """
+        Builds the key under which identical requests are shared.
+
+        Args:
+            query (Union[str, Query]): The GraphQL query to execute.
+            fail_fast (bool): Whether timeouts and gateway errors are raised without retrying.
+
+        Returns:
+            Optional[str]: The key, or None if the request is sent on its own: single flight is disabled, the
+            authenticator has no visibility scope, or the document is a mutation. Viewer-independent queries share
+            the public scope, whatever the credentials.
+        """
+        if not self._single_flight:
+            return None
+        variables, public = None, self._is_viewer_independent(query)
+        if isinstance(query, Query):
+            query, variables = query.get_document(), query.get_variables()
+        if query.lstrip().startswith("mutation"):
+            return None
+        scope = PUBLIC_SCOPE if public else self._authenticator.visibility_scope()
+        if scope is None:
+            return None
+        return SingleFlight.key(
+            self._host,
+            query,
+            variables,
+            scope,
+            self._protocol,
+            self._max_wait,
+            fail_fast,
+        )
+
+    @staticmethod
+    def _is_viewer_independent(query: Union[str, Query]) -> bool:
+        """
+        Checks whether a query is shared with clients of other credentials, under the public scope.
+
+        Args:
+            query (Union[str, Query]): The GraphQL query to execute.
+
+        Returns:
+            bool: Whether the query is marked viewer-independent.
+        """
+        return isinstance(query, Query) and query.viewer_independent
+
+    @staticmethod
+    def _is_shareable(response: Dict[str, Any]) -> bool:
+        """
+        Checks whether a result may be reused by later requests. Rate-limit responses are not, since the budget
+        they report changes.
+
+        Args:
+            response (Dict[str, Any]): The result of a request.
+
+        Returns:
+            bool: Whether the result may be reused.
+        """
+        return not (isinstance(response, dict) and response.get("no_limit"))
+
     def _execution_generator(
         self, query: PaginatedQuery
     ) -> Generator[Dict[str, Any], None, None]:
         """
         Handles the iteration over paginated query results, yielding each page's data as it's fetched.
+        The page size grows after fast pages and shrinks when a page times out, see AdaptivePager.
+        Iteration stops after yielding a rate-limit response.
 
         Args:
             query (Union[Query, PaginatedQuery]): The paginated GraphQL query to execute.
@@ -225,17 +441,63 @@ class Client:
         Returns:
             Generator[Dict[str, Any], None, None]: A generator yielding each page's data as a dictionary.
         """
+        pager = self._create_pager(query)
         while query.paginator.has_next():
-            response = self._execute(query)
-            curr_node = response
+            started = time.monotonic()
+            try:
+                response = self._execute(query, pager is not None and pager.can_shrink())
+            except (Timeout, QueryFailedException) as e:
+                if not self._shrink_page(query, pager, e):
+                    raise
+                continue
+            if response.get("no_limit"):
+                yield response
+                return
+            if pager is not None:
+                query.paginator.args["first"] = pager.record_success(
+                    time.monotonic() - started
+                )
+            self._update_paginator(query, response)
+            yield response
 
-            for field_name in query.path:
-                curr_node = curr_node[field_name]
+    def _create_pager(self, query: PaginatedQuery) -> Optional[AdaptivePager]:
+        """
+        Creates the pager that tunes the page size of a paginated query.
 
-            end_cursor = curr_node["pageInfo"]["endCursor"]
-            has_next_page = curr_node["pageInfo"]["hasNextPage"]
-            query.paginator.update_paginator(has_next_page, end_cursor)
-            yield response
+        Args:
+            query (PaginatedQuery): The paginated GraphQL query to execute.
+
+        Returns:
+            Optional[AdaptivePager]: The pager, or None if adaptive page sizing is disabled or the connection has no
+            integer page size.
+        """
+        first = (query.paginator.args or {}).get("first")
+        if not self._adaptive_page_size or not isinstance(first, int):
+            return None
+        return AdaptivePager(first)
+
+    @staticmethod
+    def _shrink_page(
+        query: PaginatedQuery, pager: Optional[AdaptivePager], error: Exception
+    ) -> bool:
+        """
+        Halves the page size of a paginated query after its page failed because it was too expensive to resolve.
+
+        Args:
+            query (PaginatedQuery): The paginated GraphQL query whose page failed.
+            pager (Optional[AdaptivePager]): The pager of the query.
+            error (Exception): The error raised while fetching the page.
+
+        Returns:
+            bool: True if the page should be requested again with the smaller page size, False if the error should
+            be raised.
+        """
+        if pager is None or not pager.can_shrink() or not pager.is_overload(error):
+            return False
+        size = pager.record_failure()
+        query.paginator.args["first"] = size
+        logging.warning("Page timed out. Retrying with a page size of %d...", size)
+        return True
 
     def execute(
         self,
@@ -262,12 +524,24 @@ class Client:
         return self._execute(query)
 
     def _have_limit(self, query: Union[str, Query]) -> Tuple[bool, str]:
+        """
+        Pre-calculates the cost of a query with a dry run. The cost is recorded by the rate-limit scheduler, which
+        uses it to pace the following requests of this token.
+
+        Args:
+            query (Union[str, Query]): The GraphQL query whose cost is calculated.
+
+        Returns:
+            Tuple[bool, str]: Whether the remaining budget cannot cover the query and its retries, and the reset time.
+        """
         if isinstance(query, Query):
             query = query.get_query()
         match = re.search(r"query\s*{(?P<content>.+)}", query)
         # pre-calculate the cost of the upcoming graphql query
         rate_query = QueryCost(match.group("content"), dryrun=True).get_query()
         rate_limit = self._retry_request(rate_query)
+        if isinstance(rate_limit, dict):
+            return True, rate_limit["reset_at"]
         rate_limit = rate_limit.json()["data"]["rateLimit"]
         cost, remaining, reset_at = (
             rate_limit["cost"],
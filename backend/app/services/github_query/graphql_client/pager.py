@@ -0,0 +1,100 @@
+"""The module defines an adaptive pager that tunes the page size of a paginated query while it is being executed."""
+
+import math
+from typing import Optional
+from requests.exceptions import Timeout
+
+MIN_PAGE_SIZE = 5
+MAX_PAGE_SIZE = 100
+FAST_PAGE_SECONDS = 2.0
+GROWTH_FACTOR = 1.5
+SHRINK_STATUS_CODES = (502, 503, 504)
+
+
+class AdaptivePager:
+    """
+    AdaptivePager tracks the `first` argument of one paginated connection. Pages that come back quickly let the next
+    page grow toward the API maximum of 100 so that the connection takes fewer round trips, while timeouts and gateway
+    errors, which GitHub returns when a page of heavy nodes (e.g. commit history with additions and deletions) takes
+    too long to resolve, halve the page and the same page is requested again.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        min_size: int = MIN_PAGE_SIZE,
+        max_size: int = MAX_PAGE_SIZE,
+        fast_seconds: float = FAST_PAGE_SECONDS,
+    ) -> None:
+        """
+        Initializes the pager with the page size the query was built with.
+
+        Args:
+            size (int): The initial page size.
+            min_size (int): The smallest page size the pager shrinks to.
+            max_size (int): The largest page size the pager grows to.
+            fast_seconds (float): Pages that take less than this many seconds let the page size grow.
+        """
+        self.min_size = min(min_size, size)
+        self.max_size = max(max_size, size)
+        self.size = size
+        self.fast_seconds = fast_seconds
+        self._failed_size: Optional[int] = None
+
+    def can_shrink(self) -> bool:
+        """
+        Checks whether a failed page can be retried with a smaller page size.
+
+        Returns:
+            bool: True if the page size is above the minimum.
+        """
+        return self.size > self.min_size
+
+    def record_success(self, elapsed: float) -> int:
+        """
+        Records a page that was fetched successfully and grows the page size if the page was fast. The page size
+        never grows back to a size that already failed for this connection.
+
+        Args:
+            elapsed (float): The number of seconds the page took.
+
+        Returns:
+            int: The page size for the next page.
+        """
+        if elapsed < self.fast_seconds:
+            ceiling = self.max_size
+            if self._failed_size is not None:
+                ceiling = min(ceiling, self._failed_size - 1)
+            self.size = max(self.size, min(ceiling, math.ceil(self.size * GROWTH_FACTOR)))
+        return self.size
+
+    def record_failure(self) -> int:
+        """
+        Records a page that timed out and halves the page size.
+
+        Returns:
+            int: The page size to retry the page with.
+        """
+        self._failed_size = self.size
+        self.size = max(self.min_size, self.size // 2)
+        return self.size
+
+    @staticmethod
+    def is_overload(error: Exception) -> bool:
+        """
+        Checks whether an error means the page was too expensive to resolve, rather than that the query is wrong.
+
+        Args:
+            error (Exception): The error raised while fetching the page.
+
+        Returns:
+            bool: True for timeouts, gateway errors and GraphQL errors that report a timeout.
+        """
+        if isinstance(error, Timeout):
+            return True
+        response = getattr(error, "response", None)
+        if response is None:
+            return False
+        if response.status_code in SHRINK_STATUS_CODES:
+            return True
+        return "timeout" in (response.text or "").lower()
@@ -0,0 +1,276 @@
+"""The module defines a process-wide scheduler that paces requests against the GitHub rate-limit budget of each token."""
+
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+DEFAULT_BURST = 100
+DEFAULT_MAX_WAIT = 60
+RESET_MARGIN_SECONDS = 3
+
+BudgetKey = Tuple[str, str, str]
+
+
+class RateLimitBudget:
+    """
+    RateLimitBudget is a token bucket for one (host, resource, token) budget. The bucket refills at the rate that
+    spends the points left in the current window evenly until the window resets, and holds at most `burst` points,
+    so short interactive bursts go through immediately while long runs settle at a steady throughput.
+    """
+
+    def __init__(self, burst: int) -> None:
+        """
+        Initializes a budget whose limits are unknown until the first response is observed.
+
+        Args:
+            burst (int): The maximum number of points that can be spent without pacing.
+        """
+        self.burst = burst
+        self.tokens = float(burst)
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.cost = 1
+        self.last_refill = time.time()
+
+    def _rate(self, now: float) -> float:
+        """
+        Computes the refill rate in points per second.
+
+        Args:
+            now (float): The current epoch time.
+
+        Returns:
+            float: The refill rate, or infinity when the budget is unknown or the window has already reset.
+        """
+        if self.remaining is None or self.reset_at is None or now >= self.reset_at:
+            return float("inf")
+        return self.remaining / max(self.reset_at - now, 1.0)
+
+    def reserve(self, cost: int, now: float) -> float:
+        """
+        Takes `cost` points from the bucket if they are available.
+
+        Args:
+            cost (int): The number of points the request is expected to cost.
+            now (float): The current epoch time.
+
+        Returns:
+            float: 0 if the points were taken, otherwise the number of seconds until they will be available.
+        """
+        if self.reset_at is not None and now >= self.reset_at:
+            # A new window started, the old numbers no longer apply
+            self.remaining = None
+            self.reset_at = None
+            self.tokens = float(self.burst)
+        rate = self._rate(now)
+        if rate == float("inf"):
+            self.tokens = float(self.burst)
+        else:
+            self.tokens = min(
+                float(self.burst), self.tokens + rate * (now - self.last_refill)
+            )
+        self.last_refill = now
+
+        if self.remaining is not None and self.remaining < cost:
+            return self.reset_at - now + RESET_MARGIN_SECONDS
+        if self.tokens >= cost:
+            self.tokens -= cost
+            if self.remaining is not None:
+                self.remaining -= cost
+            return 0.0
+        return (cost - self.tokens) / rate
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Returns the state of the budget.
+
+        Returns:
+            Dict[str, Any]: The limit, remaining points, reset time and the last observed query cost.
+        """
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset_at": (
+                datetime.fromtimestamp(self.reset_at, tz=timezone.utc).isoformat()
+                if self.reset_at
+                else None
+            ),
+            "cost": self.cost,
+        }
+
+
+class RateLimitScheduler:
+    """
+    RateLimitScheduler tracks the rate-limit budget of every token from the X-RateLimit-* response headers and from
+    `rateLimit { cost remaining resetAt }` fields, and makes callers wait for their turn so that requests are spread
+    across the rate-limit window instead of exhausting it and stalling until the reset.
+    """
+
+    def __init__(self, burst: int = DEFAULT_BURST) -> None:
+        """
+        Initializes an empty scheduler.
+
+        Args:
+            burst (int): The number of points per budget that may be spent without pacing.
+        """
+        self._burst = burst
+        self._budgets: Dict[BudgetKey, RateLimitBudget] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(host: str, resource: str, token: str) -> BudgetKey:
+        """
+        Builds the key of a budget. The token is hashed so that raw credentials are not kept in memory longer than
+        needed.
+
+        Args:
+            host (str): The host of the GitHub server.
+            resource (str): The rate-limit resource, e.g. "graphql" or "core".
+            token (str): The credential the budget belongs to.
+
+        Returns:
+            BudgetKey: The budget key.
+        """
+        digest = hashlib.sha256((token or "").encode("utf-8")).hexdigest()
+        return host, resource, digest
+
+    def _budget(self, key: BudgetKey) -> RateLimitBudget:
+        budget = self._budgets.get(key)
+        if budget is None:
+            budget = self._budgets[key] = RateLimitBudget(self._burst)
+        return budget
+
+    def acquire(
+        self, key: BudgetKey, cost: Optional[int] = None, max_wait: float = None
+    ) -> Optional[float]:
+        """
+        Blocks until the budget allows a request of the given cost.
+
+        Args:
+            key (BudgetKey): The budget to spend from.
+            cost (Optional[int]): The expected cost. Defaults to the last cost observed for the budget.
+            max_wait (float): The longest the caller is willing to wait in seconds. None waits as long as needed.
+
+        Returns:
+            Optional[float]: None once the request may be sent, or the number of seconds the caller would have to
+            wait if that exceeds max_wait.
+        """
+        while True:
+            with self._lock:
+                budget = self._budget(key)
+                wait = budget.reserve(cost or budget.cost, time.time())
+            if wait <= 0:
+                return None
+            if max_wait is not None and wait > max_wait:
+                return wait
+            time.sleep(wait)
+
+    def update_from_headers(self, key: BudgetKey, headers: Mapping[str, str]) -> None:
+        """
+        Updates a budget from the X-RateLimit-* headers of a response.
+
+        Args:
+            key (BudgetKey): The budget the response was spent from.
+            headers (Mapping[str, str]): The response headers.
+        """
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        with self._lock:
+            budget = self._budget(key)
+            limit = headers.get("X-RateLimit-Limit")
+            if limit is not None:
+                budget.limit = int(limit)
+            budget.remaining = int(remaining)
+            budget.reset_at = float(reset)
+
+    def update_from_body(self, key: BudgetKey, rate_limit: Mapping[str, Any]) -> None:
+        """
+        Updates a budget from a `rateLimit` object returned by the GraphQL API.
+
+        Args:
+            key (BudgetKey): The budget the query was spent from.
+            rate_limit (Mapping[str, Any]): The rateLimit object with cost, remaining and resetAt fields.
+        """
+        with self._lock:
+            budget = self._budget(key)
+            if rate_limit.get("cost") is not None:
+                budget.cost = max(int(rate_limit["cost"]), 1)
+            if rate_limit.get("limit") is not None:
+                budget.limit = int(rate_limit["limit"])
+            if rate_limit.get("remaining") is not None:
+                budget.remaining = int(rate_limit["remaining"])
+            if rate_limit.get("resetAt"):
+                budget.reset_at = (
+                    datetime.strptime(rate_limit["resetAt"], "%Y-%m-%dT%H:%M:%SZ")
+                    .replace(tzinfo=timezone.utc)
+                    .timestamp()
+                )
+
+    def exhaust(self, key: BudgetKey, reset_at: float) -> None:
+        """
+        Marks a budget as spent until the given reset time, e.g. after a RATE_LIMITED error.
+
+        Args:
+            key (BudgetKey): The exhausted budget.
+            reset_at (float): The epoch time at which the budget is restored.
+        """
+        with self._lock:
+            budget = self._budget(key)
+            budget.remaining = 0
+            budget.reset_at = reset_at
+
+    def budget(self, key: BudgetKey) -> Dict[str, Any]:
+        """
+        Returns the known state of a budget.
+
+        Args:
+            key (BudgetKey): The budget key.
+
+        Returns:
+            Dict[str, Any]: The limit, remaining points, reset time and last observed query cost.
+        """
+        with self._lock:
+            return self._budget(key).as_dict()
+
+
+def rate_limit_response(reset_at: float) -> Dict[str, Any]:
+    """
+    Builds the response returned to callers that cannot wait for a rate-limit budget to be restored.
+
+    Args:
+        reset_at (float): The epoch time at which the budget is restored.
+
+    Returns:
+        Dict[str, Any]: The rate-limit response with the seconds to wait and the reset time.
+    """
+    reset_time = datetime.fromtimestamp(reset_at, tz=timezone.utc)
+    seconds = (reset_time - datetime.now(timezone.utc)).total_seconds()
+    return {
+        "no_limit": True,
+        "wait_seconds": seconds + RESET_MARGIN_SECONDS,
+        "reset_at": reset_time.isoformat(),
+    }
+
+
+_scheduler: Optional[RateLimitScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> RateLimitScheduler:
+    """
+    Returns the process-wide rate-limit scheduler, creating it on first use.
+
+    Returns:
+        RateLimitScheduler: The shared scheduler.
+    """
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = RateLimitScheduler()
+    return _scheduler
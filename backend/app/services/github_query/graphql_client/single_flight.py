@@ -0,0 +1,238 @@
+"""The module defines a process-wide single-flight layer that shares identical GraphQL requests between callers."""
+
+import asyncio
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+DEFAULT_TTL_SECONDS = 30
+DEFAULT_MAX_ENTRIES = 1024
+# The visibility scope of results that are the same for every viewer, see Query.viewer_independent. Also keys the
+# viewer-independent entries of the contribution window cache.
+PUBLIC_SCOPE = "public"
+
+
+class SingleFlight:
+    """
+    SingleFlight lets concurrent callers that send the same query to the same server with the same visibility share
+    one upstream request: the first caller sends it and the others wait for its result. Successful results are kept
+    for a short time, so requests repeated right after are answered without spending rate-limit points. Requests are
+    only shared between users for queries marked viewer-independent, e.g. the public profile of a login; any other
+    query is shared only between clients with the same credentials. Across credentials only successful, shareable
+    results are passed on: when the leader fails, e.g. because its token was revoked or ran out of budget, the other
+    callers send the request themselves. Every caller gets its own copy of the result, so callers can modify it.
+    Works for threads as well as for coroutines on any event loop.
+    """
+
+    def __init__(
+        self, ttl: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES
+    ) -> None:
+        """
+        Initializes an empty single-flight layer.
+
+        Args:
+            ttl (float): The number of seconds a result is reused for. 0 only shares requests that are in flight.
+            max_entries (int): The maximum number of results kept. The least recently stored result is dropped when
+            the limit is exceeded.
+        """
+        if ttl < 0 or max_entries < 1:
+            raise ValueError("The TTL must not be negative and the cache must hold at least one entry")
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._in_flight: Dict[str, Future] = {}
+        self._results: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        host: str,
+        document: str,
+        variables: Optional[Dict[str, Any]],
+        scope: str,
+        *extra: Any,
+    ) -> str:
+        """
+        Builds the key of a request. Requests only share a key if every part matches.
+
+        Args:
+            host (str): The host of the GitHub server.
+            document (str): The GraphQL document.
+            variables (Optional[Dict[str, Any]]): The values of the variables declared by the document.
+            scope (str): The visibility scope of the credentials, see Authenticator.visibility_scope.
+            *extra (Any): Further options that change the outcome of the request.
+
+        Returns:
+            str: The key.
+        """
+        payload = json.dumps(
+            [host, document, variables or {}, scope, *extra],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _begin(self, key: str) -> Tuple[Future, bool]:
+        """
+        Joins the request of the given key, or starts it.
+
+        Args:
+            key (str): The key of the request.
+
+        Returns:
+            Tuple[Future, bool]: The future of the result, and whether the caller has to send the request and
+            resolve the future.
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                if cached[1] > now:
+                    future = Future()
+                    future.set_result(cached[0])
+                    return future, False
+                del self._results[key]
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future, False
+            future = self._in_flight[key] = Future()
+            return future, True
+
+    def _finish(
+        self,
+        key: str,
+        future: Future,
+        result: Any = None,
+        error: Optional[BaseException] = None,
+        cacheable: bool = False,
+    ) -> None:
+        """
+        Resolves the request of the given key for every waiting caller.
+
+        Args:
+            key (str): The key of the request.
+            future (Future): The future of the result.
+            result (Any): The shared copy of the result.
+            error (Optional[BaseException]): The error the request failed with.
+            cacheable (bool): Whether the result is reused by later requests.
+        """
+        with self._lock:
+            self._in_flight.pop(key, None)
+            if error is None and cacheable and self._ttl > 0:
+                self._results[key] = (result, time.monotonic() + self._ttl)
+                self._results.move_to_end(key)
+                while len(self._results) > self._max_entries:
+                    self._results.popitem(last=False)
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def run(
+        self,
+        key: str,
+        fetch: Callable[[], Any],
+        cacheable: Callable[[Any], bool],
+        across_scopes: bool = False,
+    ) -> Any:
+        """
+        Returns the result of the request of the given key, fetching it if no other caller is already doing so.
+
+        Args:
+            key (str): The key of the request.
+            fetch (Callable[[], Any]): Sends the request and returns its result.
+            cacheable (Callable[[Any], bool]): Whether a result may be reused by later requests.
+            across_scopes (bool): Whether callers with different credentials share the key. A caller then only takes
+            a cacheable result from another caller, and fetches on its own if that caller failed.
+
+        Returns:
+            Any: The result, or a copy of the result fetched by another caller.
+        """
+        future, leader = self._begin(key)
+        if not leader:
+            if not across_scopes:
+                return copy.deepcopy(future.result())
+            try:
+                result = future.result()
+            except Exception:  # pylint: disable=broad-except
+                return fetch()
+            return copy.deepcopy(result) if cacheable(result) else fetch()
+        try:
+            result = fetch()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, copy.deepcopy(result), cacheable=cacheable(result))
+        return result
+
+    async def run_async(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool],
+        across_scopes: bool = False,
+    ) -> Any:
+        """
+        Coroutine version of run.
+
+        Args:
+            key (str): The key of the request.
+            fetch (Callable[[], Awaitable[Any]]): Sends the request and returns its result.
+            cacheable (Callable[[Any], bool]): Whether a result may be reused by later requests.
+            across_scopes (bool): Whether callers with different credentials share the key, see run.
+
+        Returns:
+            Any: The result, or a copy of the result fetched by another caller.
+        """
+        future, leader = self._begin(key)
+        if not leader:
+            # Shielded, so that a cancelled waiter does not cancel the request of the other callers
+            waiting = asyncio.shield(asyncio.wrap_future(future))
+            if not across_scopes:
+                return copy.deepcopy(await waiting)
+            try:
+                result = await waiting
+            except Exception:  # pylint: disable=broad-except
+                return await fetch()
+            return copy.deepcopy(result) if cacheable(result) else await fetch()
+        try:
+            result = await fetch()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, copy.deepcopy(result), cacheable=cacheable(result))
+        return result
+
+    def clear(self) -> None:
+        """
+        Drops every stored result. Requests in flight are not affected.
+        """
+        with self._lock:
+            self._results.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._results)
+
+
+_single_flight: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """
+    Returns the process-wide single-flight layer, creating it on first use.
+
+    Returns:
+        SingleFlight: The shared single-flight layer.
+    """
+    global _single_flight
+    if _single_flight is None:
+        with _single_flight_lock:
+            if _single_flight is None:
+                _single_flight = SingleFlight()
+    return _single_flight
@@ -0,0 +1,187 @@
+"""The module defines a process-wide pool of keep-alive HTTP sessions shared by the GraphQL and REST clients."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_MAX_SESSIONS = 64
+DEFAULT_IDLE_TIMEOUT = 300
+
+
+class SessionPool:
+    """
+    SessionPool keeps one requests.Session per (protocol, host, token) so that consecutive requests to the same
+    GitHub server with the same credentials reuse open TCP/TLS connections instead of paying a new handshake each time.
+    The number of sessions and the number of connections kept per session are bounded, and sessions that have not been
+    used for a while are closed.
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ) -> None:
+        """
+        Initializes an empty session pool.
+
+        Args:
+            pool_maxsize (int): The maximum number of connections kept alive per session.
+            max_sessions (int): The maximum number of sessions kept in the pool. The least recently used session is
+            closed when the limit is exceeded.
+            idle_timeout (float): The number of seconds after which an unused session is closed.
+        """
+        if pool_maxsize < 1 or max_sessions < 1:
+            raise ValueError("Pool sizes must be positive")
+        self._pool_maxsize = pool_maxsize
+        self._max_sessions = max_sessions
+        self._idle_timeout = idle_timeout
+        self._sessions: "OrderedDict[Tuple[str, str, str], Tuple[requests.Session, float]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(protocol: str, host: str, token: str) -> Tuple[str, str, str]:
+        """
+        Builds the pool key. The token is hashed so that raw credentials are not kept as dictionary keys.
+
+        Args:
+            protocol (str): The protocol of the server (http/https).
+            host (str): The host of the server.
+            token (str): The credential the session is used with.
+
+        Returns:
+            Tuple[str, str, str]: The pool key.
+        """
+        digest = hashlib.sha256((token or "").encode("utf-8")).hexdigest()
+        return protocol, host, digest
+
+    def _new_session(self, protocol: str) -> requests.Session:
+        """
+        Creates a session whose connection pool is bounded by the configured size.
+
+        Args:
+            protocol (str): The protocol the session is used with.
+
+        Returns:
+            requests.Session: A new session.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_maxsize)
+        session.mount(f"{protocol}://", adapter)
+        return session
+
+    def get_session(self, protocol: str, host: str, token: str) -> requests.Session:
+        """
+        Returns the session for the given server and credential, creating it if needed.
+
+        Args:
+            protocol (str): The protocol of the server (http/https).
+            host (str): The host of the server.
+            token (str): The credential (e.g. the authorization header value) used with the session.
+
+        Returns:
+            requests.Session: A keep-alive session.
+        """
+        key = self._key(protocol, host, token)
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            evicted.extend(self._pop_idle(now))
+            entry = self._sessions.get(key)
+            if entry is None:
+                session = self._new_session(protocol)
+            else:
+                session = entry[0]
+            self._sessions[key] = (session, now)
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self._max_sessions:
+                _, (oldest, _) = self._sessions.popitem(last=False)
+                evicted.append(oldest)
+        for stale in evicted:
+            stale.close()
+        return session
+
+    def _pop_idle(self, now: float) -> list:
+        """
+        Removes the sessions that have been idle for longer than the idle timeout. Must be called with the lock held.
+
+        Args:
+            now (float): The current monotonic time.
+
+        Returns:
+            list: The removed sessions, which the caller closes outside the lock.
+        """
+        idle = [
+            key
+            for key, (_, last_used) in self._sessions.items()
+            if now - last_used > self._idle_timeout
+        ]
+        return [self._sessions.pop(key)[0] for key in idle]
+
+    def evict_idle(self) -> int:
+        """
+        Closes every session that has been idle for longer than the idle timeout.
+
+        Returns:
+            int: The number of sessions closed.
+        """
+        with self._lock:
+            evicted = self._pop_idle(time.monotonic())
+        for session in evicted:
+            session.close()
+        return len(evicted)
+
+    def close(self) -> None:
+        """
+        Closes every session in the pool.
+        """
+        with self._lock:
+            sessions = [session for session, _ in self._sessions.values()]
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+
+_session_pool: Optional[SessionPool] = None
+_session_pool_lock = threading.Lock()
+
+
+def get_session_pool() -> SessionPool:
+    """
+    Returns the process-wide session pool, creating it on first use.
+
+    Returns:
+        SessionPool: The shared session pool.
+    """
+    global _session_pool
+    if _session_pool is None:
+        with _session_pool_lock:
+            if _session_pool is None:
+                _session_pool = SessionPool()
+    return _session_pool
+
+
+def get_session(protocol: str, host: str, token: str) -> requests.Session:
+    """
+    Returns a keep-alive session from the process-wide pool.
+
+    Args:
+        protocol (str): The protocol of the server (http/https).
+        host (str): The host of the server.
+        token (str): The credential used with the session.
+
+    Returns:
+        requests.Session: A keep-alive session.
+    """
+    return get_session_pool().get_session(protocol, host, token)
@@ -24,6 +24,7 @@ from .repositories import (
 from .time_range_contributions import (
     UserContributionsCollection,
     UserContributionCalendar,
+    CreatedAtWindow,
 )
 from .costs import QueryCost, RateLimit
 from .profiles import UserLogin, UserLoginViewer, UserProfileStats
@@ -44,6 +45,7 @@ __all__ = [
     "RepositoryContributors",
     "UserContributionsCollection",
     "UserContributionCalendar",
+    "CreatedAtWindow",
     "QueryCost",
     "RateLimit",
     "UserLogin",
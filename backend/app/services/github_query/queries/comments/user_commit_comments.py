@@ -9,10 +9,12 @@ Classes:
 Functions:
     user_commit_comments(raw_data: Dict[str, Any]) -> List[Dict[str, Any]]:
     created_before_time(commit_comments: List[Dict[str, Any]], time: str) -> int:
+    count_query(login: str, pg_size: int = 100) -> CreatedAtWindow:
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from app.services.github_query.utils.helper import created_before
+from ..time_range_contributions.created_at_window import CreatedAtWindow
 from ..query import (
     QueryNode,
     PaginatedQuery,
@@ -116,3 +118,20 @@ class UserCommitComments(PaginatedQuery):
             else:
                 break
         return counter
+
+    @staticmethod
+    def count_query(login: str, pg_size: int = 100, fields: Optional[List[Any]] = None) -> CreatedAtWindow:
+        """
+        Builds a query that walks the user's commit comments newest first, fetching only their creation times, so that
+        the commit comments created in a time window can be counted without paging through the user's whole history.
+        GitHub lists commit comments oldest first, so the window is read backwards.
+
+        Args:
+            login (str): GitHub username.
+            pg_size (int): Number of commit comments per page (default: 100).
+            fields (Optional[List[Any]]): Further node fields to fetch, e.g. to build table rows of the nodes.
+
+        Returns:
+            CreatedAtWindow: The counting query.
+        """
+        return CreatedAtWindow(login, NODE_COMMIT_COMMENTS, None, pg_size, fields)
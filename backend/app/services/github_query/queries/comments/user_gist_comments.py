@@ -12,10 +12,14 @@ Functions:
 
     created_before_time(gist_comments: List[Dict[str, Any]], time: str) -> int:
         Counts how many gist comments were created before a specific time.
+
+    count_query(login: str, pg_size: int = 100) -> CreatedAtWindow:
+        Builds a query that counts the nodes created in a time window, stopping once it passes the window.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from app.services.github_query.utils.helper import created_before
+from ..time_range_contributions.created_at_window import CreatedAtWindow
 from ..query import (
     QueryNode,
     PaginatedQuery,
@@ -120,3 +124,20 @@ class UserGistComments(PaginatedQuery):
             else:
                 break
         return counter
+
+    @staticmethod
+    def count_query(login: str, pg_size: int = 100, fields: Optional[List[Any]] = None) -> CreatedAtWindow:
+        """
+        Builds a query that walks the user's gist comments newest first, fetching only their creation times, so that
+        the gist comments created in a time window can be counted without paging through the user's whole history.
+        GitHub lists gist comments oldest first, so the window is read backwards.
+
+        Args:
+            login (str): GitHub username.
+            pg_size (int): Number of gist comments per page (default: 100).
+            fields (Optional[List[Any]]): Further node fields to fetch, e.g. to build table rows of the nodes.
+
+        Returns:
+            CreatedAtWindow: The counting query.
+        """
+        return CreatedAtWindow(login, NODE_GIST_COMMENTS, None, pg_size, fields)
@@ -14,10 +14,14 @@ Functions:
 
     created_before_time(issue_comments: List[Dict[str, Any]], time: str) -> int:
         Counts how many issue comments were created before a specific time.
+
+    count_query(login: str, pg_size: int = 100) -> CreatedAtWindow:
+        Builds a query that counts the nodes created in a time window, stopping once it passes the window.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from app.services.github_query.utils.helper import created_before
+from ..time_range_contributions.created_at_window import CreatedAtWindow
 from ..query import (
     QueryNode,
     PaginatedQuery,
@@ -123,3 +127,20 @@ class UserIssueComments(PaginatedQuery):
             else:
                 break
         return counter
+
+    @staticmethod
+    def count_query(login: str, pg_size: int = 100, fields: Optional[List[Any]] = None) -> CreatedAtWindow:
+        """
+        Builds a query that walks the user's issue comments newest first, fetching only their creation times, so that
+        the issue comments created in a time window can be counted without paging through the user's whole history.
+        GitHub can only order issue comments by update time, which bounds the creation time from above.
+
+        Args:
+            login (str): GitHub username.
+            pg_size (int): Number of issue comments per page (default: 100).
+            fields (Optional[List[Any]]): Further node fields to fetch, e.g. to build table rows of the nodes.
+
+        Returns:
+            CreatedAtWindow: The counting query.
+        """
+        return CreatedAtWindow(login, NODE_ISSUE_COMMENTS, "UPDATED_AT", pg_size, fields)
@@ -49,6 +49,7 @@ from ..constants import (
     NODE_PARENTS,
     NODE_REF,
     ARG_QUALIFIED_NAME,
+    ARG_SINCE,
     FIELD_NAME,
     FIELD_EMAIL,
     NODE_USER,
@@ -83,6 +84,7 @@ class RepositoryContributorContributions(PaginatedQuery):
         branch_name: str,
         github_id: str,
         pg_size: int = 50,
+        since: Optional[str] = None,
     ) -> None:
         """
         Initializes a paginated query to retrieve commit contributions.
@@ -93,8 +95,13 @@ class RepositoryContributorContributions(PaginatedQuery):
             branch_name (str): Branch name.
             github_id (str): GitHub ID of the contributor.
             pg_size (int): Number of commits per page.
+            since (str, optional): Only commits committed at or after this quoted timestamp are fetched, e.g.
+            '"2024-01-01T00:00:00Z"'.
         """
         github_id = format_github_id(github_id)
+        history_args = {ARG_AUTHOR: github_id, ARG_FIRST: pg_size}
+        if since:
+            history_args[ARG_SINCE] = since
         super().__init__(
             fields=[
                 QueryNode(
@@ -117,10 +124,7 @@ class RepositoryContributorContributions(PaginatedQuery):
                                             fields=[
                                                 QueryNodePaginator(
                                                     NODE_HISTORY,
-                                                    args={
-                                                        ARG_AUTHOR: github_id,
-                                                        ARG_FIRST: pg_size,
-                                                    },
+                                                    args=history_args,
                                                     fields=[
                                                         FIELD_TOTAL_COUNT,
                                                         QueryNode(
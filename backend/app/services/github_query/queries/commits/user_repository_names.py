@@ -28,6 +28,7 @@ from ..constants import (
     ARG_FIRST,
     NODE_OWNER,
     FIELD_LOGIN,
+    FIELD_IS_PRIVATE,
 )
 
 
@@ -61,6 +62,7 @@ class UserRepositoryNames(PaginatedQuery):
                                     NODE_NODES,
                                     fields=[
                                         FIELD_NAME,
+                                        FIELD_IS_PRIVATE,
                                         QueryNode(NODE_OWNER, fields=[FIELD_LOGIN]),
                                     ],
                                 ),
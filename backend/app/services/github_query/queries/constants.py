@@ -12,6 +12,7 @@ FIELD_BIO = "bio"
 FIELD_BODY_TEXT = "bodyText"
 FIELD_CHANGED_FILES_IF_AVAILABLE = "changedFilesIfAvailable"
 FIELD_COLOR = "color"
+FIELD_COMMITTED_DATE = "committedDate"
 FIELD_COMPANY = "company"
 FIELD_CONTRIBUTION_COUNT = "contributionCount"
 FIELD_CONTRIBUTION_YEARS = "contributionYears"
@@ -24,6 +25,7 @@ FIELD_EMAIL = "email"
 FIELD_END_CURSOR = "endCursor"
 FIELD_ENDED_AT = "endedAt"
 FIELD_HAS_NEXT_PAGE = "hasNextPage"
+FIELD_HAS_PREVIOUS_PAGE = "hasPreviousPage"
 FIELD_ID = "id"
 FIELD_OID = "oid"
 FIELD_IS_BOUNTY_HUNTER = "isBountyHunter"
@@ -33,6 +35,7 @@ FIELD_IS_EMPLOYEE = "isEmployee"
 FIELD_IS_EMPTY = "isEmpty"
 FIELD_IS_GITHUB_STAR = "isGitHubStar"
 FIELD_IS_HIREABLE = "isHireable"
+FIELD_IS_PRIVATE = "isPrivate"
 FIELD_IS_SITE_ADMIN = "isSiteAdmin"
 FIELD_LIMIT = "limit"
 FIELD_LOGIN = "login"
@@ -43,6 +46,7 @@ FIELD_REMAINING = "remaining"
 FIELD_RESET_AT = "resetAt"
 FIELD_RESTRICTED_CONTRIBUTIONS_COUNT = "restrictedContributionsCount"
 FIELD_SIZE = "size"
+FIELD_START_CURSOR = "startCursor"
 FIELD_STARTED_AT = "startedAt"
 FIELD_TITLE = "title"
 FIELD_TOTAL_COMMIT_CONTRIBUTIONS = "totalCommitContributions"
@@ -93,6 +97,7 @@ NODE_HISTORY = "history"
 NODE_ON = "... on "
 NODE_COMMIT = "Commit"
 NODE_PARENTS = "parents (first: 2)"
+NODE_COMMIT_PARENTS = "parents"
 NODE_REFS = "refs"
 NODE_REF = "ref"
 NODE_OWNER = "owner"
@@ -100,6 +105,9 @@ NODE_OWNER = "owner"
 # Argument names for GraphQL queries
 ARG_LOGIN = "login"
 ARG_FIRST = "first"
+ARG_LAST = "last"
+ARG_AFTER = "after"
+ARG_BEFORE = "before"
 ARG_IS_FORK = "isFork"
 ARG_OWNER_AFFILIATIONS = "ownerAffiliations"
 ARG_ORDER_BY = "orderBy"
@@ -113,3 +121,4 @@ ARG_NAME = "name"
 ARG_AUTHOR = "author"
 ARG_REF_PREFIX = "refPrefix"
 ARG_QUALIFIED_NAME = "qualifiedName"
+ARG_SINCE = "since"
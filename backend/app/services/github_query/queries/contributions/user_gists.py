@@ -8,10 +8,14 @@ Functions:
         Processes raw data to extract user gists information.
     created_before_time(gists: Dict[str, Any], time: str) -> int:
         Counts the gists created before a specified time.
+
+    count_query(login: str, pg_size: int = 100) -> CreatedAtWindow:
+        Builds a query that counts the nodes created in a time window, stopping once it passes the window.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from app.services.github_query.utils.helper import created_before
+from ..time_range_contributions.created_at_window import CreatedAtWindow
 from ..query import (
     QueryNode,
     PaginatedQuery,
@@ -114,3 +118,20 @@ class UserGists(PaginatedQuery):
             else:
                 break
         return counter
+
+    @staticmethod
+    def count_query(login: str, pg_size: int = 100, fields: Optional[List[Any]] = None) -> CreatedAtWindow:
+        """
+        Builds a query that walks the user's gists newest first, fetching only their creation times, so that
+        the gists created in a time window can be counted without paging through the user's whole history.
+        The gists are ordered by creation time, newest first.
+
+        Args:
+            login (str): GitHub username.
+            pg_size (int): Number of gists per page (default: 100).
+            fields (Optional[List[Any]]): Further node fields to fetch, e.g. to build table rows of the nodes.
+
+        Returns:
+            CreatedAtWindow: The counting query.
+        """
+        return CreatedAtWindow(login, NODE_GISTS, "CREATED_AT", pg_size, fields)
@@ -11,10 +11,14 @@ Functions:
         
     created_before_time(issues: Dict[str, Any], time: str) -> int:
         Counts the number of issues created before a specified time.
+
+    count_query(login: str, pg_size: int = 100) -> CreatedAtWindow:
+        Builds a query that counts the nodes created in a time window, stopping once it passes the window.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from app.services.github_query.utils.helper import created_before
+from ..time_range_contributions.created_at_window import CreatedAtWindow
 from ..query import (
     QueryNode,
     PaginatedQuery,
@@ -116,3 +120,20 @@ class UserIssues(PaginatedQuery):
             else:
                 break
         return counter
+
+    @staticmethod
+    def count_query(login: str, pg_size: int = 100, fields: Optional[List[Any]] = None) -> CreatedAtWindow:
+        """
+        Builds a query that walks the user's issues newest first, fetching only their creation times, so that
+        the issues created in a time window can be counted without paging through the user's whole history.
+        The issues are ordered by creation time, newest first.
+
+        Args:
+            login (str): GitHub username.
+            pg_size (int): Number of issues per page (default: 100).
+            fields (Optional[List[Any]]): Further node fields to fetch, e.g. to build table rows of the nodes.
+
+        Returns:
+            CreatedAtWindow: The counting query.
+        """
+        return CreatedAtWindow(login, NODE_ISSUES, "CREATED_AT", pg_size, fields)
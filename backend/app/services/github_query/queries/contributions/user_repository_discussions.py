@@ -7,10 +7,12 @@ Classes:
 Functions:
     user_repository_discussions(raw_data: Dict[str, Any]) -> List[Dict[str, Any]]:
     created_before_time(repository_discussions: Dict[str, Any], time: str) -> int:
+    count_query(login: str, pg_size: int = 100) -> CreatedAtWindow:
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from app.services.github_query.utils.helper import created_before
+from ..time_range_contributions.created_at_window import CreatedAtWindow
 from ..query import (
     QueryNode,
     PaginatedQuery,
@@ -111,3 +113,21 @@ class UserRepositoryDiscussions(PaginatedQuery):
             else:
                 break
         return counter
+
+    @staticmethod
+    def count_query(login: str, pg_size: int = 100, fields: Optional[List[Any]] = None) -> CreatedAtWindow:
+        """
+        Builds a query that walks the user's repository discussions newest first, fetching only their creation times,
+        so that the repository discussions created in a time window can be counted without paging through the user's
+        whole history.
+        The repository discussions are ordered by creation time, newest first.
+
+        Args:
+            login (str): GitHub username.
+            pg_size (int): Number of repository discussions per page (default: 100).
+            fields (Optional[List[Any]]): Further node fields to fetch, e.g. to build table rows of the nodes.
+
+        Returns:
+            CreatedAtWindow: The counting query.
+        """
+        return CreatedAtWindow(login, NODE_REPOSITORY_DISCUSSIONS, "CREATED_AT", pg_size, fields)
@@ -5,10 +5,12 @@ Classes:
     UserLogin: Constructs a GraphQL query to fetch a specific user's profile information using their login name.
 Functions:
     UserLoginViewer.profile_stats: Processes raw GraphQL query data and extracts user login details.
+    UserLoginViewer.identity: Builds a query that fetches only the login and node id of the authenticated user.
+    UserLogin.batch: Builds one aliased query that fetches the login information of several users.
 """
 
-from typing import Dict, Any
-from ..query import QueryNode, Query
+from typing import Dict, Any, List
+from ..query import QueryNode, Query, BatchQuery
 from ..constants import (
     NODE_VIEWER,
     NODE_USER,
@@ -86,6 +88,17 @@ class UserLoginViewer(Query):
             ]
         )
 
+    @staticmethod
+    def identity() -> Query:
+        """
+        Builds a query that fetches only the login and node id of the authenticated user, which identify the viewer
+        a token belongs to.
+
+        Returns:
+            Query: The query.
+        """
+        return Query(fields=[QueryNode(NODE_VIEWER, fields=[FIELD_LOGIN, FIELD_ID])])
+
     @staticmethod
     def profile_stats(raw_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -130,9 +143,12 @@ class UserLoginViewer(Query):
 class UserLogin(Query):
     """
     UserLogin is a subclass of Query designed to fetch a specific user's login and
-    other profile information using the 'user' field in a GraphQL query.
+    other profile information using the 'user' field in a GraphQL query. The fields are public profile fields, so
+    the result is the same for every viewer.
     """
 
+    viewer_independent = True
+
     def __init__(self, login: str) -> None:
         """
         Initializes a GraphQL query to retrieve specified user information, including login, name, ID, email,
@@ -158,3 +174,16 @@ class UserLogin(Query):
                 )
             ]
         )
+
+    @classmethod
+    def batch(cls, logins: List[str]) -> BatchQuery:
+        """
+        Builds one query that fetches the login information of several users, aliasing each user node.
+
+        Args:
+            logins (List[str]): The GitHub usernames of the users.
+
+        Returns:
+            BatchQuery: The batched query. Use its split method to get the raw data per login.
+        """
+        return BatchQuery([cls(login) for login in logins])
@@ -10,10 +10,12 @@ Functions:
     UserProfileStats.profile_stats(raw_data: Dict[str, Any]) -> Dict[str, Any]:
         Processes the raw data returned from a GraphQL query about a user's profile and extracts
         specific statistics, formatting the data into a simplified dictionary structure.
+    UserProfileStats.batch(logins: List[str]) -> BatchQuery:
+        Builds one aliased query that fetches the profile statistics of several users.
 """
 
-from typing import Dict, Any
-from ..query import QueryNode, Query
+from typing import Dict, Any, List
+from ..query import QueryNode, Query, BatchQuery
 from ..constants import (
     FIELD_LOGIN,
     FIELD_NAME,
@@ -94,6 +96,19 @@ class UserProfileStats(Query):
             ]
         )
 
+    @classmethod
+    def batch(cls, logins: List[str]) -> BatchQuery:
+        """
+        Builds one query that fetches the profile statistics of several users, aliasing each user node.
+
+        Args:
+            logins (List[str]): The GitHub usernames of the users.
+
+        Returns:
+            BatchQuery: The batched query. Use its split method to get the raw data for profile_stats per login.
+        """
+        return BatchQuery([cls(login) for login in logins])
+
     @staticmethod
     def profile_stats(raw_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -1,10 +1,52 @@
-"""The module defines four query-related classes that are used to generate GraphQL query strings
+"""The module defines five query-related classes that are used to generate GraphQL query strings
 in an object-oriented way."""
 
-from typing import Union, List, Dict, Tuple, Optional
+import json
+from typing import Any, Union, List, Dict, Tuple, Optional
 from datetime import datetime
 from collections import deque
 
+# Arguments whose values are always string literals
+QUOTED_ARGS = ("login", "owner", "name", "qualifiedName")
+
+# Scalar arguments that compiled documents declare as variables, with their GraphQL types
+VARIABLE_TYPES = {
+    "login": "String!",
+    "owner": "String!",
+    "name": "String!",
+    "qualifiedName": "String!",
+    "refPrefix": "String!",
+    "first": "Int",
+    "last": "Int",
+    "after": "String",
+    "before": "String",
+    "from": "DateTime",
+    "to": "DateTime",
+    "isFork": "Boolean",
+    "since": "GitTimestamp",
+}
+
+
+def _variable_value(value: Any, var_type: str) -> Any:
+    """
+    Converts an argument value as stored on a node into its JSON variable value. Values that were pre-quoted for
+    string rendering (e.g. '"2024-01-01T00:00:00Z"' or the paginator's cursor) are unquoted.
+
+    Args:
+        value (Any): The argument value.
+        var_type (str): The GraphQL type of the variable.
+
+    Returns:
+        Any: The variable value.
+    """
+    if isinstance(value, str) and len(value) >= 2 and value[0] == value[-1] == '"':
+        value = value[1:-1]
+    if value == "" and var_type == "String":
+        return None
+    if var_type == "Int" and isinstance(value, str):
+        return int(value)
+    return value
+
 
 class InvalidQueryException(Exception):
     """
@@ -69,6 +111,28 @@ class QueryNode:
             self.fields = fields
         self.args = args
 
+    def _format_arg(self, key: str, value) -> str:
+        """
+        Formats a single argument into GraphQL syntax. String arguments that identify users, repositories and refs are
+        emitted as escaped JSON string literals; other values are emitted as given.
+
+        Args:
+            key (str): The name of the argument.
+            value: The value of the argument.
+
+        Returns:
+            str: The argument formatted for a GraphQL query.
+        """
+        if key in QUOTED_ARGS:
+            return f"{key}: {json.dumps(value)}"
+        if isinstance(value, list):
+            return f'{key}: [{", ".join(value)}]'
+        if isinstance(value, dict):
+            return f"{key}: " + "{" + ", ".join(f"{k}: {v}" for k, v in value.items()) + "}"
+        if isinstance(value, bool):
+            return f"{key}: {str(value).lower()}"
+        return f"{key}: {value}"
+
     def _format_args(self) -> str:
         """
         Formats the arguments of the QueryNode into a string suitable for inclusion in a GraphQL query.
@@ -80,32 +144,51 @@ class QueryNode:
         if self.args is None:
             return ""
 
-        args_list = []
-        for key, value in self.args.items():
-            if key == "login":
-                args_list.append(f'{key}: "{value}"')
-            elif key == "owner":
-                args_list.append(f'{key}: "{value}"')
-            elif key == "name":
-                args_list.append(f'{key}: "{value}"')
-            elif key == "qualifiedName":
-                args_list.append(f'{key}: "{value}"')
-            elif isinstance(value, list):
-                args_list.append(f'{key}: [{", ".join(value)}]')
-            elif isinstance(value, dict):
-                args_list.append(
-                    f"{key}: "
-                    + "{"
-                    + ", ".join(f"{key}: {v}" for key, v in value.items())
-                    + "}"
-                )
-            elif isinstance(value, bool):
-                args_list.append(f"{key}: {str(value).lower()}")
-            else:
-                args_list.append(f"{key}: {value}")
-
+        args_list = [self._format_arg(key, value) for key, value in self.args.items()]
         return "(" + ", ".join(args_list) + ")"
 
+    def _variable_args(self) -> Dict:
+        """
+        Returns the arguments to compile into a document. Subclasses add arguments that must always be declared.
+
+        Returns:
+            Dict: The arguments of the node.
+        """
+        return dict(self.args or {})
+
+    def _compile(
+        self, bindings: List[Tuple[str, str, "QueryNode", str]], names: Dict[str, int]
+    ) -> str:
+        """
+        Renders the node with its scalar arguments replaced by variable references, recording each variable.
+
+        Args:
+            bindings (List[Tuple[str, str, QueryNode, str]]): Collects (variable, type, node, argument) for every
+            variable that is introduced.
+            names (Dict[str, int]): The number of variables introduced so far per argument name, used to keep variable
+            names unique.
+
+        Returns:
+            str: The node formatted for a GraphQL document.
+        """
+        args_list = []
+        for key, value in self._variable_args().items():
+            var_type = VARIABLE_TYPES.get(key)
+            if var_type is None or isinstance(value, (list, dict)):
+                args_list.append(self._format_arg(key, value))
+                continue
+            count = names.get(key, 0)
+            names[key] = count + 1
+            variable = key if count == 0 else f"{key}_{count}"
+            bindings.append((variable, var_type, self, key))
+            args_list.append(f"{key}: ${variable}")
+        args = "(" + ", ".join(args_list) + ")" if args_list else ""
+        fields = " ".join(
+            field._compile(bindings, names) if isinstance(field, QueryNode) else field
+            for field in self.fields
+        )
+        return f"{self.name}{args} {{ {fields} }}"
+
     def _format_fields(self) -> str:
         """
         Formats the fields of the QueryNode into a string suitable for inclusion in a GraphQL query.
@@ -159,8 +242,54 @@ class Query(QueryNode):
     """
     Query is a subclass of QueryNode specifically designed to represent a complete, executable GraphQL query.
     It provides additional functionality for formatting and substituting values in preparation for execution.
+    The query is compiled once into a GraphQL document whose scalar arguments ($login, $first, $after, ...) are
+    variables, so executing further pages only re-reads the variable values.
     """
 
+    # Whether the result is the same for every viewer, so identical requests of different users can share it
+    viewer_independent = False
+    _compiled: Optional[Tuple[str, List[Tuple[str, str, "QueryNode", str]]]] = None
+
+    def _compile_document(self) -> Tuple[str, List[Tuple[str, str, "QueryNode", str]]]:
+        """
+        Compiles the query into a document with variables, once per query instance.
+
+        Returns:
+            Tuple[str, List[Tuple[str, str, QueryNode, str]]]: The document and its variable bindings.
+        """
+        if self._compiled is None:
+            bindings = []
+            body = self._compile(bindings, {})
+            if bindings:
+                declarations = ", ".join(
+                    f"${variable}: {var_type}" for variable, var_type, _, _ in bindings
+                )
+                # The operation name is rendered without arguments, the declarations take their place
+                body = f"{self.name}({declarations})" + body[len(self.name) :]
+            self._compiled = (body, bindings)
+        return self._compiled
+
+    def get_document(self) -> str:
+        """
+        Returns the GraphQL document of the query, with scalar arguments declared as variables.
+
+        Returns:
+            str: The GraphQL document.
+        """
+        return self._compile_document()[0]
+
+    def get_variables(self) -> Dict[str, Any]:
+        """
+        Returns the current values of the document's variables, including the pagination cursor.
+
+        Returns:
+            Dict[str, Any]: The variables payload of the request.
+        """
+        variables = {}
+        for variable, var_type, node, key in self._compile_document()[1]:
+            variables[variable] = _variable_value((node.args or {}).get(key), var_type)
+        return variables
+
     @staticmethod
     def test_time_format(time_string: str) -> bool:
         """
@@ -179,6 +308,58 @@ class Query(QueryNode):
             return False
 
 
+class BatchQuery(Query):
+    """
+    BatchQuery folds several single-root queries into one GraphQL document. The root node of every query is given a
+    field alias (u0, u1, ...) so that, for example, N `user(login: ...)` lookups cost one HTTP round trip, and the
+    response is split back into the raw data each query would have received on its own.
+    """
+
+    def __init__(self, queries: List[Query], alias_prefix: str = "u") -> None:
+        """
+        Initializes a BatchQuery from a list of queries that each have exactly one root node.
+
+        Args:
+            queries (List[Query]): The queries to fold into one document.
+            alias_prefix (str): The prefix of the aliases given to the root nodes.
+
+        Raises:
+            InvalidQueryException: If the list is empty or a query does not have exactly one root node.
+        """
+        if not queries:
+            raise InvalidQueryException("A batch query needs at least one query")
+        fields = []
+        self.roots = []
+        for index, query in enumerate(queries):
+            if len(query.fields) != 1 or not isinstance(query.fields[0], QueryNode):
+                raise InvalidQueryException(
+                    "Only queries with a single root node can be batched"
+                )
+            root = query.fields[0]
+            alias = f"{alias_prefix}{index}"
+            fields.append(QueryNode(f"{alias}: {root.name}", root.fields, root.args))
+            self.roots.append((alias, root.name))
+        super().__init__(fields=fields)
+        self.viewer_independent = all(query.viewer_independent for query in queries)
+
+    def split(self, raw_data: Dict) -> List[Optional[Dict]]:
+        """
+        Splits the response of the batch back into one raw response per query, in the order the queries were given.
+
+        Args:
+            raw_data (Dict): The data returned for the batch query.
+
+        Returns:
+            List[Optional[Dict]]: The raw data of each query shaped as if it had been executed alone, or None where
+            the root node resolved to null (e.g. the user does not exist).
+        """
+        results = []
+        for alias, name in self.roots:
+            node = raw_data.get(alias)
+            results.append(None if node is None else {name: node})
+        return results
+
+
 class QueryNodePaginator(QueryNode):
     """
     QueryNodePaginator is a specialized version of QueryNode designed specifically for paginated requests.
@@ -222,6 +403,18 @@ class QueryNodePaginator(QueryNode):
             end_cursor = ""
         self.args.update({"after": '"' + end_cursor + '"'})
 
+    def _variable_args(self) -> Dict:
+        """
+        Returns the arguments to compile into a document, always including the cursor so that every page is served
+        by the same document.
+
+        Returns:
+            Dict: The arguments of the node.
+        """
+        args = super()._variable_args()
+        args.setdefault("after", None)
+        return args
+
     def has_next(self) -> bool:
         """
         Checks whether there is a next page available based on the current pagination state.
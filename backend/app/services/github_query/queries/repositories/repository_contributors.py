@@ -9,9 +9,11 @@ Classes:
 Functions:
     extract_unique_author: Static method to process raw data from the GraphQL query and extract unique authors
     from the repository's commit history.
+    head: Static method to extract the OID and commit date of the head of the default branch.
+    history_commits: Static method to extract the OIDs and parent OIDs of the commits of a page of the history.
 """
 
-from typing import Dict, Set, Optional
+from typing import Dict, List, Set, Optional, Tuple
 from ..query import (
     QueryNode,
     PaginatedQuery,
@@ -21,11 +23,13 @@ from ..constants import (
     ARG_FIRST,
     ARG_NAME,
     ARG_OWNER,
+    FIELD_COMMITTED_DATE,
     FIELD_END_CURSOR,
     FIELD_HAS_NEXT_PAGE,
     FIELD_LOGIN,
     FIELD_EMAIL,
     FIELD_NAME,
+    FIELD_OID,
     FIELD_TOTAL_COUNT,
     NODE_AUTHOR,
     NODE_DEFAULT_BRANCH_REF,
@@ -37,8 +41,12 @@ from ..constants import (
     NODE_USER,
     NODE_ON,
     NODE_COMMIT,
+    NODE_COMMIT_PARENTS,
 )
 
+# Above the number of parents of any merge commit in practice, so the parents of a commit fit in one page
+MAX_PARENTS = 100
+
 
 class RepositoryContributors(PaginatedQuery):
     """
@@ -46,7 +54,12 @@ class RepositoryContributors(PaginatedQuery):
     It extends PaginatedQuery to handle potentially large numbers of contributors.
     """
 
-    def __init__(self, owner: str, repo_name: str, pg_size: int = 50) -> None:
+    def __init__(
+        self,
+        owner: str,
+        repo_name: str,
+        pg_size: int = 50,
+    ) -> None:
         """
         Initializes a query to retrieve repository contributors.
 
@@ -74,6 +87,8 @@ class RepositoryContributors(PaginatedQuery):
                                             NODE_ON
                                             + NODE_COMMIT,  # Inline fragment on Commit type
                                             fields=[
+                                                FIELD_OID,  # OID of the head commit
+                                                FIELD_COMMITTED_DATE,  # Commit date of the head commit
                                                 QueryNodePaginator(
                                                     NODE_HISTORY,  # Paginated history of commits
                                                     args={ARG_FIRST: pg_size},
@@ -82,6 +97,14 @@ class RepositoryContributors(PaginatedQuery):
                                                         QueryNode(
                                                             NODE_NODES,  # List of commit nodes
                                                             fields=[
+                                                                FIELD_OID,  # OID of the commit
+                                                                QueryNode(
+                                                                    NODE_COMMIT_PARENTS,  # Parents of the commit
+                                                                    args={ARG_FIRST: MAX_PARENTS},
+                                                                    fields=[
+                                                                        QueryNode(NODE_NODES, fields=[FIELD_OID])
+                                                                    ],
+                                                                ),
                                                                 QueryNode(
                                                                     NODE_AUTHOR,  # Author of the commit
                                                                     fields=[
@@ -119,7 +142,9 @@ class RepositoryContributors(PaginatedQuery):
 
     @staticmethod
     def extract_unique_author(
-        raw_data: Dict[str, Dict], unique_authors: Optional[Dict[str, Set[str]]] = None
+        raw_data: Dict[str, Dict],
+        unique_authors: Optional[Dict[str, Set[str]]] = None,
+        oids: Optional[Set[str]] = None,
     ) -> Dict[str, Set[str]]:
         """
         Processes the raw data to extract unique contributors from the repository's commit history.
@@ -127,6 +152,7 @@ class RepositoryContributors(PaginatedQuery):
         Args:
             raw_data (dict): The raw data returned from the GraphQL query.
             unique_authors (dict, optional): Dictionary to accumulate unique contributors' names and logins.
+            oids (set, optional): Only the authors of the commits with these OIDs are extracted.
 
         Returns:
             dict: A dictionary containing sets of unique author names and logins.
@@ -139,6 +165,8 @@ class RepositoryContributors(PaginatedQuery):
 
         # Process each commit node to accumulate unique author data
         for node in nodes:
+            if oids is not None and node.get(FIELD_OID) not in oids:
+                continue
             author = node[NODE_AUTHOR]
             name = author[FIELD_NAME]
             login = author[NODE_USER][FIELD_LOGIN] if author[NODE_USER] else None
@@ -149,3 +177,43 @@ class RepositoryContributors(PaginatedQuery):
                 unique_authors[FIELD_LOGIN].add(login)
 
         return unique_authors
+
+    @staticmethod
+    def head(raw_data: Dict[str, Dict]) -> Optional[Tuple[str, str]]:
+        """
+        Extracts the head of the repository's default branch.
+
+        Args:
+            raw_data (dict): The raw data returned from the GraphQL query.
+
+        Returns:
+            Optional[Tuple[str, str]]: The OID and the commit date of the head commit, or None if the repository has
+            no default branch (e.g. an empty repository).
+        """
+        branch = raw_data[NODE_REPOSITORY][NODE_DEFAULT_BRANCH_REF]
+        if not branch:
+            return None
+        return branch[NODE_TARGET][FIELD_OID], branch[NODE_TARGET][FIELD_COMMITTED_DATE]
+
+    @staticmethod
+    def history_commits(raw_data: Dict[str, Dict]) -> List[Tuple[str, List[str]]]:
+        """
+        Extracts the commits of a page of the default branch's history.
+
+        Args:
+            raw_data (dict): The raw data returned from the GraphQL query.
+
+        Returns:
+            List[Tuple[str, List[str]]]: The OID of every commit and the OIDs of its parents, in history order.
+        """
+        nodes = raw_data[NODE_REPOSITORY][NODE_DEFAULT_BRANCH_REF][NODE_TARGET][
+            NODE_HISTORY
+        ][NODE_NODES]
+        return [
+            (
+                node[FIELD_OID],
+                [parent[FIELD_OID] for parent in (node.get(NODE_COMMIT_PARENTS) or {}).get(NODE_NODES) or []],
+            )
+            for node in nodes
+            if node.get(FIELD_OID)
+        ]
@@ -1,13 +1,16 @@
 """
 This module initializes the time_range_contribution package by importing the
 UserContributionsCollection class, which is used to collect user contributions
-within a specified time range.
+within a specified time range, and the CreatedAtWindow class, which counts the
+nodes of a user's connection created within a time range.
 """
 
 from .user_contributions_collection import UserContributionsCollection
 from .user_contribution_calendar import UserContributionCalendar
+from .created_at_window import CreatedAtWindow
 
 __all__ = [
     "UserContributionsCollection",
     "UserContributionCalendar",
+    "CreatedAtWindow",
 ]
@@ -0,0 +1,226 @@
+"""
+This module defines the CreatedAtWindow class, which constructs a GraphQL query that walks one of a GitHub user's
+connections (issues, pull requests, gists, discussions or comments) from the newest node to the oldest, fetching only
+the creation time of each node. It lets the nodes created in a time window be counted while stopping as soon as the
+walk passes the start of the window, instead of reading the user's whole history.
+Classes:
+    CreatedAtWindow: Constructs the query, advances its cursor and counts the nodes of a page inside a time window.
+Methods:
+    __init__(login: str, connection: str, order_field: Optional[str] = None, pg_size: int = 100,
+    fields: Optional[List[Any]] = None): Initializes the query for the given connection.
+    nodes(raw_data: Dict[str, Any]) -> List[Dict[str, Any]]: Returns the nodes of a page, newest first.
+    next_page(raw_data: Dict[str, Any]) -> bool: Moves the cursor to the next (older) page.
+    cursor -> Optional[str]: The cursor the next request starts from.
+    resume_from(cursor: str) -> None: Moves the cursor to a page reached by an earlier walk.
+    order_time(node: Dict[str, Any]) -> str: Returns the time a node is ordered by.
+    count_in_window(raw_data: Dict[str, Any], start: str, end: str) -> Tuple[int, bool]: Counts the nodes of a page
+    created in the window and reports whether the walk has passed the start of the window.
+    nodes_since(raw_data: Dict[str, Any], since: Optional[str]) -> Tuple[List[Dict[str, Any]], bool]: Returns the
+    nodes of a page ordered at or after a high-water mark and reports whether the walk has passed the mark.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from ..query import Query, QueryNode
+from ..constants import (
+    ARG_LOGIN,
+    ARG_FIRST,
+    ARG_LAST,
+    ARG_AFTER,
+    ARG_BEFORE,
+    ARG_ORDER_BY,
+    ARG_FIELD,
+    ARG_DIRECTION,
+    NODE_USER,
+    NODE_NODES,
+    NODE_PAGE_INFO,
+    FIELD_CREATED_AT,
+    FIELD_UPDATED_AT,
+    FIELD_END_CURSOR,
+    FIELD_HAS_NEXT_PAGE,
+    FIELD_START_CURSOR,
+    FIELD_HAS_PREVIOUS_PAGE,
+)
+
+
+class CreatedAtWindow(Query):
+    """
+    CreatedAtWindow constructs a query over one connection of a user, newest node first. Connections that can be
+    ordered by creation time are read in descending order. Connections without an order argument (commit, gist and
+    discussion comments) list their nodes oldest first, so they are read backwards with last/before. Issue comments
+    can only be ordered by update time; a node is never updated before it is created, so the walk can still stop at
+    the first node updated before the window.
+    """
+
+    def __init__(
+        self,
+        login: str,
+        connection: str,
+        order_field: Optional[str] = None,
+        pg_size: int = 100,
+        fields: Optional[List[Any]] = None,
+    ) -> None:
+        """
+        Initializes the query for the given connection.
+
+        Args:
+            login (str): GitHub username.
+            connection (str): The connection of the user node, e.g. "issues" or "commitComments".
+            order_field (Optional[str]): The field the connection is ordered by in descending order, "CREATED_AT" or
+            "UPDATED_AT". None reads an unordered connection backwards.
+            pg_size (int): Number of nodes per page (default: 100).
+            fields (Optional[List[Any]]): Further node fields to fetch with the creation time, e.g. to build table
+            rows of the nodes that are newer than a high-water mark.
+        """
+        self.connection = connection
+        self.order_field = order_field
+        self.backwards = order_field is None
+        if self.backwards:
+            args = {ARG_LAST: pg_size, ARG_BEFORE: None}
+            page_info = [FIELD_START_CURSOR, FIELD_HAS_PREVIOUS_PAGE]
+        else:
+            args = {
+                ARG_FIRST: pg_size,
+                ARG_ORDER_BY: {ARG_FIELD: order_field, ARG_DIRECTION: "DESC"},
+                ARG_AFTER: None,
+            }
+            page_info = [FIELD_END_CURSOR, FIELD_HAS_NEXT_PAGE]
+        node_fields = [FIELD_CREATED_AT]
+        if order_field == "UPDATED_AT":
+            node_fields.append(FIELD_UPDATED_AT)
+        node_fields.extend(field for field in fields or [] if field not in node_fields)
+        self.connection_node = QueryNode(
+            connection,
+            args=args,
+            fields=[
+                QueryNode(NODE_NODES, fields=node_fields),
+                QueryNode(NODE_PAGE_INFO, fields=page_info),
+            ],
+        )
+        super().__init__(
+            fields=[
+                QueryNode(
+                    NODE_USER,
+                    args={ARG_LOGIN: login},
+                    fields=[self.connection_node],
+                )
+            ]
+        )
+
+    def _connection(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+        return (raw_data.get(NODE_USER) or {}).get(self.connection) or {}
+
+    def nodes(self, raw_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Returns the nodes of a page, newest first.
+
+        Args:
+            raw_data (Dict[str, Any]): The raw data returned by the query.
+
+        Returns:
+            List[Dict[str, Any]]: The nodes with their creation (and update) times.
+        """
+        nodes = self._connection(raw_data).get(NODE_NODES) or []
+        return nodes[::-1] if self.backwards else nodes
+
+    def next_page(self, raw_data: Dict[str, Any]) -> bool:
+        """
+        Moves the cursor to the next, older page.
+
+        Args:
+            raw_data (Dict[str, Any]): The raw data of the current page.
+
+        Returns:
+            bool: True if there is an older page.
+        """
+        page_info = self._connection(raw_data).get(NODE_PAGE_INFO) or {}
+        if self.backwards:
+            has_more, cursor, arg = (
+                page_info.get(FIELD_HAS_PREVIOUS_PAGE),
+                page_info.get(FIELD_START_CURSOR),
+                ARG_BEFORE,
+            )
+        else:
+            has_more, cursor, arg = (
+                page_info.get(FIELD_HAS_NEXT_PAGE),
+                page_info.get(FIELD_END_CURSOR),
+                ARG_AFTER,
+            )
+        if not has_more or not cursor:
+            return False
+        self.connection_node.args[arg] = cursor
+        return True
+
+    @property
+    def cursor(self) -> Optional[str]:
+        """The cursor the next request starts from, None for the newest page."""
+        return self.connection_node.args[ARG_BEFORE if self.backwards else ARG_AFTER]
+
+    def resume_from(self, cursor: str) -> None:
+        """
+        Moves the cursor to a page reached by an earlier walk, e.g. one saved in a job's checkpoint.
+
+        Args:
+            cursor (str): The cursor returned by an earlier walk.
+        """
+        self.connection_node.args[ARG_BEFORE if self.backwards else ARG_AFTER] = cursor
+
+    def order_time(self, node: Dict[str, Any]) -> str:
+        """
+        Returns the time a node is ordered by: its update time for connections ordered by update time, its creation
+        time otherwise.
+
+        Args:
+            node (Dict[str, Any]): A node of the connection.
+
+        Returns:
+            str: The time formatted as "%Y-%m-%dT%H:%M:%SZ".
+        """
+        if self.order_field == "UPDATED_AT":
+            return node[FIELD_UPDATED_AT]
+        return node[FIELD_CREATED_AT]
+
+    def count_in_window(
+        self, raw_data: Dict[str, Any], start: str, end: str
+    ) -> Tuple[int, bool]:
+        """
+        Counts the nodes of a page created in a time window.
+
+        Args:
+            raw_data (Dict[str, Any]): The raw data of the page.
+            start (str): Start of the window formatted as "%Y-%m-%dT%H:%M:%SZ".
+            end (str): End of the window formatted as "%Y-%m-%dT%H:%M:%SZ".
+
+        Returns:
+            Tuple[int, bool]: The number of nodes created in the window, and whether the page reached a node ordered
+            before the start of the window, after which no older node can be in the window.
+        """
+        counter = 0
+        for node in self.nodes(raw_data):
+            if self.order_time(node) < start:
+                return counter, True
+            if start <= node[FIELD_CREATED_AT] <= end:
+                counter += 1
+        return counter, False
+
+    def nodes_since(
+        self, raw_data: Dict[str, Any], since: Optional[str]
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Returns the nodes of a page that are ordered at or after a high-water mark, e.g. the creation time of the
+        newest node already saved. Nodes ordered exactly at the mark are returned again, so that nodes created in
+        the same second as the mark are not missed.
+
+        Args:
+            raw_data (Dict[str, Any]): The raw data of the page.
+            since (Optional[str]): The mark formatted as "%Y-%m-%dT%H:%M:%SZ". None returns every node.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], bool]: The nodes, newest first, and whether the page reached a node ordered
+            before the mark, after which no older node is newer than the mark.
+        """
+        nodes = []
+        for node in self.nodes(raw_data):
+            if since and self.order_time(node) < since:
+                return nodes, True
+            nodes.append(node)
+        return nodes, False
@@ -9,9 +9,11 @@ Classes:
 Functions:
     user_contribution_calendar: Static method to process raw data from the query and aggregate
                                 the contributions into a countable collection.
+    windows: Class method that builds one query fetching the calendars of several time windows.
+    windows_calendars: Class method that extracts the join date and calendar of each window.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from collections import Counter
 from ..query import Query, QueryNode
 from ..constants import (
@@ -103,6 +105,59 @@ class UserContributionCalendar(Query):
             ]
         )
 
+    @classmethod
+    def windows(cls, login: str, windows: List[Tuple[str, str]]) -> Query:
+        """
+        Builds one query that fetches the contribution calendar of a user in several time windows. A calendar spans
+        at most one year, so a longer range is split into windows, and each window is an aliased
+        contributionsCollection (w0, w1, ...) of the same user node.
+
+        Args:
+            login (str): The GitHub username of the user.
+            windows (List[Tuple[str, str]]): The (start, end) pairs of the windows.
+
+        Returns:
+            Query: The query. Use windows_calendars to process its raw data.
+        """
+        collection = cls(login).fields[0].fields[0]
+        return Query(
+            fields=[
+                QueryNode(
+                    NODE_USER,
+                    args={ARG_LOGIN: login},
+                    fields=[
+                        QueryNode(
+                            f"w{index}: {NODE_CONTRIBUTIONS_COLLECTION}",
+                            args={ARG_FROM: start, ARG_TO: end},
+                            fields=collection.fields,
+                        )
+                        for index, (start, end) in enumerate(windows)
+                    ],
+                )
+            ]
+        )
+
+    @classmethod
+    def windows_calendars(cls, raw_data: Dict[str, Any]) -> List[Tuple[dict, list]]:
+        """
+        Processes the raw data of a windows query into the join date and calendar of each window.
+
+        Args:
+            raw_data (Dict[str, Any]): The response from the GraphQL API.
+
+        Returns:
+            List[Tuple[dict, list]]: The join date and weekly calendar of each window, in the order the windows were
+            given. The join date is empty unless the user joined within the window.
+        """
+        user = raw_data[NODE_USER]
+        windows = []
+        while f"w{len(windows)}" in user:
+            join_date, calendar, _ = cls.user_contribution_calendar(
+                {NODE_USER: {NODE_CONTRIBUTIONS_COLLECTION: user[f"w{len(windows)}"]}}
+            )
+            windows.append((join_date, calendar))
+        return windows
+
     @staticmethod
     def user_contribution_calendar(raw_data: Dict[str, Any]) -> Counter:
         """
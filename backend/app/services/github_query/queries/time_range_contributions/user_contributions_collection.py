@@ -11,16 +11,23 @@ Methods:
     range.
     user_contributions_collection(raw_data: Dict[str, Any]) -> Counter: Processes the raw data from the GraphQL API to 
     extract and count user contributions.
+    batch(logins: List[str], start: str, end: str) -> BatchQuery: Builds one aliased query that fetches the
+    contributions of several users.
+    windows(login: str, windows: List[Tuple[str, str]], created_at: bool = True) -> Query: Builds one query that
+    fetches the contributions of a user in several time windows and, unless it is already known, their creation time.
+    windows_contributions(raw_data: Dict[str, Any]) -> Tuple[str, List[Counter]]: Extracts the contributions of each
+    window.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from collections import Counter
-from ..query import Query, QueryNode
+from ..query import Query, QueryNode, BatchQuery
 from ..constants import (
     ARG_LOGIN,
     ARG_FROM,
     ARG_TO,
     NODE_USER,
+    FIELD_CREATED_AT,
     NODE_CONTRIBUTIONS_COLLECTION,
     FIELD_STARTED_AT,
     FIELD_ENDED_AT,
@@ -81,6 +88,83 @@ class UserContributionsCollection(Query):
             ]
         )
 
+    @classmethod
+    def batch(cls, logins: List[str], start: str, end: str) -> BatchQuery:
+        """
+        Builds one query that fetches the contributions of several users over the same time period,
+        aliasing each user node.
+
+        Args:
+            logins (List[str]): GitHub usernames.
+            start (str): Start date for fetching contributions.
+            end (str): End date for fetching contributions.
+
+        Returns:
+            BatchQuery: The batched query. Use its split method to get the raw data for
+            user_contributions_collection per login.
+        """
+        return BatchQuery([cls(login, start, end) for login in logins])
+
+    @classmethod
+    def windows(
+        cls, login: str, windows: List[Tuple[str, str]], created_at: bool = True
+    ) -> Query:
+        """
+        Builds one query that fetches the contributions of a user in several time windows and their creation time.
+        contributionsCollection spans at most one year, so a longer range is split into windows, and each window is
+        an aliased contributionsCollection (w0, w1, ...) of the same user node.
+
+        Args:
+            login (str): GitHub username.
+            windows (List[Tuple[str, str]]): The (start, end) pairs of the windows.
+            created_at (bool): Whether the creation time is fetched as well. Callers that already know it skip it.
+
+        Returns:
+            Query: The query. Use windows_contributions to process its raw data.
+        """
+        collection = cls(login, "", "").fields[0].fields[0]
+        return Query(
+            fields=[
+                QueryNode(
+                    NODE_USER,
+                    args={ARG_LOGIN: login},
+                    fields=([FIELD_CREATED_AT] if created_at else [])
+                    + [
+                        QueryNode(
+                            f"w{index}: {NODE_CONTRIBUTIONS_COLLECTION}",
+                            args={ARG_FROM: start, ARG_TO: end},
+                            fields=collection.fields,
+                        )
+                        for index, (start, end) in enumerate(windows)
+                    ],
+                )
+            ]
+        )
+
+    @classmethod
+    def windows_contributions(
+        cls, raw_data: Dict[str, Any]
+    ) -> Tuple[str, List[Counter]]:
+        """
+        Processes the raw data of a windows query into the contributions of each window.
+
+        Args:
+            raw_data (dict): The response from the GraphQL API.
+
+        Returns:
+            Tuple[str, List[Counter]]: The creation time of the user, or None if it was not fetched, and the
+            contribution counts of each window, in the order the windows were given.
+        """
+        user = raw_data[NODE_USER]
+        windows = []
+        while f"w{len(windows)}" in user:
+            windows.append(
+                cls.user_contributions_collection(
+                    {NODE_USER: {NODE_CONTRIBUTIONS_COLLECTION: user[f"w{len(windows)}"]}}
+                )
+            )
+        return user.get(FIELD_CREATED_AT), windows
+
     @staticmethod
     def user_contributions_collection(raw_data: Dict[str, Any]) -> Counter:
         """
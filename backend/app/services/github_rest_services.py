@@ -0,0 +1,205 @@
+"""
+This module provides the GitHub REST API helpers used next to the GraphQL services: fetching a resource with retries
+paced by the rate-limit scheduler, and turning a REST commit into the commit details the application stores.
+
+Functions:
+    fetch_with_retries(url: str, headers: dict, max_retries: int = MAX_RETRIES, timeout: int = 15, max_wait: Optional[float] = DEFAULT_MAX_WAIT) -> dict:
+    process_commit_details(commit: dict) -> dict:
+    can_access_repository(protocol: str, host: str, owner: str, repo: str, token: str, timeout: int = 10) -> bool:
+
+Constants:
+    MAX_RETRIES: Maximum number of retry attempts for fetching data.
+    INITIAL_RETRY_DELAY: Initial delay in seconds before retrying a failed request.
+    REPOSITORY_ACCESS_TTL: The number of seconds a granted repository access is remembered for.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+from requests.exceptions import Timeout, RequestException
+
+from .github_query.graphql_client import get_session
+from .language_classifier import classify_language
+from .github_query.graphql_client.scheduler import (
+    DEFAULT_MAX_WAIT,
+    get_scheduler,
+    rate_limit_response,
+)
+
+MAX_RETRIES = 3
+INITIAL_RETRY_DELAY = 2
+REPOSITORY_ACCESS_TTL = 300
+
+# Expiry time of every granted (host, token, repository) access, keyed by a hash that does not reveal the token
+_repository_access: Dict[str, float] = {}
+_repository_access_lock = threading.Lock()
+
+
+def fetch_with_retries(
+    url, headers, max_retries=MAX_RETRIES, timeout=15, max_wait=DEFAULT_MAX_WAIT
+):
+    """
+    Fetch data with retry logic and exponential backoff. Requests are paced by the rate-limit scheduler against the
+    REST ("core") budget of the token, and an exhausted budget is waited out server-side when the reset is at most
+    max_wait seconds away.
+
+    Args:
+        url (str): The URL to fetch data from.
+        headers (dict): Headers for the request.
+        max_retries (int, optional): Maximum number of retry attempts.
+        timeout (int, optional): Request timeout in seconds.
+        max_wait (float, optional): Longest wait in seconds for rate-limit budget before the rate-limit response is
+        returned. None waits until the budget is restored.
+
+    Returns:
+        dict: JSON response if successful, or rate-limit response.
+
+    Raises:
+        Timeout: If all retry attempts are exhausted.
+    """
+    last_exception = None
+    response = None
+    parsed = urlparse(url)
+    token = headers.get("Authorization", "")
+    session = get_session(parsed.scheme, parsed.netloc, token)
+    scheduler = get_scheduler()
+    key = scheduler.key(parsed.netloc, "core", token)
+    rate_limited_until = None
+
+    for attempt in range(max_retries):
+        try:
+            wait = scheduler.acquire(key, cost=1, max_wait=max_wait)
+            if wait is not None:
+                return rate_limit_response(time.time() + wait)
+            response = session.get(url, headers=headers, timeout=timeout)
+            scheduler.update_from_headers(key, response.headers)
+            if response.status_code in {403, 429} and (
+                response.headers.get("Retry-After")
+                or response.headers.get("X-RateLimit-Remaining") == "0"
+            ):
+                retry_after = response.headers.get("Retry-After")
+                reset_at = (
+                    time.time() + int(retry_after)
+                    if retry_after
+                    else float(response.headers.get("X-RateLimit-Reset"))
+                )
+                # The scheduler waits for the reset on the next attempt if it is within max_wait
+                scheduler.exhaust(key, reset_at)
+                rate_limited_until = reset_at
+                continue
+            response.raise_for_status()
+            if response.status_code == 200:
+                return response.json()
+            response.raise_for_status()
+
+        except Timeout as e:
+            last_exception = e
+            logging.warning(
+                "Request timed out. Retrying in %d seconds...",
+                INITIAL_RETRY_DELAY * (2**attempt),
+            )
+            time.sleep(INITIAL_RETRY_DELAY * (2**attempt))
+
+        except RequestException as e:
+            last_exception = e
+            logging.error("Request failed: %s. Retrying...", str(e))
+            time.sleep(INITIAL_RETRY_DELAY * (2**attempt))
+    if rate_limited_until is not None:
+        return rate_limit_response(rate_limited_until)
+    raise Timeout("All retry attempts exhausted.") from last_exception
+
+
+def process_commit_details(commit):
+    """
+    Extracts the commit details and per-language line statistics from a REST commit response.
+
+    Args:
+        commit (dict): The commit returned by the GitHub REST API.
+
+    Returns:
+        dict: Commit details including author, stats, and language breakdown.
+    """
+    res = {
+        "author": commit["commit"]["author"]["name"],
+        "author_email": commit["commit"]["author"]["email"],
+        "authoredDate": commit["commit"]["author"]["date"],
+        "message": commit["commit"]["message"],
+        "author_login": commit["author"]["login"] if commit["author"] else None,
+        "parents": len(commit["parents"]),
+        "additions": commit["stats"]["additions"],
+        "deletions": commit["stats"]["deletions"],
+        "changedFilesIfAvailable": len(commit["files"]),
+        "lang_stats": {},
+    }
+
+    # Calculate language statistics
+    for file in commit["files"]:
+        # Files without a patch (binary or too large) are counted as text
+        language = classify_language(file["filename"], file.get("patch"))
+
+        if language in res["lang_stats"]:
+            res["lang_stats"][language]["additions"] += file["additions"]
+            res["lang_stats"][language]["deletions"] += file["deletions"]
+        else:
+            res["lang_stats"][language] = {
+                "additions": file["additions"],
+                "deletions": file["deletions"],
+            }
+
+    return res
+
+
+def can_access_repository(protocol, host, owner, repo, token, timeout=10):
+    """
+    Checks whether a token can read a repository, with one HEAD request for the repository. Data cached from a
+    repository, e.g. commit details, is only served to callers that pass this check, so details of a private
+    repository never reach a user without access to it. Granted access is remembered for REPOSITORY_ACCESS_TTL
+    seconds; denials are not remembered.
+
+    Args:
+        protocol (str): The protocol of the GitHub server.
+        host (str): The host of the GitHub API.
+        owner (str): The owner of the repository.
+        repo (str): The name of the repository.
+        token (str): The personal access token of the caller.
+        timeout (int, optional): Request timeout in seconds.
+
+    Returns:
+        bool: True if the token can read the repository. False if it cannot, or if that cannot be told now, e.g.
+        when the rate limit is exhausted or the request fails.
+    """
+    key = hashlib.sha256(f"{host}\0{token}\0{owner}/{repo}".lower().encode("utf-8")).hexdigest()
+    now = time.time()
+    with _repository_access_lock:
+        if _repository_access.get(key, 0) > now:
+            return True
+
+    authorization = f"token {token}"
+    session = get_session(protocol, host, authorization)
+    scheduler = get_scheduler()
+    scheduler_key = scheduler.key(host, "core", authorization)
+    if scheduler.acquire(scheduler_key, cost=1, max_wait=0) is not None:
+        return False
+    try:
+        response = session.head(
+            f"{protocol}://{host}/repos/{owner}/{repo}",
+            headers={"Authorization": authorization},
+            timeout=timeout,
+        )
+    except RequestException as e:
+        logging.warning("Failed to check access to %s/%s: %s", owner, repo, e)
+        return False
+    scheduler.update_from_headers(scheduler_key, response.headers)
+    if response.status_code != 200:
+        return False
+
+    with _repository_access_lock:
+        if len(_repository_access) > 4096:
+            for stale in [k for k, expiry in _repository_access.items() if expiry <= now]:
+                del _repository_access[stale]
+        _repository_access[key] = now + REPOSITORY_ACCESS_TTL
+    return True
@@ -0,0 +1,476 @@
+"""
+This module makes the mining jobs durable. Every job is stored as a BackgroundJob with the options it was started with,
+and after each unit of work (a chunk of logins, a repository, a page of a connection) the job saves a checkpoint of
+where it is. Worker threads claim runnable jobs from the table and run them. When the rate-limit budget of a job's
+tokens is spent for longer than PARK_AFTER_SECONDS, the job parks itself until the reset instead of holding a worker,
+and a worker resumes it from its checkpoint at reset_at. A job left running by a server that was stopped is taken over
+from its checkpoint once its heartbeat is stale, so no job restarts from its first page.
+
+Workers run in the web server process and, with `flask job-worker`, in separate processes; claims are conditional
+updates, so several processes can share one queue.
+
+Classes:
+    JobParked: Raised by a job whose rate-limit budget cannot be restored within PARK_AFTER_SECONDS.
+    DurableJob: The base of the jobs that are stored, checkpointed and resumed.
+    StoredJob: A job that is not live in this process, read from its BackgroundJob.
+    JobWorker: A worker thread that claims and runs jobs.
+
+Functions:
+    register_job_kind(cls: type) -> type:
+    park_if_rate_limited(response: Union[dict, list]) -> None:
+    enqueue_job(app: Flask, job: DurableJob) -> DurableJob:
+    get_live_job(job_id: str, user_login: str, cls: type) -> Optional[DurableJob]:
+    find_stored_job(job_id: str, user_login: str) -> Optional[StoredJob]:
+    start_job_workers(app: Flask, count: int = None) -> List[JobWorker]:
+    ensure_job_worker(app: Flask) -> None:
+    register_job_commands(app: Flask) -> None:
+
+Constants:
+    PARK_AFTER_SECONDS: Rate-limit waits up to this long are waited out by the worker; longer ones park the job.
+    HEARTBEAT_SECONDS: Seconds between the heartbeats of a running job.
+    STALE_AFTER_SECONDS: Seconds without a heartbeat after which a running job is taken over by another worker.
+    POLL_SECONDS: Seconds an idle worker waits before it looks for runnable jobs again.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Type, Union
+from urllib.parse import urlparse
+
+from flask import Flask
+from app.database import db
+from app.models.background_job import BackgroundJob
+from app.models.user import User
+from .token_pool import get_token_pool
+
+PARK_AFTER_SECONDS = 60
+HEARTBEAT_SECONDS = 30
+STALE_AFTER_SECONDS = 300
+POLL_SECONDS = 5
+
+# Job classes by kind, and the jobs live in this process by id: queued here or run by a worker here. A job leaves once
+# it stops, parks or is cancelled; from then on its record is the one source of its status.
+JOB_KINDS: Dict[str, Type["DurableJob"]] = {}
+_live_jobs: Dict[str, "DurableJob"] = {}
+_live_jobs_lock = threading.Lock()
+_workers: List["JobWorker"] = []
+_workers_lock = threading.Lock()
+
+
+class JobParked(Exception):
+    """
+    Raised by a job whose rate-limit budget cannot be restored within PARK_AFTER_SECONDS. The job stops after saving
+    its checkpoint and is resumed at reset_at.
+    """
+
+    def __init__(self, reset_at: datetime) -> None:
+        self.reset_at = reset_at
+        super().__init__(f"Rate limit exceeded until {reset_at.isoformat()}")
+
+
+def park_if_rate_limited(response: Union[Dict[str, Any], List[Any], None]) -> None:
+    """
+    Parks the running job if a response, or the last page of a paginated response, is the rate-limit response of a
+    client or REST request that could not wait for the reset.
+
+    Args:
+        response (Union[Dict[str, Any], List[Any], None]): The response, or the list of pages.
+
+    Raises:
+        JobParked: If the response reports that the rate limit is exceeded.
+    """
+    if isinstance(response, list):
+        response = response[-1] if response else None
+    if isinstance(response, dict) and response.get("no_limit"):
+        reset_at = datetime.fromisoformat(response["reset_at"])
+        raise JobParked(reset_at.astimezone(timezone.utc).replace(tzinfo=None))
+
+
+def register_job_kind(cls: Type["DurableJob"]) -> Type["DurableJob"]:
+    """
+    Registers a job class so that workers can rebuild its jobs from their BackgroundJob.
+
+    Args:
+        cls (Type[DurableJob]): The job class; its `kind` names the jobs in the table.
+
+    Returns:
+        Type[DurableJob]: The class, so the function can be used as a decorator.
+    """
+    JOB_KINDS[cls.kind] = cls
+    return cls
+
+
+class DurableJob:
+    """
+    DurableJob is the base of the jobs that are stored in BackgroundJob. A subclass reports the options it was created
+    with (params), the state it resumes from (checkpoint), and saves its checkpoint after each unit of work. Jobs that
+    are run directly, without being enqueued, are not stored.
+    """
+
+    kind = ""
+
+    id: str
+    user_login: str
+    status: str
+    error: Optional[str]
+    _cancelled: threading.Event
+    durable = False
+    resume_at: Optional[datetime] = None
+
+    def params(self) -> Dict[str, Any]:
+        """Returns the options the job is created from."""
+        raise NotImplementedError
+
+    @classmethod
+    def from_params(cls, job_id: str, user_login: str, params: Dict[str, Any]) -> "DurableJob":
+        """
+        Rebuilds a job from the options it was created with.
+
+        Args:
+            job_id (str): The id of the job.
+            user_login (str): The login of the user who started the job.
+            params (Dict[str, Any]): The options returned by params().
+
+        Returns:
+            DurableJob: The job, pending.
+        """
+        raise NotImplementedError
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """Returns the state the job resumes from."""
+        raise NotImplementedError
+
+    def restore(self, checkpoint: Dict[str, Any]) -> None:
+        """Restores the state returned by checkpoint()."""
+        raise NotImplementedError
+
+    def progress(self) -> Dict[str, Any]:
+        """Returns the progress reported to the user."""
+        raise NotImplementedError
+
+    def save_checkpoint(self) -> None:
+        """
+        Saves the job's checkpoint and progress in its BackgroundJob. A cancellation requested through another process
+        is picked up here.
+        """
+        if not self.durable:
+            return
+        cancel = BackgroundJob.save(
+            self.id,
+            self.status,
+            self.checkpoint(),
+            self.progress(),
+            self.resume_at if self.status == "parked" else None,
+            self.error,
+        )
+        if cancel:
+            self._cancelled.set()
+
+    def _park(self, parked: JobParked) -> None:
+        """
+        Parks the job until the rate limit resets.
+
+        Args:
+            parked (JobParked): The exception the job stopped with.
+        """
+        logging.info("Job %s parked until %s", self.id, parked.reset_at.isoformat())
+        self.status = "parked"
+        self.resume_at = parked.reset_at
+
+    def _request_cancel(self) -> None:
+        """Stops the job after its current unit of work; a job waiting for a worker is cancelled at once."""
+        self._cancelled.set()
+        if self.status in ("pending", "parked"):
+            self.status = "cancelled"
+            _unregister_live_job(self)
+        if self.durable:
+            BackgroundJob.request_cancel(self.id)
+
+
+class StoredJob:
+    """
+    StoredJob stands in for a job that is not live in this process, e.g. one run by a worker in another process or
+    one that waits to be resumed after a restart. Its progress is the one saved with its last checkpoint. Its rows
+    are read from the job's dataset, see user_query_id.
+    """
+
+    def __init__(self, record: BackgroundJob) -> None:
+        """
+        Wraps a stored job.
+
+        Args:
+            record (BackgroundJob): The job's record.
+        """
+        self.id = record.id
+        self.record = record
+
+    def progress(self) -> Dict[str, Any]:
+        """
+        Returns the progress saved with the job's last checkpoint.
+
+        Returns:
+            Dict[str, Any]: The progress, with the job's current status and the time a parked job is resumed at.
+        """
+        progress = json.loads(self.record.progress) if self.record.progress else {}
+        progress.update(
+            id=self.record.id,
+            status=self.record.status,
+            resume_at=(
+                self.record.resume_at.isoformat() if self.record.resume_at else None
+            ),
+        )
+        return progress
+
+    @property
+    def user_query_id(self) -> Optional[int]:
+        """The id of the dataset the job saves its rows in, or None if it has not created it yet."""
+        return json.loads(self.record.progress or "{}").get("user_query_id")
+
+    def cancel(self) -> None:
+        """Cancels the job, see BackgroundJob.request_cancel."""
+        BackgroundJob.request_cancel(self.id)
+
+
+def _worker_prefix() -> str:
+    """Returns the prefix of the ids of the workers of this process."""
+    return f"{socket.gethostname()}-{os.getpid()}-"
+
+
+def _register_live_job(job: DurableJob) -> None:
+    with _live_jobs_lock:
+        _live_jobs[job.id] = job
+
+
+def _unregister_live_job(job: DurableJob) -> None:
+    with _live_jobs_lock:
+        if _live_jobs.get(job.id) is job:
+            del _live_jobs[job.id]
+
+
+def get_live_job(job_id: str, user_login: str, cls: Type[DurableJob]) -> Optional[DurableJob]:
+    """
+    Looks up a job of the given class that is live in this process and was started by the given user.
+
+    Args:
+        job_id (str): The id of the job.
+        user_login (str): The login of the user asking for the job.
+        cls (Type[DurableJob]): The class of the job.
+
+    Returns:
+        Optional[DurableJob]: The job, or None if it is not live here, has another class or belongs to another user.
+        A job queued here that a worker of another process has claimed is no longer live here.
+    """
+    with _live_jobs_lock:
+        job = _live_jobs.get(job_id)
+    if not isinstance(job, cls) or job.user_login != user_login:
+        return None
+    if job.status == "pending":
+        # A job queued here may have been claimed by a worker of another process or cancelled there
+        record = db.session.get(BackgroundJob, job_id, populate_existing=True)
+        if record is None or (
+            record.status != "queued" and not (record.worker_id or "").startswith(_worker_prefix())
+        ):
+            _unregister_live_job(job)
+            return None
+    return job
+
+
+def find_stored_job(job_id: str, user_login: str) -> Optional[StoredJob]:
+    """
+    Looks up a stored job started by the given user.
+
+    Args:
+        job_id (str): The id of the job.
+        user_login (str): The login of the user asking for the job.
+
+    Returns:
+        Optional[StoredJob]: The job, or None if it does not exist or belongs to another user.
+    """
+    record = BackgroundJob.find(job_id, user_login)
+    return StoredJob(record) if record else None
+
+
+def enqueue_job(app: Flask, job: DurableJob) -> DurableJob:
+    """
+    Stores a pending job for the workers and makes sure this process runs a worker.
+
+    Args:
+        app (Flask): The application whose database the job is stored in.
+        job (DurableJob): The job.
+
+    Returns:
+        DurableJob: The job, live in this process until it stops.
+    """
+    job.durable = True
+    BackgroundJob.enqueue(job.id, job.kind, job.user_login, job.params())
+    _register_live_job(job)
+    ensure_job_worker(app)
+    return job
+
+
+class JobWorker(threading.Thread):
+    """
+    JobWorker claims runnable jobs from BackgroundJob one at a time and runs them: a live job is run as it is, a job
+    that is not live in this process is rebuilt from its options and checkpoint. While a job runs, the worker renews
+    its heartbeat.
+    """
+
+    def __init__(self, app: Flask) -> None:
+        """
+        Initializes a worker.
+
+        Args:
+            app (Flask): The application whose database the jobs are stored in.
+        """
+        self.worker_id = f"{_worker_prefix()}{uuid.uuid4().hex[:8]}"
+        super().__init__(name=f"job-worker-{self.worker_id}", daemon=True)
+        self.app = app
+        self._stopped = threading.Event()
+
+    def stop(self) -> None:
+        """Asks the worker to stop once its current job has stopped."""
+        self._stopped.set()
+
+    def run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                ran = self.run_once()
+            except Exception:  # pylint: disable=broad-except
+                # E.g. the table does not exist yet while the migrations run
+                logging.exception("Job worker %s failed to claim a job", self.worker_id)
+                ran = False
+            if not ran:
+                self._stopped.wait(POLL_SECONDS)
+
+    def run_once(self) -> bool:
+        """
+        Claims a runnable job and runs it until it stops or parks.
+
+        Returns:
+            bool: Whether a job was run.
+        """
+        with self.app.app_context():
+            try:
+                record = BackgroundJob.claim(
+                    self.worker_id,
+                    datetime.utcnow() - timedelta(seconds=STALE_AFTER_SECONDS),
+                )
+                if record is None:
+                    return False
+                job = self._job(record)
+                user = User.query.filter_by(github_login=record.user_login).first()
+                if user is None:
+                    job.status, job.error = "failed", "The user of the job no longer exists"
+                    job.save_checkpoint()
+                    _unregister_live_job(job)
+                    return True
+                parsed_url = urlparse(user.api_url)
+                tokens = get_token_pool(user)
+            finally:
+                db.session.remove()
+
+        running = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(job.id, running), daemon=True
+        )
+        heartbeat.start()
+        try:
+            job.run(self.app, parsed_url.scheme, parsed_url.netloc, tokens)
+        finally:
+            running.set()
+            heartbeat.join()
+            # The job stopped or parked; a parked job may be resumed by a worker of another process
+            _unregister_live_job(job)
+        return True
+
+    def _job(self, record: BackgroundJob) -> DurableJob:
+        """
+        Returns the live job of a claimed record, or rebuilds it from the record's options and checkpoint.
+
+        Args:
+            record (BackgroundJob): The claimed job.
+
+        Returns:
+            DurableJob: The job.
+        """
+        with _live_jobs_lock:
+            job = _live_jobs.get(record.id)
+        if job is None:
+            job = JOB_KINDS[record.kind].from_params(
+                record.id, record.user_login, json.loads(record.params)
+            )
+            job.created_at = record.created_at
+            if record.checkpoint:
+                job.restore(json.loads(record.checkpoint))
+            job.durable = True
+            _register_live_job(job)
+            logging.info("Resuming job %s from its checkpoint", record.id)
+        return job
+
+    def _heartbeat(self, job_id: str, running: threading.Event) -> None:
+        while not running.wait(HEARTBEAT_SECONDS):
+            try:
+                with self.app.app_context():
+                    BackgroundJob.heartbeat(job_id, self.worker_id)
+                    db.session.remove()
+            except Exception:  # pylint: disable=broad-except
+                logging.exception("Heartbeat of job %s failed", job_id)
+
+
+def start_job_workers(app: Flask, count: int = None) -> List[JobWorker]:
+    """
+    Starts worker threads in this process.
+
+    Args:
+        app (Flask): The application whose database the jobs are stored in.
+        count (int, optional): The number of workers. Defaults to the JOB_WORKERS setting.
+
+    Returns:
+        List[JobWorker]: The started workers.
+    """
+    count = app.config.get("JOB_WORKERS", 2) if count is None else count
+    workers = [JobWorker(app) for _ in range(count)]
+    for worker in workers:
+        worker.start()
+    with _workers_lock:
+        _workers.extend(workers)
+    return workers
+
+
+def ensure_job_worker(app: Flask) -> None:
+    """
+    Starts the workers of this process unless they are running.
+
+    Args:
+        app (Flask): The application whose database the jobs are stored in.
+    """
+    with _workers_lock:
+        running = any(worker.is_alive() for worker in _workers)
+    if not running:
+        start_job_workers(app)
+
+
+def register_job_commands(app: Flask) -> None:
+    """
+    Registers the `flask job-worker` command, which runs workers in the foreground of a separate process.
+
+    Args:
+        app (Flask): The application.
+    """
+
+    @app.cli.command("job-worker")
+    def job_worker():
+        """Runs job workers until interrupted."""
+        workers = start_job_workers(app)
+        try:
+            for worker in workers:
+                while worker.is_alive():
+                    worker.join(POLL_SECONDS)
+        except KeyboardInterrupt:
+            for worker in workers:
+                worker.stop()
@@ -0,0 +1,143 @@
+"""
+This module classifies the language of a changed file from its name, as the pygments lexer names used in the
+lang_stats of commit details. pygments.guess_lexer_for_filename matches the file name against the filename patterns
+of every lexer on each call; here the patterns are indexed once by exact file name and by extension, and the
+candidates of a file name are cached. Only names matched by several lexers (e.g. "*.h" or "*.m") run the lexers'
+content analysis on the patch, ranked as pygments ranks them, so the result is the lexer pygments would pick.
+
+Functions:
+    classify_language(filename: str, patch: Optional[str] = None, sniff: bool = True) -> str:
+    candidate_lexers(basename: str) -> Tuple[Tuple[type, bool], ...]:
+
+Constants:
+    TEXT_LANGUAGE: The name reported for files no lexer matches (pygments' TextLexer).
+"""
+
+import fnmatch
+import posixpath
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from pygments.lexers import find_lexer_class, get_all_lexers
+from pygments.lexers.special import TextLexer
+
+TEXT_LANGUAGE = TextLexer.name
+CANDIDATE_CACHE_SIZE = 8192
+
+# "*.ext" patterns without any other wildcard can be looked up by extension
+_SUFFIX_PATTERN = re.compile(r"^\*(\.[^*?\[\]]+)$")
+_WILDCARDS = re.compile(r"[*?\[]")
+
+
+def _lexer_classes() -> List[type]:
+    """Returns every lexer class, including plugin lexers, ordered by class name as pygments tries them."""
+    lexers = {find_lexer_class(name) for name, *_ in get_all_lexers()}
+    return sorted((lexer for lexer in lexers if lexer is not None), key=lambda lexer: lexer.__name__)
+
+
+class _LexerIndex:
+    """The filename patterns of every lexer, indexed by exact name, by extension and, for the rest, as regexes."""
+
+    def __init__(self) -> None:
+        self.names: Dict[str, List[Tuple[type, bool]]] = {}
+        self.suffixes: Dict[str, List[Tuple[type, bool]]] = {}
+        self.patterns: List[Tuple[re.Pattern, type, bool]] = []
+        for lexer in _lexer_classes():
+            for patterns, primary in ((lexer.filenames, True), (lexer.alias_filenames, False)):
+                for pattern in patterns:
+                    suffix = _SUFFIX_PATTERN.match(pattern)
+                    if suffix:
+                        self.suffixes.setdefault(suffix.group(1), []).append((lexer, primary))
+                    elif not _WILDCARDS.search(pattern):
+                        self.names.setdefault(pattern, []).append((lexer, primary))
+                    else:
+                        self.patterns.append(
+                            (re.compile(fnmatch.translate(pattern)), lexer, primary)
+                        )
+
+
+@lru_cache(maxsize=None)
+def _index() -> _LexerIndex:
+    return _LexerIndex()
+
+
+@lru_cache(maxsize=CANDIDATE_CACHE_SIZE)
+def candidate_lexers(basename: str) -> Tuple[Tuple[type, bool], ...]:
+    """
+    Finds the lexers whose filename patterns match a file name, as pygments.guess_lexer_for_filename does.
+
+    Args:
+        basename (str): The file name without its directory.
+
+    Returns:
+        Tuple[Tuple[type, bool], ...]: The matching lexer classes, each with whether the match is one of the lexer's
+        primary filename patterns rather than an alias pattern.
+    """
+    index = _index()
+    matches: Dict[type, bool] = {}
+
+    def add(lexer: type, primary: bool) -> None:
+        # pygments checks alias patterns after primary ones, so any alias match makes the lexer a secondary match
+        matches[lexer] = matches.get(lexer, True) and primary
+
+    for lexer, primary in index.names.get(basename, ()):
+        add(lexer, primary)
+    position = basename.find(".")
+    while position != -1:
+        for lexer, primary in index.suffixes.get(basename[position:], ()):
+            add(lexer, primary)
+        position = basename.find(".", position + 1)
+    for regex, lexer, primary in index.patterns:
+        if regex.match(basename):
+            add(lexer, primary)
+    return tuple(matches.items())
+
+
+def _rank(candidates: Tuple[Tuple[type, bool], ...], patch: str) -> type:
+    """
+    Picks one of several matching lexers by analysing the patch, with the ranking of guess_lexer_for_filename.
+
+    Args:
+        candidates (Tuple[Tuple[type, bool], ...]): The matching lexers.
+        patch (str): The patch of the file.
+
+    Returns:
+        type: The chosen lexer class.
+    """
+    ranked = []
+    for lexer, primary in candidates:
+        score = lexer.analyse_text(patch)
+        if score == 1.0:
+            return lexer
+        ranked.append((score, primary, lexer.priority, lexer.__name__, lexer))
+    return max(ranked, key=lambda entry: entry[:4])[-1]
+
+
+def classify_language(
+    filename: str, patch: Optional[str] = None, sniff: bool = True
+) -> str:
+    """
+    Classifies the language of a changed file.
+
+    Args:
+        filename (str): The path of the file.
+        patch (Optional[str]): The patch of the file. Files without a patch (e.g. binary files) are reported as
+        text, as the pygments path did.
+        sniff (bool): Whether names matched by several lexers are resolved by analysing the patch. Without it the
+        lexer pygments ranks highest for content it cannot recognize is chosen.
+
+    Returns:
+        str: The name of the language, e.g. "Python", or TEXT_LANGUAGE if no lexer matches.
+    """
+    if patch is None:
+        return TEXT_LANGUAGE
+    candidates = candidate_lexers(posixpath.basename(filename))
+    if not candidates:
+        return TEXT_LANGUAGE
+    if len(candidates) == 1:
+        return candidates[0][0].name
+    try:
+        return _rank(candidates, patch if sniff else "").name
+    except Exception:  # pylint: disable=broad-except
+        return TEXT_LANGUAGE
@@ -0,0 +1,151 @@
+"""
+This module keeps the per-language tables of commits and repositories in step with the language columns they are built
+from. The lang_stats of a commit and the languages of a repository are JSON text; their rows in commit_languages and
+repository_languages hold the same numbers one language per row, so language questions like "lines added in Python per
+student" are answered by an indexed GROUP BY instead of parsing every row in Python.
+
+Functions:
+    sync_languages(model: Type[db.Model], ids: Iterable[int]) -> int:
+    sync_dataset_languages(model: Type[db.Model], user_query_id: int, after: int = 0) -> int:
+    language_totals(user_query: UserQuery) -> List[Dict[str, Any]]:
+
+Constants:
+    LANGUAGE_TABLES: The language model of every model with a language column, and the name of that column.
+    LANGUAGE_DATA_TYPES: The model of every data type with language rows.
+    SYNC_CHUNK_ROWS: The number of rows parsed per query.
+"""
+
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Type
+from sqlalchemy import delete, func, insert, select
+from app.database import db
+from app.models import Commit, CommitLanguage, Repository, RepositoryLanguage, UserQuery
+
+LANGUAGE_TABLES: Dict[Type[db.Model], Tuple[Type[db.Model], str]] = {
+    Commit: (CommitLanguage, "lang_stats"),
+    Repository: (RepositoryLanguage, "languages"),
+}
+LANGUAGE_DATA_TYPES: Dict[str, Type[db.Model]] = {
+    "Repo Commits": Commit,
+    "User Commits": Commit,
+    "Repositories": Repository,
+}
+# Below the bound parameter limit of SQLite for the id lists and the multi-row INSERT
+SYNC_CHUNK_ROWS = 2000
+
+
+def _sync_rows(model: Type[db.Model], rows: Sequence[Any]) -> int:
+    """
+    Replaces the language rows of the given rows of the model.
+
+    Args:
+        model (Type[db.Model]): Commit or Repository.
+        rows (Sequence[Any]): The ids and language columns of the rows.
+
+    Returns:
+        int: The number of language rows written.
+    """
+    language_model, _ = LANGUAGE_TABLES[model]
+    parent = next(iter(language_model.__table__.primary_key.columns))
+    db.session.execute(delete(language_model).where(parent.in_([row[0] for row in rows])))
+    records = [
+        record for row in rows for record in language_model.records_from_stats(row[0], row[1])
+    ]
+    for start in range(0, len(records), SYNC_CHUNK_ROWS):
+        db.session.execute(insert(language_model).values(records[start : start + SYNC_CHUNK_ROWS]))
+    return len(records)
+
+
+def sync_languages(model: Type[db.Model], ids: Iterable[int]) -> int:
+    """
+    Rebuilds the language rows of the given commits or repositories from their language columns. Called after rows
+    are inserted or updated through the ORM; the caller owns the transaction, and the rows must be flushed.
+
+    Args:
+        model (Type[db.Model]): Commit or Repository.
+        ids (Iterable[int]): The ids of the rows.
+
+    Returns:
+        int: The number of language rows written.
+    """
+    _, column = LANGUAGE_TABLES[model]
+    ids = list(ids)
+    written = 0
+    for start in range(0, len(ids), SYNC_CHUNK_ROWS):
+        rows = db.session.execute(
+            select(model.id, getattr(model, column)).where(
+                model.id.in_(ids[start : start + SYNC_CHUNK_ROWS])
+            )
+        ).all()
+        if rows:
+            written += _sync_rows(model, rows)
+    return written
+
+
+def sync_dataset_languages(model: Type[db.Model], user_query_id: int, after: int = 0) -> int:
+    """
+    Builds the language rows of the commits or repositories of a dataset whose id is greater than the given id, e.g.
+    the rows just written by a bulk INSERT. The rows are read in keyset batches; the caller owns the transaction.
+
+    Args:
+        model (Type[db.Model]): Commit or Repository.
+        user_query_id (int): The id of the dataset.
+        after (int): The largest id of the dataset before the rows were written.
+
+    Returns:
+        int: The number of language rows written.
+    """
+    _, column = LANGUAGE_TABLES[model]
+    written = 0
+    while True:
+        rows = db.session.execute(
+            select(model.id, getattr(model, column))
+            .where(model.user_query_id == user_query_id, model.id > after)
+            .order_by(model.id)
+            .limit(SYNC_CHUNK_ROWS)
+        ).all()
+        if not rows:
+            return written
+        written += _sync_rows(model, rows)
+        after = rows[-1][0]
+
+
+def language_totals(user_query: UserQuery) -> List[Dict[str, Any]]:
+    """
+    Sums the language rows of a commit or repository dataset per author and language with one GROUP BY query.
+
+    Args:
+        user_query (UserQuery): The dataset.
+
+    Returns:
+        List[Dict[str, Any]]: The "login" and "language" of every group, with the total "additions" and "deletions"
+        of a commit dataset or the total "bytes" of a repository dataset, ordered by login and language.
+
+    Raises:
+        KeyError: If the dataset has no language rows.
+    """
+    model = LANGUAGE_DATA_TYPES[user_query.data_type]
+    language_model, _ = LANGUAGE_TABLES[model]
+    if model is Commit:
+        login = Commit.author_login
+        sums = [
+            func.sum(CommitLanguage.additions).label("additions"),
+            func.sum(CommitLanguage.deletions).label("deletions"),
+        ]
+        join = CommitLanguage.commit_id == Commit.id
+    else:
+        login = Repository.author_github_login
+        sums = [func.sum(RepositoryLanguage.bytes).label("bytes")]
+        join = RepositoryLanguage.repository_id == Repository.id
+    query = (
+        select(login.label("login"), language_model.language, *sums)
+        .select_from(language_model)
+        .join(model, join)
+        .where(model.user_query_id == user_query.id)
+        .group_by(login, language_model.language)
+        .order_by(login, language_model.language)
+    )
+    # SUM gives a Decimal on MySQL
+    return [
+        {**row._mapping, **{label.name: int(row._mapping[label.name]) for label in sums}}
+        for row in db.session.execute(query)
+    ]
@@ -0,0 +1,62 @@
+"""
+This module assembles the pool of personal access tokens that bulk jobs draw from and reports the pool's
+rate-limit headroom.
+
+Functions:
+    get_token_pool(user: User) -> List[str]:
+    get_token_pool_budget(user: User) -> dict:
+"""
+
+from typing import List
+from urllib.parse import urlparse
+from flask import current_app
+from app.models.user import User
+from .github_query.graphql_client import TokenPoolAuthenticator
+
+
+def get_token_pool(user: User) -> List[str]:
+    """
+    Collects the tokens a bulk job started by the given user may use: the user's own token, the tokens configured in
+    GITHUB_TOKEN_POOL when the user works against the configured GitHub server, and the stored tokens of the users
+    listed in GITHUB_TOKEN_POOL_USERS that work against the same server.
+
+    Args:
+        user (User): The user who starts the job.
+
+    Returns:
+        List[str]: The personal access tokens of the pool, the user's own token first.
+    """
+    tokens = [user.personal_access_token]
+    host = urlparse(user.api_url).netloc
+
+    configured_api_url = current_app.config.get("GITHUB_API_BASE_URL")
+    if configured_api_url and urlparse(configured_api_url).netloc == host:
+        tokens.extend(current_app.config.get("GITHUB_TOKEN_POOL", []))
+
+    shared_logins = current_app.config.get("GITHUB_TOKEN_POOL_USERS", [])
+    if shared_logins:
+        shared_users = User.query.filter(User.github_login.in_(shared_logins)).all()
+        tokens.extend(
+            shared.personal_access_token
+            for shared in shared_users
+            if urlparse(shared.api_url).netloc == host
+        )
+    return list(dict.fromkeys(tokens))
+
+
+def get_token_pool_budget(user: User) -> dict:
+    """
+    Reports the GraphQL rate-limit budget of every token in the user's pool, as last observed by the scheduler.
+
+    Args:
+        user (User): The user whose pool is reported.
+
+    Returns:
+        dict: The masked tokens with their budgets, and the summed remaining points of the tokens with a known budget.
+    """
+    host = urlparse(user.api_url).netloc
+    budgets = TokenPoolAuthenticator(get_token_pool(user), host=host).budgets()
+    return {
+        "tokens": budgets,
+        "remaining": sum(b["remaining"] for b in budgets if b["remaining"] is not None),
+    }
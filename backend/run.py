@@ -1,4 +1,6 @@
+import os
 from app import create_app
+from app.services.job_queue import start_job_workers
 from flask_cors import CORS
 from app.database import db
 from flask import session
@@ -41,4 +43,7 @@ if __name__ == "__main__":
     print("Accessible endpoints:")
     for rule in app.url_map.iter_rules():
         print(f"{rule.endpoint}: {rule}")
+    # With the reloader, only the serving child process runs the job workers; they resume the stored jobs
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_job_workers(app)
     app.run(host="0.0.0.0", port=5000, debug=True)
@@ -0,0 +1,181 @@
+"""
+Measures the dataset hot-path queries with and without the composite indexes of migration b9d3f6a2c815, printing the
+query plan and the median latency of each query.
+
+A database is seeded with many users' datasets: their UserQuery rows, a large commit dataset per user and issue
+datasets. The queries are then timed once without the indexes and once after creating them. By default a temporary
+SQLite file is used; pass --database-url to measure an empty MySQL or PostgreSQL database instead. Run from the backend
+directory:
+
+    python -m scripts.benchmark_dataset_indexes --users 50 --commits 200000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import sqlalchemy as sa
+
+from app.database import db
+from app.models import Commit, Issue, User, UserQuery
+
+# The indexes of the migration, as declared on the models
+INDEXES = [
+    index
+    for model in (UserQuery, Commit, Issue)
+    for index in model.__table__.indexes
+    if index.name.startswith(("ix_user_queries_", "ix_commits_", "ix_issues_"))
+]
+START = datetime(2020, 1, 1)
+
+QUERIES = {
+    "check-duplicate": (
+        "SELECT id FROM user_queries WHERE user_login = :login AND ds_name = :name AND data_type = :type",
+        lambda rng, args: {"login": f"user{rng.randrange(args.users)}", "name": "issues-3", "type": "Issues"},
+    ),
+    "user-by-github-id": (
+        "SELECT id FROM users WHERE github_id = :github_id",
+        lambda rng, args: {"github_id": f"U{rng.randrange(args.users)}"},
+    ),
+    "newest-issue-of-dataset": (
+        "SELECT max(created_at) FROM issues WHERE user_query_id = :query_id",
+        lambda rng, args: {"query_id": rng.randrange(args.users * 5) + 1},
+    ),
+    "issues-of-dataset-in-window": (
+        "SELECT id, created_at FROM issues WHERE user_query_id = :query_id AND created_at >= :since "
+        "ORDER BY created_at",
+        lambda rng, args: {"query_id": rng.randrange(args.users * 5) + 1, "since": START + timedelta(days=900)},
+    ),
+    "commits-of-author-in-repo": (
+        "SELECT id, authored_date FROM commits WHERE repo_name = :repo AND author_login = :login "
+        "ORDER BY authored_date DESC LIMIT 50",
+        lambda rng, args: {"repo": f"org/repo{rng.randrange(200)}", "login": f"author{rng.randrange(500)}"},
+    ),
+    "commits-of-dataset-in-window": (
+        "SELECT count(*) FROM commits WHERE user_query_id = :query_id AND authored_date >= :since",
+        lambda rng, args: {"query_id": rng.randrange(args.users * 5) + 1, "since": START + timedelta(days=1000)},
+    ),
+}
+
+
+def seed(engine: sa.Engine, users: int, commits: int, issues: int, seed_value: int = 0) -> None:
+    """Creates the tables without the benchmarked indexes and fills them."""
+    rng = random.Random(seed_value)
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for index in INDEXES:
+            index.drop(conn, checkfirst=True)
+        conn.execute(
+            sa.insert(User),
+            [
+                {"github_id": f"U{i}", "github_login": f"user{i}", "personal_access_token": "t", "api_url": "x"}
+                for i in range(users)
+            ],
+        )
+        # Five datasets per user, so that lookups have to tell the user's datasets apart
+        datasets = [
+            {"user_login": f"user{i}", "ds_name": f"{kind}-{n}", "data_type": kind}
+            for i in range(users)
+            for n, kind in enumerate(["User Commits", "Issues", "Issues", "Issues", "Issues"])
+        ]
+        conn.execute(sa.insert(UserQuery), datasets)
+        query_ids = [i + 1 for i in range(len(datasets))]
+        rows = [
+            {
+                "repo_name": f"org/repo{rng.randrange(200)}",
+                "author_login": f"author{rng.randrange(500)}",
+                "authored_date": START + timedelta(minutes=rng.randrange(2_000_000)),
+                "message": "m",
+                "user_query_id": rng.choice(query_ids),
+            }
+            for _ in range(commits)
+        ]
+        for start in range(0, len(rows), 5000):
+            conn.execute(sa.insert(Commit), rows[start : start + 5000])
+        rows = [
+            {
+                "author_github_login": f"user{rng.randrange(users)}",
+                "created_at": START + timedelta(minutes=rng.randrange(2_000_000)),
+                "body_text": "b",
+                "title": "t",
+                "user_query_id": rng.choice(query_ids),
+            }
+            for _ in range(issues)
+        ]
+        for start in range(0, len(rows), 5000):
+            conn.execute(sa.insert(Issue), rows[start : start + 5000])
+
+
+def query_plan(conn: sa.Connection, sql: str, params: dict) -> str:
+    """Returns the plan the database picks for the query."""
+    if conn.dialect.name == "sqlite":
+        rows = conn.execute(sa.text(f"EXPLAIN QUERY PLAN {sql}"), params).all()
+        return "; ".join(row[-1] for row in rows)
+    rows = conn.execute(sa.text(f"EXPLAIN {sql}"), params).all()
+    return "; ".join(" ".join(str(value) for value in row if value is not None) for row in rows)
+
+
+def measure(engine: sa.Engine, args: argparse.Namespace) -> dict:
+    """Prints the plan of every query and returns its median latency in milliseconds."""
+    latencies = {}
+    with engine.connect() as conn:
+        for name, (sql, make_params) in QUERIES.items():
+            rng = random.Random(1)
+            print(f"  {name}: {query_plan(conn, sql, make_params(rng, args))}")
+            samples = []
+            for _ in range(args.repeat):
+                params = make_params(rng, args)
+                started = time.perf_counter()
+                conn.execute(sa.text(sql), params).all()
+                samples.append((time.perf_counter() - started) * 1000)
+            latencies[name] = statistics.median(samples)
+    return latencies
+
+
+def run(args: argparse.Namespace) -> None:
+    path = None
+    url = args.database_url
+    if url is None:
+        handle, path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(handle)
+        url = f"sqlite:///{path}"
+    engine = sa.create_engine(url)
+    try:
+        started = time.perf_counter()
+        seed(engine, args.users, args.commits, args.issues)
+        seconds = time.perf_counter() - started
+        print(
+            f"seeded {args.users} users, {args.commits} commits, {args.issues} issues "
+            f"in {seconds:.1f}s ({engine.dialect.name})"
+        )
+
+        print("without indexes:")
+        before = measure(engine, args)
+        with engine.begin() as conn:
+            for index in INDEXES:
+                index.create(conn)
+        print("with indexes:")
+        after = measure(engine, args)
+
+        print(f"{'query':32} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+        for name in QUERIES:
+            speedup = before[name] / after[name] if after[name] else float("inf")
+            print(f"{name:32} {before[name]:10.3f} {after[name]:10.3f} {speedup:7.1f}x")
+    finally:
+        engine.dispose()
+        if path is not None:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=50, help="The number of users, each with five datasets")
+    parser.add_argument("--commits", type=int, default=200_000, help="The number of commit rows")
+    parser.add_argument("--issues", type=int, default=100_000, help="The number of issue rows")
+    parser.add_argument("--repeat", type=int, default=50, help="How many times each query is timed")
+    parser.add_argument("--database-url", help="An empty database to seed instead of a temporary SQLite file")
+    run(parser.parse_args())
@@ -0,0 +1,101 @@
+"""
+Compares the language classifier used for commit details with pygments.guess_lexer_for_filename on a corpus of
+changed files, reporting the time of each and how often they agree.
+
+The corpus is made of typical repository files plus one file for every extension pygments knows, each repeated as
+files are across the commits of a repository. Run from the backend directory:
+
+    python -m scripts.benchmark_language_classifier --repeat 20
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+
+from pygments.lexers import _iter_lexerclasses, guess_lexer_for_filename
+from pygments.lexers.special import TextLexer
+
+from app.services.language_classifier import candidate_lexers, classify_language
+
+COMMON_FILES = {
+    "src/app.py": "+import os\n+def main():\n+    print(os.getcwd())\n",
+    "web/index.js": "+const x = require('x');\n+module.exports = x;\n",
+    "web/App.tsx": "+export const App = () => <div />;\n",
+    "include/util.h": "+#include <stdio.h>\n+int util(void);\n",
+    "include/view.h": "+#import <Foundation/Foundation.h>\n+@interface View : NSObject\n+@end\n",
+    "src/main.c": "+#include <stdio.h>\n+int main(void) { return 0; }\n",
+    "src/Main.java": "+public class Main { }\n",
+    "lib/model.m": "+#import \"model.h\"\n+@implementation Model\n+@end\n",
+    "scripts/fit.m": "+function y = fit(x)\n+  y = x';\n+end\n",
+    "README.md": "+# Title\n+Some text\n",
+    "docs/index.rst": "+Title\n+=====\n",
+    "Makefile": "+all:\n+\tgcc main.c\n",
+    "Dockerfile": "+FROM python:3.11\n+RUN pip install flask\n",
+    "config.yaml": "+key: value\n",
+    "package.json": '+{"name": "x"}\n',
+    "styles/site.css": "+body { margin: 0; }\n",
+    "templates/base.html": "+<html><body></body></html>\n",
+    "build.sh": "+#!/bin/bash\n+echo hi\n",
+    "data/table.csv": "+a,b\n+1,2\n",
+    "assets/logo.png": None,
+    "LICENSE": "+MIT License\n",
+    "src/lib.rs": "+fn main() {}\n",
+    "cmd/main.go": "+package main\n",
+    "app/models/user.rb": "+class User\n+end\n",
+    "server/index.php": "+<?php echo 1; ?>\n",
+}
+
+
+def build_corpus(repeat: int, seed: int = 0) -> list:
+    """Returns (filename, patch) pairs: the common files and one file per known extension, repeated and shuffled."""
+    files = dict(COMMON_FILES)
+    for lexer in _iter_lexerclasses():
+        for pattern in lexer.filenames:
+            if pattern.startswith("*.") and not any(c in pattern[2:] for c in "*?["):
+                files.setdefault(f"src/file{pattern[1:]}", "+x = 1\n")
+    corpus = list(files.items()) * repeat
+    random.Random(seed).shuffle(corpus)
+    return corpus
+
+
+def pygments_language(filename: str, patch) -> str:
+    """The language as process_commit_details classified it before, with pygments' lexer guessing."""
+    try:
+        return guess_lexer_for_filename(filename, patch).name
+    except Exception:  # pylint: disable=broad-except
+        return TextLexer.name
+
+
+def run(repeat: int) -> None:
+    corpus = build_corpus(repeat)
+    unique = len(set(corpus))
+
+    start = time.perf_counter()
+    expected = [pygments_language(filename, patch) for filename, patch in corpus]
+    pygments_seconds = time.perf_counter() - start
+
+    candidate_lexers.cache_clear()
+    start = time.perf_counter()
+    actual = [classify_language(filename, patch) for filename, patch in corpus]
+    classifier_seconds = time.perf_counter() - start
+
+    mismatches = Counter(
+        (filename, want, got)
+        for (filename, _), want, got in zip(corpus, expected, actual)
+        if want != got
+    )
+    agreement = 1 - sum(mismatches.values()) / len(corpus)
+    print(f"files: {len(corpus)} ({unique} distinct)")
+    print(f"pygments:   {pygments_seconds:8.3f}s  {len(corpus) / pygments_seconds:10.0f} files/s")
+    print(f"classifier: {classifier_seconds:8.3f}s  {len(corpus) / classifier_seconds:10.0f} files/s")
+    print(f"speedup:    {pygments_seconds / classifier_seconds:8.1f}x")
+    print(f"agreement:  {agreement:8.2%}")
+    for (filename, want, got), count in mismatches.most_common(10):
+        print(f"  {filename}: pygments {want!r}, classifier {got!r} ({count}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5, help="How many times each file occurs in the corpus")
+    run(parser.parse_args().repeat)
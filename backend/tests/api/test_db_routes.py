@@ -0,0 +1,129 @@
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from app.api.db_routes import db_bp
+from app.database import db
+from app.models import User
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI="sqlite://", JWT_SECRET_KEY="test-secret-key-of-thirty-two-bytes")
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(db_bp, url_prefix="/api")
+    with app.app_context():
+        # Deleting a dataset loads the rows of every data type
+        db.create_all()
+        for github_id, login in (("U1", "owner"), ("U2", "other")):
+            db.session.add(User(github_id=github_id, github_login=login, personal_access_token="t", api_url="x"))
+        db.session.commit()
+        headers = {
+            login: {"Authorization": f"Bearer {create_access_token(identity=github_id)}"}
+            for github_id, login in (("U1", "owner"), ("U2", "other"))
+        }
+    # Every request runs in its own app context and session, as in the server
+    client = app.test_client()
+    client.headers = headers
+    return client
+
+
+def save(client, rows, **fields):
+    body = {"name": "commits", "type": "User Commits", "tableHeader": ["Message"], "tableData": rows, **fields}
+    return client.post("/api/db/save-data", json=body, headers=client.headers["owner"])
+
+
+def row_ids(client, query_id):
+    response = client.get(f"/api/db/user-queries/{query_id}/rows", headers=client.headers["owner"])
+    return [row["id"] for row in response.json["rows"]]
+
+
+def test_chunked_upload_appends_to_dataset(client):
+    first = save(client, [["a"], ["b"]])
+    assert first.status_code == 200
+    assert first.json["rows"] == 2
+    query_id = first.json["query_id"]
+
+    assert save(client, [["c"]], queryId=query_id).json["query_id"] == query_id
+    assert row_ids(client, query_id) == [1, 2, 3]
+    assert save(client, [["d"]], type="Bogus").status_code == 400
+
+
+def test_failed_chunked_upload_can_be_retried(client):
+    query_id = save(client, [["a"]], final=False).json["query_id"]
+    check = {"name": "commits", "type": "User Commits"}
+    assert client.post("/api/db/check-duplicate", json=check, headers=client.headers["owner"]).json["exists"] is False
+
+    # The upload failed before its last chunk, so saving the dataset again replaces the partial one
+    retry = save(client, [["a"]], final=False).json["query_id"]
+    assert retry != query_id
+    assert save(client, [["b"]], queryId=retry).status_code == 200
+    assert client.post("/api/db/check-duplicate", json=check, headers=client.headers["owner"]).json["exists"] is True
+    queries = client.get("/api/db/user-queries", headers=client.headers["owner"]).json
+    assert [(query["id"], query["complete"]) for query in queries] == [(retry, True)]
+    assert len(row_ids(client, retry)) == 2
+
+
+def test_later_chunks_keep_the_repository_type(client):
+    header = ["GitHub ID", "Name", "Primary Language", "Language Stats"]
+    row = ["octocat", "hello", "Python", "{}"]
+    first = save(client, [row], name="repos", type="Collaborating Forked Repo", tableHeader=header)
+    query_id = first.json["query_id"]
+    assert save(client, [row], queryId=query_id, tableHeader=header).status_code == 200
+
+    response = client.get(f"/api/db/user-queries/{query_id}", headers=client.headers["owner"])
+    assert [repo["repository_type"] for repo in response.json] == ["Collaborating Forked Repo"] * 2
+
+
+def test_rows_are_paged_by_id(client):
+    query_id = save(client, [[str(i)] for i in range(5)]).json["query_id"]
+
+    url = f"/api/db/user-queries/{query_id}/rows"
+    page = client.get(url, query_string={"limit": 3}, headers=client.headers["owner"]).json
+    assert ([row["id"] for row in page["rows"]], page["after"]) == ([1, 2, 3], 3)
+    page = client.get(url, query_string={"limit": 3, "after": 3}, headers=client.headers["owner"]).json
+    assert ([row["id"] for row in page["rows"]], page["after"]) == ([4, 5], None)
+
+    stream = client.get(url, query_string={"format": "ndjson", "after": 1}, headers=client.headers["owner"])
+    assert stream.mimetype == "application/x-ndjson"
+    assert len(stream.data.decode().splitlines()) == 4
+    assert client.get(url, headers=client.headers["other"]).status_code == 404
+
+
+def test_bulk_delete_checks_ownership(client):
+    query_id = save(client, [[str(i)] for i in range(5)]).json["query_id"]
+    url = f"/api/db/user-contributions/{query_id}"
+
+    assert client.delete(url, json={"ids": [1, 2]}, headers=client.headers["other"]).status_code == 404
+    response = client.delete(url, json={"ids": [1, 2, 99]}, headers=client.headers["owner"])
+    assert response.json["deleted"] == 2
+    assert client.delete(f"{url}/3", headers=client.headers["owner"]).status_code == 200
+    assert client.delete(f"{url}/3", headers=client.headers["owner"]).status_code == 404
+    assert client.delete(url, json={"ids": "1"}, headers=client.headers["owner"]).status_code == 400
+    assert row_ids(client, query_id) == [4, 5]
+
+
+def test_export_streams_a_parquet_file(client):
+    query_id = save(client, [[str(i)] for i in range(3)]).json["query_id"]
+    url = f"/api/db/user-queries/{query_id}/export"
+
+    response = client.get(url, headers=client.headers["owner"])
+    assert response.headers["Content-Disposition"] == 'attachment; filename="commits.parquet"'
+    table = pq.read_table(pa.BufferReader(response.data))
+    assert table.column("message").to_pylist() == ["0", "1", "2"]
+    assert client.get(url, query_string={"format": "csv"}, headers=client.headers["owner"]).status_code == 400
+    assert client.get(url, headers=client.headers["other"]).status_code == 404
+
+
+def test_language_totals_are_grouped_by_author(client):
+    header = ["Author Login", "Languages"]
+    rows = [["alice", '{"Python": {"additions": 4, "deletions": 1}}'], ["alice", "N/A"]]
+    query_id = save(client, rows, tableHeader=header).json["query_id"]
+    url = f"/api/db/user-queries/{query_id}/languages"
+
+    response = client.get(url, headers=client.headers["owner"])
+    assert response.json == [{"login": "alice", "language": "Python", "additions": 4, "deletions": 1}]
+    assert client.get(url, headers=client.headers["other"]).status_code == 404
@@ -0,0 +1,51 @@
+import json
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from app.api.github_routes import github_bp
+from app.database import db
+from app.models import BackgroundJob, Issue, User, UserQuery
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI="sqlite://", JWT_SECRET_KEY="test-secret-key-of-thirty-two-bytes")
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(github_bp, url_prefix="/api")
+    with app.app_context():
+        for model in (User, UserQuery, Issue, BackgroundJob):
+            model.__table__.create(db.engine)
+        db.session.add(User(github_id="U1", github_login="owner", personal_access_token="t", api_url="x"))
+        user_query = UserQuery(user_login="owner", ds_name="issues", data_type="Issues")
+        db.session.add(user_query)
+        db.session.flush()
+        for title in ("First", "Second", "Third"):
+            db.session.add(
+                Issue(author_github_login="octocat", body_text="", title=title, user_query_id=user_query.id)
+            )
+        for job_id, progress in (("done", {"user_query_id": user_query.id}), ("empty", {"user_query_id": None})):
+            record = BackgroundJob.enqueue(job_id, "dataset_refresh", "owner", {})
+            record.status, record.progress = "completed", json.dumps(progress)
+        db.session.commit()
+        headers = {"Authorization": f"Bearer {create_access_token(identity='U1')}"}
+    client = app.test_client()
+    client.headers = headers
+    return client
+
+
+def test_results_of_a_job_that_is_not_live_are_read_from_its_dataset(client):
+    response = client.get("/api/graphql/jobs/done/results", headers=client.headers)
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert [json.loads(line)["title"] for line in response.data.decode().splitlines()] == ["First", "Second", "Third"]
+
+    response = client.get("/api/graphql/jobs/done/results", query_string={"offset": 2}, headers=client.headers)
+    assert [json.loads(line)["title"] for line in response.data.decode().splitlines()] == ["Third"]
+
+    # A job without a dataset yet reports its state instead of an empty stream
+    response = client.get("/api/graphql/jobs/empty/results", headers=client.headers)
+    assert response.status_code == 409
+    assert response.json["job"]["status"] == "completed"
+    assert client.get("/api/graphql/jobs/missing/results", headers=client.headers).status_code == 404
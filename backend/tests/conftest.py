@@ -0,0 +1,8 @@
+import pytest
+from app.services.github_query.graphql_client import single_flight
+
+
+@pytest.fixture(autouse=True)
+def fresh_single_flight(monkeypatch):
+    # Results shared between identical requests must not leak from one test's mocked responses into the next
+    monkeypatch.setattr(single_flight, "_single_flight", single_flight.SingleFlight())
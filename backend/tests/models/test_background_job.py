@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+from app.database import db
+from app.models.background_job import BackgroundJob
+
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    with app.app_context():
+        BackgroundJob.__table__.create(db.engine)
+        yield app
+        db.session.remove()
+
+
+def stored(job_id, status, **fields):
+    record = BackgroundJob.enqueue(job_id, "cohort", "owner", {"logins": ["octocat"]})
+    for name, value in dict(status=status, **fields).items():
+        setattr(record, name, value)
+    db.session.commit()
+    return record
+
+
+class TestBackgroundJob:
+    def test_claims_runnable_jobs_once(self, app):
+        stored("queued", "queued")
+        stored("parked-due", "parked", resume_at=NOW - timedelta(seconds=1))
+        stored("parked-later", "parked", resume_at=NOW + timedelta(hours=1))
+        stored("running-stale", "running", heartbeat_at=NOW - timedelta(hours=1))
+        stored("running", "running", heartbeat_at=NOW)
+        stored("done", "completed")
+
+        stale_before = NOW - timedelta(minutes=5)
+        claimed = set()
+        while (record := BackgroundJob.claim("w1", stale_before, NOW)) is not None:
+            assert (record.status, record.worker_id) == ("running", "w1")
+            claimed.add(record.id)
+        assert claimed == {"queued", "parked-due", "running-stale"}
+
+    def test_cancel_stops_waiting_jobs_at_once(self, app):
+        stored("queued", "queued")
+        stored("running", "running", heartbeat_at=NOW)
+        BackgroundJob.request_cancel("queued")
+        BackgroundJob.request_cancel("running")
+
+        assert BackgroundJob.find("queued", "owner").status == "cancelled"
+        assert BackgroundJob.find("running", "owner").status == "running"
+        assert BackgroundJob.save("running", "running", {}, {}) is True
+        assert BackgroundJob.find("running", "someone-else") is None
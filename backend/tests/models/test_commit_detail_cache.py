@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+import pytest
+from flask import Flask
+from app.database import db
+from app.models import commit_detail_cache
+from app.models.commit_detail_cache import CommitDetailCache
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    with app.app_context():
+        CommitDetailCache.__table__.create(db.engine)
+        yield app
+        db.session.remove()
+
+
+class TestCommitDetailCache:
+    def test_miss_then_hit(self, app):
+        assert CommitDetailCache.get("api.github.com", "octo", "repo", "abc") is None
+        details = {"additions": 3, "lang_stats": {"Python": {"additions": 3, "deletions": 0}}}
+        CommitDetailCache.put("api.github.com", "octo", "repo", "abc", details, 10)
+        assert CommitDetailCache.get("api.github.com", "octo", "repo", "abc") == details
+        assert CommitDetailCache.get("github.example.com", "octo", "repo", "abc") is None
+
+    def test_many_commits_are_read_in_chunks(self, app, monkeypatch):
+        monkeypatch.setattr(commit_detail_cache, "LOOKUP_CHUNK_SHAS", 2)
+        for i in range(5):
+            CommitDetailCache.put("api.github.com", "octo", "repo", f"sha{i}", {"n": i}, 100)
+        CommitDetailCache.put("api.github.com", "octo", "other", "sha5", {"n": 5}, 100)
+        past = datetime.utcnow() - timedelta(days=1)
+        CommitDetailCache.query.update({"last_accessed": past})
+        db.session.commit()
+
+        shas = [f"sha{i}" for i in range(6)] + ["missing"]
+        details = CommitDetailCache.get_many("api.github.com", "octo", "repo", shas)
+        assert details == {f"sha{i}": {"n": i} for i in range(5)}
+        touched = {entry.sha for entry in CommitDetailCache.query if entry.last_accessed > past}
+        assert touched == {f"sha{i}" for i in range(5)}
+
+    def test_duplicate_put_is_ignored(self, app):
+        CommitDetailCache.put("api.github.com", "octo", "repo", "abc", {"n": 1}, 10)
+        CommitDetailCache.put("api.github.com", "octo", "repo", "abc", {"n": 2}, 10)
+        assert CommitDetailCache.get("api.github.com", "octo", "repo", "abc") == {"n": 1}
+
+    def test_least_recently_used_entries_are_evicted(self, app):
+        for i in range(10):
+            CommitDetailCache.put("api.github.com", "octo", "repo", f"sha{i}", {"n": i}, 10)
+        # Age every entry, then touch sha0 so it becomes the most recently used
+        past = datetime.utcnow() - timedelta(days=1)
+        for i, entry in enumerate(CommitDetailCache.query.order_by(CommitDetailCache.id)):
+            entry.last_accessed = past + timedelta(seconds=i)
+        db.session.commit()
+        CommitDetailCache.get("api.github.com", "octo", "repo", "sha0")
+
+        CommitDetailCache.put("api.github.com", "octo", "repo", "sha10", {"n": 10}, 10)
+        remaining = {entry.sha for entry in CommitDetailCache.query}
+        assert len(remaining) == 9
+        assert {"sha0", "sha10"} <= remaining
+        assert "sha1" not in remaining and "sha2" not in remaining
+
+    def test_size_is_counted_once_per_tenth_of_the_cap(self, app, monkeypatch):
+        monkeypatch.setattr(CommitDetailCache, "_inserts_since_check", 0)
+        due = [CommitDetailCache._eviction_due(100) for _ in range(50)]
+        assert [i + 1 for i, check in enumerate(due) if check] == [10, 20, 30, 40, 50]
+
+    def test_recent_hits_are_not_written(self, app):
+        CommitDetailCache.put("api.github.com", "octo", "repo", "abc", {"n": 1}, 10)
+        accessed = CommitDetailCache.query.one().last_accessed
+        CommitDetailCache.get("api.github.com", "octo", "repo", "abc")
+        db.session.expire_all()
+        assert CommitDetailCache.query.one().last_accessed == accessed
@@ -0,0 +1,53 @@
+import pytest
+from flask import Flask
+from app.database import db
+from app.models.contribution_window_cache import ContributionWindowCache
+
+WINDOWS = [
+    ("2020-01-01T00:00:00Z", "2020-12-31T23:59:59Z"),
+    ("2021-01-01T00:00:00Z", "2021-12-31T23:59:59Z"),
+]
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    with app.app_context():
+        ContributionWindowCache.__table__.create(db.engine)
+        yield app
+        db.session.remove()
+
+
+class TestContributionWindowCache:
+    def test_get_many_returns_cached_windows(self, app):
+        ContributionWindowCache.put_many("api.github.com", "Octocat", "collection", {WINDOWS[0]: {"commit": 3}}, "s1")
+        cached = ContributionWindowCache.get_many("api.github.com", "octocat", "collection", WINDOWS, "s1")
+        assert cached == {WINDOWS[0]: {"commit": 3}}
+        assert ContributionWindowCache.get_many("api.github.com", "octocat", "calendar", WINDOWS, "s1") == {}
+
+    def test_window_end_is_part_of_the_key(self, app):
+        ContributionWindowCache.put("api.github.com", "octocat", "calendar", "2020-01-01", "", {"n": 1}, "s1")
+        assert ContributionWindowCache.get("api.github.com", "octocat", "calendar", "2020-01-01", "", "s1") == {"n": 1}
+        assert (
+            ContributionWindowCache.get("api.github.com", "octocat", "calendar", "2020-01-01", "2020-02-01", "s1")
+            is None
+        )
+
+    def test_duplicate_put_is_ignored(self, app):
+        ContributionWindowCache.put("api.github.com", "octocat", "collection", *WINDOWS[0], {"n": 1}, "s1")
+        ContributionWindowCache.put("api.github.com", "octocat", "collection", *WINDOWS[0], {"n": 2}, "s1")
+        assert ContributionWindowCache.get("api.github.com", "octocat", "collection", *WINDOWS[0], "s1") == {"n": 1}
+
+    def test_results_are_not_shared_between_scopes(self, app):
+        # The totals of a viewer who can see private contributions must not reach other viewers
+        ContributionWindowCache.put("api.github.com", "octocat", "collection", *WINDOWS[0], {"commit": 9}, "owner")
+        ContributionWindowCache.put("api.github.com", "octocat", "collection", *WINDOWS[0], {"commit": 2}, "other")
+        assert ContributionWindowCache.get("api.github.com", "octocat", "collection", *WINDOWS[0], "owner") == {
+            "commit": 9
+        }
+        assert ContributionWindowCache.get("api.github.com", "octocat", "collection", *WINDOWS[0], "other") == {
+            "commit": 2
+        }
+        assert ContributionWindowCache.get("api.github.com", "octocat", "collection", *WINDOWS[0], "third") is None
@@ -0,0 +1,33 @@
+import pytest
+from flask import Flask
+from app.database import db
+from app.models.repository_contributors_checkpoint import RepositoryContributorsCheckpoint
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    with app.app_context():
+        RepositoryContributorsCheckpoint.__table__.create(db.engine)
+        yield app
+        db.session.remove()
+
+
+class TestRepositoryContributorsCheckpoint:
+    def test_put_replaces_checkpoint(self, app):
+        authors = {"name": ["Alice"], "login": ["alice"]}
+        RepositoryContributorsCheckpoint.put("api.github.com", "Octo", "Repo", "c1", "2024-01-01T00:00:00Z", authors)
+        RepositoryContributorsCheckpoint.put(
+            "api.github.com", "octo", "repo", "c2", "2024-02-01T00:00:00Z", {"name": ["Alice", "Bob"], "login": []}
+        )
+        assert RepositoryContributorsCheckpoint.query.count() == 1
+        assert RepositoryContributorsCheckpoint.get("api.github.com", "OCTO", "repo") == {
+            "head_oid": "c2",
+            "head_committed_date": "2024-02-01T00:00:00Z",
+            "authors": {"name": ["Alice", "Bob"], "login": []},
+        }
+
+    def test_unknown_repository_has_no_checkpoint(self, app):
+        assert RepositoryContributorsCheckpoint.get("api.github.com", "octo", "repo") is None
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import threading
+import time
+import pytest
+import requests
+import requests_mock
+from app.services.github_query.graphql_client import scheduler, transport
+from app.services.github_query.graphql_client.async_client import AsyncClient
+from app.services.github_query.graphql_client.authentication import (
+    PersonalAccessTokenAuthenticator,
+)
+from app.services.github_query.graphql_client.client import QueryFailedException
+from app.services.github_query.queries.query import (
+    BatchQuery,
+    PaginatedQuery,
+    Query,
+    QueryNode,
+    QueryNodePaginator,
+)
+
+URL = "https://api.github.com/graphql"
+
+
+@pytest.fixture(autouse=True)
+def session_pool(monkeypatch):
+    pool = transport.SessionPool()
+    monkeypatch.setattr(transport, "_session_pool", pool)
+    monkeypatch.setattr(scheduler, "_scheduler", scheduler.RateLimitScheduler())
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def client():
+    return AsyncClient(authenticator=PersonalAccessTokenAuthenticator(token="abc"))
+
+
+def echo_login(request, context):
+    login = request.json()["query"].split('"')[1]
+    return {"data": {"user": {"login": login}}}
+
+
+def test_execute_many_preserves_order(client):
+    queries = [f'query {{ user(login: "user{i}") {{ login }} }}' for i in range(6)]
+    with requests_mock.Mocker() as m:
+        m.post(URL, json=echo_login)
+        results = asyncio.run(client.execute_many(queries, concurrency=3))
+    assert [r["user"]["login"] for r in results] == [f"user{i}" for i in range(6)]
+
+
+def test_execute_many_bounds_concurrency(client, monkeypatch):
+    lock = threading.Lock()
+    in_flight = [0]
+    peak = [0]
+
+    def slow_send(query, variables=None):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.05)
+        with lock:
+            in_flight[0] -= 1
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"data": {"viewer": {}}}).encode()
+        return response
+
+    monkeypatch.setattr(client, "_send", slow_send)
+    queries = [f'query {{ user(login: "user{i}") {{ login }} }}' for i in range(8)]
+    asyncio.run(client.execute_many(queries, concurrency=2))
+    assert peak[0] == 2
+
+
+def test_execute_many_rejects_invalid_concurrency(client):
+    with pytest.raises(ValueError):
+        asyncio.run(client.execute_many([], concurrency=0))
+
+
+def test_paginated_query_collects_pages(client):
+    query = PaginatedQuery(
+        fields=[
+            QueryNode(
+                "user",
+                args={"login": "octocat"},
+                fields=[
+                    QueryNodePaginator(
+                        "gists",
+                        args={"first": 1},
+                        fields=["totalCount", QueryNode("pageInfo", fields=["endCursor", "hasNextPage"])],
+                    )
+                ],
+            )
+        ]
+    )
+    pages = [
+        {"data": {"user": {"gists": {"totalCount": 2, "pageInfo": {"endCursor": "c1", "hasNextPage": True}}}}},
+        {"data": {"user": {"gists": {"totalCount": 2, "pageInfo": {"endCursor": "c2", "hasNextPage": False}}}}},
+    ]
+    with requests_mock.Mocker() as m:
+        m.post(URL, [{"json": page} for page in pages])
+        results = asyncio.run(client.execute_many([query]))
+    assert len(results[0]) == 2
+    assert not query.paginator.has_next()
+
+
+def test_rate_limit_is_detected(client):
+    with requests_mock.Mocker() as m:
+        m.post(
+            URL,
+            json={"errors": [{"type": "RATE_LIMITED"}]},
+            headers={"X-RateLimit-Reset": str(int(time.time()) + 60)},
+        )
+        result = asyncio.run(client.execute("query { viewer { login } }"))
+    assert result["no_limit"] is True
+    assert result["wait_seconds"] > 0
+
+
+def test_failed_query_raises(client):
+    with requests_mock.Mocker() as m:
+        m.post(URL, status_code=500, json={"message": "error"})
+        with pytest.raises(QueryFailedException):
+            asyncio.run(client.execute("query { viewer { login } }"))
+
+
+def test_batch_query_keeps_found_users(client):
+    batch = BatchQuery(
+        [
+            Query(fields=[QueryNode("user", args={"login": login}, fields=["login"])])
+            for login in ("octocat", "ghost")
+        ]
+    )
+    with requests_mock.Mocker() as m:
+        m.post(
+            URL,
+            json={
+                "data": {"u0": {"login": "octocat"}, "u1": None},
+                "errors": [{"type": "NOT_FOUND", "path": ["u1"]}],
+            },
+        )
+        response = asyncio.run(client.execute(batch))
+    assert batch.split(response) == [{"user": {"login": "octocat"}}, None]
@@ -0,0 +1,105 @@
+import pytest
+import requests_mock
+from app.services.github_query.graphql_client import scheduler, transport
+from app.services.github_query.graphql_client.authentication import (
+    PersonalAccessTokenAuthenticator,
+)
+from app.services.github_query.graphql_client.client import Client
+from app.services.github_query.queries.query import (
+    BatchQuery,
+    PaginatedQuery,
+    Query,
+    QueryNode,
+    QueryNodePaginator,
+)
+
+URL = "https://api.github.com/graphql"
+
+
+@pytest.fixture(autouse=True)
+def session_pool(monkeypatch):
+    pool = transport.SessionPool()
+    monkeypatch.setattr(transport, "_session_pool", pool)
+    monkeypatch.setattr(scheduler, "_scheduler", scheduler.RateLimitScheduler())
+    yield pool
+    pool.close()
+
+
+def gists_query():
+    return PaginatedQuery(
+        fields=[
+            QueryNode(
+                "user",
+                args={"login": "octocat"},
+                fields=[
+                    QueryNodePaginator(
+                        "gists",
+                        args={"first": 10},
+                        fields=["totalCount", QueryNode("pageInfo", fields=["endCursor", "hasNextPage"])],
+                    )
+                ],
+            )
+        ]
+    )
+
+
+def test_document_declares_variables():
+    query = gists_query()
+    assert query.get_document() == (
+        "query($login: String!, $first: Int, $after: String) "
+        "{ user(login: $login) { gists(first: $first, after: $after) "
+        "{ totalCount pageInfo { endCursor hasNextPage } } } }"
+    )
+    assert query.get_variables() == {"login": "octocat", "first": 10, "after": None}
+
+
+def test_document_is_stable_across_pages():
+    query = gists_query()
+    document = query.get_document()
+    query.paginator.update_paginator(True, "c1")
+    assert query.get_document() is document
+    assert query.get_variables()["after"] == "c1"
+    query.paginator.reset_paginator()
+    assert query.get_variables()["after"] is None
+
+
+def test_quoted_values_are_unquoted():
+    query = Query(
+        fields=[
+            QueryNode(
+                "user",
+                args={"login": 'oct"o'},
+                fields=[QueryNode("contributionsCollection", args={"from": '"2024-01-01T00:00:00Z"'}, fields=["startedAt"])],
+            )
+        ]
+    )
+    assert query.get_variables() == {"login": 'oct"o', "from": "2024-01-01T00:00:00Z"}
+    assert str(query) == (
+        'query { user(login: "oct\\"o") { contributionsCollection(from: "2024-01-01T00:00:00Z") { startedAt } } }'
+    )
+
+
+def test_batch_variables_are_unique():
+    batch = BatchQuery(
+        [Query(fields=[QueryNode("user", args={"login": login}, fields=["login"])]) for login in ("a", "b")]
+    )
+    assert batch.get_document() == (
+        "query($login: String!, $login_1: String!) "
+        "{ u0: user(login: $login) { login } u1: user(login: $login_1) { login } }"
+    )
+    assert batch.get_variables() == {"login": "a", "login_1": "b"}
+
+
+def test_client_sends_document_and_variables():
+    client = Client(authenticator=PersonalAccessTokenAuthenticator(token="abc"))
+    query = gists_query()
+    pages = [
+        {"data": {"user": {"gists": {"totalCount": 2, "pageInfo": {"endCursor": "c1", "hasNextPage": True}}}}},
+        {"data": {"user": {"gists": {"totalCount": 2, "pageInfo": {"endCursor": "c2", "hasNextPage": False}}}}},
+    ]
+    with requests_mock.Mocker() as m:
+        m.post(URL, [{"json": page} for page in pages])
+        list(client.execute(query))
+        bodies = [request.json() for request in m.request_history]
+    assert bodies[0]["query"] == bodies[1]["query"] == query.get_document()
+    assert [body["variables"]["after"] for body in bodies] == [None, "c1"]
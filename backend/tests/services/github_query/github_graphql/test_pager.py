@@ -0,0 +1,109 @@
+import pytest
+import requests_mock
+from requests.exceptions import Timeout
+from app.services.github_query.graphql_client import scheduler, transport
+from app.services.github_query.graphql_client.authentication import (
+    PersonalAccessTokenAuthenticator,
+)
+from app.services.github_query.graphql_client.client import Client
+from app.services.github_query.graphql_client.pager import AdaptivePager
+from app.services.github_query.queries.query import (
+    PaginatedQuery,
+    QueryNode,
+    QueryNodePaginator,
+)
+
+URL = "https://api.github.com/graphql"
+
+
+@pytest.fixture(autouse=True)
+def session_pool(monkeypatch):
+    pool = transport.SessionPool()
+    monkeypatch.setattr(transport, "_session_pool", pool)
+    monkeypatch.setattr(scheduler, "_scheduler", scheduler.RateLimitScheduler())
+    yield pool
+    pool.close()
+
+
+def history_query(first=50):
+    return PaginatedQuery(
+        fields=[
+            QueryNode(
+                "repository",
+                args={"owner": "octo", "name": "repo"},
+                fields=[
+                    QueryNodePaginator(
+                        "history",
+                        args={"first": first},
+                        fields=["totalCount", QueryNode("pageInfo", fields=["endCursor", "hasNextPage"])],
+                    )
+                ],
+            )
+        ]
+    )
+
+
+def page(cursor, has_next):
+    return {"data": {"repository": {"history": {"totalCount": 3, "pageInfo": {"endCursor": cursor, "hasNextPage": has_next}}}}}
+
+
+def test_fast_pages_grow_to_maximum():
+    pager = AdaptivePager(50)
+    assert pager.record_success(0.1) == 75
+    assert pager.record_success(0.1) == 100
+    assert pager.record_success(0.1) == 100
+
+
+def test_slow_pages_keep_size():
+    pager = AdaptivePager(50)
+    assert pager.record_success(5.0) == 50
+
+
+def test_failures_shrink_and_cap_growth():
+    pager = AdaptivePager(40)
+    assert pager.record_failure() == 20
+    assert pager.record_success(0.1) == 30
+    assert pager.record_success(0.1) == 39
+    assert pager.record_success(0.1) == 39
+
+
+def test_shrinks_down_to_minimum():
+    pager = AdaptivePager(8, min_size=5)
+    assert pager.record_failure() == 5
+    assert not pager.can_shrink()
+
+
+def test_is_overload():
+    assert AdaptivePager.is_overload(Timeout())
+    assert not AdaptivePager.is_overload(ValueError())
+
+
+def test_client_shrinks_page_on_gateway_error():
+    client = Client(authenticator=PersonalAccessTokenAuthenticator(token="abc"))
+    query = history_query()
+    with requests_mock.Mocker() as m:
+        m.post(
+            URL,
+            [
+                {"status_code": 502, "text": "Bad Gateway"},
+                {"json": page("c1", True)},
+                {"json": page("c2", False)},
+            ],
+        )
+        pages = list(client.execute(query))
+        sizes = [request.json()["variables"]["first"] for request in m.request_history]
+    assert len(pages) == 2
+    assert sizes == [50, 25, 38]
+
+
+def test_client_without_adaptive_page_size_keeps_size():
+    client = Client(
+        authenticator=PersonalAccessTokenAuthenticator(token="abc"),
+        adaptive_page_size=False,
+    )
+    query = history_query()
+    with requests_mock.Mocker() as m:
+        m.post(URL, [{"json": page("c1", True)}, {"json": page("c2", False)}])
+        list(client.execute(query))
+        sizes = [request.json()["variables"]["first"] for request in m.request_history]
+    assert sizes == [50, 50]
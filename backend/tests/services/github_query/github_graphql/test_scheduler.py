@@ -0,0 +1,105 @@
+import pytest
+import requests_mock
+from app.services.github_query.graphql_client import scheduler, transport
+from app.services.github_query.graphql_client.authentication import (
+    PersonalAccessTokenAuthenticator,
+)
+from app.services.github_query.graphql_client.client import Client
+from app.services.github_query.graphql_client.scheduler import RateLimitScheduler
+
+URL = "https://api.github.com/graphql"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(scheduler.time, "time", lambda: now[0])
+    monkeypatch.setattr(scheduler.time, "sleep", sleep)
+    return now, sleeps
+
+
+@pytest.fixture
+def key():
+    return RateLimitScheduler.key("api.github.com", "graphql", "token abc")
+
+
+def test_unknown_budget_is_not_paced(clock, key):
+    limiter = RateLimitScheduler(burst=2)
+    for _ in range(10):
+        assert limiter.acquire(key) is None
+    assert clock[1] == []
+
+
+def test_requests_are_spread_over_the_window(clock, key):
+    now, sleeps = clock
+    limiter = RateLimitScheduler(burst=2)
+    limiter.update_from_headers(
+        key, {"X-RateLimit-Remaining": "100", "X-RateLimit-Reset": str(now[0] + 100)}
+    )
+    for _ in range(4):
+        assert limiter.acquire(key) is None
+    # Two requests fit in the burst, the others wait for the bucket to refill at ~1 point/s
+    assert len(sleeps) == 2
+    assert all(0.9 < s < 1.1 for s in sleeps)
+    assert limiter.budget(key)["remaining"] == 96
+
+
+def test_exhausted_budget_returns_wait_beyond_max_wait(clock, key):
+    now, sleeps = clock
+    limiter = RateLimitScheduler()
+    limiter.exhaust(key, now[0] + 600)
+    wait = limiter.acquire(key, max_wait=60)
+    assert wait == pytest.approx(603)
+    assert sleeps == []
+
+
+def test_exhausted_budget_is_waited_out_within_max_wait(clock, key):
+    now, sleeps = clock
+    limiter = RateLimitScheduler()
+    limiter.exhaust(key, now[0] + 10)
+    assert limiter.acquire(key, max_wait=60) is None
+    assert sleeps == [pytest.approx(13)]
+
+
+def test_body_rate_limit_updates_cost(clock, key):
+    limiter = RateLimitScheduler()
+    limiter.update_from_body(
+        key, {"cost": 5, "remaining": 4000, "resetAt": "2030-01-01T00:00:00Z"}
+    )
+    budget = limiter.budget(key)
+    assert budget["cost"] == 5
+    assert budget["remaining"] == 4000
+    assert budget["reset_at"] == "2030-01-01T00:00:00+00:00"
+
+
+def test_client_waits_out_short_rate_limit(clock, monkeypatch):
+    now, sleeps = clock
+    pool = transport.SessionPool()
+    monkeypatch.setattr(transport, "_session_pool", pool)
+    monkeypatch.setattr(scheduler, "_scheduler", RateLimitScheduler())
+    client = Client(authenticator=PersonalAccessTokenAuthenticator(token="abc"))
+    with requests_mock.Mocker() as m:
+        m.post(
+            URL,
+            [
+                {
+                    "json": {"errors": [{"type": "RATE_LIMITED"}]},
+                    "headers": {
+                        "X-RateLimit-Remaining": "0",
+                        "X-RateLimit-Reset": str(int(now[0]) + 5),
+                    },
+                },
+                {"json": {"data": {"viewer": {"login": "octocat"}}}},
+            ],
+        )
+        assert client.execute("query { viewer { login } }") == {
+            "viewer": {"login": "octocat"}
+        }
+    assert len(sleeps) == 1
+    pool.close()
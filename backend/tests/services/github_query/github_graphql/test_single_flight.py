@@ -0,0 +1,222 @@
+import asyncio
+import threading
+import time
+import pytest
+import requests_mock
+from app.services.github_query.graphql_client import scheduler, single_flight, transport
+from app.services.github_query.graphql_client.async_client import AsyncClient
+from app.services.github_query.graphql_client.authentication import (
+    PersonalAccessTokenAuthenticator,
+    TokenPoolAuthenticator,
+)
+from app.services.github_query.graphql_client.client import Client
+from app.services.github_query.graphql_client.single_flight import SingleFlight
+from app.services.github_query.queries import RepositoryDefaultBranch, UserLogin
+
+URL = "https://api.github.com/graphql"
+QUERY = 'query { user(login: "octocat") { login } }'
+
+
+@pytest.fixture(autouse=True)
+def session_pool(monkeypatch):
+    pool = transport.SessionPool()
+    monkeypatch.setattr(transport, "_session_pool", pool)
+    monkeypatch.setattr(scheduler, "_scheduler", scheduler.RateLimitScheduler())
+    yield pool
+    pool.close()
+
+
+def client(token="abc", cls=Client, **kwargs):
+    return cls(authenticator=PersonalAccessTokenAuthenticator(token=token), **kwargs)
+
+
+def test_concurrent_identical_requests_share_one_call():
+    flight = SingleFlight(ttl=0)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"user": {"login": "octocat"}}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.run("k", fetch, lambda r: True)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(flight.run("k", fetch, lambda r: True)))
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert len(calls) == 1
+    assert results == [{"user": {"login": "octocat"}}] * 2
+    # Every caller gets its own copy
+    assert results[0] is not results[1]
+    # Without a TTL, nothing is kept once the request finished
+    assert len(flight) == 0
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.run("k", fail, lambda r: True)
+    assert flight.run("k", lambda: "ok", lambda r: True) == "ok"
+
+
+def run_with_follower(flight, leader_fetch, follower_fetch, cacheable=lambda r: True):
+    """Runs leader_fetch as the leader of key "k" and joins it with follower_fetch across scopes."""
+    started, release = threading.Event(), threading.Event()
+    outcomes = {}
+
+    def lead():
+        started.set()
+        release.wait(5)
+        return leader_fetch()
+
+    def run(name, fetch):
+        try:
+            outcomes[name] = flight.run("k", fetch, cacheable, across_scopes=True)
+        except ValueError as e:
+            outcomes[name] = e
+
+    leader = threading.Thread(target=run, args=("leader", lead))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=run, args=("follower", follower_fetch))
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join()
+    follower.join()
+    return outcomes
+
+
+def test_errors_are_not_passed_across_scopes():
+    def revoked():
+        raise ValueError("Bad credentials")
+
+    outcomes = run_with_follower(SingleFlight(ttl=0), revoked, lambda: {"user": {"login": "octocat"}})
+    assert isinstance(outcomes["leader"], ValueError)
+    # The follower sends the request with its own credentials
+    assert outcomes["follower"] == {"user": {"login": "octocat"}}
+
+
+def test_rate_limit_responses_are_not_passed_across_scopes():
+    outcomes = run_with_follower(
+        SingleFlight(ttl=0),
+        lambda: {"no_limit": True},
+        lambda: {"user": {"login": "octocat"}},
+        cacheable=lambda r: not r.get("no_limit"),
+    )
+    assert outcomes == {"leader": {"no_limit": True}, "follower": {"user": {"login": "octocat"}}}
+
+
+def test_results_are_cached_until_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(single_flight.time, "monotonic", lambda: now[0])
+    with requests_mock.Mocker() as m:
+        m.post(URL, json={"data": {"user": {"login": "octocat"}}})
+        first = client().execute(QUERY)
+        first["user"]["login"] = "changed"
+        assert client().execute(QUERY) == {"user": {"login": "octocat"}}
+        assert m.call_count == 1
+        now[0] += single_flight.DEFAULT_TTL_SECONDS + 1
+        client().execute(QUERY)
+        assert m.call_count == 2
+
+
+def test_requests_are_not_shared_across_scopes():
+    with requests_mock.Mocker() as m:
+        m.post(URL, json={"data": {"user": {"login": "octocat"}}})
+        client("abc").execute(QUERY)
+        client("def").execute(QUERY)
+        client("abc", single_flight=False).execute(QUERY)
+        Client(authenticator=TokenPoolAuthenticator(["abc", "def"])).execute(QUERY)
+        Client(authenticator=TokenPoolAuthenticator(["def", "abc"])).execute(QUERY)
+        client("abc").execute('mutation { addStar(input: {starrableId: "1"}) { clientMutationId } }')
+        client("abc").execute('mutation { addStar(input: {starrableId: "1"}) { clientMutationId } }')
+        # The pools hold the same tokens in a different order, and mutations are never shared
+        assert m.call_count == 6
+
+
+def test_viewer_independent_queries_are_shared_across_scopes():
+    with requests_mock.Mocker() as m:
+        user = {"login": "octocat", "name": None, "id": "U_1", "email": "", "createdAt": "2020-03-01T00:00:00Z"}
+        m.post(URL, json={"data": {"user": user}})
+        client("abc").execute(UserLogin(login="octocat"))
+        client("def").execute(UserLogin(login="octocat"))
+        client("ghi").execute(UserLogin.batch(["octocat"]))
+        client("jkl").execute(UserLogin.batch(["octocat"]))
+        assert m.call_count == 2
+
+        # A repository may be private, so its queries stay in the scope of the credentials
+        m.post(URL, json={"data": {"repository": {"defaultBranchRef": {"name": "main"}}}})
+        client("abc").execute(RepositoryDefaultBranch(owner="octo", repo_name="repo"))
+        client("def").execute(RepositoryDefaultBranch(owner="octo", repo_name="repo"))
+        assert m.call_count == 4
+
+
+def test_viewer_independent_queries_fall_back_to_own_credentials_across_scopes():
+    async def run():
+        return await asyncio.gather(
+            *(client(token, cls=AsyncClient).execute(UserLogin(login="octocat")) for token in ("revoked", "abc")),
+            return_exceptions=True,
+        )
+
+    user = {"login": "octocat", "name": None, "id": "U_1", "email": "", "createdAt": "2020-03-01T00:00:00Z"}
+
+    def respond(request, context):
+        time.sleep(0.1)
+        if request.headers["Authorization"] == "token revoked":
+            context.status_code = 401
+            return {"message": "Bad credentials"}
+        return {"data": {"user": user}}
+
+    with requests_mock.Mocker() as m:
+        m.post(URL, json=respond)
+        failed, result = asyncio.run(run())
+        # The second client sent the query itself once the first one failed
+        assert m.request_history[-1].headers["Authorization"] == "token abc"
+    assert isinstance(failed, Exception)
+    assert result == {"user": user}
+
+
+def test_rate_limit_responses_are_not_cached(monkeypatch):
+    with requests_mock.Mocker() as m:
+        m.post(
+            URL,
+            [
+                {
+                    "json": {"errors": [{"type": "RATE_LIMITED"}]},
+                    "headers": {"Retry-After": "3600"},
+                },
+                {"json": {"data": {"user": {"login": "octocat"}}}},
+            ],
+        )
+        assert client(max_wait=0).execute(QUERY)["no_limit"] is True
+        # The budget is restored
+        monkeypatch.setattr(scheduler, "_scheduler", scheduler.RateLimitScheduler())
+        assert client(max_wait=0).execute(QUERY) == {"user": {"login": "octocat"}}
+
+
+def test_async_clients_share_one_call():
+    def slow_echo(request, context):
+        time.sleep(0.1)
+        return {"data": {"user": {"login": "octocat"}}}
+
+    async def run():
+        return await asyncio.gather(*(client(cls=AsyncClient).execute(QUERY) for _ in range(3)))
+
+    with requests_mock.Mocker() as m:
+        m.post(URL, json=slow_echo)
+        results = asyncio.run(run())
+        assert m.call_count == 1
+    assert results == [{"user": {"login": "octocat"}}] * 3
@@ -0,0 +1,70 @@
+import pytest
+import requests_mock
+from app.services.github_query.graphql_client import scheduler, transport
+from app.services.github_query.graphql_client.authentication import (
+    TokenPoolAuthenticator,
+)
+from app.services.github_query.graphql_client.client import Client
+from app.services.github_query.graphql_client.scheduler import RateLimitScheduler
+
+URL = "https://api.github.com/graphql"
+
+
+@pytest.fixture(autouse=True)
+def limiter(monkeypatch):
+    limiter = RateLimitScheduler()
+    monkeypatch.setattr(scheduler, "_scheduler", limiter)
+    pool = transport.SessionPool()
+    monkeypatch.setattr(transport, "_session_pool", pool)
+    yield limiter
+    pool.close()
+
+
+def key(token):
+    return RateLimitScheduler.key("api.github.com", "graphql", f"token {token}")
+
+
+def test_empty_pool_is_rejected():
+    with pytest.raises(ValueError):
+        TokenPoolAuthenticator(["", None])
+
+
+def test_routes_to_token_with_most_budget(limiter):
+    authenticator = TokenPoolAuthenticator(["aaaa", "bbbb"])
+    limiter.update_from_body(key("aaaa"), {"remaining": 10, "resetAt": "2030-01-01T00:00:00Z"})
+    limiter.update_from_body(key("bbbb"), {"remaining": 4000, "resetAt": "2030-01-01T00:00:00Z"})
+    assert authenticator.get_authorization_header() == {"Authorization": "token bbbb"}
+
+
+def test_unused_tokens_are_preferred(limiter):
+    authenticator = TokenPoolAuthenticator(["aaaa", "bbbb"])
+    limiter.update_from_body(key("aaaa"), {"remaining": 4000, "resetAt": "2030-01-01T00:00:00Z"})
+    assert authenticator.get_authorization_header() == {"Authorization": "token bbbb"}
+
+
+def test_budgets_are_masked(limiter):
+    authenticator = TokenPoolAuthenticator(["ghp_secret_token_1234"])
+    budgets = authenticator.budgets()
+    assert budgets[0]["token"] == "****1234"
+    assert budgets[0]["remaining"] is None
+
+
+def test_client_fails_over_to_next_token(limiter):
+    client = Client(authenticator=TokenPoolAuthenticator(["aaaa", "bbbb"]), max_wait=0)
+    limiter.update_from_body(key("bbbb"), {"remaining": 100, "resetAt": "2030-01-01T00:00:00Z"})
+
+    def respond(request, context):
+        if request.headers["Authorization"] == "token aaaa":
+            context.headers["X-RateLimit-Reset"] = "1900000000"
+            return {"errors": [{"type": "RATE_LIMITED"}]}
+        return {"data": {"viewer": {"login": "octocat"}}}
+
+    with requests_mock.Mocker() as m:
+        m.post(URL, json=respond)
+        assert client.execute("query { viewer { login } }") == {
+            "viewer": {"login": "octocat"}
+        }
+        assert [r.headers["Authorization"] for r in m.request_history] == [
+            "token aaaa",
+            "token bbbb",
+        ]
@@ -0,0 +1,66 @@
+import pytest
+import requests_mock
+from app.services.github_query.graphql_client import scheduler, transport
+from app.services.github_query.graphql_client.authentication import (
+    PersonalAccessTokenAuthenticator,
+)
+from app.services.github_query.graphql_client.client import Client
+from app.services.github_query.graphql_client.transport import SessionPool
+
+
+@pytest.fixture
+def pool():
+    pool = SessionPool(pool_maxsize=2, max_sessions=2, idle_timeout=60)
+    yield pool
+    pool.close()
+
+
+def test_same_key_reuses_session(pool):
+    first = pool.get_session("https", "api.github.com", "token a")
+    second = pool.get_session("https", "api.github.com", "token a")
+    assert first is second
+    assert len(pool) == 1
+
+
+def test_sessions_are_isolated_per_host_and_token(pool):
+    first = pool.get_session("https", "api.github.com", "token a")
+    assert pool.get_session("https", "api.github.com", "token b") is not first
+    assert pool.get_session("https", "github.example.com", "token a") is not first
+
+
+def test_least_recently_used_session_is_evicted(pool):
+    first = pool.get_session("https", "api.github.com", "token a")
+    second = pool.get_session("https", "api.github.com", "token b")
+    pool.get_session("https", "api.github.com", "token a")
+    pool.get_session("https", "api.github.com", "token c")
+    assert len(pool) == 2
+    assert pool.get_session("https", "api.github.com", "token a") is first
+    assert pool.get_session("https", "api.github.com", "token b") is not second
+
+
+def test_idle_sessions_are_evicted(pool, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(transport.time, "monotonic", lambda: now[0])
+    first = pool.get_session("https", "api.github.com", "token a")
+    now[0] += 61
+    assert pool.evict_idle() == 1
+    assert len(pool) == 0
+    assert pool.get_session("https", "api.github.com", "token a") is not first
+
+
+def test_invalid_pool_size():
+    with pytest.raises(ValueError):
+        SessionPool(pool_maxsize=0)
+
+
+def test_client_uses_shared_session(monkeypatch):
+    pool = SessionPool()
+    monkeypatch.setattr(transport, "_session_pool", pool)
+    monkeypatch.setattr(scheduler, "_scheduler", scheduler.RateLimitScheduler())
+    client = Client(authenticator=PersonalAccessTokenAuthenticator(token="abc"))
+    with requests_mock.Mocker() as m:
+        m.post("https://api.github.com/graphql", json={"data": {"viewer": {}}})
+        assert client.execute("query { viewer { login } }") == {"viewer": {}}
+        assert client.execute("query { viewer { login } }") == {"viewer": {}}
+    assert len(pool) == 1
+    pool.close()
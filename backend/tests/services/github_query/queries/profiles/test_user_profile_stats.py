@@ -135,3 +135,41 @@ class TestUserProfileStats:
         profile_stats = UserProfileStats.profile_stats(raw_data)
         assert profile_stats == expected_profile_stats, "The processed profile stats do not match the expected structure."
 
+
+
+class TestUserProfileStatsBatch:
+    def test_batch_aliases_each_login(self):
+        batch = UserProfileStats.batch(["alice", "bob"])
+        query_string = str(batch)
+        assert query_string.startswith('query { u0: user(login: "alice") {')
+        assert 'u1: user(login: "bob") {' in query_string
+
+    def test_batch_split_feeds_profile_stats(self):
+        batch = UserProfileStats.batch(["alice", "ghost"])
+        counts = {"totalCount": 1}
+        user = {
+            "login": "alice",
+            "name": "Alice",
+            "email": "",
+            "createdAt": "2020-01-01T00:00:00Z",
+            "bio": None,
+            "company": None,
+            "avatarUrl": "",
+            "watching": counts,
+            "starredRepositories": counts,
+            "following": counts,
+            "followers": counts,
+            "gists": counts,
+            "issues": counts,
+            "projects": counts,
+            "pullRequests": counts,
+            "repositories": counts,
+            "repositoryDiscussions": counts,
+            "gistComments": counts,
+            "issueComments": counts,
+            "commitComments": counts,
+            "repositoryDiscussionComments": counts,
+        }
+        alice, ghost = batch.split({"u0": user, "u1": None})
+        assert UserProfileStats.profile_stats(alice)["github"] == "alice"
+        assert ghost is None
@@ -0,0 +1,70 @@
+from app.services.github_query.queries import UserCommitComments, UserIssueComments, UserIssues
+
+START = "2021-01-01T00:00:00Z"
+END = "2022-01-01T00:00:00Z"
+
+
+def page(connection, times, page_info):
+    return {"user": {connection: {"nodes": [{"createdAt": t} for t in times], "pageInfo": page_info}}}
+
+
+def test_ordered_connection_reads_newest_first():
+    query = UserIssues.count_query("octocat", pg_size=50)
+    document = query.get_document()
+    assert "issues(first: $first, orderBy: {field: CREATED_AT, direction: DESC}, after: $after)" in document
+    assert "startCursor" not in document
+    assert query.get_variables() == {"login": "octocat", "first": 50, "after": None}
+
+
+def test_unordered_connection_reads_backwards():
+    query = UserCommitComments.count_query("octocat")
+    assert "commitComments(last: $last, before: $before)" in query.get_document()
+    raw = page(
+        "commitComments",
+        ["2020-06-01T00:00:00Z", "2021-03-01T00:00:00Z", "2022-03-01T00:00:00Z"],
+        {"startCursor": "c1", "hasPreviousPage": True},
+    )
+    assert [node["createdAt"][:4] for node in query.nodes(raw)] == ["2022", "2021", "2020"]
+    assert query.count_in_window(raw, START, END) == (1, True)
+    assert query.next_page(raw) is True
+    assert query.get_variables()["before"] == "c1"
+
+
+def test_page_inside_window_continues():
+    query = UserIssues.count_query("octocat")
+    raw = page("issues", ["2021-09-01T00:00:00Z", "2021-05-01T00:00:00Z"], {"endCursor": "c1", "hasNextPage": False})
+    assert query.count_in_window(raw, START, END) == (2, False)
+    assert query.next_page(raw) is False
+
+
+def test_issue_comments_stop_on_update_time():
+    query = UserIssueComments.count_query("octocat")
+    raw = {
+        "user": {
+            "issueComments": {
+                "nodes": [
+                    {"createdAt": "2021-02-01T00:00:00Z", "updatedAt": "2023-01-01T00:00:00Z"},
+                    {"createdAt": "2019-02-01T00:00:00Z", "updatedAt": "2021-04-01T00:00:00Z"},
+                    {"createdAt": "2020-02-01T00:00:00Z", "updatedAt": "2020-02-01T00:00:00Z"},
+                    {"createdAt": "2021-06-01T00:00:00Z", "updatedAt": "2021-06-01T00:00:00Z"},
+                ],
+                "pageInfo": {"endCursor": "c1", "hasNextPage": True},
+            }
+        }
+    }
+    assert "updatedAt" in query.get_document()
+    assert query.count_in_window(raw, START, END) == (1, True)
+
+
+def test_nodes_since_stop_at_mark():
+    query = UserIssues.count_query("octocat", fields=["bodyText", "title"])
+    assert "nodes { createdAt bodyText title }" in query.get_document()
+    raw = page(
+        "issues",
+        ["2021-09-01T00:00:00Z", "2021-05-01T00:00:00Z", "2021-03-01T00:00:00Z"],
+        {"endCursor": "c1", "hasNextPage": True},
+    )
+    nodes, reached = query.nodes_since(raw, "2021-05-01T00:00:00Z")
+    assert [node["createdAt"] for node in nodes] == ["2021-09-01T00:00:00Z", "2021-05-01T00:00:00Z"]
+    assert reached is True
+    assert query.nodes_since(raw, None) == (query.nodes(raw), False)
@@ -63,3 +63,24 @@ class TestUserContributionsCollection:
         # Call the user_contributions_collection method and assert it returns the expected result
         processed_contributions = UserContributionsCollection.user_contributions_collection(raw_data)
         assert processed_contributions == expected_contributions, "Processed user contributions do not match the expected structure."
+
+    def test_batch_split_feeds_parser(self):
+        batch = UserContributionsCollection.batch(
+            ["alice", "bob"], '"2020-01-01T00:00:00Z"', '"2021-01-01T00:00:00Z"'
+        )
+        assert 'u1: user(login: "bob") { contributionsCollection(from: "2020-01-01T00:00:00Z"' in str(batch)
+        collection = {
+            "startedAt": "2020-01-01T00:00:00Z",
+            "endedAt": "2021-01-01T00:00:00Z",
+            "restrictedContributionsCount": 1,
+            "totalCommitContributions": 2,
+            "totalIssueContributions": 3,
+            "totalPullRequestContributions": 4,
+            "totalPullRequestReviewContributions": 5,
+            "totalRepositoryContributions": 6,
+        }
+        results = batch.split(
+            {"u0": {"contributionsCollection": collection}, "u1": {"contributionsCollection": collection}}
+        )
+        parsed = [UserContributionsCollection.user_contributions_collection(r) for r in results]
+        assert [p["commit"] for p in parsed] == [2, 2]
@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import pytest
+from flask import Flask
+from app.database import db
+from app.models import Commit, CommitLanguage, Repository, RepositoryLanguage, UserQuery
+from app.services import bulk_ingest
+from app.services.bulk_ingest import bulk_insert, parse_timestamps
+
+COMMIT_HEADER = ["Repository", "Author", "Authored Date", "Additions", "Message", "Languages", "Ignored"]
+COMMIT_DATA = [
+    ["octo/repo", "Alice", "2024-05-01T10:00:00Z", 3, "first", '{"Python": 3}', "x"],
+    ["octo/repo", "Bob", "N/A", 0, "second", None, "y"],
+    ["octo/other", "Carol", "2024-05-02T11:30:00Z", 7, "third", "{}", "z"],
+]
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    with app.app_context():
+        for model in (UserQuery, Commit, Repository, CommitLanguage, RepositoryLanguage):
+            model.__table__.create(db.engine)
+        user_query = UserQuery(user_login="owner", ds_name="commits", data_type="User Commits")
+        db.session.add(user_query)
+        db.session.commit()
+        app.user_query_id = user_query.id
+        yield app
+        db.session.remove()
+
+
+def test_parse_timestamps():
+    assert parse_timestamps(["2024-05-01T10:00:00Z", "N/A", None]) == [datetime(2024, 5, 1, 10), None, None]
+    with pytest.raises(ValueError):
+        parse_timestamps(["2024-05-01 10:00"])
+
+
+def test_rows_match_create_from_row(app, monkeypatch):
+    monkeypatch.setattr(bulk_ingest, "INGEST_CHUNK_ROWS", 2)
+    stats = bulk_insert("User Commits", COMMIT_HEADER, COMMIT_DATA, app.user_query_id)
+    db.session.commit()
+
+    assert (stats["rows"], stats["statements"]) == (3, 2)
+    expected = [
+        Commit.create_from_row(dict(zip(COMMIT_HEADER, row)), app.user_query_id) for row in COMMIT_DATA
+    ]
+    saved = Commit.query.order_by(Commit.id).all()
+    columns = [column.name for column in Commit.__table__.columns if column.name != "id"]
+    assert [[getattr(c, name) for name in columns] for c in saved] == [
+        [getattr(c, name) for name in columns] for c in expected
+    ]
+
+
+def test_repository_rows_get_their_type(app):
+    header = ["GitHub ID", "Name", "Created At", "Updated At", "Primary Language", "Language Stats"]
+    data = [["octocat", "repo", "2020-01-01T00:00:00Z", "2024-01-01T00:00:00Z", "Python", "{}"]]
+    bulk_insert("Repositories", header, data, app.user_query_id, repository_type="Owned Original Repo")
+    db.session.commit()
+
+    repository = Repository.query.one()
+    assert (repository.repository_type, repository.updated_at) == ("Owned Original Repo", datetime(2024, 1, 1))
+
+
+def test_invalid_timestamp_inserts_nothing(app):
+    with pytest.raises(ValueError):
+        bulk_insert("User Commits", ["Authored Date"], [["yesterday"]], app.user_query_id)
+    assert Commit.query.count() == 0
@@ -0,0 +1,140 @@
+import json
+import pytest
+from flask import Flask
+from app.database import db
+from app.models import GithubContributionData, UserQuery
+from app.services import cohort_jobs
+from app.services.cohort_jobs import CohortJob, build_contribution_row
+
+
+def repo_page(*repos):
+    return {
+        "user": {
+            "repositories": {
+                "nodes": [
+                    {
+                        "createdAt": created_at,
+                        "languages": {"edges": [{"size": size, "node": {"name": name}} for name, size in langs]},
+                    }
+                    for created_at, langs in repos
+                ],
+                "pageInfo": {"endCursor": None, "hasNextPage": False},
+            }
+        }
+    }
+
+
+PROFILE = {
+    "github": "octocat",
+    "name": "The Octocat",
+    "email": None,
+    "created_at": "2020-01-01T00:00:00Z",
+    "bio": None,
+    "company": "GitHub",
+    "avatarUrl": "",
+    "followers": 4,
+    "gists": 1,
+    "issues": 2,
+    "projects": 0,
+    "pull_requests": 3,
+    "repositories": 2,
+    "repository_discussions": 0,
+    "gist_comments": 0,
+    "issue_comments": 5,
+    "commit_comments": 6,
+    "repository_discussion_comments": 0,
+    "watching": 7,
+    "starred_repositories": 8,
+    "following": 9,
+}
+
+
+class FakeClient:
+    async def execute_many(self, queries, concurrency, return_exceptions):
+        pages = []
+        for query in queries:
+            assert query.paginator.name == "repositories"
+            pages.append(
+                [
+                    repo_page(
+                        ("2021-06-01T00:00:00Z", [("Python", 100), ("C", 10)]),
+                        ("2019-06-01T00:00:00Z", [("Go", 50)]),
+                    )
+                ]
+            )
+        return pages
+
+    async def execute(self, query):
+        node = {"createdAt": "2021-02-01T00:00:00Z", "updatedAt": "2021-02-01T00:00:00Z"}
+        return {"user": {query.connection: {"nodes": [node], "pageInfo": {}}}}
+
+
+@pytest.fixture
+def app(monkeypatch):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    monkeypatch.setattr(
+        cohort_jobs,
+        "get_users_profile_stats",
+        lambda logins, *args, **kwargs: {
+            login: PROFILE if login == "octocat" else {"error": "Not Found", "message": login} for login in logins
+        },
+    )
+    monkeypatch.setattr(
+        cohort_jobs,
+        "get_users_contributions_collection",
+        lambda logins, *args, **kwargs: {login: {"res_con": 1, "commit": 2, "pr_review": 3} for login in logins},
+    )
+    monkeypatch.setattr(cohort_jobs, "get_async_github_client", lambda **kwargs: FakeClient())
+    with app.app_context():
+        UserQuery.__table__.create(db.engine)
+        GithubContributionData.__table__.create(db.engine)
+    yield app
+
+
+def test_row_without_time_range():
+    stats = {column: (1, 100, 100, {"Python"}) for column, _ in cohort_jobs.REPOSITORY_CATEGORIES}
+    row = build_contribution_row("octocat", PROFILE, {"res_con": 1, "commit": 2, "pr_review": 3}, stats, None)
+    assert row["Name"] == "The Octocat"
+    assert row["Email"] == "N/A"
+    assert row["Watching"] == 7
+    assert row["Commit Comments"] == 6
+    assert row["Collaborating Forked Repo Langs Size Number"] == 1
+    assert row["Total Langs Number"] == 1
+
+
+def test_job_saves_rows_in_time_range(app):
+    job = CohortJob("owner", ["octocat", "ghost"], "cohort", "2021-01-01", "2022-01-01", ["Python"])
+    job.run(app, "https", "api.github.com", ["token"])
+
+    progress = job.progress()
+    assert progress["status"] == "completed"
+    assert progress["processed"] == 2
+    assert progress["invalid"] == ["ghost"]
+    assert progress["saved"] == 1
+
+    row = job.rows_from(0)[0]
+    assert row["Age (days)"] == 731
+    assert row["Watching"] == 0
+    assert row["Issue Comments"] == 1
+    assert row["Owned Original Repo"] == 1
+    assert row["Owned Original Repo Size"] == 110
+    assert row["Owned Original Repo Selected Langs Size"] == 100
+    assert row["Repositories"] == 4
+    assert row["Total Langs Number"] == 2
+
+    with app.app_context():
+        saved = GithubContributionData.query.all()
+        assert len(saved) == 1
+        assert saved[0].user_query_id == job.user_query_id
+        assert json.loads(saved[0].selected_langs) == ["Python"]
+        assert UserQuery.query.get(job.user_query_id).data_type == "total"
+
+
+def test_cancelled_job_stops(app):
+    job = CohortJob("owner", ["octocat"], "cohort")
+    job.cancel()
+    job.run(app, "https", "api.github.com", ["token"])
+    assert job.progress()["status"] == "cancelled"
+    assert job.rows_from(0) == []
@@ -0,0 +1,188 @@
+import time
+import pytest
+import requests
+from flask import Flask
+from app.database import db
+from app.models import Commit, CommitDetailCache, CommitLanguage, UserQuery
+from app.services import commit_mining
+from app.services.commit_mining import CommitMiningJob
+from app.services.github_query.graphql_client import QueryFailedException, get_scheduler
+from app.services.github_query.queries import (
+    RepositoryBranches,
+    RepositoryContributorContributions,
+    UserRepositoryNames,
+)
+
+BRANCH_OIDS = {"main": ["a1", "b2"], "dev": ["b2", "c3"], "docs": ["a1"]}
+
+
+def rest_commit(sha):
+    return {
+        "commit": {"author": {"name": "Octo", "email": None, "date": "2021-01-01T00:00:00Z"}, "message": sha},
+        "author": {"login": "octocat"},
+        "parents": [{}],
+        "stats": {"additions": 2, "deletions": 1},
+        "files": [{"filename": "main.py", "patch": "+print(1)", "additions": 2, "deletions": 1}],
+    }
+
+
+class FakeClient:
+    async def execute(self, query):
+        if isinstance(query, UserRepositoryNames):
+            if "ghost" in query.get_variables().values():
+                response = requests.Response()
+                response.status_code = 200
+                response._content = b'{"errors": [{"type": "NOT_FOUND"}]}'
+                raise QueryFailedException(response, "query")
+            nodes = [{"name": "repo", "owner": {"login": "octocat"}}]
+            return [{"user": {"id": "U_1", "repositories": {"nodes": nodes}}}]
+        if isinstance(query, RepositoryBranches):
+            return [{"repository": {"refs": {"nodes": [{"name": name} for name in BRANCH_OIDS]}}}]
+        return {"repository": {"defaultBranchRef": {"name": "main"}}}
+
+    async def execute_many(self, queries, concurrency):
+        pages = []
+        for query in queries:
+            assert isinstance(query, RepositoryContributorContributions)
+            branch = query.get_variables()["qualifiedName"]
+            nodes = [{"oid": oid} for oid in BRANCH_OIDS[branch]]
+            pages.append([{"repository": {"ref": {"target": {"history": {"nodes": nodes}}}}}])
+        return pages
+
+
+@pytest.fixture
+def app(monkeypatch):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    fetched = []
+    authorizations = []
+
+    def fake_fetch(url, headers, max_wait=None):
+        fetched.append(url)
+        authorizations.append(headers["Authorization"])
+        return rest_commit(url.rsplit("/", 1)[-1])
+
+    monkeypatch.setattr(commit_mining, "fetch_with_retries", fake_fetch)
+    monkeypatch.setattr(commit_mining, "get_async_github_client", lambda **kwargs: FakeClient())
+    app.fetched = fetched
+    app.authorizations = authorizations
+    with app.app_context():
+        UserQuery.__table__.create(db.engine)
+        Commit.__table__.create(db.engine)
+        CommitLanguage.__table__.create(db.engine)
+        CommitDetailCache.__table__.create(db.engine)
+    yield app
+
+
+def test_commits_on_several_branches_are_fetched_once(app):
+    job = CommitMiningJob("owner", ["octocat"], "commits", all_branches=True)
+    job.run(app, "https", "api.github.com", ["t1", "t2"])
+
+    progress = job.progress()
+    assert progress["status"] == "completed"
+    assert progress["repositories"]["octocat/repo"] == {
+        "status": "completed",
+        "commits": 3,
+        "fetched": 3,
+        "cached": 0,
+    }
+    assert sorted(url.rsplit("/", 1)[-1] for url in app.fetched) == ["a1", "b2", "c3"]
+    assert {row["Message"]: row["Branch"] for row in job.rows_from(0)} == {"a1": "main", "b2": "main", "c3": "dev"}
+    with app.app_context():
+        assert Commit.query.count() == 3
+        assert UserQuery.query.get(job.user_query_id).data_type == "User Commits"
+
+
+def test_cached_details_are_not_fetched_again(app):
+    CommitMiningJob("owner", ["octocat"], "first").run(app, "https", "api.github.com", ["t1"])
+    app.fetched.clear()
+
+    job = CommitMiningJob("owner", ["octocat"], "second", all_branches=True)
+    job.run(app, "https", "api.github.com", ["t1"])
+    assert [url.rsplit("/", 1)[-1] for url in app.fetched] == ["c3"]
+    assert job.progress()["repositories"]["octocat/repo"]["cached"] == 2
+
+
+def test_unknown_login_is_invalid(app):
+    job = CommitMiningJob("owner", ["ghost"], "commits")
+    job.run(app, "https", "api.github.com", ["t1"])
+    assert job.progress()["invalid"] == ["ghost"]
+    assert job.rows_from(0) == []
+
+
+def test_details_are_fetched_with_the_token_with_most_budget(app):
+    scheduler = get_scheduler()
+    reset = str(int(time.time()) + 3600)
+    for token, remaining in (("t1", "5"), ("t2", "4000")):
+        scheduler.update_from_headers(
+            scheduler.key("mining.example.com", "core", f"token {token}"),
+            {"X-RateLimit-Remaining": remaining, "X-RateLimit-Reset": reset},
+        )
+
+    job = CommitMiningJob("owner", ["octocat"], "commits", all_branches=True)
+    job.run(app, "https", "mining.example.com", ["t1", "t2"])
+    assert app.authorizations == ["token t2"] * 3
+
+
+def not_found():
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b'{"errors": [{"type": "NOT_FOUND"}]}'
+    return QueryFailedException(response, "query")
+
+
+class PrivateRepoClient(FakeClient):
+    def __init__(self, private):
+        self.private = private
+        self.queries = []
+
+    async def execute(self, query):
+        self.queries.append(query)
+        if isinstance(query, UserRepositoryNames):
+            nodes = [{"name": "repo", "isPrivate": self.private, "owner": {"login": "octocat"}}]
+            return [{"user": {"id": "U_1", "repositories": {"nodes": nodes}}}]
+        return await super().execute(query)
+
+
+class BlindPoolClient(FakeClient):
+    """The pool's tokens belong to other users, who cannot see the repository."""
+
+    def __init__(self):
+        self.queries = []
+
+    async def execute(self, query):
+        self.queries.append(query)
+        raise not_found()
+
+
+def mine_with_clients(app, monkeypatch, owner_client, pool_client):
+    monkeypatch.setattr(
+        commit_mining,
+        "get_async_github_client",
+        lambda **kwargs: pool_client if kwargs.get("tokens") else owner_client,
+    )
+    job = CommitMiningJob("owner", ["octocat"], "commits")
+    job.run(app, "https", "api.github.com", ["t1", "t2"])
+    return job
+
+
+def test_private_repositories_are_read_with_the_owner_token(app, monkeypatch):
+    owner_client, pool_client = PrivateRepoClient(private=True), BlindPoolClient()
+    job = mine_with_clients(app, monkeypatch, owner_client, pool_client)
+
+    assert job.progress()["repositories"]["octocat/repo"]["status"] == "completed"
+    assert isinstance(owner_client.queries[0], UserRepositoryNames)
+    assert pool_client.queries == []
+    assert app.authorizations == ["token t1"] * 2
+
+
+def test_public_repository_not_found_with_the_pool_is_retried_with_the_owner_token(app, monkeypatch):
+    owner_client, pool_client = PrivateRepoClient(private=False), BlindPoolClient()
+    job = mine_with_clients(app, monkeypatch, owner_client, pool_client)
+
+    progress = job.progress()
+    assert progress["failed"] == {}
+    assert progress["repositories"]["octocat/repo"]["status"] == "completed"
+    assert len(pool_client.queries) == 1
+    assert app.authorizations == ["token t1"] * 2
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from flask import Flask
+from app.database import db
+from app.models import Commit, UserQuery
+from app.services.dataset_export import export_dataset
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    with app.app_context():
+        for model in (UserQuery, Commit):
+            model.__table__.create(db.engine)
+        yield app
+        db.session.remove()
+
+
+def commit_dataset(count):
+    user_query = UserQuery(user_login="owner", ds_name="commits", data_type="User Commits")
+    db.session.add(user_query)
+    db.session.flush()
+    for i in range(count):
+        db.session.add(
+            Commit(
+                repo_name="octo/repo",
+                message=f"m{i}",
+                additions=i,
+                authored_date=datetime(2024, 1, 1 + i) if i % 2 else None,
+                user_query_id=user_query.id,
+            )
+        )
+    db.session.commit()
+    return user_query
+
+
+def test_parquet_has_typed_columns_and_a_row_group_per_batch(app):
+    user_query = commit_dataset(5)
+
+    chunks = list(export_dataset(user_query, "parquet", batch_rows=2))
+    parquet = pq.ParquetFile(pa.BufferReader(b"".join(chunks)))
+    table = parquet.read()
+
+    assert parquet.metadata.num_row_groups == 3
+    assert table.schema.field("authored_date").type == pa.timestamp("us")
+    assert table.schema.field("additions").type == pa.int64()
+    assert table.column("message").to_pylist() == ["m0", "m1", "m2", "m3", "m4"]
+    assert table.column("authored_date").to_pylist() == [
+        None, datetime(2024, 1, 2), None, datetime(2024, 1, 4), None
+    ]
+
+
+def test_arrow_stream_of_an_empty_dataset_is_readable(app):
+    user_query = commit_dataset(0)
+
+    chunks = list(export_dataset(user_query, "arrow"))
+    table = pa.ipc.open_stream(b"".join(chunks)).read_all()
+
+    assert table.num_rows == 0
+    assert "authored_date" in table.schema.names
@@ -0,0 +1,93 @@
+from datetime import datetime
+
+import pytest
+from flask import Flask
+from app.database import db
+from app.models import (
+    Commit,
+    Gist,
+    Issue,
+    PullRequest,
+    Repository,
+    UserQuery,
+)
+from app.services.dataset_reader import iter_rows, read_page
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    with app.app_context():
+        for model in (UserQuery, Commit, Issue, Gist, PullRequest, Repository):
+            model.__table__.create(db.engine)
+        yield app
+        db.session.remove()
+
+
+def dataset(data_type, rows):
+    user_query = UserQuery(user_login="owner", ds_name=data_type, data_type=data_type)
+    db.session.add(user_query)
+    db.session.flush()
+    for row in rows:
+        row.user_query_id = user_query.id
+        db.session.add(row)
+    db.session.commit()
+    return user_query
+
+
+def commits(count):
+    return [
+        Commit(repo_name="octo/repo", message=f"m{i}", authored_date=datetime(2024, 1, 1 + i) if i % 2 else None)
+        for i in range(count)
+    ]
+
+
+def test_pages_follow_the_last_id(app):
+    user_query = dataset("User Commits", commits(5))
+    # Rows of another dataset are never read
+    dataset("User Commits", commits(2))
+
+    first = read_page(user_query, limit=2)
+    second = read_page(user_query, after=first[-1]["id"], limit=2)
+    last = read_page(user_query, after=second[-1]["id"], limit=2)
+    assert [row["message"] for row in first + second + last] == ["m0", "m1", "m2", "m3", "m4"]
+    assert read_page(user_query, after=last[-1]["id"]) == []
+
+
+def test_stream_reads_in_batches(app):
+    user_query = dataset("User Commits", commits(5))
+
+    assert [row["message"] for row in iter_rows(user_query, batch_rows=2)] == ["m0", "m1", "m2", "m3", "m4"]
+    rows = list(iter_rows(user_query, after=1, limit=3, batch_rows=2))
+    assert [row["message"] for row in rows] == ["m1", "m2", "m3"]
+
+
+def test_rows_match_to_dict(app):
+    created = datetime(2024, 1, 1)
+    datasets = [
+        ("User Commits", Commit, commits(2)),
+        ("Issues", Issue, [Issue(author_github_login="a", created_at=None, body_text="b", title="t")]),
+        ("Gists", Gist, [Gist(author_github_login="a", created_at=created, description="d")]),
+        ("Pull Requests", PullRequest, [PullRequest(author_github_login="a", created_at=created, body_text="b")]),
+        (
+            "Repositories",
+            Repository,
+            [
+                Repository(
+                    author_github_login="a",
+                    name="r",
+                    created_at=created,
+                    updated_at=None,
+                    primary_language="Python",
+                    languages="{}",
+                    repository_type="Owned Original Repo",
+                )
+            ],
+        ),
+    ]
+    for data_type, model, rows in datasets:
+        user_query = dataset(data_type, rows)
+        expected = [row.to_dict() for row in model.query.filter_by(user_query_id=user_query.id).order_by(model.id)]
+        assert read_page(user_query) == expected
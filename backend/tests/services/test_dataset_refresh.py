@@ -0,0 +1,112 @@
+from datetime import datetime
+
+import pytest
+from flask import Flask
+from app.database import db
+from app.models import DatasetRefreshMark, Issue, UserQuery
+from app.services import dataset_refresh
+from app.services.dataset_refresh import DatasetRefreshJob
+
+ISSUES = {
+    "octocat": [
+        {"createdAt": "2021-09-01T00:00:00Z", "bodyText": "new", "title": "New"},
+        {"createdAt": "2021-05-01T00:00:00Z", "bodyText": "old", "title": "Old (edited)"},
+        {"createdAt": "2021-03-01T00:00:00Z", "bodyText": "older", "title": "Older"},
+    ],
+    "newbie": [{"createdAt": "2021-07-01T00:00:00Z", "bodyText": "first", "title": "First"}],
+}
+
+
+class FakeClient:
+    def __init__(self):
+        self.pages = 0
+
+    async def execute(self, query):
+        self.pages += 1
+        login = query.get_variables()["login"]
+        # Only the history of octocat has older pages; its walk has to stop at the newest saved row
+        page_info = {"endCursor": "c1", "hasNextPage": login == "octocat"}
+        return {"user": {"issues": {"nodes": ISSUES[login], "pageInfo": page_info}}}
+
+
+@pytest.fixture
+def app(monkeypatch):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    app.client = FakeClient()
+    monkeypatch.setattr(dataset_refresh, "get_async_github_client", lambda **kwargs: app.client)
+    with app.app_context():
+        UserQuery.__table__.create(db.engine)
+        Issue.__table__.create(db.engine)
+        DatasetRefreshMark.__table__.create(db.engine)
+        user_query = UserQuery(user_login="owner", ds_name="issues", data_type="Issues")
+        db.session.add(user_query)
+        db.session.flush()
+        db.session.add_all(
+            [
+                Issue(
+                    author_github_login="octocat",
+                    created_at=datetime(2021, 5, 1),
+                    body_text="old",
+                    title="Old",
+                    user_query_id=user_query.id,
+                ),
+                Issue(
+                    author_github_login="newbie",
+                    created_at=None,
+                    body_text="N/A",
+                    title="N/A",
+                    user_query_id=user_query.id,
+                ),
+            ]
+        )
+        db.session.commit()
+        app.user_query_id = user_query.id
+    yield app
+
+
+def refresh(app):
+    job = DatasetRefreshJob("owner", app.user_query_id, "issues", "Issues")
+    job.run(app, "https", "api.github.com", ["t1"])
+    return job
+
+
+def test_refresh_upserts_items_since_newest_row(app):
+    job = refresh(app)
+
+    progress = job.progress()
+    assert progress["status"] == "completed"
+    assert (progress["total"], progress["inserted"], progress["updated"]) == (2, 2, 1)
+    assert progress["marks"] == {"octocat": "2021-09-01T00:00:00Z", "newbie": "2021-07-01T00:00:00Z"}
+    assert app.client.pages == 2
+    with app.app_context():
+        titles = {(issue.author_github_login, issue.title) for issue in Issue.query}
+        assert titles == {("octocat", "Old (edited)"), ("octocat", "New"), ("newbie", "First")}
+        assert DatasetRefreshMark.get_marks(app.user_query_id) == progress["marks"]
+
+
+def test_second_refresh_starts_from_recorded_marks(app):
+    refresh(app)
+    job = refresh(app)
+
+    progress = job.progress()
+    # Only the items at the marks are fetched again, and they match their rows
+    assert (progress["inserted"], progress["updated"]) == (0, 0)
+    assert [row["Title"] for row in job.rows_from(0)] == ["New", "First"]
+    with app.app_context():
+        assert Issue.query.count() == 3
+
+
+def test_rows_outside_time_range_are_skipped(app):
+    with app.app_context():
+        user_query = db.session.get(UserQuery, app.user_query_id)
+        user_query.end_time = datetime(2021, 8, 1)
+        db.session.commit()
+    job = refresh(app)
+
+    assert job.progress()["inserted"] == 1
+    with app.app_context():
+        assert Issue.query.filter_by(title="New").count() == 0
+        # The mark still covers the item, so it is not fetched again
+        assert DatasetRefreshMark.get_marks(app.user_query_id)["octocat"] == "2021-09-01T00:00:00Z"
@@ -0,0 +1,438 @@
+import hashlib
+import time
+from datetime import datetime
+import pytest
+import requests
+import requests_mock
+from app.services import github_graphql_services
+from app.services.github_graphql_services import (
+    count_user_nodes_in_window,
+    get_repository_contributors,
+    get_user_contribution_calendar,
+    get_user_contributions_collection,
+    stream_repository_branch_commits,
+    stream_user_nodes,
+)
+from app.services.github_query.graphql_client import get_single_flight, scheduler, transport
+
+URL = "https://api.github.com/graphql"
+
+
+@pytest.fixture(autouse=True)
+def session_pool(monkeypatch):
+    pool = transport.SessionPool()
+    monkeypatch.setattr(transport, "_session_pool", pool)
+    monkeypatch.setattr(scheduler, "_scheduler", scheduler.RateLimitScheduler())
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(autouse=True)
+def viewer_scopes(monkeypatch):
+    monkeypatch.setattr(github_graphql_services, "_viewer_scopes", {})
+
+
+def gists_page(names, cursor, has_next):
+    return {
+        "data": {
+            "user": {
+                "gists": {
+                    "totalCount": 3,
+                    "nodes": [{"createdAt": "2024-01-01T00:00:00Z", "description": name} for name in names],
+                    "pageInfo": {"endCursor": cursor, "hasNextPage": has_next},
+                }
+            }
+        }
+    }
+
+
+def test_stream_user_nodes_flattens_pages():
+    with requests_mock.Mocker() as m:
+        m.post(URL, [{"json": gists_page(["a", "b"], "c1", True)}, {"json": gists_page(["c"], "c2", False)}])
+        nodes = list(stream_user_nodes("user-gists", "octocat", "https", "api.github.com", "token"))
+        assert m.call_count == 2
+    assert [node["description"] for node in nodes] == ["a", "b", "c"]
+
+
+def test_stream_stops_with_rate_limit_entry():
+    with requests_mock.Mocker() as m:
+        m.post(
+            URL,
+            [
+                {"json": gists_page(["a"], "c1", True)},
+                {
+                    "json": {"errors": [{"type": "RATE_LIMITED"}]},
+                    "headers": {"X-RateLimit-Reset": str(int(time.time()) + 3600)},
+                },
+            ],
+        )
+        nodes = list(stream_user_nodes("user-gists", "octocat", "https", "api.github.com", "token"))
+    assert nodes[0]["description"] == "a"
+    assert nodes[-1]["no_limit"] is True
+
+
+def test_stream_ends_with_error_entry_after_network_failure(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    with requests_mock.Mocker() as m:
+        m.post(URL, [{"json": gists_page(["a"], "c1", True)}, {"exc": requests.exceptions.ConnectTimeout}])
+        nodes = list(stream_user_nodes("user-gists", "octocat", "https", "api.github.com", "token"))
+    assert nodes[0]["description"] == "a"
+    assert "error" in nodes[-1]
+
+
+def test_stream_unknown_kind():
+    with pytest.raises(KeyError):
+        stream_user_nodes("user-stars", "octocat", "https", "api.github.com", "token")
+
+
+def test_stream_repository_branch_commits():
+    page = {
+        "data": {
+            "repository": {
+                "defaultBranchRef": {
+                    "target": {
+                        "history": {
+                            "totalCount": 1,
+                            "nodes": [{"oid": "abc"}],
+                            "pageInfo": {"endCursor": "c1", "hasNextPage": False},
+                        }
+                    }
+                }
+            }
+        }
+    }
+    with requests_mock.Mocker() as m:
+        m.post(URL, json=page)
+        commits = list(
+            stream_repository_branch_commits("octo", "repo", None, True, "https", "api.github.com", "token")
+        )
+    assert commits == [{"oid": "abc"}]
+
+
+def issues_page(times, cursor, has_next):
+    return {
+        "data": {
+            "user": {
+                "issues": {
+                    "nodes": [{"createdAt": t} for t in times],
+                    "pageInfo": {"endCursor": cursor, "hasNextPage": has_next},
+                }
+            }
+        }
+    }
+
+
+def test_count_stops_at_window_start():
+    with requests_mock.Mocker() as m:
+        m.post(
+            URL,
+            [
+                {"json": issues_page(["2023-05-01T00:00:00Z", "2021-08-01T00:00:00Z"], "c1", True)},
+                {"json": issues_page(["2021-03-01T00:00:00Z", "2020-12-01T00:00:00Z"], "c2", True)},
+                {"json": issues_page(["2020-01-01T00:00:00Z"], "c3", False)},
+            ],
+        )
+        result = count_user_nodes_in_window(
+            "user-issues", "octocat", "2021-01-01", "2022-01-01", "https", "api.github.com", "token"
+        )
+        assert m.call_count == 2
+        assert m.request_history[1].json()["variables"]["after"] == "c1"
+    assert result == {"count": 2, "pages": 2}
+
+
+def test_count_unknown_kind():
+    with pytest.raises(KeyError):
+        count_user_nodes_in_window(
+            "user-repositories-a", "octocat", "2021-01-01", "2022-01-01", "https", "api.github.com", "token"
+        )
+
+
+def window(commits):
+    return {
+        "startedAt": "",
+        "endedAt": "",
+        "restrictedContributionsCount": 1,
+        "totalCommitContributions": commits,
+        "totalIssueContributions": 0,
+        "totalPullRequestContributions": 0,
+        "totalPullRequestReviewContributions": 2,
+        "totalRepositoryContributions": 0,
+    }
+
+
+def test_contributions_collection_in_one_request():
+    with requests_mock.Mocker() as m:
+        m.post(
+            URL,
+            json={"data": {"user": {"createdAt": "2012-01-01T00:00:00Z", "w0": window(3), "w1": window(4)}}},
+        )
+        result = get_user_contributions_collection(
+            "octocat", "https", "api.github.com", "token", "2020-01-01", "2021-06-01"
+        )
+        assert m.call_count == 1
+        body = m.request_history[0].json()
+        assert body["variables"]["from"] == "2020-01-01T00:00:00Z"
+        assert body["variables"]["to_1"] == "2021-06-01T00:00:00Z"
+    assert result == {"res_con": 2, "commit": 7, "pr_review": 4}
+
+
+VIEWER = {"json": {"data": {"viewer": {"login": "mona", "id": "U_1"}}}}
+
+
+class DictCache:
+    def __init__(self, entries):
+        self.entries = dict(entries)
+        self.scopes = set()
+
+    def get_many(self, host, login, kind, windows, scope):
+        self.scopes.add(scope)
+        return {window: self.entries[window] for window in windows if window in self.entries}
+
+    def put_many(self, host, login, kind, results, scope):
+        self.entries.update(results)
+
+    def get(self, host, login, kind, start, end, scope):
+        return self.entries.get((kind, start, end))
+
+    def put(self, host, login, kind, start, end, data, scope):
+        self.entries[(kind, start, end)] = data
+
+
+def test_contributions_collection_reads_elapsed_years_from_cache():
+    cached_year = ("2020-01-01T00:00:00Z", "2020-12-31T23:59:59Z")
+    cache = DictCache({cached_year: {"res_con": 0, "commit": 10, "pr_review": 0}})
+    windows = {"json": {"data": {"user": {"createdAt": "2012-01-01T00:00:00Z", "w0": window(4)}}}}
+    with requests_mock.Mocker() as m:
+        m.post(URL, [VIEWER, windows])
+        result = get_user_contributions_collection(
+            "octocat", "https", "api.github.com", "token", "2020-01-01", "2021-06-01", cache=cache
+        )
+        assert m.call_count == 2
+        assert m.request_history[1].json()["variables"]["from"] == "2021-01-01T00:00:00Z"
+    assert result == {"res_con": 1, "commit": 14, "pr_review": 2}
+    assert ("2021-01-01T00:00:00Z", "2021-06-01T00:00:00Z") in cache.entries
+    # Windows are cached under the visibility scope of the viewer, not shared with every viewer
+    assert cache.scopes == {hashlib.sha256(b"api.github.com/U_1").hexdigest()}
+
+    with requests_mock.Mocker() as m:
+        result = get_user_contributions_collection(
+            "octocat", "https", "api.github.com", "token", "2020-01-01", "2021-06-01", cache=cache
+        )
+        assert m.call_count == 0
+    assert result == {"res_con": 1, "commit": 14, "pr_review": 2}
+
+
+def test_contributions_collection_cache_survives_rotated_token():
+    cached_year = ("2020-01-01T00:00:00Z", "2020-12-31T23:59:59Z")
+    cache = DictCache({cached_year: {"res_con": 0, "commit": 10, "pr_review": 0}})
+    with requests_mock.Mocker() as m:
+        m.post(URL, [VIEWER])
+        result = get_user_contributions_collection(
+            "octocat", "https", "api.github.com", "rotated", "2020-01-01", "2021-01-01", cache=cache
+        )
+        # Only the viewer of the new token is looked up
+        assert m.call_count == 1
+        assert "viewer" in m.request_history[0].json()["query"]
+    assert result == {"res_con": 0, "commit": 10, "pr_review": 0}
+    assert cache.scopes == {hashlib.sha256(b"api.github.com/U_1").hexdigest()}
+
+
+def test_contributions_collection_without_start_begins_at_account_creation():
+    cache = DictCache({})
+    created = {"json": {"data": {"user": {"login": "octocat", "createdAt": "2020-03-01T00:00:00Z"}}}}
+    windows = {"json": {"data": {"user": {"w0": window(4), "w1": window(1)}}}}
+    with requests_mock.Mocker() as m:
+        m.post(URL, [created, VIEWER, windows])
+        result = get_user_contributions_collection(
+            "octocat", "https", "api.github.com", "token", end="2021-06-01", cache=cache
+        )
+        assert m.call_count == 3
+        body = m.request_history[2].json()
+        variables = body["variables"]
+        assert (variables["from"], variables["to_1"]) == ("2020-03-01T00:00:00Z", "2021-06-01T00:00:00Z")
+        # The windows request reuses the creation time that was just looked up
+        assert "createdAt" not in body["query"]
+    assert result == {"res_con": 2, "commit": 5, "pr_review": 4}
+
+    # The creation time and the windows of elapsed years are cached
+    with requests_mock.Mocker() as m:
+        result = get_user_contributions_collection(
+            "octocat", "https", "api.github.com", "token", end="2021-06-01", cache=cache
+        )
+        assert m.call_count == 0
+    assert result == {"res_con": 2, "commit": 5, "pr_review": 4}
+
+
+def test_contributions_collection_caches_creation_time_of_windows_request():
+    cache = DictCache({})
+    with requests_mock.Mocker() as m:
+        m.post(URL, [VIEWER, {"json": {"data": {"user": {"createdAt": "2012-01-01T00:00:00Z", "w0": window(3)}}}}])
+        get_user_contributions_collection(
+            "octocat", "https", "api.github.com", "token", "2024-01-01", "2024-06-01", cache=cache
+        )
+    assert cache.entries[("created_at", "", "")] == "2012-01-01T00:00:00Z"
+
+    # A range without a start date needs no separate lookup of the creation time
+    get_single_flight().clear()
+    with requests_mock.Mocker() as m:
+        m.post(URL, json={"data": {"user": {"w0": window(4)}}})
+        result = get_user_contributions_collection(
+            "octocat", "https", "api.github.com", "token", end="2012-06-01", cache=cache
+        )
+        assert m.call_count == 1
+        body = m.request_history[0].json()
+        assert "createdAt" not in body["query"]
+        assert body["variables"]["from"] == "2012-01-01T00:00:00Z"
+    assert result == {"res_con": 1, "commit": 4, "pr_review": 2}
+
+
+def calendar_window(days, joined=None):
+    weeks = [
+        {"contributionDays": [{"date": d, "weekday": w, "contributionCount": c} for d, w, c in week]} for week in days
+    ]
+    return {
+        "startedAt": "",
+        "endedAt": "",
+        "contributionYears": [],
+        "joinedGitHubContribution": joined,
+        "contributionCalendar": {"weeks": weeks},
+    }
+
+
+def test_contribution_calendar_caches_elapsed_years_and_joins_split_weeks():
+    cache = DictCache({})
+    year_2024 = calendar_window(
+        [
+            [("2024-05-30", 4, 1), ("2024-05-31", 5, 2), ("2024-06-01", 6, 3)],
+            [("2024-12-29", 0, 1), ("2024-12-30", 1, 0), ("2024-12-31", 2, 4)],
+        ],
+        joined={"occurredAt": "2024-03-01T00:00:00Z"},
+    )
+    year_2025 = calendar_window([[("2025-01-01", 3, 5), ("2025-01-04", 6, 1)], [("2025-01-05", 0, 7)]])
+    with requests_mock.Mocker() as m:
+        m.post(URL, [VIEWER, {"json": {"data": {"user": {"w0": year_2024, "w1": year_2025}}}}])
+        join_date, calendar = get_user_contribution_calendar(
+            "octocat", "https", "api.github.com", "token", "2024-05-31", "2025-01-05", cache=cache
+        )
+        assert m.call_count == 2
+        # Elapsed years are fetched whole, in one request
+        variables = m.request_history[1].json()["variables"]
+        assert (variables["from"], variables["to_1"]) == ("2024-01-01T00:00:00Z", "2025-12-31T23:59:59Z")
+    # The join date lies before the range
+    assert join_date is None
+    assert [[day["date"] for day in week["contributionDays"]] for week in calendar] == [
+        ["2024-05-31", "2024-06-01"],
+        ["2024-12-29", "2024-12-30", "2024-12-31", "2025-01-01", "2025-01-04"],
+        ["2025-01-05"],
+    ]
+    assert ("2024-01-01T00:00:00Z", "2024-12-31T23:59:59Z") in cache.entries
+
+    # Any other range within the elapsed years is served from the cache
+    with requests_mock.Mocker() as m:
+        join_date, calendar = get_user_contribution_calendar(
+            "octocat", "https", "api.github.com", "token", "2024-12-30", "2025-01-01", cache=cache
+        )
+        assert m.call_count == 0
+    assert [[day["date"] for day in week["contributionDays"]] for week in calendar] == [
+        ["2024-12-30", "2024-12-31", "2025-01-01"]
+    ]
+
+
+def test_contribution_calendar_without_start_fetches_only_the_current_year():
+    year = datetime.utcnow().year
+    cache = DictCache({})
+    response = {"json": {"data": {"user": {"w0": calendar_window([]), "w1": calendar_window([])}}}}
+    with requests_mock.Mocker() as m:
+        m.post(URL, [VIEWER, response])
+        get_user_contribution_calendar("octocat", "https", "api.github.com", "token", end=f"{year}-01-15", cache=cache)
+        variables = m.request_history[1].json()["variables"]
+        assert (variables["from"], variables["from_1"]) == (f"{year - 1}-01-01T00:00:00Z", f"{year}-01-01T00:00:00Z")
+
+    get_single_flight().clear()
+    with requests_mock.Mocker() as m:
+        m.post(URL, json={"data": {"user": {"w0": calendar_window([])}}})
+        get_user_contribution_calendar("octocat", "https", "api.github.com", "token", end=f"{year}-01-15", cache=cache)
+        assert m.call_count == 1
+        variables = m.request_history[0].json()["variables"]
+        assert variables["from"] == f"{year}-01-01T00:00:00Z"
+        assert "from_1" not in variables
+
+
+def history_page(head, commits, cursor=None):
+    """Commits are (oid, author) or (oid, author, parents); by default the parent of a commit is the next one listed."""
+    nodes = []
+    for i, (oid, name, *parents) in enumerate(commits):
+        parents = parents[0] if parents else [c[0] for c in commits[i + 1 : i + 2]]
+        author = {"name": name, "email": None, "user": {"login": name.lower()}}
+        nodes.append({"oid": oid, "parents": {"nodes": [{"oid": p} for p in parents]}, "author": author})
+    history = {"totalCount": len(nodes), "nodes": nodes, "pageInfo": {"endCursor": cursor, "hasNextPage": bool(cursor)}}
+    target = {"oid": head, "committedDate": "2024-05-01T10:00:00Z", "history": history}
+    return {"json": {"data": {"repository": {"defaultBranchRef": {"target": target}}}}}
+
+
+class DictCheckpoint:
+    def __init__(self):
+        self.entry = None
+
+    def get(self, host, owner, name):
+        return self.entry
+
+    def put(self, host, owner, name, head_oid, head_committed_date, authors):
+        self.entry = {"head_oid": head_oid, "head_committed_date": head_committed_date, "authors": authors}
+
+
+def test_repository_contributors_walk_only_commits_since_checkpoint():
+    checkpoint = DictCheckpoint()
+    args = ("octo", "repo", "https", "api.github.com", "token")
+    with requests_mock.Mocker() as m:
+        m.post(URL, [history_page("c2", [("c2", "Alice")], "p1"), history_page("c2", [("c1", "Bob")])])
+        result = get_repository_contributors(*args, checkpoint=checkpoint)
+        assert "since" not in m.request_history[0].json()["variables"]
+    assert result["login"] == ["alice", "bob"]
+    assert result["incremental"] is False
+    assert checkpoint.entry["head_oid"] == "c2"
+
+    # Later requests, after the results of the first walk are no longer shared
+    get_single_flight().clear()
+    with requests_mock.Mocker() as m:
+        m.post(URL, [history_page("c3", [("c3", "Carol"), ("c2", "Alice")])])
+        result = get_repository_contributors(*args, checkpoint=checkpoint)
+        assert m.call_count == 1
+        assert "since" not in m.request_history[0].json()["variables"]
+    assert result["login"] == ["alice", "bob", "carol"]
+    assert (result["incremental"], result["walked_commits"]) == (True, 2)
+    assert checkpoint.entry["head_oid"] == "c3"
+
+    get_single_flight().clear()
+    with requests_mock.Mocker() as m:
+        m.post(URL, [history_page("c3", [("c3", "Carol")])])
+        result = get_repository_contributors(*args, checkpoint=checkpoint)
+    assert (result["walked_commits"], result["login"]) == (0, ["alice", "bob", "carol"])
+
+
+def test_repository_contributors_rebuild_after_force_push():
+    checkpoint = DictCheckpoint()
+    checkpoint.put("api.github.com", "octo", "repo", "gone", "2024-05-01T10:00:00Z", {"name": ["Old"], "login": ["old"]})
+    with requests_mock.Mocker() as m:
+        m.post(URL, [history_page("n2", [("n2", "Dave")], "p1"), history_page("n2", [("n1", "Erin")])])
+        result = get_repository_contributors("octo", "repo", "https", "api.github.com", "token", checkpoint=checkpoint)
+        # The stored head is not in the history, so the one walk covers the whole history
+        assert m.call_count == 2
+    assert result["login"] == ["dave", "erin"]
+    assert result["incremental"] is False
+    assert checkpoint.entry["authors"]["login"] == ["dave", "erin"]
+
+
+def test_repository_contributors_include_merged_commits_older_than_checkpoint():
+    checkpoint = DictCheckpoint()
+    checkpoint.put("api.github.com", "octo", "repo", "c2", "2024-05-01T10:00:00Z", {"name": ["Bob"], "login": ["bob"]})
+    # m3 merges f1 into c2. f1 was committed before c2 on a branch from c1, so it comes after c2 in the history
+    merge = [("m3", "Mallory", ["c2", "f1"]), ("c2", "Bob", ["c1"]), ("f1", "Frank", ["c1"])]
+    with requests_mock.Mocker() as m:
+        m.post(URL, [history_page("m3", merge, "p1"), history_page("m3", [("c1", "Carl")])])
+        result = get_repository_contributors("octo", "repo", "https", "api.github.com", "token", checkpoint=checkpoint)
+        # c1 is an ancestor of the stored head, so the walk stops before the next page
+        assert m.call_count == 1
+    assert result["login"] == ["bob", "frank", "mallory"]
+    assert (result["incremental"], result["walked_commits"]) == (True, 3)
+    assert checkpoint.entry["head_oid"] == "m3"
@@ -0,0 +1,36 @@
+import pytest
+import requests
+from app.services import github_rest_services
+from app.services.github_rest_services import can_access_repository
+
+
+class FakeSession:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.urls = []
+
+    def head(self, url, headers, timeout):
+        self.urls.append(url)
+        response = requests.Response()
+        response.status_code = self.status_code
+        return response
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = FakeSession(200)
+    monkeypatch.setattr(github_rest_services, "get_session", lambda *args: session)
+    monkeypatch.setattr(github_rest_services, "_repository_access", {})
+    return session
+
+
+def test_granted_access_is_remembered_per_token(session):
+    assert can_access_repository("https", "api.github.com", "octo", "repo", "t1")
+    assert can_access_repository("https", "api.github.com", "octo", "repo", "t1")
+    assert session.urls == ["https://api.github.com/repos/octo/repo"]
+
+    # Another token must pass the check itself
+    session.status_code = 404
+    assert not can_access_repository("https", "api.github.com", "octo", "repo", "t2")
+    assert not can_access_repository("https", "api.github.com", "octo", "repo", "t2")
+    assert len(session.urls) == 3
@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from flask import Flask
+from app.database import db
+from app.models import BackgroundJob, DatasetRefreshMark, Issue, User, UserQuery
+from app.services import dataset_refresh, job_queue
+from app.services.dataset_refresh import DatasetRefreshJob
+from app.services.job_queue import JobWorker, find_stored_job, get_live_job
+
+PAGES = {
+    None: (
+        [
+            {"createdAt": "2021-09-01T00:00:00Z", "bodyText": "new", "title": "New"},
+            {"createdAt": "2021-08-01T00:00:00Z", "bodyText": "newer", "title": "Newer"},
+        ],
+        True,
+    ),
+    "c1": ([{"createdAt": "2021-03-01T00:00:00Z", "bodyText": "old", "title": "Old"}], False),
+}
+
+
+class FakeClient:
+    def __init__(self):
+        self.requests = []
+        self.rate_limited = True
+
+    async def execute(self, query):
+        after = query.get_variables().get("after")
+        self.requests.append(after)
+        if after == "c1" and self.rate_limited:
+            # The second page runs into the rate limit, which resets in an hour
+            self.rate_limited = False
+            reset_at = datetime.now(timezone.utc) + timedelta(hours=1)
+            return {"no_limit": True, "wait_seconds": 3600, "reset_at": reset_at.isoformat()}
+        nodes, has_next_page = PAGES[after]
+        page_info = {"endCursor": "c1", "hasNextPage": has_next_page}
+        return {"user": {"issues": {"nodes": nodes, "pageInfo": page_info}}}
+
+
+@pytest.fixture
+def app(monkeypatch):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    app.client = FakeClient()
+    monkeypatch.setattr(dataset_refresh, "get_async_github_client", lambda **kwargs: app.client)
+    monkeypatch.setattr(job_queue, "_live_jobs", {})
+    with app.app_context():
+        for model in (User, UserQuery, Issue, DatasetRefreshMark, BackgroundJob):
+            model.__table__.create(db.engine)
+        db.session.add(
+            User(github_id="U1", github_login="owner", personal_access_token="t1", api_url="https://api.github.com")
+        )
+        user_query = UserQuery(user_login="owner", ds_name="issues", data_type="Issues")
+        db.session.add(user_query)
+        db.session.flush()
+        db.session.add(
+            Issue(
+                author_github_login="octocat",
+                created_at=None,
+                body_text="N/A",
+                title="N/A",
+                user_query_id=user_query.id,
+            )
+        )
+        db.session.commit()
+        job = DatasetRefreshJob("owner", user_query.id, "issues", "Issues")
+        # Queued like enqueue_job does, without starting the worker threads
+        job.durable = True
+        BackgroundJob.enqueue(job.id, job.kind, "owner", job.params())
+        app.job_id, app.user_query_id = job.id, user_query.id
+    yield app
+
+
+def test_rate_limited_job_parks_and_resumes_from_checkpoint(app):
+    assert JobWorker(app).run_once()
+    # A parked job is not kept in memory; another process may resume it
+    assert job_queue._live_jobs == {}
+
+    with app.app_context():
+        record = db.session.get(BackgroundJob, app.job_id)
+        assert record.status == "parked"
+        assert record.resume_at > datetime.utcnow() + timedelta(minutes=50)
+        assert record.to_dict()["checkpoint"]["walk"]["cursor"] == "c1"
+        assert Issue.query.filter(Issue.title != "N/A").count() == 2
+        # Not due yet
+        assert not JobWorker(app).run_once()
+
+        # The server restarts before the rate limit resets
+        record.resume_at = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+    job_queue._live_jobs.clear()
+    assert JobWorker(app).run_once()
+
+    # The first page is not fetched again
+    assert app.client.requests == [None, "c1", "c1"]
+    assert job_queue._live_jobs == {}
+    with app.app_context():
+        record = db.session.get(BackgroundJob, app.job_id, populate_existing=True)
+        progress = record.to_dict()["progress"]
+        assert record.status == "completed"
+        assert (progress["inserted"], progress["updated"]) == (3, 0)
+        assert DatasetRefreshMark.get_marks(app.user_query_id) == {"octocat": "2021-09-01T00:00:00Z"}
+        assert Issue.query.filter(Issue.title != "N/A").count() == 3
+
+
+def live_job(app):
+    with app.app_context():
+        record = db.session.get(BackgroundJob, app.job_id)
+        job = DatasetRefreshJob.from_params(record.id, "owner", record.to_dict()["params"])
+    job.durable = True
+    job_queue._register_live_job(job)
+    return job
+
+
+def test_queued_job_claimed_by_another_process_is_read_from_its_record(app):
+    job = live_job(app)
+    with app.app_context():
+        assert get_live_job(app.job_id, "owner", DatasetRefreshJob) is job
+        BackgroundJob.claim("elsewhere-1-abcd1234", datetime.utcnow())
+
+        assert get_live_job(app.job_id, "owner", DatasetRefreshJob) is None
+        assert job_queue._live_jobs == {}
+        assert find_stored_job(app.job_id, "owner").progress()["status"] == "running"
+
+
+def test_cancelled_queued_job_is_dropped(app):
+    job = live_job(app)
+    with app.app_context():
+        job.cancel()
+        assert job_queue._live_jobs == {}
+        assert find_stored_job(app.job_id, "owner").progress()["status"] == "cancelled"
@@ -0,0 +1,49 @@
+import pytest
+from pygments.lexers import guess_lexer_for_filename
+from app.services.github_rest_services import process_commit_details
+from app.services.language_classifier import TEXT_LANGUAGE, candidate_lexers, classify_language
+
+FILES = [
+    ("src/app.py", "+def main():\n+    pass\n"),
+    ("web/App.tsx", "+export const App = () => <div />;\n"),
+    ("include/util.h", "+#include <stdio.h>\n+int util(void);\n"),
+    ("include/view.h", "+#import <Foundation/Foundation.h>\n+@interface View : NSObject\n+@end\n"),
+    ("lib/model.m", "+#import \"model.h\"\n+@implementation Model\n+@end\n"),
+    ("Makefile", "+all:\n+\tgcc main.c\n"),
+    ("Dockerfile", "+FROM python:3.11\n"),
+    ("CMakeLists.txt", "+project(x)\n"),
+]
+
+
+@pytest.mark.parametrize("filename,patch", FILES)
+def test_agrees_with_pygments(filename, patch):
+    assert classify_language(filename, patch) == guess_lexer_for_filename(filename, patch).name
+
+
+def test_ambiguous_extension_is_sniffed():
+    assert len(candidate_lexers("view.h")) > 1
+    assert classify_language("view.h", "+@interface View : NSObject\n+@end\n") == "Objective-C"
+    assert classify_language("util.h", "+int util(void);\n") == "C"
+
+
+def test_unknown_and_binary_files_are_text():
+    assert classify_language("data.unknownext", "+x\n") == TEXT_LANGUAGE
+    assert classify_language("logo.png", None) == TEXT_LANGUAGE
+
+
+def test_lang_stats_are_aggregated_per_language():
+    commit = {
+        "commit": {"author": {"name": "Octo", "email": None, "date": "2021-01-01T00:00:00Z"}, "message": "m"},
+        "author": None,
+        "parents": [{}],
+        "stats": {"additions": 6, "deletions": 3},
+        "files": [
+            {"filename": "a.py", "patch": "+x = 1\n", "additions": 1, "deletions": 1},
+            {"filename": "b/c.py", "patch": "+y = 2\n", "additions": 2, "deletions": 0},
+            {"filename": "logo.png", "additions": 3, "deletions": 2},
+        ],
+    }
+    assert process_commit_details(commit)["lang_stats"] == {
+        "Python": {"additions": 3, "deletions": 1},
+        TEXT_LANGUAGE: {"additions": 3, "deletions": 2},
+    }
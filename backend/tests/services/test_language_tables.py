@@ -0,0 +1,85 @@
+import json
+
+import pytest
+from flask import Flask
+from app.database import db
+from app.models import Commit, CommitLanguage, Repository, RepositoryLanguage, UserQuery
+from app.services.bulk_ingest import bulk_insert
+from app.services.language_tables import language_totals, sync_languages
+
+COMMIT_HEADER = ["Author Login", "Authored Date", "Languages"]
+
+
+def stats(**languages):
+    return json.dumps({name: {"additions": a, "deletions": d} for name, (a, d) in languages.items()})
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    with app.app_context():
+        for model in (UserQuery, Commit, Repository, CommitLanguage, RepositoryLanguage):
+            model.__table__.create(db.engine)
+        yield app
+        db.session.remove()
+
+
+def dataset(data_type):
+    user_query = UserQuery(user_login="owner", ds_name=data_type, data_type=data_type)
+    db.session.add(user_query)
+    db.session.commit()
+    return user_query
+
+
+def test_bulk_insert_fills_commit_languages(app):
+    user_query = dataset("User Commits")
+    bulk_insert(
+        "User Commits",
+        COMMIT_HEADER,
+        [
+            ["alice", "2024-05-01T10:00:00Z", stats(Python=(10, 2), Go=(1, 0))],
+            ["alice", "N/A", "N/A"],
+        ],
+        user_query.id,
+    )
+    # A second chunk appended to the dataset only adds the languages of its own rows
+    bulk_insert("User Commits", COMMIT_HEADER, [["bob", "N/A", stats(Python=(5, 5))]], user_query.id)
+    db.session.commit()
+
+    assert db.session.query(CommitLanguage).count() == 3
+    assert language_totals(user_query) == [
+        {"login": "alice", "language": "Go", "additions": 1, "deletions": 0},
+        {"login": "alice", "language": "Python", "additions": 10, "deletions": 2},
+        {"login": "bob", "language": "Python", "additions": 5, "deletions": 5},
+    ]
+
+
+def test_sync_replaces_languages_of_changed_rows(app):
+    user_query = dataset("Repositories")
+    repository = Repository(
+        author_github_login="alice",
+        name="repo",
+        primary_language="Python",
+        languages=json.dumps({"Python": 100, "C": 20}),
+        repository_type="Owned Original Repo",
+        user_query_id=user_query.id,
+    )
+    db.session.add(repository)
+    db.session.flush()
+    assert sync_languages(Repository, [repository.id]) == 2
+
+    repository.languages = json.dumps({"Python": 300})
+    db.session.flush()
+    sync_languages(Repository, [repository.id])
+    db.session.commit()
+
+    assert language_totals(user_query) == [{"login": "alice", "language": "Python", "bytes": 300}]
+
+
+def test_malformed_statistics_give_no_rows():
+    assert CommitLanguage.records_from_stats(1, "not json") == []
+    assert CommitLanguage.records_from_stats(1, '{"Python": 3}') == []
+    assert RepositoryLanguage.records_from_stats(1, "N/A") == []
+    assert RepositoryLanguage.records_from_stats(1, {"Go": 7}) == [{"repository_id": 1, "language": "Go", "bytes": 7}]
@@ -310,12 +310,35 @@ export const checkDuplicate = async (
     return response ? response.data : null;
 };
 
+// Rows per /api/db/save-data request; larger tables are uploaded in chunks appended to the dataset, which stays
+// incomplete until its last chunk is saved
+const SAVE_CHUNK_ROWS = 5000;
+
 export const saveToDatabase = async (
   params: { [key: string]: string | string[] | string[][] | Set<string>},
   setError: (error: string | null) => void,
 ) => {
-    const response = await postData(`/api/db/save-data`, setError, params);
-    return response ? response.data : null;
+    const tableData = (params.tableData as string[][]) || [];
+    const response = await postData(`/api/db/save-data`, setError, {
+      ...params,
+      tableData: tableData.slice(0, SAVE_CHUNK_ROWS),
+      final: tableData.length <= SAVE_CHUNK_ROWS,
+    });
+    if (!response) {
+      return null;
+    }
+    for (let start = SAVE_CHUNK_ROWS; start < tableData.length; start += SAVE_CHUNK_ROWS) {
+      const chunk = await postData(`/api/db/save-data`, setError, {
+        ...params,
+        queryId: response.data.query_id,
+        tableData: tableData.slice(start, start + SAVE_CHUNK_ROWS),
+        final: start + SAVE_CHUNK_ROWS >= tableData.length,
+      });
+      if (!chunk) {
+        return null;
+      }
+    }
+    return response.data;
 };
 
 